@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LostItem, StationDict, RidershipDaily, WeatherDaily
+from .models import LostItem, StationDict, Station, RidershipHourly, RidershipDaily, WeatherDaily, PipelineRun, LostItemRate, LostForecast, DuplicateCluster, SavedSearch, SearchNotification, QuarantinedRow, StorageOccupancy, PickupTimeHistogram, ArchivedLostItem, NameAlias, TransportOperator
 
 # ----------------------------------------------------------------------
 # 1. LostItem (기존 코드 유지 및 확장)
@@ -35,9 +35,10 @@ class StationDictAdmin(admin.ModelAdmin):
 @admin.register(RidershipDaily)
 class RidershipDailyAdmin(admin.ModelAdmin):
     """일별 승하차 인원 데이터 관리"""
-    list_display = ("date", "line_code", "station_name_std", "total", "boardings", "alightings")
-    list_filter = ("line_code", "date") # 날짜별로 필터링 용이하게
-    search_fields = ("station_name_std", "line_code")
+    list_display = ("date", "station__line_code", "station__station_name_std", "total", "boardings", "alightings")
+    list_filter = ("station__line_code", "date") # 날짜별로 필터링 용이하게
+    search_fields = ("station__station_name_std", "station__line_code")
+    list_select_related = ("station",)
     date_hierarchy = "date"
     # 최신 날짜 순, 총 인원 순으로 정렬
     ordering = ('-date', '-total') 
@@ -54,4 +55,216 @@ class WeatherDailyAdmin(admin.ModelAdmin):
     list_filter = ("is_rainy", "city_code")
     search_fields = ("city_code",)
     date_hierarchy = "date"
-    ordering = ('-date',) # 최신 날짜 순 정렬
\ No newline at end of file
+    ordering = ('-date',) # 최신 날짜 순 정렬
+
+
+# ----------------------------------------------------------------------
+# 5. PipelineRun (야간 파이프라인 실행 기록)
+# ----------------------------------------------------------------------
+@admin.register(PipelineRun)
+class PipelineRunAdmin(admin.ModelAdmin):
+    """run_pipeline 실행 이력 및 단계별 소요 시간 확인"""
+    list_display = ("id", "started_at", "finished_at", "status", "resumed_from")
+    list_filter = ("status",)
+    readonly_fields = ("started_at", "finished_at", "status", "stages", "resumed_from")
+    ordering = ('-started_at',)
+
+
+
+# ----------------------------------------------------------------------
+# 6. LostItemRate (분실률 지표 - sync_reports가 계산)
+# ----------------------------------------------------------------------
+@admin.register(LostItemRate)
+class LostItemRateAdmin(admin.ModelAdmin):
+    """(날짜, 노선, 역, 카테고리)별 1만 명당 분실률 확인"""
+    list_display = ("date", "station__line_code", "station__station_name_std", "category", "lost_count", "ridership", "rate_per_10k")
+    list_filter = ("station__line_code", "category")
+    search_fields = ("station__station_name_std",)
+    list_select_related = ("station",)
+    date_hierarchy = "date"
+    ordering = ('-date', 'station__line_code')
+
+
+
+# ----------------------------------------------------------------------
+# 7. LostForecast (향후 7일 분실 예보 - sync_reports가 계산)
+# ----------------------------------------------------------------------
+@admin.register(LostForecast)
+class LostForecastAdmin(admin.ModelAdmin):
+    """노선·카테고리별 예측 분실률 확인"""
+    list_display = ("date", "line_code", "category", "rain_mm", "avg_temp", "predicted_rate", "dry_rate", "rainy_rate", "training_days")
+    list_filter = ("date", "line_code", "category")
+    ordering = ('date', 'line_code', 'category')
+
+
+
+# ----------------------------------------------------------------------
+# 8. DuplicateCluster (중복 의심 분실물 묶음 - main/dedup.py가 생성)
+# ----------------------------------------------------------------------
+class DuplicateClusterItemInline(admin.TabularInline):
+    """묶음에 속한 분실물 목록"""
+    model = DuplicateCluster.items.through
+    raw_id_fields = ("lostitem",)
+    extra = 0
+    verbose_name = "분실물"
+    verbose_name_plural = "묶음에 속한 분실물"
+
+
+@admin.register(DuplicateCluster)
+class DuplicateClusterAdmin(admin.ModelAdmin):
+    """CSV / API로 따로 들어온 같은 물건 후보 검토"""
+    list_display = ("id", "status", "similarity", "item_count", "created_at", "updated_at")
+    list_filter = ("status",)
+    readonly_fields = ("similarity", "created_at", "updated_at")
+    exclude = ("items",)
+    inlines = (DuplicateClusterItemInline,)
+    ordering = ('status', '-similarity')
+    actions = ("mark_confirmed", "mark_dismissed")
+
+    @admin.display(description="분실물 수")
+    def item_count(self, obj):
+        return obj.items.count()
+
+    @admin.action(description="선택한 묶음을 중복 확정")
+    def mark_confirmed(self, request, queryset):
+        queryset.update(status=DuplicateCluster.STATUS_CONFIRMED)
+
+    @admin.action(description="선택한 묶음을 중복 아님으로 기각")
+    def mark_dismissed(self, request, queryset):
+        queryset.update(status=DuplicateCluster.STATUS_DISMISSED)
+
+
+
+# ----------------------------------------------------------------------
+# 9. SavedSearch / SearchNotification (저장된 검색 알림 - main/percolator.py)
+# ----------------------------------------------------------------------
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    """분실물 알림 신청 조건 관리"""
+    list_display = ("id", "contact", "category", "line", "station", "keywords", "is_active", "created_at")
+    list_filter = ("is_active", "category", "line")
+    search_fields = ("contact", "keywords", "station")
+    ordering = ('-created_at',)
+
+
+@admin.register(SearchNotification)
+class SearchNotificationAdmin(admin.ModelAdmin):
+    """적재 시점에 매칭된 알림 확인"""
+    list_display = ("id", "saved_search", "item", "is_sent", "created_at")
+    list_filter = ("is_sent",)
+    raw_id_fields = ("saved_search", "item")
+    ordering = ('-created_at',)
+
+
+
+# ----------------------------------------------------------------------
+# 10. Station (역 차원 - StationDict에서 파생, 사실 테이블의 정수 키)
+# ----------------------------------------------------------------------
+@admin.register(Station)
+class StationAdmin(admin.ModelAdmin):
+    """역 정수 키 확인 (sync_ridership이 StationDict 기준으로 갱신)"""
+    list_display = ("id", "line_code", "station_name_std", "is_transfer")
+    list_filter = ("line_code", "is_transfer")
+    search_fields = ("station_name_std",)
+    ordering = ('line_code', 'station_name_std')
+
+
+
+# ----------------------------------------------------------------------
+# 11. RidershipHourly (시간대별 승하차 인원 - 역·월당 패킹 배열 1행)
+# ----------------------------------------------------------------------
+@admin.register(RidershipHourly)
+class RidershipHourlyAdmin(admin.ModelAdmin):
+    """시간대별 승하차 배열 확인 (counts는 디코딩해서 표시)"""
+    list_display = ("date", "station", "days", "peak_hour")
+    list_filter = ("date", "station__line_code")
+    readonly_fields = ("date", "station", "days", "decoded_counts")
+    exclude = ("counts",)
+    ordering = ('-date', 'station')
+
+    @admin.display(description="최대 혼잡 시간대")
+    def peak_hour(self, obj):
+        from .hourly import decode, peak_hours
+        return f"{peak_hours(decode(obj.counts), top=1)[0]}시"
+
+    @admin.display(description="시간대별 인원 (승차 / 하차)")
+    def decoded_counts(self, obj):
+        from .hourly import decode
+        counts = decode(obj.counts)
+        return ", ".join(f"{hour}시 {on}/{off}" for hour, (on, off) in enumerate(zip(counts[0], counts[1])))
+
+
+# ----------------------------------------------------------------------
+# 12. QuarantinedRow (적재 전 검증에 실패한 원천 행)
+# ----------------------------------------------------------------------
+@admin.register(QuarantinedRow)
+class QuarantinedRowAdmin(admin.ModelAdmin):
+    """CSV 업로드 / API 동기화에서 격리된 행과 실패 사유 확인"""
+    list_display = ("source", "batch_id", "row_number", "reasons", "created_at")
+    list_filter = ("source", "created_at")
+    search_fields = ("batch_id",)
+    readonly_fields = ("source", "batch_id", "row_number", "raw", "reasons", "created_at")
+    ordering = ('-created_at', 'row_number')
+
+
+# ----------------------------------------------------------------------
+# 13. StorageOccupancy / PickupTimeHistogram (보관 장소별 재고 증분 카운터)
+# ----------------------------------------------------------------------
+@admin.register(StorageOccupancy)
+class StorageOccupancyAdmin(admin.ModelAdmin):
+    """보관 장소 카운터 확인 (값은 적재/수정 시점에 자동 갱신, 불일치 시 rebuild_occupancy)"""
+    list_display = ("storage_location", "held", "received", "avg_pickup_days", "updated_at")
+    search_fields = ("storage_location",)
+    readonly_fields = ("storage_location", "held", "received", "pickup_samples", "pickup_days_total", "updated_at")
+    ordering = ('-held',)
+
+
+@admin.register(PickupTimeHistogram)
+class PickupTimeHistogramAdmin(admin.ModelAdmin):
+    list_display = ("category", "bucket", "count")
+    list_filter = ("category",)
+    ordering = ('category', 'bucket')
+
+
+# ----------------------------------------------------------------------
+# 14. ArchivedLostItem (수령 완료 분실물 콜드 아카이브 - 읽기 전용)
+# ----------------------------------------------------------------------
+@admin.register(ArchivedLostItem)
+class ArchivedLostItemAdmin(admin.ModelAdmin):
+    """archive_lostitems가 옮긴 분실물 확인 (압축 필드는 풀어서 표시)"""
+    list_display = ("item_id", "category", "item_name", "station", "registered_at", "received_at", "archived_at")
+    list_filter = ("category", "transport")
+    search_fields = ("item_id", "item_name", "station")
+    date_hierarchy = "registered_at"
+    exclude = ("payload",)
+    readonly_fields = (
+        "id", "item_id", "transport", "line", "station", "category", "item_name", "status", "registered_at",
+        "received_at", "storage_location", "views", "description", "registrar_id", "pickup_company_location", "archived_at",
+    )
+    ordering = ('-registered_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+
+# ----------------------------------------------------------------------
+# 15. NameAlias / TransportOperator (정규화 규칙 - main/normalize.py)
+# ----------------------------------------------------------------------
+@admin.register(NameAlias)
+class NameAliasAdmin(admin.ModelAdmin):
+    """노선명 / 역명 별칭 관리 (적재 명령은 다음 실행부터, 웹 프로세스는 저장 즉시 반영)"""
+    list_display = ("kind", "alias", "target", "is_regex", "is_active")
+    list_editable = ("target", "is_active")
+    list_filter = ("kind", "is_regex", "is_active")
+    search_fields = ("alias", "target")
+    ordering = ('kind', 'alias')
+
+
+@admin.register(TransportOperator)
+class TransportOperatorAdmin(admin.ModelAdmin):
+    """분실물 수령 회사 → 교통수단 분류 관리"""
+    list_display = ("name", "transport", "is_active")
+    list_editable = ("transport", "is_active")
+    list_filter = ("transport", "is_active")
+    search_fields = ("name",)
+    ordering = ('transport', 'name')
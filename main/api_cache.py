@@ -0,0 +1,252 @@
+# pickuplog/main/api_cache.py (서울 Open API 응답 디스크 캐시)
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from django.conf import settings
+
+CACHE_DIRNAME = 'http_cache'
+# 캐시 전체 크기 상한. 넘으면 가장 오래 쓰지 않은 항목부터 LOW_WATERMARK까지 지웁니다.
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+LOW_WATERMARK = 0.9
+
+# 서비스별 유효 기간(초). None = 만료 없음 (지난 날짜 / 지난 달 자료는 공개 후 바뀌지 않음)
+CACHE_TTL = {
+    'CardSubwayStatsNew': None,
+    'CardSubwayTime': None,
+    'lostArticleInfo': 10 * 60,
+}
+# 목록에 없는 서비스
+DEFAULT_TTL = 60 * 60
+# '데이터 없음' 응답은 아직 공개 전일 수 있으므로 짧게 (서비스 TTL이 더 짧으면 그쪽)
+NO_DATA_TTL = 6 * 60 * 60
+# 본문을 나눠 읽을 때 한 번에 읽는 압축 바이트
+READ_CHUNK = 64 * 1024
+ZLIB_LEVEL = 6
+
+
+def cache_dir():
+    return settings.ANALYTICS_DIR / CACHE_DIRNAME
+
+
+def cache_ttl(service, has_data):
+    ttl = CACHE_TTL.get(service, DEFAULT_TTL)
+    if has_data:
+        return ttl
+    return NO_DATA_TTL if ttl is None else min(ttl, NO_DATA_TTL)
+
+
+class CacheEntry:
+    """content가 None이면(lookup(load=False)) 본문은 chunks()로 파일에서 조금씩 풀어 읽습니다."""
+
+    __slots__ = ('key', 'content', 'expires_at', 'etag', 'last_modified', 'path')
+
+    def __init__(self, key, content, expires_at, etag, last_modified, path=None):
+        self.key = key
+        self.content = content
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.path = path
+
+    @property
+    def fresh(self):
+        return self.expires_at is None or self.expires_at > time.time()
+
+    def chunks(self, size=READ_CHUNK):
+        """압축을 풀며 본문을 조각 단위로 내보냅니다. (파일이 그사이 지워졌거나 손상됐으면 OSError / zlib.error)"""
+        if self.content is not None:
+            for start in range(0, len(self.content), size):
+                yield self.content[start:start + size]
+            return
+        decompressor = zlib.decompressobj()
+        with open(self.path, 'rb') as f:
+            f.readline()
+            while True:
+                data = f.read(size)
+                if not data:
+                    break
+                yield decompressor.decompress(data)
+        yield decompressor.flush()
+
+    def compressed(self):
+        """저장된 압축 본문 그대로 (304로 유효 기간만 늘릴 때 다시 압축하지 않도록)"""
+        if self.content is not None:
+            return zlib.compress(self.content, ZLIB_LEVEL)
+        with open(self.path, 'rb') as f:
+            f.readline()
+            return f.read()
+
+    def conditional_headers(self):
+        """만료된 항목을 다시 확인할 때 보낼 조건부 요청 헤더 (서버가 검증자를 주지 않았으면 빈 dict)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    요청 키(서비스/시작/끝/추가 인자 - API 키 제외)마다 파일 하나에 응답 본문을 zlib으로 압축해 저장합니다.
+    (응답이 잘리는 sample 키의 요청은 SeoulApiClient가 캐시를 거치지 않습니다)
+    파일 구성: 메타데이터 JSON 한 줄 + 압축 본문. 저장은 임시 파일 + os.replace라 읽는 쪽이 반쯤 쓴 파일을 보지 않습니다.
+    적중할 때마다 파일 mtime을 갱신하고, 전체 크기가 CACHE_MAX_BYTES를 넘으면 mtime이 오래된 순(LRU)으로 지웁니다.
+    """
+
+    def __init__(self, directory=None, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    def _dir(self):
+        directory = self.directory or cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self._dir() / f"{digest}.cache"
+
+    def _entries(self):
+        return [path for path in self._dir().iterdir() if path.suffix == '.cache']
+
+    def lookup(self, key, load=True):
+        """
+        저장된 항목 (만료 여부와 무관, 없거나 읽을 수 없으면 None)
+        load=False면 메타데이터만 읽고 본문은 entry.chunks()로 나눠 읽습니다. (스트리밍 해석용)
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                content = zlib.decompress(f.read()) if load else None
+        except (OSError, ValueError, zlib.error):
+            return None
+        if meta.get('key') != key:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return CacheEntry(key, content, meta.get('expires_at'), meta.get('etag'), meta.get('last_modified'), path)
+
+    def store(self, key, content, ttl, etag=None, last_modified=None):
+        self.store_compressed(key, zlib.compress(content, ZLIB_LEVEL), ttl, etag, last_modified)
+
+    def store_compressed(self, key, compressed, ttl, etag=None, last_modified=None):
+        """이미 zlib으로 압축한 본문 저장 (스트리밍으로 받으며 압축한 응답)"""
+        meta = {
+            'key': key,
+            'stored_at': time.time(),
+            'expires_at': None if ttl is None else time.time() + ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        data = json.dumps(meta, ensure_ascii=False).encode('utf-8') + b'\n' + compressed
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        # 처음 크기를 셀 때 새 파일이 이미 포함돼 두 번 더해지지 않도록 쓰기 전에 계산해 둡니다.
+        self.size()
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._grow(len(data) - old_size)
+
+    def refresh(self, entry, ttl):
+        """조건부 요청이 304(변경 없음)면 본문은 그대로 두고 유효 기간만 늘립니다."""
+        try:
+            compressed = entry.compressed()
+        except OSError:
+            return
+        self.store_compressed(entry.key, compressed, ttl, entry.etag, entry.last_modified)
+
+    # ------------------------------------------------------------------
+    # 크기 관리
+    # ------------------------------------------------------------------
+    def size(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(path.stat().st_size for path in self._entries())
+            return self._size
+
+    def _grow(self, delta):
+        total = self.size()
+        with self._lock:
+            self._size = total + delta
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self, target=None):
+        """mtime이 오래된 항목부터 target 바이트(기본: 상한 × LOW_WATERMARK) 이하가 될 때까지 지웁니다. 반환: 지운 수"""
+        target = int(self.max_bytes * LOW_WATERMARK) if target is None else target
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            self._size = total
+            return removed
+
+    def purge_expired(self):
+        """만료된 항목 삭제 (검증자가 있어 조건부 요청으로 되살릴 수 있는 항목도 함께). 반환: 지운 수"""
+        removed = 0
+        now = time.time()
+        for path in self._entries():
+            try:
+                with open(path, 'rb') as f:
+                    expires_at = json.loads(f.readline()).get('expires_at')
+            except (OSError, ValueError):
+                expires_at = 0
+            if expires_at is not None and expires_at <= now:
+                path.unlink(missing_ok=True)
+                removed += 1
+        with self._lock:
+            self._size = None
+        return removed
+
+    def stats(self):
+        """{서비스: [항목 수, 바이트]}"""
+        by_service = {}
+        for path in self._entries():
+            try:
+                with open(path, 'rb') as f:
+                    service = json.loads(f.readline())['key'].split('/')[0]
+                size = path.stat().st_size
+            except (OSError, ValueError, KeyError):
+                continue
+            counts = by_service.setdefault(service, [0, 0])
+            counts[0] += 1
+            counts[1] += size
+        return by_service
+
+    def clear(self):
+        removed = 0
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        with self._lock:
+            self._size = 0
+        return removed
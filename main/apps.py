@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from .db import configure_sqlite
+
+        connection_created.connect(configure_sqlite, dispatch_uid='main.configure_sqlite')
+
+        # 폼 / 관리자 화면의 단건 저장·삭제 시 보관 장소 카운터 증분 반영 (일괄 적재는 track_occupancy 사용)
+        from .models import LostItem
+        from .occupancy import lostitem_post_delete, lostitem_post_save, lostitem_pre_save
+
+        pre_save.connect(lostitem_pre_save, sender=LostItem, dispatch_uid='main.occupancy_pre_save')
+        post_save.connect(lostitem_post_save, sender=LostItem, dispatch_uid='main.occupancy_post_save')
+        post_delete.connect(lostitem_post_delete, sender=LostItem, dispatch_uid='main.occupancy_post_delete')
+
+        # 정규화 규칙(별칭 / 운수사)이 바뀌면 컴파일된 규칙을 버리고 다음 사용 때 다시 읽습니다. (다른 프로세스는 표시 파일로)
+        from .models import NameAlias, TransportOperator
+        from .normalize import reset_rules
+
+        for model in (NameAlias, TransportOperator):
+            post_save.connect(reset_rules, sender=model, dispatch_uid=f'main.reset_rules_save_{model.__name__}')
+            post_delete.connect(reset_rules, sender=model, dispatch_uid=f'main.reset_rules_delete_{model.__name__}')
@@ -0,0 +1,168 @@
+# pickuplog/main/archive.py (수령 완료 분실물 콜드 아카이브)
+
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from main.models import ArchivedLostItem, LostItem
+from main.occupancy import QUERY_CHUNK, suspend_tracking
+
+# 한 트랜잭션에서 옮기는 분실물 수. 청크마다 커밋되므로 중간에 멈춰도 다시 실행하면 남은 행부터 이어서 옮깁니다.
+ARCHIVE_CHUNK = 2000
+# 컬럼으로 남기지 않고 압축해 두는 긴 텍스트 필드
+PAYLOAD_FIELDS = ('description', 'registrar_id', 'pickup_company_location')
+COLUMN_FIELDS = (
+    'item_id', 'transport', 'line', 'station', 'category', 'item_name', 'status',
+    'registered_at', 'received_at', 'storage_location', 'views',
+)
+
+
+def pack_payload(item):
+    data = {field: getattr(item, field) for field in PAYLOAD_FIELDS}
+    return zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'), 6)
+
+
+def archive_cutoff(days=None):
+    """이 시각보다 먼저 등록된 수령 완료 분실물이 아카이브 대상입니다."""
+    days = settings.LOSTITEM_ARCHIVE_AFTER_DAYS if days is None else days
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_candidates(cutoff):
+    return LostItem.objects.filter(is_received=True, registered_at__lt=cutoff)
+
+
+def archive_chunk(cutoff, chunk_size=ARCHIVE_CHUNK):
+    """
+    대상 분실물을 pk 순서로 chunk_size개 옮깁니다. (아카이브 INSERT + LostItem DELETE를 한 트랜잭션으로)
+    이전 실행이 INSERT 후 중단됐더라도 ignore_conflicts로 건너뛰고 삭제만 마칩니다. 반환값: 옮긴 pk 목록
+    """
+    with transaction.atomic():
+        items = list(archive_candidates(cutoff).order_by('pk')[:chunk_size])
+        if not items:
+            return []
+        ArchivedLostItem.objects.bulk_create(
+            [
+                ArchivedLostItem(id=item.pk, payload=pack_payload(item), **{f: getattr(item, f) for f in COLUMN_FIELDS})
+                for item in items
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        pks = [item.pk for item in items]
+        # 보관 장소 카운터(수령 완료 건수 / 소요 시간)는 아카이브 후에도 유지합니다.
+        with suspend_tracking():
+            LostItem.objects.filter(pk__in=pks).delete()
+    return pks
+
+
+def archive_items(days=None, chunk_size=ARCHIVE_CHUNK, max_chunks=None, stdout=None):
+    """
+    등록 후 days일이 지난 수령 완료 분실물을 청크 단위로 아카이브로 옮깁니다.
+    반환값: 옮긴 분실물 수
+    """
+    from main.matching import remove_from_search_index
+
+    cutoff = archive_cutoff(days)
+    moved, chunks = [], 0
+    while max_chunks is None or chunks < max_chunks:
+        pks = archive_chunk(cutoff, chunk_size)
+        if not pks:
+            break
+        moved += pks
+        chunks += 1
+        if stdout is not None:
+            stdout.write(f"  ... 청크 {chunks}: {len(pks)}건 이동 (누적 {len(moved)}건, 마지막 pk {pks[-1]})")
+    if moved:
+        remove_from_search_index(moved)
+    return len(moved)
+
+
+def archived_item_ids(item_ids):
+    """item_ids 중 이미 아카이브로 옮긴 item_id 집합 (원천 재적재 시 핫 테이블에 다시 만들지 않도록)"""
+    item_ids = list(item_ids)
+    archived = set()
+    for i in range(0, len(item_ids), QUERY_CHUNK):
+        archived.update(
+            ArchivedLostItem.objects.filter(item_id__in=item_ids[i:i + QUERY_CHUNK]).values_list('item_id', flat=True)
+        )
+    return archived
+
+
+def archive_watermark():
+    """아카이브에 있는 가장 늦은 등록일시 (아카이브가 비어 있으면 None)"""
+    return ArchivedLostItem.objects.aggregate(latest=Max('registered_at'))['latest']
+
+
+# ----------------------------------------------------------------------
+# 목록 조회: 핫(LostItem) + 아카이브 병합
+# ----------------------------------------------------------------------
+def needs_archive(date_from, date_to, only_unreceived, watermark):
+    """
+    날짜 필터가 아카이브 구간(watermark 이전)에 걸칠 때만 아카이브를 함께 조회합니다.
+    날짜 필터가 없는 기본 목록과 미수령만 보기는 핫 테이블만 읽습니다. (date_from / date_to는 date)
+    """
+    if watermark is None or only_unreceived:
+        return False
+    if date_from is None and date_to is None:
+        return False
+    return date_from is None or date_from <= timezone.localtime(watermark).date()
+
+
+def _sort_key(field):
+    # 같은 값이면 pk로 순서를 고정 (쿼리의 order_by(field, pk)와 같은 순서)
+    def key(item):
+        value = getattr(item, field)
+        return (0, 0, item.pk) if value is None else (1, value, item.pk)
+    return key
+
+
+class TieredLostItems:
+    """
+    정렬 조건이 같은 핫 / 아카이브 결과를 하나의 목록처럼 보여 주는 Paginator용 시퀀스.
+    페이지를 자를 때 두 계층에서 각각 앞쪽 stop개만 읽어 병합하므로 전체를 읽지 않습니다.
+    archived는 QuerySet 또는 (설명 검색으로 걸러 낸) 리스트입니다.
+    """
+
+    def __init__(self, hot, archived, order_field='registered_at', descending=True):
+        self.hot = hot
+        self.archived = archived
+        self.key = _sort_key(order_field)
+        self.descending = descending
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            archived = len(self.archived) if isinstance(self.archived, list) else self.archived.count()
+            self._count = self.hot.count() + archived
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop if index.stop is not None else self.count()
+        merged = sorted(
+            list(self.hot[:stop]) + list(self.archived[:stop]),
+            key=self.key,
+            reverse=self.descending,
+        )
+        return merged[start:stop]
+
+
+def filter_archived_text(archived, q):
+    """물품명 / 역명 / (압축된) 설명에 q가 들어간 아카이브 행 (LostItem의 icontains 검색과 같은 조건)"""
+    q = q.lower()
+    return [
+        item for item in archived.iterator(chunk_size=2000)
+        if q in (item.item_name or '').lower()
+        or q in (item.station or '').lower()
+        or q in (item.description or '').lower()
+    ]
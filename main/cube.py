@@ -0,0 +1,194 @@
+# pickuplog/main/cube.py (요일 × 노선 × 역 × 카테고리 분실 패턴 큐브)
+
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+
+WEEKDAY_LABELS = ['월', '화', '수', '목', '금', '토', '일']
+CUBE_FILENAME = 'pattern_cube.npz'
+
+
+def cube_path():
+    return settings.ANALYTICS_DIR / CUBE_FILENAME
+
+
+class PatternCube:
+    """
+    분실물 수를 (요일, 역, 카테고리) 3차원 배열로, 승하차 인원을 (요일, 역) 배열로 보관합니다.
+    역 축은 (노선 코드, 표준 역명) 쌍이므로 노선 조건은 역 축의 마스크로 처리됩니다.
+    값은 LostItemRate 행을 더하고(sign=+1) 빼서(sign=-1) 증분 갱신합니다.
+    """
+
+    def __init__(self, stations=(), categories=(), counts=None, riders=None, version=None):
+        self.stations = [tuple(station) for station in stations]
+        self.categories = list(categories)
+        self.counts = counts if counts is not None else np.zeros((7, len(self.stations), len(self.categories)), dtype=np.int64)
+        self.riders = riders if riders is not None else np.zeros((7, len(self.stations)), dtype=np.int64)
+        self.version = version
+        self._reindex()
+
+    def _reindex(self):
+        self._station_pos = {station: i for i, station in enumerate(self.stations)}
+        self._category_pos = {category: i for i, category in enumerate(self.categories)}
+        self.lines = sorted({line for line, _ in self.stations})
+        line_pos = {line: i for i, line in enumerate(self.lines)}
+        self.station_line = np.array([line_pos[line] for line, _ in self.stations], dtype=np.int32)
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def _grow(self, stations, categories):
+        new_stations = [s for s in dict.fromkeys(stations) if s not in self._station_pos]
+        new_categories = [c for c in dict.fromkeys(categories) if c not in self._category_pos]
+        if not new_stations and not new_categories:
+            return
+        self.stations += new_stations
+        self.categories += new_categories
+        self.counts = np.pad(self.counts, ((0, 0), (0, len(new_stations)), (0, len(new_categories))))
+        self.riders = np.pad(self.riders, ((0, 0), (0, len(new_stations))))
+        self._reindex()
+
+    def apply(self, rows, all_categories, sign=1):
+        """
+        LostItemRate 행 (date, line_code, station_name_std, category, lost_count, ridership)을 반영합니다.
+        category == all_categories 인 합계 행은 승하차 인원(riders)에만, 나머지는 분실물 수(counts)에만 더합니다.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        stations = [(row[1], row[2]) for row in rows]
+        categories = [row[3] for row in rows if row[3] != all_categories]
+        self._grow(stations, categories)
+
+        weekday = np.fromiter((row[0].weekday() for row in rows), dtype=np.int64, count=len(rows))
+        station = np.fromiter((self._station_pos[s] for s in stations), dtype=np.int64, count=len(rows))
+        is_total = np.fromiter((row[3] == all_categories for row in rows), dtype=bool, count=len(rows))
+        lost = np.fromiter((row[4] for row in rows), dtype=np.int64, count=len(rows)) * sign
+        riders = np.fromiter((row[5] for row in rows), dtype=np.int64, count=len(rows)) * sign
+
+        np.add.at(self.riders, (weekday[is_total], station[is_total]), riders[is_total])
+        detail = ~is_total
+        category = np.fromiter(
+            (self._category_pos[row[3]] for row in rows if row[3] != all_categories),
+            dtype=np.int64, count=int(detail.sum()),
+        )
+        np.add.at(self.counts, (weekday[detail], station[detail], category), lost[detail])
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _axis_index(self, values, positions):
+        if values is None:
+            return None
+        return np.array([positions[v] for v in values if v in positions], dtype=np.int64)
+
+    def slice(self, weekdays=None, lines=None, stations=None, categories=None, group_by=None):
+        """
+        조건에 맞는 부분 큐브를 합산합니다. 각 조건은 값 목록이며 None이면 전체입니다.
+        group_by ('weekday' | 'line' | 'station' | 'category')를 주면 그 축별로 나눠 반환합니다.
+        반환: [{'key', 'lost', 'riders', 'rate_per_10k'}, ...]
+        """
+        weekday_idx = np.arange(7) if weekdays is None else np.array([w for w in weekdays if 0 <= w < 7], dtype=np.int64)
+        station_mask = np.ones(len(self.stations), dtype=bool)
+        if lines is not None:
+            line_idx = self._axis_index(lines, {line: i for i, line in enumerate(self.lines)})
+            station_mask &= np.isin(self.station_line, line_idx)
+        if stations is not None:
+            names = set(stations)
+            station_mask &= np.array([name in names for _, name in self.stations], dtype=bool)
+        station_idx = np.flatnonzero(station_mask)
+        category_idx = self._axis_index(categories, self._category_pos)
+        if category_idx is None:
+            category_idx = np.arange(len(self.categories))
+
+        counts = self.counts[np.ix_(weekday_idx, station_idx, category_idx)]
+        riders = self.riders[np.ix_(weekday_idx, station_idx)]
+
+        if group_by == 'weekday':
+            keys = [WEEKDAY_LABELS[w] for w in weekday_idx]
+            lost, total = counts.sum(axis=(1, 2)), riders.sum(axis=1)
+        elif group_by == 'station':
+            keys = [f'{self.stations[s][0]} {self.stations[s][1]}' for s in station_idx]
+            lost, total = counts.sum(axis=(0, 2)), riders.sum(axis=0)
+        elif group_by == 'line':
+            line_of = self.station_line[station_idx]
+            present = np.unique(line_of)
+            keys = [self.lines[i] for i in present]
+            per_station_lost, per_station_riders = counts.sum(axis=(0, 2)), riders.sum(axis=0)
+            lost = np.array([per_station_lost[line_of == i].sum() for i in present], dtype=np.int64)
+            total = np.array([per_station_riders[line_of == i].sum() for i in present], dtype=np.int64)
+        elif group_by == 'category':
+            # 카테고리별 분모는 선택된 역/요일의 전체 승하차 인원으로 동일
+            keys = [self.categories[c] for c in category_idx]
+            lost = counts.sum(axis=(0, 1))
+            total = np.full(len(keys), riders.sum(), dtype=np.int64)
+        else:
+            keys = ['전체']
+            lost, total = np.array([counts.sum()]), np.array([riders.sum()])
+
+        return [
+            {
+                'key': key,
+                'lost': int(l),
+                'riders': int(t),
+                'rate_per_10k': round(float(l) / float(t) * 10000, 4) if t > 0 else None,
+            }
+            for key, l, t in zip(keys, lost, total)
+        ]
+
+    # ------------------------------------------------------------------
+    # 저장 / 불러오기
+    # ------------------------------------------------------------------
+    def save(self, path=None):
+        path = path or cube_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            counts=self.counts.astype(np.int32),
+            riders=self.riders,
+            station_lines=np.array([line for line, _ in self.stations], dtype=str),
+            station_names=np.array([name for _, name in self.stations], dtype=str),
+            categories=np.array(self.categories, dtype=str),
+            version=np.array(self.version or [], dtype=np.int64),
+        )
+        # 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 원자적으로 교체
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or cube_path()
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return cls(
+                stations=zip(data['station_lines'].tolist(), data['station_names'].tolist()),
+                categories=data['categories'].tolist(),
+                counts=data['counts'].astype(np.int64),
+                riders=data['riders'],
+                version=data['version'].tolist() or None,
+            )
+
+
+# ----------------------------------------------------------------------
+# 프로세스 단위 캐시: 파일이 바뀌었을 때만 다시 읽습니다.
+# ----------------------------------------------------------------------
+_cache_lock = threading.Lock()
+_cached = {'mtime': None, 'cube': None}
+
+
+def get_cube():
+    """메모리에 올린 PatternCube를 반환합니다. 스냅샷 파일이 없으면 None."""
+    path = cube_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _cached['mtime'] != mtime:
+        with _cache_lock:
+            if _cached['mtime'] != mtime:
+                _cached['cube'] = PatternCube.load(path)
+                _cached['mtime'] = mtime
+    return _cached['cube']
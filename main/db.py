@@ -0,0 +1,133 @@
+# pickuplog/main/db.py (DB 연결 튜닝)
+
+import os
+import sqlite3
+
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    connection_created 시그널 수신기.
+    SQLite 연결이 만들어질 때마다 settings.SQLITE_PRAGMAS를 적용합니다.
+    (WAL, synchronous=NORMAL, mmap_size, cache_size, busy_timeout 등)
+    분석용 스냅샷 연결에는 읽기 전용 설정(settings.SQLITE_SNAPSHOT_PRAGMAS)을 적용합니다.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    if connection.alias == getattr(settings, 'ANALYTICS_DB_ALIAS', None):
+        pragmas = getattr(settings, 'SQLITE_SNAPSHOT_PRAGMAS', {})
+    else:
+        pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def sqlite_pragma_status(using='default'):
+    """현재 연결에 적용된 PRAGMA 값을 {이름: 값} 으로 반환합니다. (벤치마크/진단용)"""
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return {}
+    status = {}
+    with connection.cursor() as cursor:
+        for name in getattr(settings, 'SQLITE_PRAGMAS', {}):
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            status[name] = row[0] if row else None
+    return status
+
+
+# ----------------------------------------------------------------------
+# 분석용 읽기 전용 스냅샷 (main.routers.AnalyticsRouter)
+# ----------------------------------------------------------------------
+# (st_mtime_ns, st_ino, st_size) → 스냅샷 스키마가 현재 코드와 맞는지. 스냅샷은 os.replace로만 바뀌므로 파일이 같으면 결과도 같음
+_snapshot_schema = {'stat': None, 'current': False}
+
+
+def analytics_db_available():
+    """
+    분석 읽기 DB 별칭이 설정되어 있고 (SQLite라면) 스냅샷이 현재 코드의 스키마로 만들어져 있는지.
+    마이그레이션 후 snapshot_db를 다시 돌리기 전까지는 스냅샷에 없는 컬럼을 읽게 되므로 primary(default)에서 읽습니다.
+    """
+    alias = getattr(settings, 'ANALYTICS_DB_ALIAS', None)
+    if alias not in settings.DATABASES:
+        return False
+    if settings.DATABASES[alias]['ENGINE'] != 'django.db.backends.sqlite3':
+        return True
+    try:
+        stat = os.stat(settings.ANALYTICS_DB_PATH)
+    except FileNotFoundError:
+        return False
+    key = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+    if _snapshot_schema['stat'] != key:
+        _snapshot_schema['current'] = snapshot_schema_current(settings.ANALYTICS_DB_PATH)
+        _snapshot_schema['stat'] = key
+    return _snapshot_schema['current']
+
+
+def _expected_migrations():
+    """디스크의 마이그레이션 그래프에서 각 앱의 마지막(leaf) 마이그레이션 (DB 연결 없이 계산)"""
+    if _expected_migrations.cache is None:
+        from django.db.migrations.loader import MigrationLoader
+
+        _expected_migrations.cache = set(MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes())
+    return _expected_migrations.cache
+
+
+_expected_migrations.cache = None
+
+
+def snapshot_schema_current(path):
+    """SQLite 스냅샷의 django_migrations에 현재 코드의 leaf 마이그레이션이 모두 적용되어 있는지"""
+    try:
+        snapshot = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            applied = set(snapshot.execute('SELECT app, name FROM django_migrations'))
+        finally:
+            snapshot.close()
+    except sqlite3.Error:
+        return False
+    return _expected_migrations() <= applied
+
+
+def backup_sqlite_snapshot(using='default'):
+    """
+    primary SQLite DB를 online backup API로 통째로 복사해 분석용 스냅샷을 교체합니다.
+    복사는 한 번의 읽기 트랜잭션(pages=-1)이라 한 시점의 일관된 상태이고, WAL 모드라 복사 중에도 쓰기를 막지 않습니다.
+    임시 파일에 만든 뒤 os.replace로 바꾸므로 이미 열려 있는 분석 연결은 이전 스냅샷을 끝까지 읽습니다.
+    반환값: 스냅샷 경로 (primary가 SQLite가 아니면 None - Postgres는 복제본이 스냅샷 역할)
+    """
+    from django.db import connections
+
+    if connections[using].vendor != 'sqlite':
+        return None
+    target = settings.ANALYTICS_DB_PATH
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+    source = sqlite3.connect(settings.DATABASES[using]['NAME'], timeout=20)
+    snapshot = sqlite3.connect(tmp)
+    try:
+        source.backup(snapshot, pages=-1)
+        # 읽기 전용(mode=ro)으로 열 수 있도록 WAL이 아닌 rollback 저널 파일로 저장
+        snapshot.execute('PRAGMA journal_mode = DELETE')
+        snapshot.execute('ANALYZE')
+        snapshot.commit()
+    except BaseException:
+        snapshot.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    snapshot.close()
+    os.replace(tmp, target)
+
+    # 다음 분석 요청이 새 스냅샷을 열도록 이 프로세스의 기존 연결을 닫습니다.
+    alias = getattr(settings, 'ANALYTICS_DB_ALIAS', None)
+    if alias in connections:
+        connections[alias].close()
+    return target
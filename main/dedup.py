@@ -0,0 +1,262 @@
+# pickuplog/main/dedup.py (MinHash + LSH 분실물 중복 탐지)
+
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import DuplicateCluster, LostItem, LostItemBucket, LostItemSignature
+from main.normalize import station_match_key
+
+# 서명 길이 = BANDS × ROWS. 추정 유사도가 약 (1 / BANDS) ** (1 / ROWS) ≈ 0.5 이상인 쌍이 후보로 잡힙니다.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# 물품명·설명의 문자 n-gram이 이보다 적은 짧은 분실물("우산")은 역/날짜 토큰이 유사도를 좌우하므로 색인하지 않습니다.
+MIN_TEXT_SHINGLES = 3
+# 한 버킷에 이보다 많은 분실물이 모이면(같은 안내 문구 등) 후보 비교를 건너뜁니다. 진짜 중복 쌍은 다른 밴드에서 만납니다.
+MAX_BUCKET_SIZE = 200
+# 후보 쌍 중 추정 Jaccard 유사도가 이 값 이상이고, 등록일 차이가 MAX_DAY_GAP일 이내이며
+# 발견역이 같으면(한쪽이 비어 있으면 통과) 중복 의심으로 묶습니다.
+SIMILARITY_THRESHOLD = 0.6
+MAX_DAY_GAP = 1
+# IN 절 하나에 넣는 값 개수 (SQLite 변수 제한 대비)
+QUERY_CHUNK = 500
+
+_PRIME = np.uint64(4294967291)  # 2^32 미만 최대 소수
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 2**32 - 5, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2**32 - 5, size=NUM_PERM, dtype=np.uint64)
+
+_SPACES = re.compile(r'\s+')
+
+
+# ----------------------------------------------------------------------
+# 서명 계산
+# ----------------------------------------------------------------------
+def shingles(item_name, description, station, registered_at):
+    """
+    물품명·설명의 문자 n-gram과 역/등록일 토큰 집합.
+    역과 날짜는 표기 차이를 없앤 뒤 통째로 한 토큰으로 넣어, 같은 역·같은 날이면 유사도가 올라갑니다.
+    문자 n-gram이 MIN_TEXT_SHINGLES개 미만이면 빈 집합을 반환합니다. (비교할 근거가 부족)
+    """
+    text = _SPACES.sub(' ', f"{item_name or ''} {description or ''}".lower()).strip()
+    result = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    if len(result) < MIN_TEXT_SHINGLES:
+        return set()
+    if station:
+        result.add(f"@station:{station_match_key(station)}")
+    if registered_at:
+        result.add(f"@date:{timezone.localdate(registered_at).isoformat()}")
+    return result
+
+
+def minhash(shingle_set):
+    """shingle 집합 → uint32 MinHash 서명 (NUM_PERM,). 빈 집합이면 None."""
+    if not shingle_set:
+        return None
+    x = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    # (a·x + b) mod p 를 해시 함수 NUM_PERM개에 대해 한 번에 계산 (a, x < 2^32 이므로 uint64에서 넘치지 않음)
+    hashed = (_A[:, None] * x[None, :] % _PRIME + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature):
+    """밴드마다 (밴드 번호 + 밴드 값) 해시를 부호 있는 64비트 정수 키로 만듭니다."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(band.to_bytes(2, 'little') + chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def similarity(sig_a, sig_b):
+    """두 MinHash 서명이 일치하는 비율 = Jaccard 유사도 추정값"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def _same_item(meta_a, meta_b):
+    """텍스트 유사도와 별개로 등록일 / 발견역이 같은 물건으로 볼 수 있는 범위인지 확인"""
+    (day_a, station_a), (day_b, station_b) = meta_a, meta_b
+    if day_a and day_b and abs((day_a - day_b).days) > MAX_DAY_GAP:
+        return False
+    return not (station_a and station_b and station_a != station_b)
+
+
+def _meta(station, registered_at):
+    return (timezone.localdate(registered_at) if registered_at else None, station_match_key(station) if station else '')
+
+
+def _chunks(values, size=QUERY_CHUNK):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+# ----------------------------------------------------------------------
+# 증분 색인 (새로 적재된 배치만 처리)
+# ----------------------------------------------------------------------
+def index_items(item_pks):
+    """
+    새로 적재/갱신된 분실물 배치를 LSH 색인에 넣고 기존 색인과 같은 버킷에 떨어진 쌍만 비교합니다.
+    (전체 쌍 비교 없이 버킷 키 인덱스 조회만 하므로 색인 크기와 무관하게 배치 크기에 비례합니다.)
+    유사도가 SIMILARITY_THRESHOLD 이상인 쌍은 DuplicateCluster로 묶습니다.
+    반환값: (색인한 분실물 수, 중복 의심 쌍 수, 생성/갱신한 묶음 수)
+    """
+    item_pks = list(dict.fromkeys(item_pks))
+    if not item_pks:
+        return 0, 0, 0
+
+    # 1. 배치 서명 / 버킷 키 계산
+    signatures, keys, meta = {}, {}, {}
+    for pks in _chunks(item_pks):
+        rows = LostItem.objects.filter(pk__in=pks).values_list('pk', 'item_name', 'description', 'station', 'registered_at')
+        for pk, item_name, description, station, registered_at in rows:
+            signature = minhash(shingles(item_name, description, station, registered_at))
+            if signature is not None:
+                signatures[pk] = signature
+                meta[pk] = _meta(station, registered_at)
+                keys[pk] = band_keys(signature)
+
+    # 2. 기존 색인에서 같은 버킷의 분실물 조회 (재적재된 항목 자신은 제외)
+    batch = set(item_pks)
+    members = {}
+    for pk, item_keys in keys.items():
+        for key in item_keys:
+            members.setdefault(key, []).append(pk)
+    for bucket_keys in _chunks(members):
+        for key, other in LostItemBucket.objects.filter(bucket__in=bucket_keys).values_list('bucket', 'item_id'):
+            if other not in batch:
+                members[key].append(other)
+
+    candidates = set()
+    for bucket_members in members.values():
+        if not 2 <= len(bucket_members) <= MAX_BUCKET_SIZE:
+            continue
+        new = [pk for pk in bucket_members if pk in signatures]
+        for a in new:
+            for b in bucket_members:
+                if a != b:
+                    candidates.add((min(a, b), max(a, b)))
+
+    # 3. 후보 쌍만 서명 / 등록일 / 발견역으로 검증
+    others = {pk for pair in candidates for pk in pair if pk not in signatures}
+    known = dict(signatures)
+    for pks in _chunks(others):
+        for pk, raw in LostItemSignature.objects.filter(item_id__in=pks).values_list('item_id', 'signature'):
+            known[pk] = np.frombuffer(bytes(raw), dtype=np.uint32)
+        for pk, station, registered_at in LostItem.objects.filter(pk__in=pks).values_list('pk', 'station', 'registered_at'):
+            meta[pk] = _meta(station, registered_at)
+    pairs = {}
+    for a, b in candidates:
+        if a in known and b in known and _same_item(meta[a], meta[b]):
+            score = similarity(known[a], known[b])
+            if score >= SIMILARITY_THRESHOLD:
+                pairs[(a, b)] = score
+
+    with transaction.atomic():
+        # 4. 배치 색인 교체
+        for pks in _chunks(item_pks):
+            LostItemBucket.objects.filter(item_id__in=pks).delete()
+            LostItemSignature.objects.filter(item_id__in=pks).delete()
+        LostItemSignature.objects.bulk_create(
+            [LostItemSignature(item_id=pk, signature=signature.tobytes()) for pk, signature in signatures.items()],
+            batch_size=1000,
+        )
+        LostItemBucket.objects.bulk_create(
+            [LostItemBucket(bucket=key, item_id=pk) for pk, item_keys in keys.items() for key in item_keys],
+            batch_size=5000,
+        )
+        # 5. 중복 의심 묶음 갱신
+        cluster_count = _merge_clusters(pairs)
+
+    return len(signatures), len(pairs), cluster_count
+
+
+def _merge_clusters(pairs):
+    """
+    유사 쌍을 연결 요소로 묶어 DuplicateCluster에 반영합니다.
+    이미 같은 묶음으로 검토된 쌍은 건너뛰고, 검토 대기 묶음과 겹치면 그 묶음에 합칩니다.
+    """
+    if not pairs:
+        return 0
+    Membership = DuplicateCluster.items.through
+    involved = {pk for pair in pairs for pk in pair}
+    clusters_of = {}
+    for pks in _chunks(involved):
+        for item_id, cluster_id, status in Membership.objects.filter(lostitem_id__in=pks).values_list(
+            'lostitem_id', 'duplicatecluster_id', 'duplicatecluster__status'
+        ):
+            clusters_of.setdefault(item_id, {})[cluster_id] = status
+
+    # union-find
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    best = {}
+    for (a, b), score in pairs.items():
+        if set(clusters_of.get(a, ())) & set(clusters_of.get(b, ())):
+            continue
+        parent[find(a)] = find(b)
+        best[(a, b)] = score
+
+    components = {}
+    for a, b in best:
+        components.setdefault(find(a), set()).update((a, b))
+
+    touched = 0
+    for component in components.values():
+        score = max(s for (a, b), s in best.items() if a in component)
+        pending = sorted({
+            cluster_id for pk in component
+            for cluster_id, status in clusters_of.get(pk, {}).items()
+            if status == DuplicateCluster.STATUS_PENDING
+        })
+        if pending:
+            cluster = DuplicateCluster.objects.get(pk=pending[0])
+            # 같은 연결 요소에 걸친 다른 검토 대기 묶음은 하나로 합칩니다.
+            for other in DuplicateCluster.objects.filter(pk__in=pending[1:]):
+                cluster.items.add(*other.items.all())
+                cluster.similarity = max(cluster.similarity, other.similarity)
+                other.delete()
+            cluster.similarity = max(cluster.similarity, score)
+            cluster.save()
+        else:
+            cluster = DuplicateCluster.objects.create(similarity=score)
+        cluster.items.add(*component)
+        touched += 1
+    return touched
+
+
+def rebuild_index(chunk_size=5000, stdout=None):
+    """
+    전체 분실물을 pk 순서로 chunk_size씩 색인합니다. (최초 적재 / 파라미터 변경 시)
+    각 청크는 앞선 청크의 색인과만 비교하므로 전체 쌍 비교 없이 모든 중복 쌍을 찾습니다.
+    검토 대기 묶음은 새로 만들고, 이미 확정/기각한 묶음은 유지합니다.
+    """
+    DuplicateCluster.objects.filter(status=DuplicateCluster.STATUS_PENDING).delete()
+    LostItemBucket.objects.all().delete()
+    LostItemSignature.objects.all().delete()
+    totals = [0, 0, 0]
+    last_pk = 0
+    while True:
+        pks = list(LostItem.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        result = index_items(pks)
+        totals = [t + r for t, r in zip(totals, result)]
+        last_pk = pks[-1]
+        if stdout is not None:
+            stdout.write(f"  ... pk {last_pk}까지 색인 (누적 {totals[0]}건, 의심 쌍 {totals[1]}건)")
+    return tuple(totals)
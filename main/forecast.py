@@ -0,0 +1,183 @@
+# pickuplog/main/forecast.py (날씨 기반 분실 예보 엔진)
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import LostForecast, LostItemRate
+from main.snapshot import ensure_snapshot, from_day, to_day
+
+ALL = LostItemRate.ALL_CATEGORIES
+FORECAST_DAYS = 7
+# 카테고리별 모델은 분실물이 많은 상위 N개 카테고리만 학습 (나머지는 '전체' 모델로 충분)
+TOP_CATEGORIES = 10
+# 학습 일수가 이보다 적으면 회귀 대신 평균 분실률을 사용
+MIN_TRAINING_DAYS = 14
+RIDGE_LAMBDA = 1.0
+DEFAULT_RAINY_MM = 10.0
+
+
+def design_matrix(days, rain_mm, avg_temp, temp_fill):
+    """
+    특징 행렬 X (n × 9): [1, 요일 원-핫(화~일, 월요일 기준), 강수량(mm), 평균 기온(C)]
+    days는 1970-01-01 기준 일수 배열입니다. (1970-01-01은 목요일)
+    """
+    days = np.asarray(days, dtype=np.int64)
+    weekday = (days + 3) % 7  # 0 = 월요일
+    X = np.zeros((len(days), 9), dtype=np.float64)
+    X[:, 0] = 1.0
+    for wd in range(1, 7):
+        X[:, wd] = weekday == wd
+    X[:, 7] = np.nan_to_num(np.asarray(rain_mm, dtype=np.float64), nan=0.0)
+    temp = np.asarray(avg_temp, dtype=np.float64)
+    X[:, 8] = np.where(np.isnan(temp), temp_fill, temp)
+    return X
+
+
+def fit_ridge(X, Y, mask, lam=RIDGE_LAMBDA):
+    """
+    공통 특징 행렬 X (d × k)와 모델별 목표값 Y (d × m), 유효 마스크 (d × m)로
+    m개의 ridge 회귀를 한 번에 풉니다. (절편은 규제하지 않음)
+    반환: 계수 B (m × k), 모델별 학습 일수 (m,)
+    """
+    W = mask.astype(np.float64)
+    Yw = np.where(mask, Y, 0.0)
+    # XtX[m] = Xᵀ diag(W[:, m]) X,  XtY[m] = Xᵀ (W[:, m] * Y[:, m])
+    XtX = np.einsum('dk,dm,dj->mkj', X, W, X)
+    XtY = np.einsum('dk,dm->mk', X, W * Yw)
+    penalty = np.eye(X.shape[1]) * lam
+    penalty[0, 0] = 0.0
+    n = W.sum(axis=0)
+
+    B = np.zeros((Y.shape[1], X.shape[1]))
+    enough = n >= MIN_TRAINING_DAYS
+    if enough.any():
+        B[enough] = np.linalg.solve(XtX[enough] + penalty, XtY[enough][..., None])[..., 0]
+    # 데이터가 부족한 모델은 평균 분실률(절편)만 사용
+    sparse = ~enough & (n > 0)
+    B[sparse, 0] = Yw[:, sparse].sum(axis=0) / n[sparse]
+    return B, n.astype(int)
+
+
+def _training_frame():
+    """
+    LostItemRate에서 (날짜 × 모델) 분실률 행렬을 만듭니다.
+    모델 = (노선 | 전체) × (상위 카테고리 | 전체), 분모는 같은 노선의 승하차 합계.
+    """
+    detail = pd.DataFrame.from_records(
+        LostItemRate.objects.exclude(category=ALL)
+        .values_list('date', 'station__line_code', 'category', 'lost_count').iterator(chunk_size=5000),
+        columns=['date', 'line_code', 'category', 'lost_count'],
+    )
+    totals = pd.DataFrame.from_records(
+        LostItemRate.objects.filter(category=ALL, ridership__gt=0)
+        .values_list('date', 'station__line_code', 'lost_count', 'ridership').iterator(chunk_size=5000),
+        columns=['date', 'line_code', 'lost_count', 'ridership'],
+    )
+    if totals.empty:
+        return None, None, None
+
+    riders = totals.groupby(['date', 'line_code'])['ridership'].sum()
+    riders_all = totals.groupby('date')['ridership'].sum()
+
+    top_categories = (
+        detail.groupby('category')['lost_count'].sum().sort_values(ascending=False).head(TOP_CATEGORIES).index.tolist()
+        if not detail.empty else []
+    )
+    detail = detail[detail['category'].isin(top_categories)]
+
+    # 분실물 수: (노선, 카테고리), (노선, 전체), (전체, 카테고리), (전체, 전체)
+    lost = pd.concat([
+        detail.groupby(['date', 'line_code', 'category'], as_index=False)['lost_count'].sum(),
+        totals.groupby(['date', 'line_code'], as_index=False)['lost_count'].sum().assign(category=ALL),
+        detail.groupby(['date', 'category'], as_index=False)['lost_count'].sum().assign(line_code=ALL),
+        totals.groupby('date', as_index=False)['lost_count'].sum().assign(line_code=ALL, category=ALL),
+    ])
+    lost_wide = lost.pivot_table(index='date', columns=['line_code', 'category'], values='lost_count', aggfunc='sum')
+
+    dates = sorted(riders_all.index)
+    lost_wide = lost_wide.reindex(dates)
+    models = list(lost_wide.columns)
+
+    riders_wide = riders.unstack('line_code').reindex(dates)
+    denominators = np.column_stack([
+        riders_all.reindex(dates).to_numpy(dtype=np.float64) if line == ALL
+        else riders_wide[line].to_numpy(dtype=np.float64)
+        for line, _ in models
+    ])
+    lost_values = lost_wide.fillna(0).to_numpy(dtype=np.float64)
+    mask = np.nan_to_num(denominators) > 0
+    rates = np.divide(lost_values * 10000, denominators, out=np.zeros_like(lost_values), where=mask)
+    return dates, models, (rates, mask)
+
+
+def train_and_forecast(days=FORECAST_DAYS):
+    """
+    노선·카테고리별 분실률 회귀 모델을 학습하고, 오늘부터 days일간의 예보 날씨로 일괄 예측해
+    LostForecast에 저장합니다. 반환값: 저장한 예측 행 수
+    """
+    dates, models, data = _training_frame()
+    if not dates:
+        return 0
+    rates, mask = data
+
+    snapshot = ensure_snapshot()
+    weather = snapshot.weather
+
+    # 1. 학습: 날짜별 날씨 결합 (날씨가 없는 날은 학습에서 제외)
+    train_days = np.array([to_day(d) for d in dates], dtype=np.int64)
+    index, found = snapshot.weather_for(train_days)
+    if not found.any():
+        return 0
+    rain = np.where(found, weather['rain_mm'][index], np.nan)
+    temp = np.where(found, weather['avg_temp'][index], np.nan)
+    temp_fill = float(np.nanmean(temp)) if np.isfinite(temp).any() else 15.0
+    X = design_matrix(train_days, rain, temp, temp_fill)
+    B, n = fit_ridge(X, rates, mask & found[:, None])
+
+    rainy_mm = rain[found & (np.nan_to_num(rain) > 0)]
+    rainy_reference = float(rainy_mm.mean()) if len(rainy_mm) else DEFAULT_RAINY_MM
+
+    # 2. 예측: Open-Meteo 예보 날짜 (sync_weather가 과거 + 예보 일자를 함께 저장)
+    today = to_day(timezone.localdate())
+    future_days = np.arange(today, today + days, dtype=np.int64)
+    index, found = snapshot.weather_for(future_days)
+    future_days = future_days[found]
+    if len(future_days) == 0:
+        return 0
+    future_rain = weather['rain_mm'][index[found]].astype(np.float64)
+    future_temp = weather['avg_temp'][index[found]].astype(np.float64)
+
+    X_forecast = design_matrix(future_days, future_rain, future_temp, temp_fill)
+    X_dry = design_matrix(future_days, np.zeros(len(future_days)), future_temp, temp_fill)
+    X_rainy = design_matrix(future_days, np.full(len(future_days), rainy_reference), future_temp, temp_fill)
+
+    # (날짜 × 모델) 예측을 행렬 곱 한 번씩으로 계산, 음수는 0으로
+    predicted = np.clip(X_forecast @ B.T, 0, None)
+    dry = np.clip(X_dry @ B.T, 0, None)
+    rainy = np.clip(X_rainy @ B.T, 0, None)
+
+    forecasts = []
+    for i, day in enumerate(future_days):
+        for m, (line_code, category) in enumerate(models):
+            if n[m] == 0:
+                continue
+            forecasts.append(LostForecast(
+                date=from_day(day),
+                line_code=line_code,
+                category=category,
+                rain_mm=float(future_rain[i]),
+                avg_temp=None if np.isnan(future_temp[i]) else float(future_temp[i]),
+                predicted_rate=round(float(predicted[i, m]), 4),
+                dry_rate=round(float(dry[i, m]), 4),
+                rainy_rate=round(float(rainy[i, m]), 4),
+                training_days=int(n[m]),
+            ))
+
+    with transaction.atomic():
+        LostForecast.objects.filter(date__gte=from_day(future_days[0])).delete()
+        LostForecast.objects.filter(date__lt=from_day(today)).delete()
+        LostForecast.objects.bulk_create(forecasts, batch_size=1000)
+
+    return len(forecasts)
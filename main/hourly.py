@@ -0,0 +1,86 @@
+# pickuplog/main/hourly.py (시간대별 승하차 배열 인코딩 / 집계)
+
+import numpy as np
+
+from main.models import RidershipHourly
+
+HOURS = 24
+# 저장 형식: little-endian uint32, [승차 0~23시, 하차 0~23시]
+COUNT_DTYPE = np.dtype('<u4')
+RECORD_BYTES = COUNT_DTYPE.itemsize * HOURS * 2
+
+
+def pack_counts(boardings, alightings):
+    """시간대별 승차 / 하차 인원(각 24개) → BinaryField에 넣을 bytes"""
+    values = np.zeros((2, HOURS), dtype=COUNT_DTYPE)
+    values[0] = np.asarray(boardings, dtype=np.int64).clip(0, np.iinfo(COUNT_DTYPE).max)
+    values[1] = np.asarray(alightings, dtype=np.int64).clip(0, np.iinfo(COUNT_DTYPE).max)
+    return values.tobytes()
+
+
+def decode(blob):
+    """bytes 하나 → (2, 24) 배열 (0행 승차, 1행 하차)"""
+    return np.frombuffer(bytes(blob), dtype=COUNT_DTYPE).reshape(2, HOURS)
+
+
+def decode_many(blobs):
+    """
+    여러 행의 bytes를 한 번에 이어 붙여 (n, 2, 24) 배열로 디코딩합니다. (행별 파싱 없이 frombuffer 한 번)
+    """
+    buffer = b''.join(bytes(blob) for blob in blobs)
+    if len(buffer) % RECORD_BYTES:
+        raise ValueError(f"시간대 배열 크기가 {RECORD_BYTES}바이트 단위가 아닙니다: {len(buffer)}")
+    return np.frombuffer(buffer, dtype=COUNT_DTYPE).reshape(-1, 2, HOURS)
+
+
+def _load(start=None, end=None, lines=None, station_ids=None):
+    rows = RidershipHourly.objects.all()
+    if start:
+        rows = rows.filter(date__gte=start)
+    if end:
+        rows = rows.filter(date__lte=end)
+    if lines:
+        rows = rows.filter(station__line_code__in=lines)
+    if station_ids:
+        rows = rows.filter(station_id__in=station_ids)
+    return list(rows.values_list('station_id', 'station__line_code', 'days', 'counts').iterator(chunk_size=5000))
+
+
+def hour_profile(start=None, end=None, lines=None, station_ids=None, per_day=True):
+    """
+    기간·노선·역 조건의 시간대별 승차/하차 합계 (2, 24).
+    per_day=True면 합산 일수로 나눈 일평균 값입니다.
+    """
+    rows = _load(start, end, lines, station_ids)
+    if not rows:
+        return np.zeros((2, HOURS), dtype=np.float64)
+    counts = decode_many(row[3] for row in rows).astype(np.float64)
+    total = counts.sum(axis=0)
+    if per_day:
+        # 같은 기간의 역들은 합산 일수가 같으므로, 역 수로 나눈 평균 일수로 정규화
+        days = np.array([row[2] for row in rows], dtype=np.float64)
+        n_stations = len({row[0] for row in rows})
+        total /= max(days.sum() / n_stations, 1.0)
+    return total
+
+
+def hour_profile_by(group='line', start=None, end=None, lines=None, station_ids=None):
+    """
+    노선('line') 또는 역('station')별 시간대 합계를 np.add.at으로 한 번에 집계합니다.
+    반환: (그룹 키 목록, (그룹 수, 2, 24) 배열)
+    """
+    rows = _load(start, end, lines, station_ids)
+    if not rows:
+        return [], np.zeros((0, 2, HOURS), dtype=np.int64)
+    counts = decode_many(row[3] for row in rows).astype(np.int64)
+    labels = [row[1] if group == 'line' else row[0] for row in rows]
+    keys, inverse = np.unique(np.array(labels), return_inverse=True)
+    totals = np.zeros((len(keys), 2, HOURS), dtype=np.int64)
+    np.add.at(totals, inverse, counts)
+    return keys.tolist(), totals
+
+
+def peak_hours(profile, top=3):
+    """(2, 24) 프로파일에서 승차+하차 합이 가장 큰 시간대 top개 (내림차순)"""
+    combined = np.asarray(profile).sum(axis=0)
+    return [int(hour) for hour in np.argsort(combined)[::-1][:top]]
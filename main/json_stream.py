@@ -0,0 +1,149 @@
+# pickuplog/main/json_stream.py (Open API 응답 JSON 점진 해석)
+
+import codecs
+import json
+
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+class RowStreamDecoder:
+    """
+    {"<서비스>": {"list_total_count": .., "RESULT": {..}, "row": [{..}, {..}, ...]}} 형식 응답을
+    받은 바이트 조각 단위로 해석해, row 배열의 원소를 완성되는 대로 돌려줍니다.
+      - row 앞뒤의 작은 부분(건수, RESULT, 오류 응답 전체)은 글자 단위로 따라가며 그대로 모아 두고
+      - row 원소는 json의 C 디코더(raw_decode)로 하나씩 풀어낸 뒤 버퍼에서 버리므로
+    메모리는 페이지 크기와 무관하게 조각 하나 + 행 하나 정도입니다.
+    close()는 row를 빈 배열로 바꾼 전체 문서(dict)를 돌려줍니다.
+    """
+
+    HEAD, ROWS, TAIL = 'head', 'rows', 'tail'
+
+    def __init__(self, service, field='row'):
+        self.service = service
+        self.field = field
+        self.state = self.HEAD
+        self.rows = 0
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._envelope = []
+        # HEAD / TAIL 단계 글자 단위 상태: [컨테이너 종류, 현재 키] 스택
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._done = False
+
+    def feed(self, chunk):
+        """바이트 조각을 더하고 이번에 완성된 row 원소 목록을 반환합니다. JSON이 아니면 ValueError"""
+        self._buffer += self._text.decode(chunk)
+        rows = []
+        while self._buffer:
+            if self.state == self.ROWS:
+                if not self._take_rows(rows):
+                    break
+            elif not self._scan():
+                break
+        return rows
+
+    def close(self):
+        """문서가 끝났는지 확인하고 row를 뺀 나머지 문서를 반환합니다. (중간에 끊겼으면 ValueError)"""
+        self._buffer += self._text.decode(b'', final=True)
+        self.feed(b'')
+        if not self._done:
+            raise ValueError('응답 JSON이 완결되지 않았습니다.')
+        return json.loads(''.join(self._envelope))
+
+    # ------------------------------------------------------------------
+    def _scan(self):
+        """
+        HEAD / TAIL: 문자열·중첩을 따라가며 envelope에 모읍니다.
+        HEAD에서 <서비스>.row 배열이 열리면 ROWS로 넘어갑니다. 반환: 버퍼를 더 처리할 수 있는지
+        """
+        text, i, n = self._buffer, 0, len(self._buffer)
+        while i < n:
+            c = text[i]
+            if self._done:
+                if c not in _WHITESPACE:
+                    raise ValueError('JSON 문서 뒤에 다른 값이 있습니다.')
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._expect_key:
+                        self._stack[-1][1] = json.loads(text[self._string_start:i + 1])
+            elif c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in '{[':
+                self._stack.append([c, None])
+                self._expect_key = c == '{'
+                if c == '[' and self._at_rows():
+                    self._envelope.append(text[:i + 1])
+                    self._buffer = text[i + 1:]
+                    self.state = self.ROWS
+                    return True
+            elif c in '}]':
+                if not self._stack:
+                    raise ValueError('JSON 괄호가 맞지 않습니다.')
+                self._stack.pop()
+                self._expect_key = False
+                if not self._stack:
+                    self._done = True
+            elif c == ':':
+                self._expect_key = False
+            elif c == ',':
+                self._expect_key = bool(self._stack) and self._stack[-1][0] == '{'
+            elif c not in _WHITESPACE and not self._stack:
+                raise ValueError('JSON 객체가 아닙니다.')
+            i += 1
+        if self._in_string:
+            # 문자열이 조각 경계에서 끊기면 문자열 시작부터 다음 조각과 이어서 다시 봅니다.
+            self._envelope.append(text[:self._string_start])
+            self._buffer = text[self._string_start:]
+            self._in_string = self._escape = False
+            return False
+        self._envelope.append(text)
+        self._buffer = ''
+        return False
+
+    def _at_rows(self):
+        stack = self._stack
+        return (
+            self.state == self.HEAD and len(stack) == 3
+            and stack[0] == ['{', self.service] and stack[1] == ['{', self.field]
+        )
+
+    def _take_rows(self, rows):
+        """ROWS: 완성된 원소를 rows에 넣습니다. 배열이 닫히면 TAIL로. 반환: 버퍼를 더 처리할 수 있는지"""
+        text, i, n = self._buffer, 0, len(self._buffer)
+        while True:
+            while i < n and (text[i] in _WHITESPACE or text[i] == ','):
+                i += 1
+            if i == n:
+                self._buffer = ''
+                return False
+            if text[i] == ']':
+                self._stack.pop()
+                self._buffer = text[i + 1:]
+                self._envelope.append(']')
+                self._expect_key = False
+                self.state = self.TAIL
+                return True
+            try:
+                row, end = _decoder.raw_decode(text, i)
+            except json.JSONDecodeError:
+                # 원소가 아직 다 오지 않았으면 다음 조각을 기다립니다. (이미 끝까지 왔는데도 실패하면 close()에서 오류)
+                self._buffer = text[i:]
+                return False
+            if end == n and not isinstance(row, (dict, list)):
+                # 숫자 등은 조각 경계에서 잘렸을 수 있으므로 다음 조각까지 기다립니다.
+                self._buffer = text[i:]
+                return False
+            rows.append(row)
+            self.rows += 1
+            i = end
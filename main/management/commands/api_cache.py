@@ -0,0 +1,39 @@
+# pickuplog/main/management/commands/api_cache.py (서울 Open API 응답 캐시 관리)
+
+from django.core.management.base import BaseCommand
+
+from main.api_cache import CACHE_MAX_BYTES, ResponseCache, cache_dir
+
+
+class Command(BaseCommand):
+    """
+    sync_ridership / sync_ridership_hourly / sync_lostitem이 쓰는 Open API 응답 캐시(ANALYTICS_DIR/http_cache)의
+    서비스별 항목 수와 크기를 보여 주고, 만료 항목 정리 / 크기 줄이기 / 전체 삭제를 합니다.
+    (평소에는 저장할 때 상한(CACHE_MAX_BYTES)을 넘으면 자동으로 오래 쓰지 않은 항목부터 지웁니다.)
+    """
+
+    help = '서울 Open API 응답 디스크 캐시 현황 조회 및 정리'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--purge-expired', action='store_true', help='유효 기간이 지난 항목 삭제')
+        parser.add_argument('--shrink-mb', type=float, default=None, help='오래 쓰지 않은 항목부터 지워 이 크기(MB) 이하로 줄임')
+        parser.add_argument('--clear', action='store_true', help='캐시 전체 삭제')
+
+    def handle(self, *args, **options):
+        cache = ResponseCache()
+        if options['clear']:
+            self.stdout.write(self.style.SUCCESS(f"✅ 캐시 전체 삭제: {cache.clear()}개 항목"))
+        if options['purge_expired']:
+            self.stdout.write(self.style.SUCCESS(f"✅ 만료 항목 삭제: {cache.purge_expired()}개"))
+        if options['shrink_mb'] is not None:
+            removed = cache.evict(target=int(options['shrink_mb'] * 1024 * 1024))
+            self.stdout.write(self.style.SUCCESS(f"✅ 오래 쓰지 않은 항목 {removed}개 삭제"))
+
+        stats = cache.stats()
+        total_bytes = sum(size for _, size in stats.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{cache_dir()}: {sum(n for n, _ in stats.values())}개 항목, "
+            f"{total_bytes / 1024 / 1024:.1f}MB / 상한 {CACHE_MAX_BYTES / 1024 / 1024:.0f}MB"
+        ))
+        for service, (count, size) in sorted(stats.items()):
+            self.stdout.write(f"  - {service:<20} {count:6d}개  {size / 1024:10.1f}KB")
@@ -0,0 +1,41 @@
+# pickuplog/main/management/commands/archive_lostitems.py (수령 완료 분실물 콜드 아카이브)
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.archive import ARCHIVE_CHUNK, archive_candidates, archive_cutoff, archive_items
+
+
+class Command(BaseCommand):
+    """
+    등록 후 --days일이 지난 수령 완료 분실물을 LostItem에서 ArchivedLostItem으로 옮겨 핫 테이블과 인덱스를 작게 유지합니다.
+    청크마다 커밋하므로 중단되면 다시 실행해 남은 분실물부터 이어서 옮깁니다. (--max-chunks로 1회 작업량 제한)
+    """
+
+    help = '오래된 수령 완료 분실물을 아카이브 테이블로 옮깁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help=f'등록 후 경과 일수 기준 (기본 settings.LOSTITEM_ARCHIVE_AFTER_DAYS = {settings.LOSTITEM_ARCHIVE_AFTER_DAYS})',
+        )
+        parser.add_argument('--chunk-size', type=int, default=ARCHIVE_CHUNK, help=f'한 트랜잭션에서 옮길 건수 (기본 {ARCHIVE_CHUNK})')
+        parser.add_argument('--max-chunks', type=int, default=None, help='이번 실행에서 처리할 최대 청크 수')
+        parser.add_argument('--dry-run', action='store_true', help='옮길 대상 건수만 출력')
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options['days'])
+        if options['dry_run']:
+            count = archive_candidates(cutoff).count()
+            self.stdout.write(self.style.NOTICE(f'아카이브 대상: {count}건 (등록일 {cutoff:%Y-%m-%d} 이전 수령 완료)'))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'분실물 아카이브 시작 (등록일 {cutoff:%Y-%m-%d} 이전 수령 완료)'))
+        started = time.perf_counter()
+        moved = archive_items(options['days'], options['chunk_size'], options['max_chunks'], stdout=self.stdout)
+        remaining = archive_candidates(cutoff).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 아카이브 완료: {moved}건 이동, 남은 대상 {remaining}건 ({time.perf_counter() - started:.2f}초)'
+        ))
@@ -0,0 +1,120 @@
+# pickuplog/main/management/commands/bench_db_concurrency.py (읽기/쓰기 동시성 벤치마크)
+
+import statistics
+import threading
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Avg, Sum
+
+from main.db import sqlite_pragma_status
+from main.models import RidershipDaily, RainImpactReport, Station
+from main.stations import StationCodeMap
+
+BENCH_LINE_CODE = 'BENCH'
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    """
+    대시보드 읽기 쿼리의 지연 시간을 (1) 유휴 상태와 (2) 대량 동기화 쓰기 중에 측정합니다.
+    쓰기 행은 노선 코드 'BENCH'인 임시 역(Station)에 적재되며 측정 후 역과 함께 삭제됩니다.
+    """
+
+    help = '대량 쓰기 중 대시보드 읽기 지연(p50/p95/p99)을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='동시 읽기 스레드 수 (기본 4)')
+        parser.add_argument('--seconds', type=float, default=5.0, help='구간별 측정 시간(초) (기본 5)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='쓰기 트랜잭션당 행 수 (기본 2000)')
+
+    def _read_query(self):
+        # 대시보드에서 실제로 쓰는 형태의 집계 쿼리
+        list(
+            RidershipDaily.objects.values('station__line_code')
+            .annotate(total=Sum('total'))
+            .order_by('station__line_code')
+        )
+        RainImpactReport.objects.aggregate(avg_rii=Avg('rain_impact_index'))
+
+    def _reader(self, stop, samples, errors):
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    self._read_query()
+                    samples.append((time.perf_counter() - started) * 1000)
+                except Exception as e:
+                    errors.append(str(e))
+        finally:
+            connections.close_all()
+
+    def _writer(self, stop, batch_size, written, errors):
+        day = date(1900, 1, 1)
+        pairs = [(BENCH_LINE_CODE, f'BENCH-{i}') for i in range(batch_size)]
+        codes = StationCodeMap.from_db().ensure(pairs)
+        try:
+            while not stop.is_set():
+                rows = [
+                    RidershipDaily(
+                        date=day, station_id=codes.get(*pair),
+                        boardings=i, alightings=i, total=2 * i,
+                    )
+                    for i, pair in enumerate(pairs)
+                ]
+                try:
+                    with transaction.atomic():
+                        RidershipDaily.objects.bulk_create(rows, batch_size=500)
+                    written.append(len(rows))
+                except Exception as e:
+                    errors.append(str(e))
+                day += timedelta(days=1)
+        finally:
+            connections.close_all()
+
+    def _phase(self, label, readers, seconds, batch_size=None):
+        stop = threading.Event()
+        samples, errors, written = [], [], []
+        threads = [
+            threading.Thread(target=self._reader, args=(stop, samples, errors))
+            for _ in range(readers)
+        ]
+        if batch_size:
+            threads.append(threading.Thread(target=self._writer, args=(stop, batch_size, written, errors)))
+
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.stdout.write(
+            f"{label:<14} reads={len(samples):>6} ({len(samples) / seconds:8.1f}/s)  "
+            f"p50={_percentile(samples, 50):7.2f}ms  p95={_percentile(samples, 95):7.2f}ms  "
+            f"p99={_percentile(samples, 99):7.2f}ms  mean={statistics.fmean(samples) if samples else 0:7.2f}ms"
+            + (f"  written={sum(written)} rows" if batch_size else '')
+        )
+        if errors:
+            self.stdout.write(self.style.WARNING(f"  오류 {len(errors)}건 (예: {errors[0]})"))
+
+    def handle(self, *args, **options):
+        connection.ensure_connection()
+        self.stdout.write(self.style.MIGRATE_HEADING(f'DB: {connection.vendor} {sqlite_pragma_status() or ""}'))
+
+        try:
+            self._phase('idle', options['readers'], options['seconds'])
+            self._phase('during-write', options['readers'], options['seconds'], batch_size=options['batch_size'])
+        finally:
+            deleted, _ = RidershipDaily.objects.filter(station__line_code=BENCH_LINE_CODE).delete()
+            Station.objects.filter(line_code=BENCH_LINE_CODE).delete()
+            self.stdout.write(f'벤치마크 행 {deleted}건 삭제')
@@ -0,0 +1,93 @@
+# pickuplog/main/management/commands/bench_percolator.py (저장된 검색 매칭 벤치마크)
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.models import SavedSearch, StationDict
+from main.percolator import Percolator, satisfies
+from main.stations import StationIndex
+
+CATEGORIES = ['우산', '가방', '지갑', '휴대폰', '의류', '쇼핑백', '서류봉투', '책', '전자기기', '기타']
+COLORS = ['검정', '흰색', '갈색', '빨간', '파란', '노란', '초록', '회색', '남색', '분홍']
+NOUNS = [
+    '장우산', '접이식우산', '백팩', '크로스백', '에코백', '카드지갑', '장지갑', '아이폰', '갤럭시', '패딩',
+    '코트', '목도리', '노트북', '태블릿', '이어폰', '모자', '안경', '시계', '텀블러', '필통',
+]
+
+
+class Command(BaseCommand):
+    """
+    DB에 쓰지 않고 메모리에서 가상 저장 검색 N개와 분실물 배치 M건을 만들어
+    Percolator(검색 색인)와 단순 방식(검색 × 분실물 전수 비교)의 매칭 시간을 비교합니다.
+    단순 방식은 일부 검색만 돌린 뒤 전체 검색 수로 환산하고, 같은 구간의 매칭 결과가 일치하는지 확인합니다.
+    """
+
+    help = '저장된 검색 percolator 매칭 벤치마크 (기본 10만 검색 × 1,000건 배치)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--searches', type=int, default=100_000, help='가상 저장 검색 수 (기본 100,000)')
+        parser.add_argument('--items', type=int, default=1_000, help='분실물 배치 크기 (기본 1,000)')
+        parser.add_argument('--naive-sample', type=int, default=2_000, help='단순 방식으로 직접 돌려볼 검색 수 (기본 2,000)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        stations = list(StationDict.objects.values_list('line_code', 'station_name_std').distinct()) or [
+            ('LINE1', '서울역'), ('LINE2', '강남'), ('LINE2', '잠실'), ('LINE8', '잠실'), ('LINE2', '홍대입구'),
+        ]
+        station_index = StationIndex(stations)
+
+        searches = []
+        for pk in range(1, options['searches'] + 1):
+            line, station = rng.choice(stations)
+            place = rng.random()
+            searches.append(SavedSearch(
+                pk=pk,
+                category=rng.choice(CATEGORIES) if rng.random() < 0.8 else None,
+                line=line if place < 0.3 else None,
+                station=station if place > 0.7 else None,
+                keywords=' '.join(rng.sample([rng.choice(COLORS), rng.choice(NOUNS)], rng.randint(1, 2))),
+            ))
+
+        items = []
+        for pk in range(1, options['items'] + 1):
+            line, station = rng.choice(stations)
+            color, noun = rng.choice(COLORS), rng.choice(NOUNS)
+            items.append((pk, rng.choice(CATEGORIES), f"{color} {noun}", f"{color}색 {noun} 분실물 설명 {pk}", line, station))
+
+        # 1. percolator: 검색 색인 생성 + 배치 1회 매칭
+        started = time.perf_counter()
+        percolator = Percolator(searches, station_index)
+        build_elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        matches = percolator.match(items)
+        match_elapsed = time.perf_counter() - started
+
+        # 2. 단순 방식: 검색마다 배치 전체를 비교 (일부 검색만 실행 후 환산)
+        sample = searches[:options['naive_sample']]
+        sample_percolator = Percolator(sample, station_index)
+        compiled = [search for group in sample_percolator.by_anchor.values() for search in group]
+        prepared = [(item[0], percolator.prepare(item)) for item in items]
+        started = time.perf_counter()
+        naive = [
+            (search['pk'], item_pk)
+            for search in compiled
+            for item_pk, fields in prepared
+            if satisfies(search, *fields)
+        ]
+        naive_elapsed = (time.perf_counter() - started) * len(searches) / max(len(sample), 1)
+        consistent = sorted(naive) == sorted(sample_percolator.match(items))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'저장된 검색 {len(searches):,}개 (색인 {len(percolator):,}개) × 분실물 {len(items):,}건'
+        ))
+        self.stdout.write(f'percolator 색인 생성    {build_elapsed * 1000:10.1f} ms')
+        self.stdout.write(f'percolator 배치 매칭    {match_elapsed * 1000:10.1f} ms  (매칭 {len(matches):,}건)')
+        self.stdout.write(f'단순 전수 비교 (환산)   {naive_elapsed * 1000:10.1f} ms  (검색 {len(sample):,}개 실측)')
+        self.stdout.write(f'속도 향상               {naive_elapsed / max(match_elapsed, 1e-9):10.1f} 배')
+        if consistent:
+            self.stdout.write(self.style.SUCCESS('✅ 실측 구간의 매칭 결과가 단순 방식과 일치합니다.'))
+        else:
+            self.stdout.write(self.style.ERROR('❌ 실측 구간의 매칭 결과가 단순 방식과 다릅니다.'))
@@ -0,0 +1,149 @@
+# pickuplog/main/management/commands/bench_startup.py (관리 명령 / WSGI 워커 기동 시간 측정)
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import find_commands
+from django.core.management.base import BaseCommand, CommandError
+
+import main
+
+# 기동 시점에 임포트되면 안 되는 무거운 의존성 (실제로 쓰는 코드 경로 안에서만 임포트)
+HEAVY_MODULES = (
+    'pandas', 'numpy', 'scipy', 'sklearn', 'statsmodels', 'pyarrow',
+    'requests', 'requests_cache', 'retry_requests', 'openmeteo_requests', 'dotenv',
+)
+BASELINE_FILENAME = 'startup_baseline.json'
+WSGI_TARGET = 'wsgi'
+# Django 자체 기동 비용 (비교 기준)
+DJANGO_TARGET = 'django.setup'
+
+_IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def _target_script(target):
+    """새 인터프리터에서 실행할 코드: manage.py <명령>이 handle() 직전까지 하는 일 / WSGI 워커의 첫 요청 준비"""
+    if target == DJANGO_TARGET:
+        return 'import django; django.setup()'
+    if target == WSGI_TARGET:
+        module = settings.WSGI_APPLICATION.rsplit('.', 1)[0]
+        return (
+            f'import {module}; from django.urls import get_resolver; get_resolver().url_patterns'
+        )
+    return (
+        'import django; django.setup(); '
+        f'from django.core.management import load_command_class; load_command_class("main", {target!r})'
+    )
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → (임포트 합계 ms, {모듈 이름: 누적 ms})"""
+    total_us, modules = 0, {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            total_us += int(match[1])
+            modules[match[4]] = int(match[2]) / 1000
+    return total_us / 1000, modules
+
+
+def measure(target, runs):
+    """
+    target을 새 프로세스(-X importtime)로 runs번 기동합니다.
+    반환: {'import_ms'(최솟값), 'wall_ms'(중앙값), 'modules'(모듈 이름 → 누적 ms)}
+    임포트 시간은 다른 프로세스 간섭이 적은 최솟값을 씁니다. (회귀 판정이 측정 잡음에 덜 흔들리도록)
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'pickuplog.settings')}
+    walls, imports, modules = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _target_script(target)],
+            cwd=settings.BASE_DIR.parent, env=env, capture_output=True, text=True,
+        )
+        walls.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            last = result.stderr.strip().splitlines()[-1:] or ['']
+            raise CommandError(f'{target} 기동 실패: {last[0]}')
+        import_ms, modules = parse_importtime(result.stderr)
+        imports.append(import_ms)
+    return {'import_ms': min(imports), 'wall_ms': statistics.median(walls), 'modules': modules}
+
+
+class Command(BaseCommand):
+    """
+    main 앱의 관리 명령과 WSGI 앱을 각각 새 프로세스로 띄워(-X importtime) 기동 비용을 측정합니다.
+      - 관리 명령: django.setup() + 명령 모듈 로드 (handle() 실행 직전까지, nightly 단계마다 드는 비용)
+      - wsgi: WSGI 앱 + URLconf(뷰 모듈) 로드 (워커가 첫 요청을 받기 전까지 드는 비용)
+
+    다음 경우를 회귀로 보고 실패(CommandError)합니다.
+      1. 기동 중에 HEAVY_MODULES(pandas, numpy, requests 등)가 임포트됨
+      2. --save-baseline으로 저장한 기준값보다 임포트 시간이 --tolerance 비율 + --slack-ms 이상 늘어남
+    기준값은 기기마다 다르므로 ANALYTICS_DIR/startup_baseline.json에 저장합니다. (버전 관리 제외)
+    """
+
+    help = '관리 명령 / WSGI 워커 기동 시 임포트 시간을 측정하고 기준값 대비 회귀 시 실패합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', help=f'측정할 명령 이름 또는 {WSGI_TARGET} (기본: main 앱 전체 명령 + wsgi)')
+        parser.add_argument('--runs', type=int, default=5, help='대상별 기동 횟수 (기본 5)')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='기준값 대비 허용 증가율 (기본 0.25 = 25%%)')
+        parser.add_argument('--slack-ms', type=float, default=20.0, help='측정 잡음 대비 허용 절대 증가량 (기본 20ms)')
+        parser.add_argument('--save-baseline', action='store_true', help='이번 측정값을 기준값으로 저장')
+
+    def handle(self, *args, **options):
+        commands = sorted(find_commands(str(Path(main.__file__).parent / 'management')))
+        targets = options['targets'] or commands + [WSGI_TARGET]
+        unknown = [t for t in targets if t not in commands and t not in (WSGI_TARGET, DJANGO_TARGET)]
+        if unknown:
+            raise CommandError(f"알 수 없는 대상: {', '.join(unknown)}")
+
+        baseline_path = settings.ANALYTICS_DIR / BASELINE_FILENAME
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+        floor = measure(DJANGO_TARGET, options['runs'])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"기동 {options['runs']}회: 임포트 최솟값 / 프로세스 중앙값"
+            f" (Django 자체: 임포트 {floor['import_ms']:.0f}ms / 프로세스 {floor['wall_ms']:.0f}ms)"
+        ))
+
+        results, failures = {}, []
+        for target in targets:
+            result = measure(target, options['runs'])
+            results[target] = round(result['import_ms'], 1)
+            heavy = [name for name in HEAVY_MODULES if name in result['modules']]
+            problems = []
+            if heavy:
+                problems.append('무거운 모듈 임포트: ' + ', '.join(f"{name} {result['modules'][name]:.0f}ms" for name in heavy))
+            budget = baseline.get(target)
+            if budget is not None and not options['save_baseline']:
+                limit = budget * (1 + options['tolerance']) + options['slack_ms']
+                if result['import_ms'] > limit:
+                    problems.append(f"기준값 {budget:.0f}ms → {result['import_ms']:.0f}ms (허용 {limit:.0f}ms)")
+
+            status = '❌' if problems else '✅'
+            self.stdout.write(
+                f"  {status} {target:<26} 임포트 {result['import_ms']:7.1f}ms  프로세스 {result['wall_ms']:7.1f}ms"
+                f"  (Django 대비 {result['import_ms'] - floor['import_ms']:+7.1f}ms)"
+            )
+            for problem in problems:
+                self.stdout.write(self.style.ERROR(f"       {problem}"))
+            if problems:
+                failures.append(target)
+
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = baseline_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({**baseline, **results}, ensure_ascii=False, indent=2))
+            os.replace(tmp, baseline_path)
+            self.stdout.write(self.style.SUCCESS(f'✅ 기준값 저장: {baseline_path} ({len(results)}개 대상)'))
+
+        if failures:
+            raise CommandError(f"기동 시간 회귀 {len(failures)}건: {', '.join(failures)}")
@@ -0,0 +1,150 @@
+# pickuplog/main/management/commands/bench_view_counter.py (상세 화면 조회수 동시성 벤치마크)
+
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory
+
+from main import views
+from main.models import LostItem
+from main.viewcounter import ViewCounter
+
+MODES = ['none', 'sync', 'write-behind']
+
+
+class NoCounter:
+    """조회수를 세지 않는 기준선 (순수 읽기 + 렌더링)"""
+
+    def record(self, pk):
+        pass
+
+    def pending_for(self, pk):
+        return 0
+
+
+class SyncCounter:
+    """조회마다 바로 UPDATE views = views + 1 (요청마다 DB 쓰기 잠금을 잡는 방식)"""
+
+    def record(self, pk):
+        LostItem.objects.filter(pk=pk).update(views=F('views') + 1)
+
+    def pending_for(self, pk):
+        return 0
+
+
+class Command(BaseCommand):
+    """
+    여러 스레드가 동시에 분실물 상세 화면을 요청할 때의 처리량을 세 가지 방식으로 비교합니다.
+      - none: 조회수 미집계 (기준선)
+      - sync: 요청마다 즉시 UPDATE
+      - write-behind: ViewCounter (메모리 버퍼 + 저널, 주기적 일괄 반영)
+    측정이 끝나면 각 방식의 DB 반영 건수가 요청 수와 같은지 확인하고, 조회수를 측정 전 값으로 되돌립니다.
+    """
+
+    help = '분실물 상세 화면 조회수 집계 방식별 동시 처리량 벤치마크'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='동시 요청 스레드 수 (기본 8)')
+        parser.add_argument('--requests', type=int, default=2_000, help='방식별 총 요청 수 (기본 2,000)')
+        parser.add_argument('--items', type=int, default=200, help='요청 대상 분실물 수 (기본 200)')
+        parser.add_argument('--interval', type=float, default=0.5, help='write-behind 반영 주기(초) (기본 0.5)')
+        parser.add_argument('--rounds', type=int, default=3, help='방식별 반복 측정 횟수 (기본 3, 중앙값 사용)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        import numpy as np
+
+        rng = random.Random(options['seed'])
+        all_pks = list(LostItem.objects.values_list('pk', flat=True))
+        if not all_pks:
+            raise CommandError('LostItem 데이터가 없습니다. sync_lostitem 또는 CSV 업로드를 먼저 실행하세요.')
+        pks = rng.sample(all_pks, min(options['items'], len(all_pks)))
+        targets = [rng.choice(pks) for _ in range(options['requests'])]
+        original = dict(LostItem.objects.filter(pk__in=pks).values_list('pk', 'views'))
+
+        factory = RequestFactory()
+        default_counter = views.view_counter
+        samples = {name: [] for name in MODES}
+        try:
+            with tempfile.TemporaryDirectory() as journal:
+                make = {
+                    'none': NoCounter,
+                    'sync': SyncCounter,
+                    'write-behind': lambda: ViewCounter(directory=Path(journal), interval=options['interval']),
+                }
+                # 템플릿 로딩 / 연결 생성 비용이 첫 방식에만 실리지 않도록 한 번 돌려 둡니다.
+                self._run(factory, NoCounter(), targets[:200], options['threads'])
+                # 측정 순서에 따른 편향을 줄이도록 라운드마다 방식 순서를 돌려 가며 측정하고 중앙값을 씁니다.
+                for round_no in range(options['rounds']):
+                    for name in MODES[round_no % len(MODES):] + MODES[:round_no % len(MODES)]:
+                        counter = make[name]()
+                        self._reset(original)
+                        elapsed, latencies = self._run(factory, counter, targets, options['threads'])
+                        if isinstance(counter, ViewCounter):
+                            counter.close()
+                        applied = sum(LostItem.objects.filter(pk__in=pks).values_list('views', flat=True)) - sum(original.values())
+                        samples[name].append((len(targets) / elapsed, np.percentile(latencies, 95) * 1000, applied))
+        finally:
+            self._reset(original)
+            views.view_counter = default_counter
+
+        results = {
+            name: (
+                float(np.median([t for t, _, _ in runs])),
+                float(np.median([p for _, p, _ in runs])),
+                [applied for _, _, applied in runs],
+            )
+            for name, runs in samples.items()
+        }
+        baseline = results['none'][0]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"스레드 {options['threads']}개 × 요청 {len(targets):,}건 × {options['rounds']}라운드 중앙값 (대상 분실물 {len(pks)}건)"
+        ))
+        for name in MODES:
+            throughput, p95, applied = results[name]
+            expected = 0 if name == 'none' else len(targets)
+            status = '✅' if all(a == expected for a in applied) else '❌'
+            self.stdout.write(
+                f"  {name:<13} {throughput:8.1f} req/s (기준선 대비 {throughput / baseline * 100:5.1f}%)"
+                f"  p95 {p95:6.1f}ms  DB 반영 {applied[-1]:,}/{expected:,} {status}"
+            )
+
+    def _reset(self, original):
+        LostItem.objects.bulk_update(
+            [LostItem(pk=pk, views=value) for pk, value in original.items()], ['views'], batch_size=500
+        )
+
+    def _run(self, factory, counter, targets, threads):
+        views.view_counter = counter
+        latencies = [0.0] * len(targets)
+        cursor = iter(range(len(targets)))
+        cursor_lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    with cursor_lock:
+                        i = next(cursor, None)
+                    if i is None:
+                        return
+                    request = factory.get(f'/archive/lostitem/{targets[i]}/')
+                    started = time.perf_counter()
+                    response = views.lostitem_detail(request, targets[i])
+                    latencies[i] = time.perf_counter() - started
+                    if response.status_code != 200:
+                        raise RuntimeError(f'상세 화면 응답 오류: {response.status_code}')
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(worker) for _ in range(threads)]:
+                future.result()
+        return time.perf_counter() - started, latencies
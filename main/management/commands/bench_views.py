@@ -0,0 +1,126 @@
+# pickuplog/main/management/commands/bench_views.py (분석 대시보드 부하 테스트)
+
+import asyncio
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+
+DEFAULT_PATHS = ['/', '/trend/', '/correlation/', '/insight/']
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    """
+    분석 뷰에 동시 요청을 보내 처리량(req/s)과 p50/p99 지연을 측정합니다.
+
+    - 기본: 프로세스 내부에서 WSGI 경로(Client + 스레드)와 ASGI 경로(AsyncClient + asyncio)를 비교
+    - --url: 이미 떠 있는 서버에 HTTP로 요청 (uvicorn / WSGI 서버를 각각 띄워 비교)
+        uvicorn pickuplog.asgi:application --port 8001
+        python manage.py bench_views --url http://127.0.0.1:8001
+    """
+
+    help = '분석 뷰(home/trend/correlation/insight)의 WSGI vs ASGI 처리량과 p99 지연을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='경로별 요청 수 (기본 200)')
+        parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수 (기본 16)')
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='측정할 경로 목록')
+        parser.add_argument('--url', default=None, help='외부 서버 기준 URL (예: http://127.0.0.1:8001)')
+
+    def _report(self, label, latencies, elapsed, failures):
+        self.stdout.write(
+            f"{label:<28} {len(latencies) / elapsed:8.1f} req/s  "
+            f"p50={_percentile(latencies, 50):7.2f}ms  p99={_percentile(latencies, 99):7.2f}ms"
+            + (self.style.WARNING(f"  실패 {failures}건") if failures else '')
+        )
+
+    # ------------------------------------------------------------------
+    # WSGI 경로: 스레드마다 동기 Client
+    # ------------------------------------------------------------------
+    def _bench_wsgi(self, path, total, concurrency):
+        client = Client()
+
+        def one(_):
+            started = time.perf_counter()
+            status = client.get(path).status_code
+            return (time.perf_counter() - started) * 1000, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(total)))
+        return results, time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+    # ASGI 경로: 하나의 이벤트 루프에서 AsyncClient
+    # ------------------------------------------------------------------
+    def _bench_asgi(self, path, total, concurrency):
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one():
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    return (time.perf_counter() - started) * 1000, response.status_code
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(one() for _ in range(total)))
+            return results, time.perf_counter() - started
+
+        return asyncio.run(run())
+
+    # ------------------------------------------------------------------
+    # 외부 서버: uvicorn / gunicorn / runserver 등
+    # ------------------------------------------------------------------
+    def _bench_http(self, base_url, path, total, concurrency):
+        url = base_url.rstrip('/') + path
+
+        def one(_):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                    status = response.status
+            except Exception:
+                status = 0
+            return (time.perf_counter() - started) * 1000, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(total)))
+        return results, time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        total, concurrency = options['requests'], options['concurrency']
+        if total < 1 or concurrency < 1:
+            raise CommandError('--requests와 --concurrency는 1 이상이어야 합니다.')
+
+        if options['url']:
+            modes = [('http', lambda path: self._bench_http(options['url'], path, total, concurrency))]
+        else:
+            # 테스트 클라이언트는 Host: testserver 로 요청하므로 측정 중에만 허용
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+            modes = [
+                ('wsgi', lambda path: self._bench_wsgi(path, total, concurrency)),
+                ('asgi', lambda path: self._bench_asgi(path, total, concurrency)),
+            ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'요청 {total}건 x 동시성 {concurrency}'))
+        for path in options['paths']:
+            for mode, bench in modes:
+                results, elapsed = bench(path)
+                latencies = [latency for latency, status in results if status == 200]
+                failures = len(results) - len(latencies)
+                self._report(f'{mode} {path}', latencies, elapsed, failures)
@@ -0,0 +1,24 @@
+# pickuplog/main/management/commands/build_search_index.py ("내 물건 찾기" 색인 재구축)
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.matching import index_path, rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    전체 LostItem으로 n-gram 역색인을 다시 만듭니다.
+    (sync_lostitem / CSV 업로드는 적재한 배치만 증분 반영하므로, 최초 생성이나 규칙 변경 시 사용합니다.)
+    """
+
+    help = '"내 물건 찾기" 매칭용 분실물 n-gram 역색인을 재구축합니다.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        index = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 검색 색인 생성 완료: 분실물 {len(index)}건, n-gram {len(index.postings)}개 '
+            f'({time.perf_counter() - started:.2f}초, {index_path()})'
+        ))
@@ -0,0 +1,24 @@
+# pickuplog/main/management/commands/dedup_lostitems.py (분실물 중복 색인 재구축)
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    전체 LostItem으로 MinHash/LSH 중복 색인을 다시 만듭니다.
+    (sync_lostitem / CSV 업로드는 적재한 배치만 증분 색인하므로, 최초 적재나 파라미터 변경 시 사용합니다.)
+    """
+
+    help = 'LostItem 전체의 MinHash/LSH 중복 색인을 재구축하고 중복 의심 묶음을 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='한 번에 색인할 행 수 (기본 5000)')
+
+    def handle(self, *args, **options):
+        from main.dedup import rebuild_index
+
+        self.stdout.write(self.style.MIGRATE_HEADING('분실물 중복 색인 재구축 시작...'))
+        indexed, pairs, clusters = rebuild_index(chunk_size=options['chunk_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 중복 색인 완료: {indexed}건 색인, 의심 쌍 {pairs}건, 묶음 {clusters}개 생성/갱신'
+        ))
@@ -0,0 +1,21 @@
+# pickuplog/main/management/commands/flush_view_counts.py (조회수 저널 반영)
+
+from django.core.management.base import BaseCommand
+
+from main.viewcounter import journal_dir, view_counter
+
+
+class Command(BaseCommand):
+    """
+    웹 프로세스가 반영하지 못하고 남긴 조회수 저널(종료/비정상 종료된 프로세스의 저널)을 DB에 반영합니다.
+    실행 중인 프로세스의 저널은 그 프로세스의 반영 스레드가 처리하므로 건드리지 않습니다. (cron 등록용)
+    """
+
+    help = '남아 있는 분실물 조회수 저널을 LostItem.views에 반영합니다.'
+
+    def handle(self, *args, **options):
+        flushed = view_counter.flush()
+        if flushed:
+            self.stdout.write(self.style.SUCCESS(f'✅ 조회수 {flushed}건 반영 완료 ({journal_dir()})'))
+        else:
+            self.stdout.write(self.style.WARNING('반영할 조회수 저널이 없습니다.'))
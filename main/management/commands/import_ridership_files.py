@@ -0,0 +1,85 @@
+# pickuplog/main/management/commands/import_ridership_files.py (승하차 인원 월별 CSV 대량 적재)
+
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+MB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    """
+    열린데이터광장에서 내려받은 서울시 지하철 승하차 인원(OA-12251) 월별 CSV를 RidershipDaily에 적재합니다.
+    Open API로 수년치를 날짜별로 받는 대신 파일을 블록 단위로 스트리밍해 읽습니다.
+      - 메인 프로세스: 파일을 줄 경계 블록으로 읽어 작업자에게 넘기고, 결과를 받아 쓰기 담당 하나가 일괄 upsert
+      - 작업자 프로세스(--workers): CSV 해석, 노선 코드 / 표준 역명 정규화, StationDict 원천 역명 해석
+    검증 실패 행은 QuarantinedRow(승하차 CSV 파일 적재)로 격리하고, 새 역은 StationDict / Station 차원에 추가합니다.
+    """
+
+    help = '서울시 승하차 인원 월별 CSV 파일(들)을 다중 프로세스로 정규화해 일괄 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='CSV 파일 또는 CSV 파일이 든 디렉터리')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='정규화 작업자 프로세스 수 (기본: CPU 수, 1이면 메인 프로세스에서 직접 처리)',
+        )
+        parser.add_argument('--block-mb', type=float, default=4, help='작업자에게 한 번에 넘기는 블록 크기 (MB, 기본 4)')
+        parser.add_argument('--dry-run', action='store_true', help='읽기 / 정규화만 하고 DB에 쓰지 않음 (처리량 측정용)')
+        parser.add_argument('--no-snapshot', action='store_true', help='적재 후 분석용 컬럼형 스냅샷을 다시 만들지 않음')
+
+    def handle(self, *args, **options):
+        from main.ridership_files import RidershipFileError, import_files
+
+        paths = []
+        for name in options['paths']:
+            path = Path(name)
+            if path.is_dir():
+                paths += sorted(p for p in path.iterdir() if p.suffix.lower() == '.csv')
+            elif path.is_file():
+                paths.append(path)
+            else:
+                raise CommandError(f'파일을 찾을 수 없습니다: {name}')
+        if not paths:
+            raise CommandError('적재할 CSV 파일이 없습니다.')
+
+        workers = max(1, options['workers'])
+        total_mb = sum(path.stat().st_size for path in paths) / MB
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"승하차 CSV 적재 시작: {len(paths)}개 파일, {total_mb:.1f}MB, 작업자 {workers}개"
+            + (' (dry-run: DB에 쓰지 않음)' if options['dry_run'] else '')
+        ))
+
+        def on_file(path, stats):
+            seconds = max(stats['seconds'], 1e-9)
+            self.stdout.write(
+                f"  - {path.name}: {stats['rows']:,}행, {stats['bytes'] / MB:.1f}MB "
+                f"({stats['rows'] / seconds:,.0f}행/s, {stats['bytes'] / MB / seconds:.1f}MB/s)"
+            )
+
+        try:
+            result = import_files(
+                paths,
+                workers=workers,
+                block_bytes=int(options['block_mb'] * MB),
+                dry_run=options['dry_run'],
+                on_file=on_file,
+            )
+        except RidershipFileError as e:
+            raise CommandError(f'🚨 {e}')
+
+        seconds = max(result['seconds'], 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 적재 완료: {result['rows']:,}행 중 {result['written']:,}행 upsert, {result['rejected']:,}행 격리, "
+            f"새 역 {result['new_stations']}개 ({result['seconds']:.1f}초, "
+            f"{result['rows'] / seconds:,.0f}행/s, {result['bytes'] / MB / seconds:.1f}MB/s)"
+        ))
+        if result['rejected'] and not options['dry_run']:
+            self.stdout.write(self.style.WARNING('⚠️ 격리된 행은 관리자 화면의 검증 실패 행(승하차 CSV 파일 적재)에서 확인하세요.'))
+
+        if result['written'] and not options['dry_run'] and not options['no_snapshot']:
+            from main.snapshot import build_snapshot
+
+            version_dir = build_snapshot()
+            self.stdout.write(self.style.SUCCESS(f'✅ 컬럼형 스냅샷 갱신: {version_dir.name}'))
@@ -0,0 +1,59 @@
+# pickuplog/main/management/commands/resolve_lostitem_stations.py (기존 분실물 역명 표준화)
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main.models import LostItem, LostItemRateDirtyDate
+from main.stations import StationIndex
+
+
+class Command(BaseCommand):
+    """
+    이미 적재된 LostItem의 station/line을 StationDict 인덱스로 표준화합니다.
+    (sync_lostitem / CSV 업로드는 적재 시점에 같은 인덱스를 사용하므로, 과거 데이터 보정용입니다.)
+    """
+
+    help = '기존 LostItem의 발견역/노선을 StationDict 기준 표준 형태로 일괄 보정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='한 번에 처리할 행 수 (기본 2000)')
+
+    def handle(self, *args, **options):
+        station_index = StationIndex.from_db()
+        if not len(station_index):
+            self.stdout.write(self.style.WARNING('StationDict가 비어 있습니다. sync_ridership을 먼저 실행하세요.'))
+            return
+
+        chunk_size = options['chunk_size']
+        last_pk, scanned, updated = 0, 0, 0
+
+        while True:
+            chunk = list(
+                LostItem.objects.filter(pk__gt=last_pk)
+                .exclude(station__isnull=True).exclude(station='')
+                .order_by('pk')
+                .only('pk', 'line', 'station', 'registered_at')[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            scanned += len(chunk)
+
+            changed = []
+            for item in chunk:
+                resolved = station_index.resolve(item.station, line=item.line)
+                if not resolved:
+                    continue
+                line_code, station_name = resolved
+                line_code = line_code or item.line
+                if (line_code, station_name) != (item.line, item.station):
+                    item.line, item.station = line_code, station_name
+                    changed.append(item)
+
+            with transaction.atomic():
+                LostItem.objects.bulk_update(changed, ['line', 'station'], batch_size=500)
+                # 역이 바뀐 분실물의 날짜는 분실률 지표를 다시 계산
+                LostItemRateDirtyDate.mark(item.registered_at for item in changed)
+            updated += len(changed)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 역명 표준화 완료: {scanned}건 중 {updated}건 보정'))
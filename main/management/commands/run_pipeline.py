@@ -0,0 +1,70 @@
+# pickuplog/main/management/commands/run_pipeline.py (daily_sync_2100.bat 대체)
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import PipelineRun
+
+
+class Command(BaseCommand):
+    """
+    sync_ridership / sync_lostitem / sync_weather를 동시에 실행하고,
+    세 단계가 모두 끝나면 sync_reports를 실행합니다.
+    단계별 소요 시간과 행 수는 PipelineRun 테이블에 기록됩니다.
+    """
+
+    help = '야간 동기화 단계를 하나의 프로세스에서 DAG로 실행하고 PipelineRun에 기록합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume', nargs='?', const='latest', default=None,
+            help='실패한 실행을 이어서 실행합니다. 실행 ID를 생략하면 가장 최근 실패한 실행을 사용합니다.'
+        )
+        parser.add_argument(
+            '--only', nargs='+', default=None,
+            help='지정한 단계만 실행합니다. (ridership, lostitem, weather, reports)'
+        )
+        parser.add_argument('--workers', type=int, default=3, help='동시에 실행할 최대 단계 수 (기본 3)')
+        parser.add_argument('--retries', type=int, default=1, help='단계별 재시도 횟수 (기본 1)')
+        parser.add_argument('--retry-delay', type=float, default=5.0, help='재시도 대기 시간(초), 시도마다 배수로 증가')
+
+    def handle(self, *args, **options):
+        from main.pipeline import NIGHTLY_STAGES, PipelineRunner
+
+        resume_from = None
+        if options['resume'] == 'latest':
+            resume_from = PipelineRun.objects.filter(status=PipelineRun.STATUS_FAILED).first()
+            if resume_from is None:
+                raise CommandError('이어서 실행할 실패한 PipelineRun이 없습니다.')
+        elif options['resume']:
+            try:
+                resume_from = PipelineRun.objects.get(pk=int(options['resume']))
+            except (ValueError, PipelineRun.DoesNotExist):
+                raise CommandError(f"PipelineRun #{options['resume']}을(를) 찾을 수 없습니다.")
+
+        stage_names = {stage.name for stage in NIGHTLY_STAGES}
+        if options['only'] and not set(options['only']) <= stage_names:
+            unknown = ', '.join(sorted(set(options['only']) - stage_names))
+            raise CommandError(f'알 수 없는 단계: {unknown}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('=== PickUpLog: 야간 파이프라인 시작 (run_pipeline) ==='))
+
+        runner = PipelineRunner(
+            max_workers=options['workers'],
+            retries=options['retries'],
+            retry_delay=options['retry_delay'],
+            stdout=self.stdout,
+        )
+        run = runner.run(resume_from=resume_from, only=options['only'])
+
+        for name, result in run.stages.items():
+            self.stdout.write(
+                f"  - {name:<10} {result.get('status'):<8} "
+                f"{result.get('duration', '-')}s rows={result.get('rows', '-')}"
+                f"{' (재사용)' if result.get('reused') else ''}"
+            )
+
+        if run.status == PipelineRun.STATUS_FAILED:
+            raise CommandError(
+                f'PipelineRun #{run.pk} 실패. `python manage.py run_pipeline --resume {run.pk}`로 실패 단계부터 재개할 수 있습니다.'
+            )
+        self.stdout.write(self.style.SUCCESS(f'✅ PipelineRun #{run.pk} 완료 ({run.duration:.1f}초)'))
@@ -0,0 +1,30 @@
+# pickuplog/main/management/commands/snapshot_db.py (분석용 읽기 전용 스냅샷 갱신)
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.db import backup_sqlite_snapshot
+
+
+class Command(BaseCommand):
+    """
+    primary SQLite DB를 online backup API로 복사해 분석 화면이 읽는 스냅샷(settings.ANALYTICS_DB_PATH)을 교체합니다.
+    sync_reports 끝에서 자동으로 실행되며, 마이그레이션 직후처럼 스키마가 바뀌었을 때 수동으로 실행합니다.
+    (스냅샷의 마이그레이션 상태가 코드와 다르면 다시 만들 때까지 분석 화면은 primary에서 읽습니다)
+    """
+
+    help = '분석 화면용 읽기 전용 DB 스냅샷을 primary에서 다시 만듭니다.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        path = backup_sqlite_snapshot()
+        if path is None:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ primary가 SQLite가 아니므로 스냅샷을 만들지 않습니다. (Postgres는 POSTGRES_REPLICA_HOST 복제본을 읽습니다)'
+            ))
+            return
+        size_mb = path.stat().st_size / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ 분석용 DB 스냅샷 갱신 완료: {path} ({size_mb:.1f}MB, {time.perf_counter() - started:.2f}초)'
+        ))
@@ -1,112 +1,163 @@
-import requests
-from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from django.utils import timezone
-import os
-from dotenv import load_dotenv
-
-from main.models import LostItem
-
-# --- Helper Functions ---
-def parse_date_and_make_aware(date_str):
-    """
-    문자열 날짜를 받아 timezone aware datetime으로 변환.
-    API에서 날짜가 없거나 형식이 잘못되면 None 반환.
-    """
-    if not date_str or date_str.strip() in ['00:00.0', '']:
-        return None
-    date_part = date_str.strip().split(' ')[0]
-    date_part = date_part.replace('/', '-')
-    try:
-        naive_datetime = datetime.strptime(date_part, '%Y-%m-%d').replace(hour=0, minute=0, second=0)
-        return timezone.make_aware(
-            naive_datetime, 
-            timezone=timezone.get_current_timezone()
-        )
-    except ValueError:
-        return None
-# --- Helper Functions 끝 ---
+
+from main.matching import update_search_index
+from main.percolator import percolate
+from main.models import LostItem, LostItemRateDirtyDate, QuarantinedRow
+from main.normalize import load_rules
+from main.occupancy import track_occupancy
+from main.stations import StationIndex
+
+# 서울시 분실물 습득물 정보 (최근 등록분 1페이지)
+SERVICE = "lostArticleInfo"
+# bulk upsert 시 기존 행에서 갱신할 필드 (item_id / views 제외 전체)
+# views는 새로 들어온 분실물만 API 조회수(INQ_CNT)로 시작하고, 이후에는 상세 화면 조회 카운터(viewcounter)가 올립니다.
+UPSERT_FIELDS = [
+    "transport", "line", "station", "category", "item_name", "status", "is_received",
+    "registered_at", "received_at", "description", "storage_location", "registrar_id",
+    "pickup_company_location",
+]
 
 
 class Command(BaseCommand):
     help = '서울시 공공 API를 통해 분실물 데이터를 가져와 LostItem 모델에 적재합니다. (API 기반)'
 
     def handle(self, *args, **options):
-        load_dotenv()
-        API_KEY = os.getenv("SEOUL_API_KEY", "6671454b426c6f763833785471726d") 
-        BASE_URL = f"http://openapi.seoul.go.kr:8088/{API_KEY}/json/lostArticleInfo/1/1000/" 
+        # pandas / HTTP 클라이언트 / 중복 탐지(numpy)는 실행 시점에만 로드 (manage.py 기동 시간 단축)
+        from main.dedup import index_items
+        from main.seoul_api import PAGE_SIZE, SeoulApiError, get_client, load_api_key
+        from main.validation import new_batch_id
+
+        client = get_client(load_api_key(default="6671454b426c6f763833785471726d"))
         
         self.stdout.write(self.style.MIGRATE_HEADING('LostItem 데이터 동기화 시작...'))
-        
+
+        # 운수사 → 교통수단 / 역명 별칭은 실행 시작 시 DB에서 한 번 컴파일 (관리자 화면에서 수정)
+        rules = load_rules()
+        station_index = StationIndex.from_db()
+        batch_id = new_batch_id()
+
+        # 응답을 받는 대로 STREAM_BATCH건씩 검증·적재 (페이지 전체를 메모리에 올리지 않고 다운로드와 DB 쓰기를 겹침)
+        total_rows, quarantined, archived, item_ids = 0, 0, 0, set()
         try:
-            response = requests.get(BASE_URL, timeout=10)
-            response.raise_for_status() 
-            api_data = response.json()
-            rows = api_data.get("lostArticleInfo", {}).get("row", [])
-        except Exception as e:
+            for rows in client.stream(SERVICE, 1, PAGE_SIZE):
+                stored, failed, skipped = self._store_batch(rows, rules, station_index, batch_id, offset=total_rows)
+                item_ids.update(stored)
+                quarantined += failed
+                archived += skipped
+                total_rows += len(rows)
+        except SeoulApiError as e:
             raise CommandError(f'API 호출 또는 JSON 디코딩 오류: {e}')
+        finally:
+            for line in client.report_lines(SERVICE):
+                self.stdout.write(line)
         
-        if not rows:
+        if not total_rows:
             self.stdout.write(self.style.WARNING("API로부터 받은 데이터가 없습니다."))
             return
-             
-        busList = ["중부운수", "대진여객", "원버스", "상진운수", "성원여객", "보성운수",
-                   "동성교통", "도선여객", "선진운수", "남성교통", "삼양교통"]
-        taxiList = ["삼이택시", "동화통운", "고려운수", "경일운수", "동도자동차", "안전한택시",
-                    "양평운수", "대진흥업", "승진통상", "백제운수", "삼익택시", "새한택시",
-                    "경서운수", "대하운수", "동성상운",]
-
-        success_count = 0
-        
-        with transaction.atomic():
-            for data in rows:
-                CSTD_PLC = data.get("CSTD_PLC", "")
-                RCPL = data.get("RCPL", "")
-                
-                # 🚇 교통수단 및 역명 판별
-                if CSTD_PLC.endswith("역"):
-                    transport = "subway"
-                    station_name = CSTD_PLC
-                elif RCPL in busList:
-                    transport = "bus"
-                    station_name = ""
-                elif RCPL in taxiList:
-                    transport = "taxi"
-                    station_name = ""
-                else: 
-                    transport = "etc"
-                    station_name = ""
-                
-                # 📅 날짜 필드 처리
-                registered_at = parse_date_and_make_aware(data.get("REG_YMD"))
-                received_at = parse_date_and_make_aware(data.get("RCV_YMD"))
-                
-                try:
-                    # DB 적재
-                    obj, created = LostItem.objects.update_or_create(
-                        item_id=data.get("LOST_MNG_NO"),
-                        defaults={
-                            "transport": transport,
-                            "station": station_name,
-                            "category": data.get("LOST_KND"),
-                            "item_name": data.get("LOST_NM"),
-                            "status": data.get("LOST_STTS"),
-                            "is_received": data.get("RCPT_YN") == "Y",
-                            "registered_at": registered_at,
-                            "received_at": received_at,
-                            "description": data.get("LGS_DTL_CN"),
-                            "storage_location": CSTD_PLC,
-                            "registrar_id": data.get("LOST_RGTR_ID"),
-                            "pickup_company_location": RCPL,
-                            "views": int(data.get("INQ_CNT") or 0),
-                        }
-                    )
-                    success_count += 1
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"[{data.get('LOST_MNG_NO')}] 데이터 처리 오류: {e}"))
-                    continue
+        if quarantined:
+            self.stdout.write(self.style.WARNING(f'⚠️ 검증 실패 {quarantined}건 격리 (관리자 화면: 검증 실패 행)'))
+        if archived:
+            self.stdout.write(f'  - 아카이브로 옮긴 분실물 {archived}건은 다시 적재하지 않음')
+        success_count = len(item_ids)
+
+        # 이번 배치만 중복 색인 (CSV 업로드 등으로 item_id가 다르게 들어온 같은 물건 탐지)
+        batch_pks = list(LostItem.objects.filter(item_id__in=list(item_ids)).values_list('pk', flat=True))
+        indexed, pairs, clusters = index_items(batch_pks)
+        update_search_index(batch_pks)
+
+        # 저장된 검색(알림 신청) 전체와 이번 배치를 한 번에 매칭
+        notified = percolate(batch_pks)
+        if notified:
+            self.stdout.write(self.style.SUCCESS(f'🔔 저장된 검색 새 알림 {notified}건'))
+        if pairs:
+            self.stdout.write(self.style.WARNING(f'⚠️ 중복 의심 {pairs}쌍 발견 → 관리자 화면에서 검토하세요. (묶음 {clusters}개)'))
 
         self.stdout.write(self.style.SUCCESS(
-            f'✅ LostItem 데이터 동기화 완료! 총 {len(rows)}건 중 {success_count}건 적재/업데이트되었습니다.'
+            f'✅ LostItem 데이터 동기화 완료! 총 {total_rows}건 중 {success_count}건 적재/업데이트되었습니다.'
         ))
+
+    def _store_batch(self, rows, rules, station_index, batch_id, offset=0):
+        """
+        받은 행 묶음 하나를 검증하고 LostItem에 upsert합니다. offset은 응답 안에서 이 묶음 앞의 행 수 (격리 행 번호용)
+        반환값: (적재한 item_id 목록, 격리 건수, 아카이브에 있어 건너뛴 건수)
+        """
+        import pandas as pd
+
+        from main.archive import archived_item_ids
+        from main.validation import BatchValidator, quarantine
+
+        # 적재 전 일괄 검증: 실패 행은 사유와 함께 QuarantinedRow로 격리
+        # (같은 묶음 안의 중복 ID는 마지막 행 기준, 묶음 사이의 중복은 나중 upsert가 덮어씀)
+        frame = pd.DataFrame(rows)
+        validator = (
+            BatchValidator(frame)
+            .require("LOST_MNG_NO")
+            .dates("REG_YMD")
+            .dates("RCV_YMD")
+            .integers("INQ_CNT")
+            .unique("LOST_MNG_NO", keep="last")
+        )
+        valid, invalid = validator.split()
+        quarantined = quarantine(
+            QuarantinedRow.SOURCE_LOSTITEM_API, frame, invalid, batch_id,
+            row_numbers=range(offset + 1, offset + len(rows) + 1),
+        )
+
+        # 이미 아카이브로 옮긴 분실물은 건너뜁니다. (API는 수령 후에도 계속 내려주므로 격리하지 않음)
+        archived = archived_item_ids(rows[i]["LOST_MNG_NO"] for i in valid)
+        items = {}
+        skipped = 0
+        for i in valid:
+            data = rows[i]
+            if data["LOST_MNG_NO"] in archived:
+                skipped += 1
+                continue
+            CSTD_PLC = data.get("CSTD_PLC") or ""
+            RCPL = data.get("RCPL") or ""
+            line_code = None
+            
+            # 🚇 교통수단 및 역명 판별
+            if CSTD_PLC.endswith("역"):
+                transport = "subway"
+                # StationDict 인덱스로 표준 역명/노선 채우기 (찾지 못하면 원천 값 유지)
+                resolved = station_index.resolve(CSTD_PLC)
+                if resolved:
+                    line_code, station_name = resolved
+                else:
+                    station_name = CSTD_PLC
+            else:
+                transport = rules.transport_for(RCPL)
+                station_name = ""
+            
+            item_id = data["LOST_MNG_NO"]
+            items[item_id] = LostItem(
+                item_id=item_id,
+                transport=transport,
+                line=line_code,
+                station=station_name,
+                category=data.get("LOST_KND"),
+                item_name=data.get("LOST_NM"),
+                status=data.get("LOST_STTS"),
+                is_received=data.get("RCPT_YN") == "Y",
+                registered_at=validator.parsed["REG_YMD"][i],
+                received_at=validator.parsed["RCV_YMD"][i],
+                description=data.get("LGS_DTL_CN"),
+                storage_location=CSTD_PLC,
+                registrar_id=data.get("LOST_RGTR_ID"),
+                pickup_company_location=RCPL,
+                views=validator.parsed["INQ_CNT"][i],
+            )
+
+        # DB 적재: item_id 기준 일괄 upsert (수령 여부가 바뀐 만큼 보관 장소 카운터 반영)
+        with transaction.atomic(), track_occupancy(items):
+            LostItem.objects.bulk_create(
+                items.values(),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["item_id"],
+                update_fields=UPSERT_FIELDS,
+            )
+            # 지난 날짜로 늦게 들어온 분실물도 다음 sync_reports에서 분실률에 반영되도록
+            LostItemRateDirtyDate.mark(item.registered_at for item in items.values())
+        return list(items), quarantined, skipped
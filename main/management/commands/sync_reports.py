@@ -13,12 +13,17 @@ class Command(BaseCommand):
     
     help = 'Calculates RII and generates the RainImpactReport.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='분실률 지표(LostItemRate)와 패턴 큐브를 증분 갱신하지 않고 전체 재계산합니다.'
+        )
     
     def handle(self, *args, **options):
         # 💡 수정: 함수 호출 시점에 모듈을 로드합니다.
         # 이렇게 하면 Django가 settings 및 URL을 로드하는 과정에서 reports.py를 강제로 로드하지 않습니다.
         try:
-            from main.reports import calculate_rain_impact_index
+            from main.reports import calculate_rain_impact_index, refresh_analytics
         except ImportError:
             self.stdout.write(self.style.ERROR('❌ ERROR: main.reports 모듈 로드에 실패했습니다. (순환 참조 문제 재확인 필요)'))
             return
@@ -38,6 +43,28 @@ class Command(BaseCommand):
                      '⚠️ 경고: 분석 로직이 실행되었으나, 업데이트된 보고서가 없습니다. (데이터 부족 또는 로직 문제)'
                  ))
 
+            # 분실률 지표 (LostItem × RidershipDaily) 및 요일 패턴 큐브 증분 갱신
+            since, rate_count = refresh_analytics(full=options['full'])
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ LostItemRate / 패턴 큐브 갱신 완료: {since or "전체"} 이후 {rate_count}행'
+            ))
+
+            # 날씨 기반 분실 예보 모델 학습 및 향후 7일 예측 캐시
+            from main.forecast import train_and_forecast
+            forecast_count = train_and_forecast()
+            self.stdout.write(self.style.SUCCESS(f'✅ LostForecast 갱신 완료: {forecast_count}건 예측'))
+
+            # 강수 what-if 시나리오용 역별 계수 배열
+            from main.scenario import build_scenario_model
+            station_count = build_scenario_model()
+            self.stdout.write(self.style.SUCCESS(f'✅ 시나리오 모델 갱신 완료: {station_count}개 역'))
+
+            # 분석 화면이 읽는 읽기 전용 스냅샷 교체 (SQLite online backup, Postgres는 복제본이 대신함)
+            from main.db import backup_sqlite_snapshot
+            snapshot_path = backup_sqlite_snapshot()
+            if snapshot_path is not None:
+                self.stdout.write(self.style.SUCCESS(f'✅ 분석용 DB 스냅샷 갱신 완료: {snapshot_path}'))
+
         except Exception as e:
             # 💡 수정: 최종 오류 시에만 raise하여 스택 트레이스를 유지하고, CommandError로 변환하여 깔끔하게 종료합니다.
             self.stdout.write(self.style.ERROR(
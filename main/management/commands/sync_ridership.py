@@ -1,34 +1,18 @@
 # main/management/commands/sync_ridership.py (기간 옵션 처리 로직 완성)
 
-import re
-import requests
-import json
-import os
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from main.models import StationDict, RidershipDaily, LostItem # LostItem 임포트 추가 (옵션이지만 안전을 위해)
+from main.models import QuarantinedRow, StationDict, RidershipDaily, LostItem # LostItem 임포트 추가 (옵션이지만 안전을 위해)
+from main.stations import StationCodeMap, sync_station_dimension
 from django.utils import timezone # Timezone 사용을 위해 추가
 
-# 환경 변수 로드 및 API 키 설정 (기존 코드 유지)
-load_dotenv() 
-API_KEY = os.getenv("SEOUL_API_KEY", "sample") 
-API_BASE_URL = f'http://openapi.seoul.go.kr:8088/{API_KEY}/json/CardSubwayStatsNew/' 
-
-# --- 데이터 정제 함수 (노선명, 역명 표준화)는 그대로 유지 ---
-def normalize_line_code(line_name):
-    """노선명(예: 1호선)을 표준 코드(예: LINE1)로 변환"""
-    if '호선' in line_name:
-        match = re.search(r'(\d+)호선', line_name)
-        if match:
-            return f"LINE{match.group(1)}"
-    return line_name.upper().replace(' ', '').replace('-', '')
-
-def normalize_station_name(raw_name):
-    """괄호 안의 호선 정보 제거"""
-    return re.sub(r'\(.*?\)', '', raw_name).strip()
+# 서울시 지하철 호선별 역별 승하차 인원 (main.seoul_api 공용 클라이언트로 요청)
+SERVICE = 'CardSubwayStatsNew'
+
+# --- 데이터 정제 함수 (노선명, 역명 표준화)는 main.normalize로 이동 ---
+from main.normalize import load_rules, normalize_line_code, normalize_station_name
 # ----------------------------------------
 
 class Command(BaseCommand):
@@ -86,60 +70,103 @@ class Command(BaseCommand):
 
 
         # 2. 데이터 동기화 루프 시작
+        from main.seoul_api import CircuitOpenError, SeoulApiError, get_client
+
+        # 노선·역명 별칭은 실행 시작 시 DB에서 한 번 컴파일 (관리자 화면에서 수정)
+        load_rules()
+        client = get_client()
+        backfill = bool(start_date_str and end_date_str)
         target_date_found = False
         
-        for target_date in dates_to_check:
-            API_URL = f'{API_BASE_URL}1/1000/{target_date}' 
+        for target_date, stream in self._stream_dates(client, dates_to_check, backfill):
             self.stdout.write(self.style.NOTICE(f'API 데이터 다운로드 시도: {target_date}'))
 
             try:
-                response = requests.get(API_URL)
-                response.raise_for_status() 
-                data = response.json()
-                
-                if 'CardSubwayStatsNew' in data:
-                    rows = data['CardSubwayStatsNew']['row']
-                    if rows:
-                        self.stdout.write(self.style.SUCCESS(f'✅ 데이터 찾기 성공! 날짜: {target_date}'))
-                        
-                        # 적재 및 정제 실행
-                        self._sync_station_dict(rows)
-                        self._sync_ridership_data(rows)
-                        
-                        target_date_found = True
-                        
-                        # 기간 지정이 없거나 (자동 검색) 특정 날짜 지정만 했을 경우, 
-                        # 성공 시 반복을 멈춥니다. 기간 지정 시에는 끝까지 실행합니다.
-                        if not (start_date_str and end_date_str):
-                            break 
-                            
-                    else:
-                        self.stdout.write(self.style.WARNING(f'데이터 없음. 다음 날짜 시도.'))
-
-                else:
-                    error_msg = data.get('RESULT', {}).get('MESSAGE', '알 수 없는 API 오류')
-                    self.stdout.write(self.style.WARNING(f'API 오류 응답: {error_msg}. 다음 날짜 시도.'))
-
-            except requests.exceptions.RequestException as e:
+                # 받는 대로 묶음 단위로 적재 및 정제 실행
+                received = self._sync_stream(stream)
+            except CircuitOpenError as e:
+                raise CommandError(f'🚨 API 호출 중단 ({target_date}): {e}')
+            except SeoulApiError as e:
                 self.stdout.write(self.style.ERROR(f'API 호출 실패 ({target_date}): {e}'))
-            except json.JSONDecodeError:
-                self.stdout.write(self.style.ERROR('API 응답이 유효한 JSON 형식이 아닙니다.'))
+                continue
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'치명적 오류 발생: {e}'))
+                continue
+
+            if not received:
+                self.stdout.write(self.style.WARNING(f'데이터 없음. 다음 날짜 시도.'))
+                continue
+            self.stdout.write(self.style.SUCCESS(f'✅ 데이터 적재 성공! 날짜: {target_date} ({received}건)'))
+
+            target_date_found = True
+
+            # 기간 지정이 없거나 (자동 검색) 특정 날짜 지정만 했을 경우, 
+            # 성공 시 반복을 멈춥니다. 기간 지정 시에는 끝까지 실행합니다.
+            if not backfill:
+                break
+
+        for line in client.report_lines(SERVICE):
+            self.stdout.write(line)
 
         if not target_date_found and not (start_date_str and end_date_str):
             raise CommandError(f'🚨 지난 {days_to_check}일간 데이터 동기화에 실패했습니다. API 상태를 확인하세요.')
         elif not target_date_found and (start_date_str and end_date_str):
              self.stdout.write(self.style.WARNING(f'경고: 지정된 기간 ({start_date_str}~{end_date_str}) 내에 적재된 데이터가 없습니다.'))
 
+        if target_date_found:
+            self._build_snapshot()
+
         self.stdout.write(self.style.SUCCESS('데이터 적재 및 정제가 완료되었습니다.'))
 
+    def _stream_dates(self, client, dates, backfill):
+        """
+        (날짜, RowStream)을 날짜 순서대로 내보냅니다. 응답은 받는 대로 STREAM_BATCH행씩 풀려 나오므로
+        페이지 전체를 메모리에 올리지 않고, 다운로드와 DB 쓰기가 겹칩니다.
+        기간 백필은 다음 날짜들을 AIMD 한도 안에서 미리 받기 시작하고(적재는 순서대로 하나씩),
+        자동 검색은 데이터가 있는 첫 날짜에서 멈추므로 한 번에 하나씩 요청합니다.
+        """
+        from main.seoul_api import PAGE_SIZE
+
+        calls = [(SERVICE, 1, PAGE_SIZE, date) for date in dates]
+        for call, stream in client.stream_many(calls, ahead=None if backfill else 0):
+            yield call[3], stream
+
+    def _sync_stream(self, stream):
+        """
+        한 날짜 응답을 묶음마다 StationDict → RidershipDaily 순으로 적재합니다.
+        환승역 표시와 Station 차원의 환승 여부 갱신은 전체 역을 훑으므로 날짜마다 한 번만 합니다.
+        반환값: 받은 행 수
+        """
+        from main.validation import new_batch_id
+
+        station_codes, batch_id = StationCodeMap.from_db(), new_batch_id()
+        received = dict_added = dict_skipped = added = quarantined = 0
+        for rows in stream:
+            added_now, skipped_now = self._sync_station_dict(rows)
+            dict_added, dict_skipped = dict_added + added_now, dict_skipped + skipped_now
+            added_now, quarantined_now = self._sync_ridership_data(rows, station_codes, batch_id, offset=received)
+            added, quarantined = added + added_now, quarantined + quarantined_now
+            received += len(rows)
+        if not received:
+            return 0
+
+        self._mark_transfers()
+        sync_station_dimension()
+        self.stdout.write(self.style.SUCCESS(f'✅ StationDict 적재 완료: {dict_added}개 추가, {dict_skipped}개 건너뜀'))
+        self.stdout.write(self.style.SUCCESS(f'✅ RidershipDaily 적재 완료: {added}개 추가, {quarantined}개 격리 (검증 실패)'))
+        return received
+
+    def _build_snapshot(self):
+        """분석용 컬럼형 스냅샷(승하차·날씨)을 새로 만듭니다."""
+        from main.snapshot import build_snapshot
+
+        version_dir = build_snapshot()
+        self.stdout.write(self.style.SUCCESS(f'✅ 컬럼형 스냅샷 갱신: {version_dir.name}'))
+
 
     @transaction.atomic
     def _sync_station_dict(self, rows):
-        """StationDict를 먼저 채워서 역 표준화 정보를 확보합니다."""
-        self.stdout.write(self.style.MIGRATE_HEADING('1/2단계: StationDict 적재 시작'))
-
+        """StationDict를 먼저 채워서 역 표준화 정보를 확보합니다. 반환값: (추가, 건너뜀)"""
         added, skipped = 0, 0
 
         # rows가 단일 dict이면 리스트화
@@ -179,69 +206,82 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(f'⚠️ 데이터 정제 오류: {raw_name}, {e}'))
                 continue
 
-        # 환승역 처리
+        return added, skipped
+
+    @transaction.atomic
+    def _mark_transfers(self):
+        """환승역 처리: 같은 표준 역명이 여러 노선에 있으면 환승역으로 표시"""
         for std_name in StationDict.objects.values_list('station_name_std', flat=True).distinct():
             lines = StationDict.objects.filter(station_name_std=std_name)
             if lines.count() > 1:
                 lines.update(is_transfer=True)
 
-        self.stdout.write(self.style.SUCCESS(f'✅ StationDict 적재 완료: {added}개 추가, {skipped}개 건너뜀'))
-
-
 
     @transaction.atomic
-    def _sync_ridership_data(self, rows):
-        """RidershipDaily 테이블에 일별 승하차 인원 데이터를 적재합니다."""
-        self.stdout.write(self.style.MIGRATE_HEADING('2/2단계: RidershipDaily 적재 시작'))
-
-        added, skipped = 0, 0
-
+    def _sync_ridership_data(self, rows, station_codes, batch_id, offset=0):
+        """
+        RidershipDaily 테이블에 일별 승하차 인원 데이터를 적재합니다. (일괄 검증 후 Station 정수 키 기준 일괄 upsert)
+        station_codes / batch_id는 날짜 하나 동안 재사용하는 StationCodeMap / 격리 배치 ID,
+        offset은 응답 안에서 이 묶음 앞의 행 수 (격리 행 번호용)
+        반환값: (추가, 격리)
+        """
+        # 이 묶음의 원천 역명 → 표준 역명만 읽고, 새 (노선, 역) 쌍은 Station 차원에 추가합니다.
+        std_names = {
+            (raw, line): std
+            for raw, line, std in StationDict.objects.filter(
+                station_name_raw__in={row.get('SBWY_STNS_NM') for row in rows},
+            ).values_list('station_name_raw', 'line_code', 'station_name_std')
+        }
+        station_codes.ensure({(line, std) for (_, line), std in std_names.items()})
+        # 적재 전 일괄 검증: 필수 값 / 날짜 / 인원 수 형식, 역 사전 존재 여부
+        # (같은 응답 안의 중복 (역, 노선, 날짜)는 마지막 행 기준)
+        import pandas as pd
+        from main.validation import BatchValidator, quarantine
+
+        frame = pd.DataFrame(rows)
+        validator = (
+            BatchValidator(frame)
+            .require('SBWY_STNS_NM', 'SBWY_ROUT_LN_NM', 'USE_YMD')
+            .dates('USE_YMD', fmt='%Y%m%d', aware=False)
+            .integers('GTON_TNOPE')
+            .integers('GTOFF_TNOPE')
+            .unique('SBWY_STNS_NM', 'SBWY_ROUT_LN_NM', 'USE_YMD', keep='last')
+        )
+        keys = []
         for row in rows:
-            raw_name = row.get('SBWY_STNS_NM')
-            line_name = row.get('SBWY_ROUT_LN_NM')
-            ride_date = row.get('USE_YMD')
-            on_count = row.get('GTON_TNOPE')
-            off_count = row.get('GTOFF_TNOPE')
-
-            if not (raw_name and line_name and ride_date):
-                skipped += 1
-                continue
-
-            try:
-                # StationDict에서 표준 역명 확인
-                line_code = normalize_line_code(line_name)
-                station_std = StationDict.objects.filter(
-                    station_name_raw=raw_name,
-                    line_code=line_code
-                ).values_list('station_name_std', flat=True).first()
-
-                if not station_std:
-                    self.stdout.write(self.style.WARNING(f'⚠️ StationDict 미존재 스킵: {raw_name}, {line_name}'))
-                    skipped += 1
-                    continue
-
-                date_obj = datetime.strptime(ride_date, '%Y%m%d').date()
-                boardings = int(on_count) if on_count else 0
-                alightings = int(off_count) if off_count else 0
-                total = boardings + alightings
-
-                obj, created = RidershipDaily.objects.update_or_create(
-                    date=date_obj,
-                    line_code=line_code,
-                    station_name_std=station_std,
-                    defaults={
-                        'boardings': boardings,
-                        'alightings': alightings,
-                        'total': total
-                    },
-                )
-
-                if created:
-                    added += 1
-
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f'⚠️ 적재 오류: {raw_name} ({ride_date}) - {e}'))
-                skipped += 1
-                continue
+            line_code = normalize_line_code(row.get('SBWY_ROUT_LN_NM') or '')
+            station_std = std_names.get((row.get('SBWY_STNS_NM'), line_code))
+            keys.append((line_code, station_std, station_codes.get(line_code, station_std) if station_std else None))
+        validator.check([station_id is None for _, _, station_id in keys], '역 사전 미존재')
+        valid, invalid = validator.split()
+        skipped = quarantine(
+            QuarantinedRow.SOURCE_RIDERSHIP_API, frame, invalid, batch_id,
+            row_numbers=range(offset + 1, offset + len(rows) + 1),
+        )
 
-        self.stdout.write(self.style.SUCCESS(f'✅ RidershipDaily 적재 완료: {added}개 추가, {skipped}개 건너뜀'))
+        records = {}
+        for i in valid:
+            station_id = keys[i][2]
+            date_obj = validator.parsed['USE_YMD'][i]
+            boardings = validator.parsed['GTON_TNOPE'][i]
+            alightings = validator.parsed['GTOFF_TNOPE'][i]
+            records[(station_id, date_obj)] = RidershipDaily(
+                date=date_obj,
+                station_id=station_id,
+                boardings=boardings,
+                alightings=alightings,
+                total=boardings + alightings,
+            )
+
+        existing = set(RidershipDaily.objects.filter(
+            date__in={date_obj for _, date_obj in records},
+            station_id__in={station_id for station_id, _ in records},
+        ).values_list('station_id', 'date'))
+        RidershipDaily.objects.bulk_create(
+            records.values(),
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['station', 'date'],
+            update_fields=['boardings', 'alightings', 'total'],
+        )
+        return len(records.keys() - existing), skipped
@@ -0,0 +1,131 @@
+# pickuplog/main/management/commands/sync_ridership_hourly.py (시간대별 승하차 인원 적재)
+
+import calendar
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from main.models import RidershipHourly, StationDict
+from main.normalize import load_rules, normalize_line_code, normalize_station_name
+from main.stations import StationCodeMap
+
+# 서울시 지하철 호선별 역별 시간대별 승하차 인원 (main.seoul_api 공용 클라이언트로 요청)
+SERVICE = 'CardSubwayTime'
+# 시간대별 자료는 보통 다음 달 초에 공개되므로, 월 지정이 없으면 최근 N개월을 역순으로 찾습니다.
+MONTHS_TO_CHECK = 3
+
+
+def _months_back(today, count):
+    year, month = today.year, today.month
+    for _ in range(count):
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+        yield f"{year}{month:02d}"
+
+
+class Command(BaseCommand):
+    """
+    서울시 지하철 호선별 역별 시간대별 승하차 인원(CardSubwayTime)을 RidershipHourly에 적재합니다.
+    역·월마다 한 행이며, 24개 시간대 × 승차/하차 값은 uint32 배열 하나(counts)로 묶어 저장합니다.
+    """
+
+    help = '서울시 시간대별 승하차 인원(월 단위)을 역별 패킹 배열로 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=str, default=None, help='적재할 월 (YYYYMM 형식, 여러 번 지정 가능)', action='append')
+
+    def handle(self, *args, **options):
+        from main.seoul_api import CircuitOpenError, SeoulApiError, get_client
+
+        months = options['month'] or list(_months_back(timezone.localdate(), MONTHS_TO_CHECK))
+        for month in months:
+            if len(month) != 6 or not month.isdigit():
+                raise CommandError("월 형식이 잘못되었습니다. YYYYMM 형식으로 입력하세요.")
+
+        # 노선·역명 별칭은 실행 시작 시 DB에서 한 번 컴파일 (관리자 화면에서 수정)
+        load_rules()
+        station_codes = StationCodeMap.from_db()
+        std_names = {
+            (raw, line): std
+            for raw, line, std in StationDict.objects.values_list('station_name_raw', 'line_code', 'station_name_std')
+        }
+
+        client = get_client()
+        loaded_any = False
+        for month in months:
+            self.stdout.write(self.style.NOTICE(f'API 데이터 다운로드 시도: {month}'))
+            try:
+                # 첫 페이지로 전체 건수를 확인한 뒤 나머지 페이지는 동시에 요청
+                rows = client.fetch_pages(SERVICE, month)
+            except CircuitOpenError as e:
+                raise CommandError(f'🚨 API 호출 중단 ({month}): {e}')
+            except SeoulApiError as e:
+                self.stdout.write(self.style.ERROR(f'API 호출 실패 ({month}): {e}'))
+                continue
+            if not rows:
+                self.stdout.write(self.style.WARNING('데이터 없음. 다음 월 시도.'))
+                continue
+
+            saved, skipped = self._store(month, rows, station_codes, std_names)
+            self.stdout.write(self.style.SUCCESS(f'✅ RidershipHourly 적재 완료 ({month}): {saved}개 역, {skipped}개 건너뜀'))
+            loaded_any = True
+            if not options['month']:
+                break
+
+        for line in client.report_lines(SERVICE):
+            self.stdout.write(line)
+        if not loaded_any:
+            raise CommandError('🚨 시간대별 승하차 데이터 동기화에 실패했습니다. API 상태를 확인하세요.')
+
+    @transaction.atomic
+    def _store(self, month, rows, station_codes, std_names):
+        import numpy as np
+        import pandas as pd
+
+        from main.hourly import HOURS, pack_counts
+        from main.validation import BatchValidator
+
+        month_date = date(int(month[:4]), int(month[4:]), 1)
+        days = calendar.monthrange(month_date.year, month_date.month)[1]
+
+        # 시간대 값은 'inf', '1e30', '-3' 같은 값도 들어올 수 있으므로 다른 적재 경로와 같은 일괄 검증을 거칩니다.
+        on_columns = [f'HR_{hour}_GET_ON_NOPE' for hour in range(HOURS)]
+        off_columns = [f'HR_{hour}_GET_OFF_NOPE' for hour in range(HOURS)]
+        frame = pd.DataFrame(rows)
+        validator = BatchValidator(frame).require('STTN', 'SBWY_ROUT_LN_NM')
+        for column in on_columns + off_columns:
+            validator.integers(column)
+        valid, invalid = validator.split()
+        boardings = np.column_stack([validator.parsed[column] for column in on_columns])
+        alightings = np.column_stack([validator.parsed[column] for column in off_columns])
+
+        parsed = {}
+        for i in valid:
+            raw_name = validator.frame.at[i, 'STTN']
+            line_code = normalize_line_code(validator.frame.at[i, 'SBWY_ROUT_LN_NM'])
+            station_std = std_names.get((raw_name, line_code)) or normalize_station_name(raw_name)
+            parsed[(line_code, station_std)] = (boardings[i], alightings[i])
+        skipped = len(invalid)
+
+        # StationDict에 아직 없는 역(신규 역 등)도 차원에 추가해 버리지 않습니다.
+        station_codes.ensure(parsed)
+        records = [
+            RidershipHourly(
+                date=month_date,
+                station_id=station_codes.get(line_code, station_std),
+                days=days,
+                counts=pack_counts(boardings, alightings),
+            )
+            for (line_code, station_std), (boardings, alightings) in parsed.items()
+        ]
+        RidershipHourly.objects.bulk_create(
+            records,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['station', 'date'],
+            update_fields=['days', 'counts'],
+        )
+        return len(records), skipped
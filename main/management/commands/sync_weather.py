@@ -1,7 +1,3 @@
-import pandas as pd
-import requests_cache
-from retry_requests import retry
-import openmeteo_requests
 from datetime import datetime
 
 from django.core.management.base import BaseCommand
@@ -11,6 +7,12 @@ class Command(BaseCommand):
     help = "Sync past weather data for Seoul using Open-Meteo kma_seamless model"
 
     def handle(self, *args, **options):
+        # pandas / HTTP 클라이언트는 실행 시점에만 로드 (manage.py 기동 시간 단축)
+        import openmeteo_requests
+        import pandas as pd
+        import requests_cache
+        from retry_requests import retry
+
         # Setup Open-Meteo API client with cache and retry
         cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
         retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
@@ -93,4 +95,10 @@ class Command(BaseCommand):
                 updated_count += 1
 
         self.stdout.write(self.style.SUCCESS(f"\nSuccessfully synced {len(df)} days of weather data for Seoul"))
-        self.stdout.write(self.style.SUCCESS(f"Created: {created_count}, Updated: {updated_count}"))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f"Created: {created_count}, Updated: {updated_count}"))
+
+        # Rebuild the columnar ridership/weather snapshot used by analytics
+        from main.snapshot import build_snapshot
+
+        version_dir = build_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"Columnar snapshot updated: {version_dir.name}"))
\ No newline at end of file
@@ -0,0 +1,377 @@
+# pickuplog/main/matching.py ("내 물건 찾기" 유사도 매칭)
+
+import heapq
+import math
+import os
+import pickle
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from main.models import LostItem
+from main.normalize import normalize_line_code, station_match_key
+from main.stations import StationIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: 색인 쓰기는 프로세스 안에서만 직렬화됩니다.
+    fcntl = None
+
+INDEX_FILENAME = 'search_index.pkl'
+
+# 점수 = 텍스트(TF-IDF) + 장소(역/노선 근접도) + 날짜 근접도 가중합
+TEXT_WEIGHT = 0.6
+PLACE_WEIGHT = 0.25
+DATE_WEIGHT = 0.15
+# 날짜 점수가 절반이 되는 일수
+DATE_HALF_LIFE = 3.0
+# 문서 빈도가 이 비율을 넘는 n-gram은 다른 조건이 있을 때 후보 수집에서 제외 (불용어 취급)
+COMMON_TERM_RATIO = 0.2
+MAX_RESULTS = 50
+
+WEEKDAYS = {
+    '월요일': 0, '화요일': 1, '수요일': 2, '목요일': 3, '금요일': 4, '토요일': 5, '일요일': 6,
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6,
+}
+_LINE_PATTERN = re.compile(r'(?:line\s*(\d+)|(\d+)\s*호선)', re.IGNORECASE)
+_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def index_path():
+    return settings.ANALYTICS_DIR / INDEX_FILENAME
+
+
+def terms(text):
+    """공백 단위 토큰 + 토큰별 문자 bigram (한글은 띄어쓰기가 제각각이라 bigram으로 부분 일치를 잡습니다)"""
+    result = []
+    for token in _TOKEN_PATTERN.findall((text or '').lower()):
+        result.append(token)
+        if len(token) > 2:
+            result.extend(token[i:i + 2] for i in range(len(token) - 1))
+    return result
+
+
+def _term_counts(text):
+    counts = {}
+    for term in terms(text):
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def _parse_date(token):
+    """'YYYY-MM-DD' → date (2024-13-45처럼 없는 날짜면 None → 텍스트 조건으로 남김)"""
+    try:
+        return datetime.strptime(token, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+class SearchIndex:
+    """
+    분실물 텍스트 n-gram 역색인 (term → {pk: tf})과 문서 메타 (pk → (노선, 역 키, 등록일 서수)).
+    장소만으로 찾는 질의를 위해 역 키 → {pk}, 노선 코드 → {pk} 역색인도 함께 유지합니다.
+    IDF는 조회 시점의 문서 빈도로 계산하므로 증분 추가/삭제 후 다시 계산할 필요가 없습니다.
+    """
+
+    # 저장 구조가 바뀌면 올립니다. 다른 버전의 색인 파일은 load()가 무시해 전체 재구축으로 이어집니다.
+    FORMAT = 2
+
+    def __init__(self):
+        self.format = self.FORMAT
+        self.postings = {}
+        self.docs = {}
+        self.station_postings = {}
+        self.line_postings = {}
+        self.station_index = StationIndex()
+
+    def __len__(self):
+        return len(self.docs)
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def remove(self, pk):
+        doc = self.docs.pop(pk, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(pk, None)
+                if not posting:
+                    del self.postings[term]
+        for postings, key in ((self.station_postings, doc['station']), (self.line_postings, doc['line'])):
+            if key:
+                postings[key].discard(pk)
+                if not postings[key]:
+                    del postings[key]
+
+    def add(self, pk, category, item_name, description, line, station, registered_at):
+        self.remove(pk)
+        counts = _term_counts(f"{category or ''} {item_name or ''} {description or ''}")
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[pk] = tf
+        self.docs[pk] = {
+            'terms': tuple(counts),
+            'line': line or '',
+            'station': station_match_key(station) if station else '',
+            'day': timezone.localdate(registered_at).toordinal() if registered_at else None,
+        }
+        doc = self.docs[pk]
+        if doc['station']:
+            self.station_postings.setdefault(doc['station'], set()).add(pk)
+        if doc['line']:
+            self.line_postings.setdefault(doc['line'], set()).add(pk)
+
+    def add_items(self, item_pks):
+        rows = LostItem.objects.filter(pk__in=item_pks).values_list(
+            'pk', 'category', 'item_name', 'description', 'line', 'station', 'registered_at'
+        )
+        for row in rows.iterator(chunk_size=5000):
+            self.add(*row)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def parse_query(self, text):
+        """
+        자유 문장에서 노선 / 역 / 요일 / 날짜 조건을 떼어내고 나머지를 텍스트 조건으로 돌려줍니다.
+        예) '검정 우산 2호선 화요일' → 텍스트 '검정 우산', 노선 LINE2, 요일 1
+        """
+        query = {'text': text or '', 'line': None, 'station': None, 'weekday': None, 'date': None}
+        rest = []
+        for token in (text or '').replace(',', ' ').split():
+            lower = token.lower()
+            line_match = _LINE_PATTERN.fullmatch(lower)
+            if line_match:
+                query['line'] = f"LINE{line_match.group(1) or line_match.group(2)}"
+            elif lower in WEEKDAYS:
+                query['weekday'] = WEEKDAYS[lower]
+            elif _DATE_PATTERN.fullmatch(token) and (day := _parse_date(token)):
+                query['date'] = day
+            elif token in self.station_index and len(station_match_key(token)) > 1:
+                query['station'] = token
+            else:
+                rest.append(token)
+        # 'line 2' 처럼 띄어 쓴 노선 표기
+        if query['line'] is None:
+            line_match = _LINE_PATTERN.search(' '.join(rest))
+            if line_match:
+                query['line'] = f"LINE{line_match.group(1) or line_match.group(2)}"
+                rest = _LINE_PATTERN.sub(' ', ' '.join(rest)).split()
+        query['text'] = ' '.join(rest)
+        return query
+
+    def _place_score(self, doc, station_key, station_lines, line):
+        if station_key and doc['station'] == station_key:
+            return 1.0
+        # 환승역은 노선이 비어 있을 수 있으므로 역의 노선 목록(StationDict)으로 비교
+        doc_lines = {doc['line']} if doc['line'] else {c[0] for c in self.station_index.candidates(doc['station'])}
+        if station_lines and doc_lines & station_lines:
+            return 0.5
+        if line and line in doc_lines:
+            return 0.7 if not station_key else 0.5
+        return 0.0
+
+    def _place_candidates(self, station_key, lines):
+        """
+        장소 점수가 0보다 클 수 있는 문서만 역/노선 역색인에서 모읍니다. (전체 문서를 훑지 않음)
+        노선이 비어 있는 문서는 그 노선에 속한 역의 문서로 찾습니다.
+        """
+        pks = set(self.station_postings.get(station_key, ())) if station_key else set()
+        for line in lines:
+            pks.update(self.line_postings.get(line, ()))
+            for key in self.station_index.keys_on_line(line):
+                pks.update(self.station_postings.get(key, ()))
+        return pks
+
+    def _date_score(self, doc, day, weekday):
+        if doc['day'] is None:
+            return 0.0
+        if day is not None:
+            return 0.5 ** (abs(doc['day'] - day) / DATE_HALF_LIFE)
+        if weekday is not None:
+            # date.toordinal(): 0001-01-01(월요일) = 1
+            return 1.0 if (doc['day'] - 1) % 7 == weekday else 0.0
+        return 0.0
+
+    def search(self, text='', line=None, station=None, date=None, weekday=None, k=10):
+        """
+        텍스트는 역색인으로 후보를 모은 뒤(희귀 n-gram 우선), 후보만 점수를 매겨 상위 k개를 힙으로 고릅니다.
+        텍스트가 없으면 노선/역 조건에 맞는 문서만 후보로 삼습니다.
+        반환: ([{'pk', 'score', 'text_score', 'place_score', 'date_score'}, ...], 해석한 조건)
+        """
+        query = self.parse_query(text)
+        line = normalize_line_code(line) if line else query['line']
+        station = station or query['station']
+        date = date or query['date']
+        weekday = weekday if weekday is not None else query['weekday']
+
+        station_key = station_match_key(station) if station else ''
+        station_lines = {c[0] for c in self.station_index.candidates(station)} if station else set()
+        day = date.toordinal() if date else None
+        parsed = {'text': query['text'], 'line': line, 'station': station, 'date': date, 'weekday': weekday}
+
+        n_docs = len(self.docs) or 1
+        query_terms = _term_counts(query['text'])
+        weights = {
+            term: tf * math.log(1 + n_docs / len(self.postings[term]))
+            for term, tf in query_terms.items() if term in self.postings
+        }
+        query_norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+        # 1. 후보 수집 (문서 빈도 오름차순, 흔한 n-gram은 다른 n-gram이 있으면 건너뜀)
+        text_scores = {}
+        ordered = sorted(weights, key=lambda term: len(self.postings[term]))
+        for i, term in enumerate(ordered):
+            posting = self.postings[term]
+            if i > 0 and len(posting) > n_docs * COMMON_TERM_RATIO:
+                # 흔한 n-gram은 이미 모인 후보의 점수에만 더합니다.
+                for pk in text_scores:
+                    if pk in posting:
+                        text_scores[pk] += weights[term] * posting[pk]
+                continue
+            for pk, tf in posting.items():
+                text_scores[pk] = text_scores.get(pk, 0.0) + weights[term] * tf
+
+        if weights:
+            candidates = text_scores
+        elif station_key or line:
+            candidates = {
+                pk: 0.0 for pk in self._place_candidates(station_key, station_lines | ({line} if line else set()))
+                if self._place_score(self.docs[pk], station_key, station_lines, line) > 0
+            }
+        else:
+            return [], {**parsed, 'candidates': 0}
+
+        # 2. 후보 점수 계산 + 상위 k개 힙 선택
+        def scored():
+            for pk, raw in candidates.items():
+                doc = self.docs[pk]
+                # 문서 길이 정규화 (서로 다른 n-gram 수 기준)
+                doc_norm = math.sqrt(len(doc['terms'])) or 1.0
+                text_score = min(raw / (query_norm * doc_norm), 1.0) if weights else 0.0
+                place_score = self._place_score(doc, station_key, station_lines, line) if (station_key or line) else 0.0
+                date_score = self._date_score(doc, day, weekday)
+                total = TEXT_WEIGHT * text_score + PLACE_WEIGHT * place_score + DATE_WEIGHT * date_score
+                yield total, pk, text_score, place_score, date_score
+
+        top = heapq.nlargest(min(k, MAX_RESULTS), scored())
+        return [
+            {
+                'pk': pk,
+                'score': round(total, 4),
+                'text_score': round(text_score, 4),
+                'place_score': round(place_score, 4),
+                'date_score': round(date_score, 4),
+            }
+            for total, pk, text_score, place_score, date_score in top
+        ], {**parsed, 'candidates': len(candidates)}
+
+    # ------------------------------------------------------------------
+    # 저장 / 불러오기
+    # ------------------------------------------------------------------
+    def save(self, path=None):
+        path = path or index_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 임시 파일 이름을 매번 새로 만들어, 동시에 저장하는 쪽과 같은 파일에 쓰지 않게 합니다.
+        tmp_path = path.with_name(f'{path.name}.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or index_path()
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            index = pickle.load(f)
+        return index if getattr(index, 'format', None) == cls.FORMAT else None
+
+
+# ----------------------------------------------------------------------
+# 적재 시점 증분 갱신 / 전체 재구축
+# ----------------------------------------------------------------------
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def _index_write_lock():
+    """
+    색인 파일 읽기-수정-저장 구간을 직렬화합니다.
+    같은 프로세스의 스레드는 _write_lock으로, 다른 워커 / 관리 명령 프로세스는 색인 옆 .lock 파일의 flock으로 막습니다.
+    """
+    lock_path = index_path().with_suffix('.lock')
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with _write_lock, open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def update_search_index(item_pks):
+    """새로 적재/갱신된 분실물 배치만 역색인에 반영합니다. (색인 파일이 없으면 전체 재구축)"""
+    item_pks = list(item_pks)
+    with _index_write_lock():
+        index = SearchIndex.load()
+        if index is None:
+            return len(_rebuild())
+        index.station_index = StationIndex.from_db()
+        index.add_items(item_pks)
+        index.save()
+    return len(item_pks)
+
+
+def remove_from_search_index(item_pks):
+    """삭제 / 아카이브로 옮긴 분실물을 역색인에서 뺍니다."""
+    with _index_write_lock():
+        index = SearchIndex.load()
+        if index is None:
+            return 0
+        for pk in item_pks:
+            index.remove(pk)
+        index.save()
+    return len(item_pks)
+
+
+def rebuild_search_index():
+    with _index_write_lock():
+        return _rebuild()
+
+
+def _rebuild():
+    index = SearchIndex()
+    index.station_index = StationIndex.from_db()
+    index.add_items(LostItem.objects.values_list('pk', flat=True))
+    index.save()
+    return index
+
+
+_cache_lock = threading.Lock()
+_cached = {'mtime': None, 'index': None}
+
+
+def get_search_index():
+    """메모리에 올린 SearchIndex를 반환합니다. 색인 파일이 없으면 None."""
+    path = index_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _cached['mtime'] != mtime:
+        with _cache_lock:
+            if _cached['mtime'] != mtime:
+                _cached['index'] = SearchIndex.load(path)
+                _cached['mtime'] = mtime
+    return _cached['index']
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_alter_weatherdaily_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='시작 시각')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시각')),
+                ('status', models.CharField(choices=[('running', '실행 중'), ('success', '성공'), ('failed', '실패')], default='running', max_length=10, verbose_name='상태')),
+                ('stages', models.JSONField(default=dict, verbose_name='단계별 실행 결과')),
+                ('resumed_from', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='main.pipelinerun', verbose_name='재개한 실행')),
+            ],
+            options={
+                'verbose_name': '4. 파이프라인 실행 기록 (PipelineRun)',
+                'verbose_name_plural': '4. 파이프라인 실행 기록 (PipelineRuns)',
+                'ordering': ('-started_at',),
+            },
+        ),
+    ]
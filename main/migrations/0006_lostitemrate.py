@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_pipelinerun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LostItemRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('line_code', models.CharField(max_length=20, verbose_name='표준 노선 코드')),
+                ('station_name_std', models.CharField(max_length=100, verbose_name='표준 역명')),
+                ('category', models.CharField(max_length=50, verbose_name='분실물 카테고리')),
+                ('lost_count', models.IntegerField(verbose_name='분실물 수')),
+                ('ridership', models.IntegerField(default=0, verbose_name='승하차 인원 (승차+하차)')),
+                ('rate_per_10k', models.FloatField(blank=True, help_text='승하차 데이터가 없으면 비어 있음', null=True, verbose_name='1만 명당 분실물 수')),
+            ],
+            options={
+                'verbose_name': '5-1. 분실률 지표 (LostItemRate)',
+                'verbose_name_plural': '5-1. 분실률 지표 (LostItemRates)',
+                'indexes': [models.Index(fields=['line_code', 'date'], name='lostrate_line_date_idx')],
+                'unique_together': {('date', 'line_code', 'station_name_std', 'category')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LostItemRateDirtyDate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True, verbose_name='다시 계산할 날짜')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='표시 시각')),
+            ],
+            options={
+                'verbose_name': '5-2. 분실률 재계산 대상 날짜 (LostItemRateDirtyDate)',
+                'verbose_name_plural': '5-2. 분실률 재계산 대상 날짜 (LostItemRateDirtyDates)',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_lostitemrate'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='lostitem',
+            name='line',
+            field=models.CharField(blank=True, db_index=True, help_text='표준 노선 코드 (StationDict 기준, 환승역은 비어 있을 수 있음)', max_length=50, null=True, verbose_name='노선명'),
+        ),
+        migrations.AlterField(
+            model_name='lostitem',
+            name='station',
+            field=models.CharField(blank=True, db_index=True, help_text='표준 역명 (StationDict 기준)', max_length=100, null=True, verbose_name='발견역'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_lostitem_station_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LostForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='예측 날짜')),
+                ('line_code', models.CharField(max_length=20, verbose_name='표준 노선 코드')),
+                ('category', models.CharField(max_length=50, verbose_name='분실물 카테고리')),
+                ('rain_mm', models.FloatField(default=0.0, verbose_name='예보 강수량 (mm)')),
+                ('avg_temp', models.FloatField(blank=True, null=True, verbose_name='예보 평균 기온 (C)')),
+                ('predicted_rate', models.FloatField(help_text='예보 날씨 기준', verbose_name='예측 분실률 (1만 명당)')),
+                ('dry_rate', models.FloatField(verbose_name='비가 오지 않을 때 예측 분실률')),
+                ('rainy_rate', models.FloatField(help_text='과거 비 온 날 평균 강수량 기준', verbose_name='비가 올 때 예측 분실률')),
+                ('training_days', models.IntegerField(default=0, verbose_name='학습 일수')),
+                ('created_at', models.DateTimeField(auto_now=True, verbose_name='계산 시각')),
+            ],
+            options={
+                'verbose_name': '5-2. 분실 예보 (LostForecast)',
+                'verbose_name_plural': '5-2. 분실 예보 (LostForecasts)',
+                'unique_together': {('date', 'line_code', 'category')},
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_lostforecast'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LostItemSignature',
+            fields=[
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='main.lostitem', verbose_name='분실물')),
+                ('signature', models.BinaryField(verbose_name='MinHash 서명')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='색인 시각')),
+            ],
+            options={
+                'verbose_name': '6-1. 분실물 MinHash 서명',
+                'verbose_name_plural': '6-1. 분실물 MinHash 서명',
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '검토 대기'), ('confirmed', '중복 확정'), ('dismissed', '중복 아님')], db_index=True, default='pending', max_length=20, verbose_name='검토 상태')),
+                ('similarity', models.FloatField(default=0.0, help_text='MinHash로 추정한 Jaccard 유사도', verbose_name='최대 추정 유사도')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+                ('items', models.ManyToManyField(related_name='duplicate_clusters', to='main.lostitem', verbose_name='분실물')),
+            ],
+            options={
+                'verbose_name': '6-3. 중복 의심 묶음 (DuplicateCluster)',
+                'verbose_name_plural': '6-3. 중복 의심 묶음 (DuplicateClusters)',
+            },
+        ),
+        migrations.CreateModel(
+            name='LostItemBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True, verbose_name='밴드 버킷 키')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='main.lostitem', verbose_name='분실물')),
+            ],
+            options={
+                'verbose_name': '6-2. LSH 버킷',
+                'verbose_name_plural': '6-2. LSH 버킷',
+            },
+        ),
+    ]
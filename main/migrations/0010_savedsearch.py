@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_lostitem_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact', models.CharField(help_text='이메일 또는 전화번호', max_length=200, verbose_name='알림 받을 연락처')),
+                ('category', models.CharField(blank=True, max_length=50, null=True, verbose_name='분실물 카테고리')),
+                ('line', models.CharField(blank=True, help_text='LINE1, LINE2 등', max_length=20, null=True, verbose_name='표준 노선 코드')),
+                ('station', models.CharField(blank=True, max_length=100, null=True, verbose_name='역명')),
+                ('keywords', models.CharField(blank=True, default='', help_text='공백으로 구분 (예: 검정 장우산)', max_length=200, verbose_name='키워드')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='사용 여부')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록 시각')),
+            ],
+            options={
+                'verbose_name': '7-1. 저장된 검색 (SavedSearch)',
+                'verbose_name_plural': '7-1. 저장된 검색 (SavedSearches)',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_sent', models.BooleanField(db_index=True, default=False, verbose_name='발송 여부')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_notifications', to='main.lostitem', verbose_name='분실물')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='main.savedsearch', verbose_name='저장된 검색')),
+            ],
+            options={
+                'verbose_name': '7-2. 검색 알림 (SearchNotification)',
+                'verbose_name_plural': '7-2. 검색 알림 (SearchNotifications)',
+                'unique_together': {('saved_search', 'item')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_savedsearch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Station',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('line_code', models.CharField(max_length=20, verbose_name='표준 노선 코드')),
+                ('station_name_std', models.CharField(max_length=100, verbose_name='표준 역명')),
+                ('is_transfer', models.BooleanField(default=False, verbose_name='환승역 여부')),
+            ],
+            options={
+                'verbose_name': '2-3. 역 차원 (Station)',
+                'verbose_name_plural': '2-3. 역 차원 (Stations)',
+                'unique_together': {('line_code', 'station_name_std')},
+            },
+        ),
+        migrations.AddField(
+            model_name='lostitemrate',
+            name='station',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lost_rates', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+        migrations.AddField(
+            model_name='rainimpactreport',
+            name='station',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rain_impact', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+        migrations.AddField(
+            model_name='ridershipdaily',
+            name='station',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='ridership', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# pickuplog/main/migrations/0012_backfill_station_keys.py (역 차원 키 채우기 - 사실 테이블 문자열 컬럼 제거 전)
+
+from django.db import migrations
+
+CHUNK_SIZE = 5000
+FACT_MODELS = ('RidershipDaily', 'RainImpactReport', 'LostItemRate')
+
+
+def _station_codes(Station, StationDict, facts):
+    """StationDict + 사실 테이블에 등장하는 (노선, 역) 쌍이 모두 Station에 있도록 만들고 코드 사전을 반환합니다."""
+    pairs = set(StationDict.objects.values_list('line_code', 'station_name_std').distinct())
+    for model in facts:
+        pairs |= set(model.objects.filter(station__isnull=True).values_list('line_code', 'station_name_std').distinct())
+    transfer = set(StationDict.objects.filter(is_transfer=True).values_list('line_code', 'station_name_std'))
+
+    Station.objects.bulk_create(
+        [Station(line_code=line, station_name_std=name, is_transfer=(line, name) in transfer) for line, name in sorted(pairs)],
+        ignore_conflicts=True,
+    )
+    return {(line, name): pk for line, name, pk in Station.objects.values_list('line_code', 'station_name_std', 'id')}
+
+
+def _backfill(model, codes):
+    """pk 순서로 CHUNK_SIZE씩 읽어 station_id를 채웁니다. (atomic=False라 청크마다 커밋되어 중단 후 재실행 가능)"""
+    last_pk = 0
+    while True:
+        chunk = list(
+            model.objects.filter(pk__gt=last_pk, station__isnull=True)
+            .order_by('pk')
+            .only('pk', 'line_code', 'station_name_std')[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        for row in chunk:
+            row.station_id = codes[(row.line_code, row.station_name_std)]
+        model.objects.bulk_update(chunk, ['station'], batch_size=1000)
+
+
+def forwards(apps, schema_editor):
+    Station = apps.get_model('main', 'Station')
+    StationDict = apps.get_model('main', 'StationDict')
+    facts = [apps.get_model('main', name) for name in FACT_MODELS]
+
+    codes = _station_codes(Station, StationDict, facts)
+    for model in facts:
+        _backfill(model, codes)
+
+
+def backwards(apps, schema_editor):
+    # 문자열 컬럼은 0013을 되돌릴 때 Station에서 다시 채워져 있으므로 이 마이그레이션에서 추가한 키만 비웁니다.
+    for name in FACT_MODELS:
+        apps.get_model('main', name).objects.update(station=None)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('main', '0011_station_dimension'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
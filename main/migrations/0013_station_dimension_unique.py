@@ -0,0 +1,120 @@
+# pickuplog/main/migrations/0013_station_dimension_unique.py (사실 테이블 문자열 역 컬럼 제거)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FACT_MODELS = ('RidershipDaily', 'RainImpactReport', 'LostItemRate')
+
+
+def restore_station_strings(apps, schema_editor):
+    """되돌리기 전용: 다시 만든 노선 코드 / 표준 역명 컬럼을 Station 차원에서 채웁니다."""
+    Station = apps.get_model('main', 'Station')
+    for line_code, station_name_std, pk in Station.objects.values_list('line_code', 'station_name_std', 'id'):
+        for name in FACT_MODELS:
+            apps.get_model('main', name).objects.filter(station_id=pk).update(
+                line_code=line_code, station_name_std=station_name_std,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0012_backfill_station_keys'),
+    ]
+
+    operations = [
+        # 문자열 복합 유일 인덱스를 정수 키 인덱스로 교체
+        migrations.AlterUniqueTogether(
+            name='rainimpactreport',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ridershipdaily',
+            unique_together={('station', 'date')},
+        ),
+        # 0012에서 채운 정수 키만 남기고 행마다 반복되던 노선 코드 / 표준 역명 문자열 컬럼을 제거합니다.
+        # (station이 NULL인 행은 (station, date) 유일성 검사를 빠져나가므로 NOT NULL로 바꿈)
+        # 되돌릴 때는 역순으로 문자열 컬럼을 NULL 허용으로 다시 만들고, Station에서 채운 뒤 NOT NULL로 돌립니다.
+        migrations.AlterField(
+            model_name='ridershipdaily',
+            name='line_code',
+            field=models.CharField(max_length=20, null=True, verbose_name='표준 노선 코드'),
+        ),
+        migrations.AlterField(
+            model_name='ridershipdaily',
+            name='station_name_std',
+            field=models.CharField(max_length=100, null=True, verbose_name='표준 역명'),
+        ),
+        migrations.AlterField(
+            model_name='rainimpactreport',
+            name='line_code',
+            field=models.CharField(max_length=10, null=True, verbose_name='노선 코드'),
+        ),
+        migrations.AlterField(
+            model_name='rainimpactreport',
+            name='station_name_std',
+            field=models.CharField(db_index=True, max_length=50, null=True, verbose_name='표준 역명'),
+        ),
+        migrations.AlterField(
+            model_name='lostitemrate',
+            name='line_code',
+            field=models.CharField(max_length=20, null=True, verbose_name='표준 노선 코드'),
+        ),
+        migrations.AlterField(
+            model_name='lostitemrate',
+            name='station_name_std',
+            field=models.CharField(max_length=100, null=True, verbose_name='표준 역명'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_station_strings),
+        migrations.RemoveIndex(
+            model_name='lostitemrate',
+            name='lostrate_line_date_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='lostitemrate',
+            unique_together={('station', 'date', 'category')},
+        ),
+        migrations.RemoveField(
+            model_name='rainimpactreport',
+            name='line_code',
+        ),
+        migrations.RemoveField(
+            model_name='rainimpactreport',
+            name='station_name_std',
+        ),
+        migrations.RemoveField(
+            model_name='ridershipdaily',
+            name='line_code',
+        ),
+        migrations.RemoveField(
+            model_name='ridershipdaily',
+            name='station_name_std',
+        ),
+        migrations.AlterField(
+            model_name='lostitemrate',
+            name='station',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lost_rates', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+        migrations.AlterField(
+            model_name='rainimpactreport',
+            name='station',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='rain_impact', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+        migrations.AlterField(
+            model_name='ridershipdaily',
+            name='station',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ridership', to='main.station', verbose_name='역 (차원 키)'),
+        ),
+        migrations.AddIndex(
+            model_name='lostitemrate',
+            index=models.Index(fields=['date', 'category'], name='lostrate_date_category_idx'),
+        ),
+        migrations.RemoveField(
+            model_name='lostitemrate',
+            name='line_code',
+        ),
+        migrations.RemoveField(
+            model_name='lostitemrate',
+            name='station_name_std',
+        ),
+    ]
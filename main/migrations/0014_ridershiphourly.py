@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_station_dimension_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RidershipHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜 (월 단위 자료는 1일)')),
+                ('days', models.SmallIntegerField(default=1, verbose_name='합산 일수')),
+                ('counts', models.BinaryField(help_text='little-endian uint32 × 48 (승차 0~23시, 하차 0~23시)', verbose_name='시간대별 인원')),
+                ('station', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='hourly_ridership', to='main.station', verbose_name='역 (차원 키)')),
+            ],
+            options={
+                'verbose_name': '2-4. 시간대별 승하차 인원 (RidershipHourly)',
+                'verbose_name_plural': '2-4. 시간대별 승하차 인원 (RidershipHourlies)',
+                'unique_together': {('station', 'date')},
+            },
+        ),
+    ]
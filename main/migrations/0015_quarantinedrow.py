@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0014_ridershiphourly'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuarantinedRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('lostitem_csv', '분실물 CSV 업로드'), ('sync_lostitem', '분실물 API 동기화'), ('sync_ridership', '승하차 API 동기화')], db_index=True, max_length=30, verbose_name='적재 경로')),
+                ('batch_id', models.CharField(db_index=True, max_length=64, verbose_name='배치 ID')),
+                ('row_number', models.IntegerField(blank=True, null=True, verbose_name='원천 행 번호')),
+                ('raw', models.JSONField(verbose_name='원천 값')),
+                ('reasons', models.JSONField(default=list, verbose_name='검증 실패 사유')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='격리 시각')),
+            ],
+            options={
+                'verbose_name': '8. 검증 실패 행 (QuarantinedRow)',
+                'verbose_name_plural': '8. 검증 실패 행 (QuarantinedRows)',
+            },
+        ),
+    ]
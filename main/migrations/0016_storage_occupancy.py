@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:20
+
+from bisect import bisect_right
+
+from django.db import migrations, models
+
+# main.occupancy.PICKUP_BUCKETS (마이그레이션 시점 값 고정)
+PICKUP_BUCKETS = [0, 1, 2, 3, 7, 14, 30, 60, 90]
+
+
+def fill_counters(apps, schema_editor):
+    """기존 분실물로 카운터 초기값을 채웁니다. (이후에는 적재/수정 시점 증분 반영)"""
+    LostItem = apps.get_model('main', 'LostItem')
+    StorageOccupancy = apps.get_model('main', 'StorageOccupancy')
+    PickupTimeHistogram = apps.get_model('main', 'PickupTimeHistogram')
+
+    locations, histogram = {}, {}
+    rows = LostItem.objects.values_list('storage_location', 'category', 'is_received', 'registered_at', 'received_at')
+    for location, category, is_received, registered_at, received_at in rows.iterator(chunk_size=5000):
+        counts = locations.setdefault(location or '', [0, 0, 0, 0])
+        counts[1 if is_received else 0] += 1
+        if is_received and registered_at and received_at:
+            days = max((received_at - registered_at).days, 0)
+            counts[2] += 1
+            counts[3] += days
+            key = (category or '미분류', bisect_right(PICKUP_BUCKETS, days) - 1)
+            histogram[key] = histogram.get(key, 0) + 1
+
+    StorageOccupancy.objects.bulk_create([
+        StorageOccupancy(storage_location=location, held=held, received=received,
+                         pickup_samples=samples, pickup_days_total=days)
+        for location, (held, received, samples, days) in locations.items()
+    ], batch_size=1000)
+    PickupTimeHistogram.objects.bulk_create([
+        PickupTimeHistogram(category=category, bucket=bucket, count=count)
+        for (category, bucket), count in histogram.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_quarantinedrow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('storage_location', models.CharField(max_length=200, unique=True, verbose_name='보관 위치')),
+                ('held', models.IntegerField(default=0, verbose_name='보관 중 (미수령)')),
+                ('received', models.IntegerField(default=0, verbose_name='수령 완료')),
+                ('pickup_samples', models.IntegerField(default=0, help_text='등록일·수령일이 모두 있는 수령 건', verbose_name='수령 소요 일수 표본 수')),
+                ('pickup_days_total', models.BigIntegerField(default=0, verbose_name='수령 소요 일수 합계')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+            ],
+            options={
+                'verbose_name': '9-1. 보관 장소별 재고 (StorageOccupancy)',
+                'verbose_name_plural': '9-1. 보관 장소별 재고 (StorageOccupancies)',
+            },
+        ),
+        migrations.CreateModel(
+            name='PickupTimeHistogram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50, verbose_name='분실물 카테고리')),
+                ('bucket', models.SmallIntegerField(verbose_name='소요 일수 구간')),
+                ('count', models.IntegerField(default=0, verbose_name='건수')),
+            ],
+            options={
+                'verbose_name': '9-2. 수령 소요 시간 분포 (PickupTimeHistogram)',
+                'verbose_name_plural': '9-2. 수령 소요 시간 분포 (PickupTimeHistograms)',
+                'unique_together': {('category', 'bucket')},
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
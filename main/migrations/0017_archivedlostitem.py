@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0016_storage_occupancy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLostItem',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='원래 LostItem ID')),
+                ('item_id', models.CharField(max_length=50, unique=True, verbose_name='분실물 ID')),
+                ('transport', models.CharField(blank=True, max_length=20, null=True, verbose_name='교통수단')),
+                ('line', models.CharField(blank=True, max_length=50, null=True, verbose_name='노선명')),
+                ('station', models.CharField(blank=True, max_length=100, null=True, verbose_name='발견역')),
+                ('category', models.CharField(blank=True, max_length=50, null=True, verbose_name='분실물 카테고리')),
+                ('item_name', models.CharField(blank=True, max_length=200, null=True, verbose_name='물품 상세명')),
+                ('status', models.CharField(blank=True, max_length=50, null=True, verbose_name='처리 상태')),
+                ('registered_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='등록일시')),
+                ('received_at', models.DateTimeField(blank=True, null=True, verbose_name='수령일시')),
+                ('storage_location', models.CharField(blank=True, max_length=200, null=True, verbose_name='보관 위치')),
+                ('views', models.IntegerField(default=0, verbose_name='조회수')),
+                ('payload', models.BinaryField(verbose_name='압축 필드 (zlib JSON)')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='아카이브 시각')),
+            ],
+            options={
+                'verbose_name': '1-1. 분실물 아카이브 (ArchivedLostItem)',
+                'verbose_name_plural': '1-1. 분실물 아카이브 (ArchivedLostItems)',
+            },
+        ),
+    ]
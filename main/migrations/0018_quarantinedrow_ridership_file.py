@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0017_archivedlostitem'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quarantinedrow',
+            name='source',
+            field=models.CharField(choices=[('lostitem_csv', '분실물 CSV 업로드'), ('sync_lostitem', '분실물 API 동기화'), ('sync_ridership', '승하차 API 동기화'), ('ridership_file', '승하차 CSV 파일 적재')], db_index=True, max_length=30, verbose_name='적재 경로'),
+        ),
+    ]
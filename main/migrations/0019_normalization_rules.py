@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:11
+
+from django.db import migrations, models
+
+# sync_lostitem에 하드코딩되어 있던 운수사 목록 (마이그레이션 시점 값 고정)
+BUS_OPERATORS = [
+    "중부운수", "대진여객", "원버스", "상진운수", "성원여객", "보성운수",
+    "동성교통", "도선여객", "선진운수", "남성교통", "삼양교통",
+]
+TAXI_OPERATORS = [
+    "삼이택시", "동화통운", "고려운수", "경일운수", "동도자동차", "안전한택시",
+    "양평운수", "대진흥업", "승진통상", "백제운수", "삼익택시", "새한택시",
+    "경서운수", "대하운수", "동성상운",
+]
+
+
+def seed_operators(apps, schema_editor):
+    TransportOperator = apps.get_model('main', 'TransportOperator')
+    TransportOperator.objects.bulk_create(
+        [TransportOperator(name=name, transport='bus') for name in BUS_OPERATORS]
+        + [TransportOperator(name=name, transport='taxi') for name in TAXI_OPERATORS],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0018_quarantinedrow_ridership_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransportOperator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='운수사 / 수령 회사명')),
+                ('transport', models.CharField(choices=[('bus', '버스'), ('taxi', '택시'), ('subway', '지하철'), ('etc', '기타')], db_index=True, max_length=20, verbose_name='교통수단')),
+                ('is_active', models.BooleanField(default=True, verbose_name='사용')),
+            ],
+            options={
+                'verbose_name': '2-6. 운수사 교통수단 (TransportOperator)',
+                'verbose_name_plural': '2-6. 운수사 교통수단 (TransportOperators)',
+            },
+        ),
+        migrations.CreateModel(
+            name='NameAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('line', '노선명 → 표준 노선 코드'), ('station', '역명 → 표준 역명')], db_index=True, max_length=10, verbose_name='종류')),
+                ('alias', models.CharField(help_text='예: 공항철도 1호선 / 정규식이면 전체 일치 패턴', max_length=100, verbose_name='원천 표기')),
+                ('target', models.CharField(help_text='노선은 LINE1 같은 코드, 역은 괄호 없는 표준 역명', max_length=100, verbose_name='표준 값')),
+                ('is_regex', models.BooleanField(default=False, verbose_name='정규식 여부')),
+                ('is_active', models.BooleanField(default=True, verbose_name='사용')),
+            ],
+            options={
+                'verbose_name': '2-5. 노선·역명 별칭 (NameAlias)',
+                'verbose_name_plural': '2-5. 노선·역명 별칭 (NameAliases)',
+                'unique_together': {('kind', 'alias')},
+            },
+        ),
+        migrations.RunPython(seed_operators, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,6 @@
+import re
+
+from django.core.exceptions import ValidationError
 from django.db import models
 
 # ----------------------------------------------------------------------
@@ -11,8 +14,8 @@ class LostItem(models.Model):
     """
     item_id = models.CharField(max_length=50, unique=True, verbose_name="분실물 ID")
     transport = models.CharField(max_length=20, null=True, blank=True, verbose_name="교통수단")
-    line = models.CharField(max_length=50, null=True, blank=True, verbose_name="노선명")
-    station = models.CharField(max_length=100, null=True, blank=True, verbose_name="발견역")
+    line = models.CharField(max_length=50, null=True, blank=True, db_index=True, verbose_name="노선명", help_text="표준 노선 코드 (StationDict 기준, 환승역은 비어 있을 수 있음)")
+    station = models.CharField(max_length=100, null=True, blank=True, db_index=True, verbose_name="발견역", help_text="표준 역명 (StationDict 기준)")
     category = models.CharField(max_length=50, null=True, blank=True, verbose_name="분실물 카테고리")
     item_name = models.CharField(max_length=200, null=True, blank=True, verbose_name="물품 상세명")
     status = models.CharField(max_length=50, null=True, blank=True, verbose_name="처리 상태")
@@ -54,20 +57,58 @@ class StationDict(models.Model):
         return f"[{self.line_code}] {self.station_name_std} (Raw: {self.station_name_raw})"
 
 
-class RidershipDaily(models.Model):
+class Station(models.Model):
+    """
+    (표준 노선 코드, 표준 역명) 차원 테이블. StationDict에서 파생되며(sync_ridership),
+    사실 테이블(RidershipDaily, RainImpactReport, LostItemRate)은 문자열 대신 이 정수 키로만 역을 참조합니다.
+    """
+    id = models.SmallAutoField(primary_key=True)
+    line_code = models.CharField(max_length=20, verbose_name="표준 노선 코드")
+    station_name_std = models.CharField(max_length=100, verbose_name="표준 역명")
+    is_transfer = models.BooleanField(default=False, verbose_name="환승역 여부")
+
+    class Meta:
+        unique_together = ('line_code', 'station_name_std')
+        verbose_name = "2-3. 역 차원 (Station)"
+        verbose_name_plural = "2-3. 역 차원 (Stations)"
+
+    def __str__(self):
+        return f"#{self.pk} [{self.line_code}] {self.station_name_std}"
+
+
+class StationFact(models.Model):
+    """
+    Station 차원 키를 가진 사실 테이블 공통 부분.
+    노선 코드 / 표준 역명은 행마다 두지 않고 Station에서 읽습니다. (목록 조회는 select_related('station'),
+    필터 / 집계는 station__line_code 조회)
+    """
+
+    class Meta:
+        abstract = True
+
+    @property
+    def line_code(self):
+        return self.station.line_code
+
+    @property
+    def station_name_std(self):
+        return self.station.station_name_std
+
+
+class RidershipDaily(StationFact):
     """
     일별, 노선별, 표준역별 승하차 인원 정보 모델.
     OA-12251 서울시 도시철도 승하차 인원정보를 정제하여 저장.
+    유일성과 집계는 정수 키(station, date) 기준입니다.
     """
     date = models.DateField(db_index=True, verbose_name="날짜")
-    line_code = models.CharField(max_length=20, verbose_name="표준 노선 코드")
-    station_name_std = models.CharField(max_length=100, verbose_name="표준 역명")
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='ridership', verbose_name="역 (차원 키)")
     boardings = models.IntegerField(verbose_name="승차 인원 합계")
     alightings = models.IntegerField(verbose_name="하차 인원 합계")
     total = models.IntegerField(verbose_name="총 이용자 수 (승차+하차)")
 
     class Meta:
-        unique_together = ('date', 'line_code', 'station_name_std')
+        unique_together = ('station', 'date')
         verbose_name = "2-2. 일별 승하차 인원 (RidershipDaily)"
         verbose_name_plural = "2-2. 일별 승하차 인원 (RidershipDailies)"
 
@@ -98,12 +139,11 @@ class WeatherDaily(models.Model):
         return f"{self.date} ({self.city_code}): {rain_status}, {self.rain_mm}mm"
 
 
-class RainImpactReport(models.Model):
+class RainImpactReport(StationFact):
     """
     비가 승하차 인원에 미치는 영향 지수(RII)를 저장하는 모델.
     """
-    line_code = models.CharField(max_length=10, verbose_name='노선 코드') 
-    station_name_std = models.CharField(max_length=50, verbose_name='표준 역명', db_index=True)
+    station = models.OneToOneField(Station, on_delete=models.CASCADE, related_name='rain_impact', verbose_name='역 (차원 키)')
     
     # 비 효과 지수 (Rain Impact Index): 100을 기준으로 영향도를 판단
     rain_impact_index = models.FloatField(verbose_name='비 효과 지수')
@@ -113,7 +153,444 @@ class RainImpactReport(models.Model):
     class Meta:
         verbose_name = '비 영향 보고서'
         verbose_name_plural = '비 영향 보고서'
-        unique_together = ('line_code', 'station_name_std') 
 
     def __str__(self):
-        return f"[{self.line_code}] {self.station_name_std}: RII {self.rain_impact_index:.2f}"
\ No newline at end of file
+        return f"[{self.line_code}] {self.station_name_std}: RII {self.rain_impact_index:.2f}"
+
+# ----------------------------------------------------------------------
+# 4. 배치 파이프라인 실행 기록 (run_pipeline)
+# ----------------------------------------------------------------------
+class PipelineRun(models.Model):
+    """
+    run_pipeline 명령 1회 실행 기록.
+    stages에는 단계명별로 {status, started_at, duration, rows, rows_delta, attempts, error}가 저장되며,
+    실패한 실행은 --resume 옵션으로 실패 단계부터 다시 시작할 수 있습니다.
+    """
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCESS = 'success'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_RUNNING, '실행 중'),
+        (STATUS_SUCCESS, '성공'),
+        (STATUS_FAILED, '실패'),
+    )
+
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name='시작 시각')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='종료 시각')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING, verbose_name='상태')
+    stages = models.JSONField(default=dict, verbose_name='단계별 실행 결과')
+    resumed_from = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='resumes', verbose_name='재개한 실행'
+    )
+
+    class Meta:
+        ordering = ('-started_at',)
+        verbose_name = '4. 파이프라인 실행 기록 (PipelineRun)'
+        verbose_name_plural = '4. 파이프라인 실행 기록 (PipelineRuns)'
+
+    def __str__(self):
+        return f"#{self.pk} {self.started_at:%Y-%m-%d %H:%M} ({self.get_status_display()})"
+
+    @property
+    def duration(self):
+        if not self.finished_at:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+# ----------------------------------------------------------------------
+# 5. 분석 지표 (sync_reports가 미리 계산하여 저장)
+# ----------------------------------------------------------------------
+class LostItemRate(StationFact):
+    """
+    (날짜, 노선, 표준역, 카테고리)별 분실물 수와 승하차 인원, 1만 명당 분실률.
+    LostItem(역명은 StationDict로 표준화)과 RidershipDaily를 결합해 sync_reports에서 증분 갱신합니다.
+    category가 ALL_CATEGORIES인 행은 역·일 합계 행으로, 분실물이 없는 날의 승하차 인원도 포함합니다.
+    (노선/기간 단위 분실률은 이 합계 행만 합산해야 승하차 인원이 중복 집계되지 않습니다.)
+    """
+    ALL_CATEGORIES = '전체'
+
+    date = models.DateField(verbose_name='날짜')
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='lost_rates', verbose_name='역 (차원 키)')
+    category = models.CharField(max_length=50, verbose_name='분실물 카테고리')
+    lost_count = models.IntegerField(verbose_name='분실물 수')
+    ridership = models.IntegerField(default=0, verbose_name='승하차 인원 (승차+하차)')
+    rate_per_10k = models.FloatField(null=True, blank=True, verbose_name='1만 명당 분실물 수', help_text='승하차 데이터가 없으면 비어 있음')
+
+    class Meta:
+        unique_together = ('station', 'date', 'category')
+        indexes = [
+            models.Index(fields=['date', 'category'], name='lostrate_date_category_idx'),
+        ]
+        verbose_name = '5-1. 분실률 지표 (LostItemRate)'
+        verbose_name_plural = '5-1. 분실률 지표 (LostItemRates)'
+
+    def __str__(self):
+        return f"{self.date} [{self.line_code}] {self.station_name_std} / {self.category}: {self.rate_per_10k}"
+
+
+class LostItemRateDirtyDate(models.Model):
+    """
+    분실물이 새로 들어오거나 바뀐 등록일 (LostItemRate를 다시 계산해야 하는 날짜).
+    증분 갱신은 보통 마지막 계산일 - RATE_REFRESH_OVERLAP_DAYS부터만 다시 계산하므로,
+    늦게 들어온 지난 날짜 분실물(CSV 업로드, API 지연 공개)은 적재 경로가 여기 남긴 날짜부터 다시 계산합니다.
+    refresh_lost_item_rates가 반영한 표시는 지웁니다.
+    """
+    date = models.DateField(db_index=True, verbose_name='다시 계산할 날짜')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='표시 시각')
+
+    class Meta:
+        verbose_name = '5-2. 분실률 재계산 대상 날짜 (LostItemRateDirtyDate)'
+        verbose_name_plural = '5-2. 분실률 재계산 대상 날짜 (LostItemRateDirtyDates)'
+
+    def __str__(self):
+        return str(self.date)
+
+    @classmethod
+    def mark(cls, registered_ats):
+        """등록일시 목록의 (현지 시각 기준) 날짜를 재계산 대상으로 표시합니다. 반환값: 표시한 날짜 수"""
+        from django.utils import timezone
+
+        dates = sorted({timezone.localdate(value) for value in registered_ats if value})
+        cls.objects.bulk_create([cls(date=day) for day in dates])
+        return len(dates)
+
+
+class LostForecast(models.Model):
+    """
+    향후 7일 (날짜, 노선, 카테고리)별 1만 명당 분실물 예측값 캐시.
+    sync_reports가 과거 데이터로 회귀 모델을 학습한 뒤 Open-Meteo 예보 날씨로 일괄 계산합니다.
+    line_code / category가 LostItemRate.ALL_CATEGORIES('전체')인 행은 전체 노선/카테고리 합계 모델입니다.
+    """
+    date = models.DateField(verbose_name='예측 날짜')
+    line_code = models.CharField(max_length=20, verbose_name='표준 노선 코드')
+    category = models.CharField(max_length=50, verbose_name='분실물 카테고리')
+    rain_mm = models.FloatField(default=0.0, verbose_name='예보 강수량 (mm)')
+    avg_temp = models.FloatField(null=True, blank=True, verbose_name='예보 평균 기온 (C)')
+    predicted_rate = models.FloatField(verbose_name='예측 분실률 (1만 명당)', help_text='예보 날씨 기준')
+    dry_rate = models.FloatField(verbose_name='비가 오지 않을 때 예측 분실률')
+    rainy_rate = models.FloatField(verbose_name='비가 올 때 예측 분실률', help_text='과거 비 온 날 평균 강수량 기준')
+    training_days = models.IntegerField(default=0, verbose_name='학습 일수')
+    created_at = models.DateTimeField(auto_now=True, verbose_name='계산 시각')
+
+    class Meta:
+        unique_together = ('date', 'line_code', 'category')
+        verbose_name = '5-2. 분실 예보 (LostForecast)'
+        verbose_name_plural = '5-2. 분실 예보 (LostForecasts)'
+
+    def __str__(self):
+        return f"{self.date} [{self.line_code}] {self.category}: {self.predicted_rate:.3f}"
+
+
+# ----------------------------------------------------------------------
+# 6. 분실물 중복 탐지 (MinHash + LSH, main/dedup.py)
+# ----------------------------------------------------------------------
+class LostItemSignature(models.Model):
+    """
+    분실물 1건의 MinHash 서명. 후보 쌍의 유사도 검증에 사용합니다.
+    signature는 uint32 배열(NUM_PERM개)의 바이트이며, 밴드별 버킷 키는 LostItemBucket에 저장됩니다.
+    """
+    item = models.OneToOneField(LostItem, on_delete=models.CASCADE, primary_key=True, related_name='signature', verbose_name='분실물')
+    signature = models.BinaryField(verbose_name='MinHash 서명')
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name='색인 시각')
+
+    class Meta:
+        verbose_name = '6-1. 분실물 MinHash 서명'
+        verbose_name_plural = '6-1. 분실물 MinHash 서명'
+
+
+class LostItemBucket(models.Model):
+    """LSH 밴드 버킷 → 분실물. 같은 bucket 값을 가진 분실물끼리만 후보 쌍으로 비교합니다."""
+    bucket = models.BigIntegerField(db_index=True, verbose_name='밴드 버킷 키')
+    item = models.ForeignKey(LostItem, on_delete=models.CASCADE, related_name='lsh_buckets', verbose_name='분실물')
+
+    class Meta:
+        verbose_name = '6-2. LSH 버킷'
+        verbose_name_plural = '6-2. LSH 버킷'
+
+
+class DuplicateCluster(models.Model):
+    """
+    같은 물건으로 추정되는 분실물 묶음 (CSV 업로드 / API 동기화로 item_id가 달라진 경우 등).
+    검토 전(pending) 상태로 생성되며 관리자 화면에서 확정/기각합니다.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_CONFIRMED = 'confirmed'
+    STATUS_DISMISSED = 'dismissed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, '검토 대기'),
+        (STATUS_CONFIRMED, '중복 확정'),
+        (STATUS_DISMISSED, '중복 아님'),
+    ]
+
+    items = models.ManyToManyField(LostItem, related_name='duplicate_clusters', verbose_name='분실물')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True, verbose_name='검토 상태')
+    similarity = models.FloatField(default=0.0, verbose_name='최대 추정 유사도', help_text='MinHash로 추정한 Jaccard 유사도')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='갱신 시각')
+
+    class Meta:
+        verbose_name = '6-3. 중복 의심 묶음 (DuplicateCluster)'
+        verbose_name_plural = '6-3. 중복 의심 묶음 (DuplicateClusters)'
+
+    def __str__(self):
+        return f"#{self.pk} ({self.get_status_display()}, 유사도 {self.similarity:.2f})"
+
+
+# ----------------------------------------------------------------------
+# 7. 저장된 검색 알림 (percolator, main/percolator.py)
+# ----------------------------------------------------------------------
+class SavedSearch(models.Model):
+    """
+    "이런 물건이 들어오면 알려주세요" 조건. 지정한 조건은 모두 만족해야 하며(AND), 비워 둔 조건은 무시합니다.
+    keywords는 공백으로 구분하며 물품명·설명·카테고리에 모두 포함되어야 합니다.
+    """
+    contact = models.CharField(max_length=200, verbose_name='알림 받을 연락처', help_text='이메일 또는 전화번호')
+    category = models.CharField(max_length=50, null=True, blank=True, verbose_name='분실물 카테고리')
+    line = models.CharField(max_length=20, null=True, blank=True, verbose_name='표준 노선 코드', help_text='LINE1, LINE2 등')
+    station = models.CharField(max_length=100, null=True, blank=True, verbose_name='역명')
+    keywords = models.CharField(max_length=200, blank=True, default='', verbose_name='키워드', help_text='공백으로 구분 (예: 검정 장우산)')
+    is_active = models.BooleanField(default=True, db_index=True, verbose_name='사용 여부')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='등록 시각')
+
+    class Meta:
+        verbose_name = '7-1. 저장된 검색 (SavedSearch)'
+        verbose_name_plural = '7-1. 저장된 검색 (SavedSearches)'
+
+    def __str__(self):
+        conditions = [c for c in (self.category, self.line, self.station, self.keywords) if c]
+        return f"{self.contact}: {' / '.join(conditions) or '(조건 없음)'}"
+
+
+class SearchNotification(models.Model):
+    """저장된 검색에 새로 적재된 분실물이 걸린 기록. (검색, 분실물) 쌍마다 한 번만 생성됩니다."""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='notifications', verbose_name='저장된 검색')
+    item = models.ForeignKey(LostItem, on_delete=models.CASCADE, related_name='search_notifications', verbose_name='분실물')
+    is_sent = models.BooleanField(default=False, db_index=True, verbose_name='발송 여부')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')
+
+    class Meta:
+        unique_together = ('saved_search', 'item')
+        verbose_name = '7-2. 검색 알림 (SearchNotification)'
+        verbose_name_plural = '7-2. 검색 알림 (SearchNotifications)'
+
+    def __str__(self):
+        return f"{self.saved_search.contact} ← {self.item}"
+
+
+# ----------------------------------------------------------------------
+# 8. 시간대별 승하차 인원 (CardSubwayTime, main/hourly.py)
+# ----------------------------------------------------------------------
+class RidershipHourly(models.Model):
+    """
+    (날짜, 역)당 한 행에 0~23시 승차 24개 + 하차 24개 값을 uint32 배열로 묶어 저장합니다.
+    48행 대신 192바이트 하나이므로, 여러 달의 시간대 프로파일도 행을 펼치지 않고 NumPy로 한 번에 디코딩합니다.
+    CardSubwayTime은 월 단위 합계로 공개되므로 date는 해당 월 1일, days는 합산된 일수입니다.
+    """
+    date = models.DateField(verbose_name="날짜 (월 단위 자료는 1일)")
+    station = models.ForeignKey(Station, on_delete=models.PROTECT, related_name='hourly_ridership', verbose_name="역 (차원 키)")
+    days = models.SmallIntegerField(default=1, verbose_name="합산 일수")
+    counts = models.BinaryField(verbose_name="시간대별 인원", help_text="little-endian uint32 × 48 (승차 0~23시, 하차 0~23시)")
+
+    class Meta:
+        unique_together = ('station', 'date')
+        verbose_name = "2-4. 시간대별 승하차 인원 (RidershipHourly)"
+        verbose_name_plural = "2-4. 시간대별 승하차 인원 (RidershipHourlies)"
+
+    def __str__(self):
+        return f"{self.date} / {self.station_id}"
+
+
+# ----------------------------------------------------------------------
+# 9. 적재 전 검증 실패 행 격리 (main/validation.py)
+# ----------------------------------------------------------------------
+class QuarantinedRow(models.Model):
+    """
+    적재 전 일괄 검증에서 걸러진 원천 행과 사유.
+    CSV 업로드 / API 동기화가 실패 건수만 세고 넘어가지 않도록 원본 값을 그대로 보관합니다.
+    """
+    SOURCE_CSV = 'lostitem_csv'
+    SOURCE_LOSTITEM_API = 'sync_lostitem'
+    SOURCE_RIDERSHIP_API = 'sync_ridership'
+    SOURCE_RIDERSHIP_FILE = 'ridership_file'
+    SOURCE_CHOICES = [
+        (SOURCE_CSV, '분실물 CSV 업로드'),
+        (SOURCE_LOSTITEM_API, '분실물 API 동기화'),
+        (SOURCE_RIDERSHIP_API, '승하차 API 동기화'),
+        (SOURCE_RIDERSHIP_FILE, '승하차 CSV 파일 적재'),
+    ]
+
+    source = models.CharField(max_length=30, choices=SOURCE_CHOICES, db_index=True, verbose_name='적재 경로')
+    batch_id = models.CharField(max_length=64, db_index=True, verbose_name='배치 ID')
+    row_number = models.IntegerField(null=True, blank=True, verbose_name='원천 행 번호')
+    raw = models.JSONField(verbose_name='원천 값')
+    reasons = models.JSONField(default=list, verbose_name='검증 실패 사유')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='격리 시각')
+
+    class Meta:
+        verbose_name = '8. 검증 실패 행 (QuarantinedRow)'
+        verbose_name_plural = '8. 검증 실패 행 (QuarantinedRows)'
+
+    def __str__(self):
+        return f"[{self.source}] {self.batch_id} #{self.row_number}: {', '.join(self.reasons)}"
+
+
+# ----------------------------------------------------------------------
+# 10. 보관 장소별 재고 / 수령 소요 시간 (증분 카운터, main/occupancy.py)
+# ----------------------------------------------------------------------
+class StorageOccupancy(models.Model):
+    """
+    보관 장소(storage_location)별 보관 중 / 수령 완료 건수와 수령 소요 일수 합계.
+    LostItem의 is_received가 바뀌는 적재·수정 시점에 증감분만 반영하므로, 대시보드는 LostItem을 다시 읽지 않습니다.
+    """
+    storage_location = models.CharField(max_length=200, unique=True, verbose_name='보관 위치')
+    held = models.IntegerField(default=0, verbose_name='보관 중 (미수령)')
+    received = models.IntegerField(default=0, verbose_name='수령 완료')
+    pickup_samples = models.IntegerField(default=0, verbose_name='수령 소요 일수 표본 수', help_text='등록일·수령일이 모두 있는 수령 건')
+    pickup_days_total = models.BigIntegerField(default=0, verbose_name='수령 소요 일수 합계')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='갱신 시각')
+
+    class Meta:
+        verbose_name = '9-1. 보관 장소별 재고 (StorageOccupancy)'
+        verbose_name_plural = '9-1. 보관 장소별 재고 (StorageOccupancies)'
+
+    def __str__(self):
+        return f"{self.storage_location}: 보관 {self.held} / 수령 {self.received}"
+
+    @property
+    def avg_pickup_days(self):
+        return self.pickup_days_total / self.pickup_samples if self.pickup_samples else None
+
+
+class PickupTimeHistogram(models.Model):
+    """카테고리별 수령 소요 일수 히스토그램 (bucket은 main.occupancy.PICKUP_BUCKETS의 위치)"""
+    category = models.CharField(max_length=50, verbose_name='분실물 카테고리')
+    bucket = models.SmallIntegerField(verbose_name='소요 일수 구간')
+    count = models.IntegerField(default=0, verbose_name='건수')
+
+    class Meta:
+        unique_together = ('category', 'bucket')
+        verbose_name = '9-2. 수령 소요 시간 분포 (PickupTimeHistogram)'
+        verbose_name_plural = '9-2. 수령 소요 시간 분포 (PickupTimeHistograms)'
+
+    def __str__(self):
+        return f"{self.category} [{self.bucket}] {self.count}"
+
+
+# ----------------------------------------------------------------------
+# 11. 분실물 콜드 아카이브 (수령 완료 + 오래된 분실물, main/archive.py)
+# ----------------------------------------------------------------------
+class ArchivedLostItem(models.Model):
+    """
+    archive_lostitems가 LostItem에서 옮겨 온 수령 완료 분실물.
+    id는 원래 LostItem의 pk를 그대로 써서 상세 화면 주소가 바뀌지 않습니다.
+    목록 필터에 쓰는 짧은 컬럼만 남기고, 긴 텍스트(설명, 등록자, 수령 위치)는 zlib 압축 JSON(payload)으로 보관합니다.
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name='원래 LostItem ID')
+    item_id = models.CharField(max_length=50, unique=True, verbose_name='분실물 ID')
+    transport = models.CharField(max_length=20, null=True, blank=True, verbose_name='교통수단')
+    line = models.CharField(max_length=50, null=True, blank=True, verbose_name='노선명')
+    station = models.CharField(max_length=100, null=True, blank=True, verbose_name='발견역')
+    category = models.CharField(max_length=50, null=True, blank=True, verbose_name='분실물 카테고리')
+    item_name = models.CharField(max_length=200, null=True, blank=True, verbose_name='물품 상세명')
+    status = models.CharField(max_length=50, null=True, blank=True, verbose_name='처리 상태')
+    registered_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name='등록일시')
+    received_at = models.DateTimeField(null=True, blank=True, verbose_name='수령일시')
+    storage_location = models.CharField(max_length=200, null=True, blank=True, verbose_name='보관 위치')
+    views = models.IntegerField(default=0, verbose_name='조회수')
+    payload = models.BinaryField(verbose_name='압축 필드 (zlib JSON)')
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='아카이브 시각')
+
+    # 템플릿에서 LostItem과 같은 모양으로 쓰기 위한 고정 값
+    is_received = True
+    is_archived = True
+
+    class Meta:
+        verbose_name = '1-1. 분실물 아카이브 (ArchivedLostItem)'
+        verbose_name_plural = '1-1. 분실물 아카이브 (ArchivedLostItems)'
+
+    def __str__(self):
+        return f"[아카이브] {self.item_id} - {self.item_name}"
+
+    def _fields(self):
+        if not hasattr(self, '_payload_cache'):
+            import json
+            import zlib
+            self._payload_cache = json.loads(zlib.decompress(bytes(self.payload)).decode('utf-8'))
+        return self._payload_cache
+
+    @property
+    def description(self):
+        return self._fields().get('description')
+
+    @property
+    def registrar_id(self):
+        return self._fields().get('registrar_id')
+
+    @property
+    def pickup_company_location(self):
+        return self._fields().get('pickup_company_location')
+
+
+# ----------------------------------------------------------------------
+# 12. 정규화 규칙 (노선·역명 별칭 / 운수사 → 교통수단, main/normalize.py)
+# ----------------------------------------------------------------------
+class NameAlias(models.Model):
+    """
+    원천 데이터의 노선명 / 역명 표기를 표준 값으로 바꾸는 별칭.
+    적재 명령은 시작할 때 활성 별칭을 한 번 읽어 정규화 규칙(main.normalize.NormalizationRules)으로 컴파일합니다.
+    정확히 일치하는 별칭이 먼저이고, 정규식 별칭(전체 일치, 대상에 \\1 같은 그룹 참조 가능)은 그다음, 기본 규칙은 마지막입니다.
+    """
+    KIND_LINE = 'line'
+    KIND_STATION = 'station'
+    KIND_CHOICES = [
+        (KIND_LINE, '노선명 → 표준 노선 코드'),
+        (KIND_STATION, '역명 → 표준 역명'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, db_index=True, verbose_name='종류')
+    alias = models.CharField(max_length=100, verbose_name='원천 표기', help_text='예: 공항철도 1호선 / 정규식이면 전체 일치 패턴')
+    target = models.CharField(max_length=100, verbose_name='표준 값', help_text='노선은 LINE1 같은 코드, 역은 괄호 없는 표준 역명')
+    is_regex = models.BooleanField(default=False, verbose_name='정규식 여부')
+    is_active = models.BooleanField(default=True, verbose_name='사용')
+
+    class Meta:
+        unique_together = ('kind', 'alias')
+        verbose_name = '2-5. 노선·역명 별칭 (NameAlias)'
+        verbose_name_plural = '2-5. 노선·역명 별칭 (NameAliases)'
+
+    def __str__(self):
+        return f"[{self.kind}] {self.alias} → {self.target}"
+
+    def clean(self):
+        if not self.is_regex:
+            return
+        try:
+            pattern = re.compile(self.alias)
+        except re.error as e:
+            raise ValidationError({'alias': f'정규식 오류: {e}'})
+        for ref in re.findall(r'\\(\d+)', self.target):
+            if int(ref) > pattern.groups:
+                raise ValidationError({'target': f'패턴에 없는 그룹 참조: \\{ref}'})
+
+
+class TransportOperator(models.Model):
+    """분실물 수령 회사(RCPL, pickup_company_location) → 교통수단. 목록에 없는 회사는 '기타'로 분류합니다."""
+    TRANSPORT_CHOICES = [
+        ('bus', '버스'),
+        ('taxi', '택시'),
+        ('subway', '지하철'),
+        ('etc', '기타'),
+    ]
+
+    name = models.CharField(max_length=100, unique=True, verbose_name='운수사 / 수령 회사명')
+    transport = models.CharField(max_length=20, choices=TRANSPORT_CHOICES, db_index=True, verbose_name='교통수단')
+    is_active = models.BooleanField(default=True, verbose_name='사용')
+
+    class Meta:
+        verbose_name = '2-6. 운수사 교통수단 (TransportOperator)'
+        verbose_name_plural = '2-6. 운수사 교통수단 (TransportOperators)'
+
+    def __str__(self):
+        return f"{self.name} → {self.transport}"
@@ -0,0 +1,216 @@
+# pickuplog/main/normalize.py (노선명·역명 표준화 / 교통수단 분류 규칙)
+
+import os
+import re
+import time
+import uuid
+from functools import lru_cache
+
+# 기본 규칙 (별칭에 없는 표기): 'N호선' → LINEN, 괄호 안 호선 정보 제거
+LINE_NUMBER = re.compile(r'(\d+)호선')
+LINE_STRIP = str.maketrans('', '', ' -')
+PARENTHESES = re.compile(r'\(.*?\)')
+# 이름별 정규화 결과를 기억해 두는 개수 (원천 표기는 수천 개 이내, 검색어 같은 임의 입력도 지나가므로 상한을 둠)
+LOOKUP_CACHE_SIZE = 8192
+# TransportOperator에 없는 수령 회사의 교통수단 (TransportOperator.TRANSPORT_CHOICES의 '기타')
+DEFAULT_TRANSPORT = 'etc'
+
+# 다른 프로세스(웹 작업자 / 적재 명령)에서 규칙이 바뀐 것을 알아채는 표시 파일 (ANALYTICS_DIR 아래).
+# 규칙을 저장·삭제할 때마다 새 파일로 교체하므로 (st_mtime_ns, st_ino, st_size)가 바뀝니다.
+RULES_VERSION_FILENAME = 'normalization_rules.version'
+# 표시 파일을 다시 확인하는 최소 간격(초). 정규화 함수가 행마다 불려도 stat은 이 간격에 한 번
+RULES_CHECK_INTERVAL = 1.0
+
+
+def _compile_aliases(aliases):
+    """(별칭, 대상, 정규식 여부) 목록 → (정확 일치 dict, [(컴파일된 패턴, 대상), ...])"""
+    exact, patterns = {}, []
+    for alias, target, is_regex in aliases:
+        if not is_regex:
+            exact[alias.strip()] = target
+            continue
+        try:
+            patterns.append((re.compile(alias), target))
+        except re.error:
+            # 관리자 화면은 저장 전에 검사하지만, 직접 넣은 잘못된 패턴이 적재 전체를 멈추지 않도록 건너뜁니다.
+            continue
+    return exact, tuple(patterns)
+
+
+def _apply_aliases(name, exact, patterns):
+    if name in exact:
+        return exact[name]
+    for pattern, target in patterns:
+        match = pattern.fullmatch(name)
+        if match:
+            return match.expand(target)
+    return None
+
+
+class NormalizationRules:
+    """
+    노선명 / 역명 별칭(NameAlias)과 운수사 → 교통수단(TransportOperator) 표를 한 번 컴파일한 규칙 묶음.
+      - 정확 일치 별칭은 dict, 정규식 별칭은 미리 컴파일한 패턴, 운수사는 dict 한 번 조회
+      - line_code / station_name / match_key는 이름별 결과를 기억하므로 같은 이름이 반복되는 적재에서는 행마다 dict 조회 한 번
+    tables는 원래 표 그대로라 다른 프로세스(import_ridership_files 작업자)로 넘겨 같은 규칙을 다시 만들 수 있습니다.
+    """
+
+    def __init__(self, line_aliases=(), station_aliases=(), operators=()):
+        self.tables = (tuple(line_aliases), tuple(station_aliases), tuple(operators))
+        self._line_exact, self._line_patterns = _compile_aliases(self.tables[0])
+        self._station_exact, self._station_patterns = _compile_aliases(self.tables[1])
+        self._transport = {name.strip(): transport for name, transport in self.tables[2]}
+        self.line_code = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._line_code)
+        self.station_name = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._station_name)
+        self.match_key = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._match_key)
+
+    @classmethod
+    def from_db(cls):
+        from main.models import NameAlias, TransportOperator
+
+        aliases = NameAlias.objects.filter(is_active=True).order_by('pk').values_list('kind', 'alias', 'target', 'is_regex')
+        line_aliases, station_aliases = [], []
+        for kind, alias, target, is_regex in aliases:
+            (line_aliases if kind == NameAlias.KIND_LINE else station_aliases).append((alias, target, is_regex))
+        operators = TransportOperator.objects.filter(is_active=True).values_list('name', 'transport')
+        return cls(line_aliases, station_aliases, operators)
+
+    def __repr__(self):
+        line, station, operators = self.tables
+        return f"<NormalizationRules 노선 별칭 {len(line)}개, 역 별칭 {len(station)}개, 운수사 {len(operators)}개>"
+
+    def _line_code(self, line_name):
+        aliased = _apply_aliases(line_name.strip(), self._line_exact, self._line_patterns)
+        if aliased is not None:
+            return aliased
+        if '호선' in line_name:
+            match = LINE_NUMBER.search(line_name)
+            if match:
+                return f"LINE{match.group(1)}"
+        return line_name.upper().translate(LINE_STRIP)
+
+    def _station_name(self, raw_name):
+        aliased = _apply_aliases(raw_name.strip(), self._station_exact, self._station_patterns)
+        if aliased is not None:
+            return aliased
+        return PARENTHESES.sub('', raw_name).strip()
+
+    def _match_key(self, name):
+        key = self.station_name(name or '')
+        if key.endswith('역') and len(key) > 1:
+            key = key[:-1]
+        return key
+
+    def transport_for(self, operator):
+        """수령 회사명 → 교통수단 ('bus', 'taxi' 등). 등록되지 않은 회사면 DEFAULT_TRANSPORT('etc' = 기타)"""
+        return self._transport.get((operator or '').strip(), DEFAULT_TRANSPORT)
+
+
+# ----------------------------------------------------------------------
+# 프로세스에서 쓰는 현재 규칙
+# ----------------------------------------------------------------------
+_active = None
+# 현재 규칙을 DB에서 읽기 직전의 표시 파일 상태. _PINNED면 install_rules로 받은 규칙이라 다시 읽지 않음
+_PINNED = object()
+_active_version = None
+_checked_at = 0.0
+
+
+def rules_version_path():
+    from django.conf import settings
+
+    return settings.ANALYTICS_DIR / RULES_VERSION_FILENAME
+
+
+def rules_version():
+    """표시 파일 상태 (st_mtime_ns, st_ino, st_size). 아직 한 번도 바뀐 적 없으면 None"""
+    try:
+        stat = os.stat(rules_version_path())
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+def bump_rules_version():
+    """표시 파일을 새 파일로 교체해 다른 프로세스가 다음 확인 때 규칙을 다시 읽게 합니다."""
+    path = rules_version_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(uuid.uuid4().hex)
+    os.replace(tmp, path)
+
+
+def _set_active(rules, version):
+    global _active, _active_version, _checked_at
+    _active, _active_version, _checked_at = rules, version, time.monotonic()
+
+
+def load_rules():
+    """DB의 활성 별칭 / 운수사 표를 다시 읽어 컴파일하고 현재 규칙으로 설정합니다. (적재 명령 시작 시 호출)"""
+    # 읽는 도중 바뀐 규칙을 놓치지 않도록 표시 파일을 먼저 확인
+    version = rules_version()
+    rules = NormalizationRules.from_db()
+    _set_active(rules, version)
+    return rules
+
+
+def install_rules(rules):
+    """
+    rules를 이 프로세스의 규칙으로 고정합니다. (표시 파일을 확인하지 않음)
+    Django 없이 도는 작업자 프로세스가 부모에게 받은 규칙을 설치할 때 씁니다. None이면 다음 사용 때 DB에서 읽습니다.
+    """
+    _set_active(rules, _PINNED if rules is not None else None)
+
+
+def reset_rules(using='default', **kwargs):
+    """
+    별칭 / 운수사 저장·삭제 시그널 수신기: 이 프로세스는 다음 사용 때 DB에서 다시 읽고,
+    다른 프로세스는 커밋 후 바뀐 표시 파일을 보고 다시 읽습니다. (커밋 전에 읽으면 이전 규칙을 다시 기억하게 되므로)
+    """
+    from django.db import transaction
+
+    install_rules(None)
+    transaction.on_commit(bump_rules_version, using=using)
+
+
+def active_rules():
+    """
+    현재 규칙. 아직 없거나 다른 프로세스에서 규칙이 바뀌었으면(표시 파일) DB에서 읽어 만들고,
+    표가 아직 없으면(마이그레이션 전) 기본 규칙만 씁니다.
+    Django 없이 도는 작업자 프로세스는 시작할 때 install_rules로 규칙을 받아 둡니다.
+    """
+    global _checked_at
+    if _active is not None and _active_version is not _PINNED:
+        now = time.monotonic()
+        if now - _checked_at >= RULES_CHECK_INTERVAL:
+            _checked_at = now
+            if rules_version() != _active_version:
+                install_rules(None)
+    if _active is None:
+        from django.db import DatabaseError
+
+        try:
+            load_rules()
+        except DatabaseError:
+            _set_active(NormalizationRules(), rules_version())
+    return _active
+
+
+def normalize_line_code(line_name):
+    """노선명(예: 1호선)을 표준 코드(예: LINE1)로 변환 (별칭 → 정규식 별칭 → 기본 규칙)"""
+    return active_rules().line_code(line_name)
+
+def normalize_station_name(raw_name):
+    """역명 별칭 적용, 없으면 괄호 안의 호선 정보 제거"""
+    return active_rules().station_name(raw_name)
+
+def station_match_key(name):
+    """
+    분실물 보관 장소(예: '강남역')와 승하차 데이터 역명(예: '강남')을 같은 키로 맞춥니다.
+    normalize_station_name 규칙 적용 후 끝의 '역'을 제거합니다.
+    """
+    return active_rules().match_key(name)
+
+def classify_transport(operator):
+    """분실물 수령 회사명(RCPL)으로 교통수단 분류 (TransportOperator에 없으면 'etc' = 기타)"""
+    return active_rules().transport_for(operator)
@@ -0,0 +1,229 @@
+# pickuplog/main/occupancy.py (보관 장소별 재고 / 수령 소요 시간 증분 카운터)
+
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import F
+
+from main.models import ArchivedLostItem, LostItem, PickupTimeHistogram, StorageOccupancy
+
+# 수령 소요 일수 구간의 하한 (일). 마지막 구간은 '90일 이상'
+PICKUP_BUCKETS = [0, 1, 2, 3, 7, 14, 30, 60, 90]
+UNKNOWN_CATEGORY = '미분류'
+# IN 절 하나에 넣는 값 개수 (SQLite 변수 제한 대비)
+QUERY_CHUNK = 500
+
+STATE_FIELDS = ('item_id', 'storage_location', 'category', 'is_received', 'registered_at', 'received_at')
+
+
+def bucket_label(index):
+    low = PICKUP_BUCKETS[index]
+    if index == len(PICKUP_BUCKETS) - 1:
+        return f"{low}일 이상"
+    high = PICKUP_BUCKETS[index + 1] - 1
+    if low == 0:
+        return "당일"
+    return f"{low}일" if low == high else f"{low}~{high}일"
+
+
+def pickup_bucket(days):
+    return bisect_right(PICKUP_BUCKETS, days) - 1
+
+
+def item_state(storage_location, category, is_received, registered_at, received_at):
+    """
+    분실물 1건이 카운터에 기여하는 값: (보관 위치, 카테고리, 수령 여부, 수령 소요 일수 또는 None)
+    소요 일수는 수령 완료이고 등록일·수령일이 모두 있을 때만 계산합니다. (음수는 0일로 처리)
+    """
+    days = None
+    if is_received and registered_at and received_at:
+        days = max((received_at - registered_at).days, 0)
+    return (storage_location or '', category or UNKNOWN_CATEGORY, bool(is_received), days)
+
+
+def load_states(item_ids):
+    """item_id → item_state 사전 (현재 DB 값)"""
+    states = {}
+    item_ids = list(item_ids)
+    for i in range(0, len(item_ids), QUERY_CHUNK):
+        rows = LostItem.objects.filter(item_id__in=item_ids[i:i + QUERY_CHUNK]).values_list(*STATE_FIELDS)
+        for item_id, *fields in rows:
+            states[item_id] = item_state(*fields)
+    return states
+
+
+def apply_changes(before, after):
+    """
+    적재/수정 전후 상태(item_id → item_state, 없으면 미존재)의 차이만 카운터에 더합니다.
+    반환값: 변경된 보관 장소 수
+    """
+    locations, histogram = {}, {}
+
+    def add(state, sign):
+        location, category, is_received, days = state
+        delta = locations.setdefault(location, [0, 0, 0, 0])
+        if is_received:
+            delta[1] += sign
+        else:
+            delta[0] += sign
+        if days is not None:
+            delta[2] += sign
+            delta[3] += sign * days
+            key = (category, pickup_bucket(days))
+            histogram[key] = histogram.get(key, 0) + sign
+
+    for item_id in before.keys() | after.keys():
+        old, new = before.get(item_id), after.get(item_id)
+        if old == new:
+            continue
+        if old is not None:
+            add(old, -1)
+        if new is not None:
+            add(new, +1)
+
+    locations = {k: v for k, v in locations.items() if any(v)}
+    histogram = {k: v for k, v in histogram.items() if v}
+    if not locations and not histogram:
+        return 0
+
+    with transaction.atomic():
+        # 처음 보는 장소 / 구간 행을 0으로 만들어 두고 F()로 증감 (동시 적재에도 값이 섞이지 않음)
+        StorageOccupancy.objects.bulk_create(
+            [StorageOccupancy(storage_location=location) for location in locations], ignore_conflicts=True
+        )
+        PickupTimeHistogram.objects.bulk_create(
+            [PickupTimeHistogram(category=category, bucket=bucket) for category, bucket in histogram],
+            ignore_conflicts=True,
+        )
+        for location, (held, received, samples, days) in locations.items():
+            StorageOccupancy.objects.filter(storage_location=location).update(
+                held=F('held') + held,
+                received=F('received') + received,
+                pickup_samples=F('pickup_samples') + samples,
+                pickup_days_total=F('pickup_days_total') + days,
+            )
+        for (category, bucket), count in histogram.items():
+            PickupTimeHistogram.objects.filter(category=category, bucket=bucket).update(count=F('count') + count)
+    return len(locations)
+
+
+@contextmanager
+def track_occupancy(item_ids):
+    """
+    bulk_create / update처럼 시그널이 발생하지 않는 일괄 적재를 감싸서 전후 상태 차이를 반영합니다.
+        with track_occupancy(item_ids):
+            LostItem.objects.bulk_create(...)
+    아카이브에 있는 item_id는 이미 (수령 완료로) 카운터에 들어 있으므로 제외합니다.
+    """
+    from main.archive import archived_item_ids
+
+    item_ids = list(item_ids)
+    archived = archived_item_ids(item_ids)
+    if archived:
+        item_ids = [item_id for item_id in item_ids if item_id not in archived]
+    before = load_states(item_ids)
+    yield
+    apply_changes(before, load_states(item_ids))
+
+
+# ----------------------------------------------------------------------
+# 단건 저장 / 삭제 (폼, 관리자 화면) - MainConfig.ready에서 연결
+# ----------------------------------------------------------------------
+_suspended = threading.local()
+
+
+@contextmanager
+def suspend_tracking():
+    """재고 변화가 아닌 삭제(아카이브 이동 등) 동안 시그널 반영을 멈춥니다. (현재 스레드만)"""
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = False
+
+
+def _tracking():
+    return not getattr(_suspended, 'active', False)
+
+
+def _state_of(instance):
+    return item_state(
+        instance.storage_location, instance.category, instance.is_received,
+        instance.registered_at, instance.received_at,
+    )
+
+
+def lostitem_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or not _tracking():
+        return
+    before = None
+    if instance.pk:
+        row = LostItem.objects.filter(pk=instance.pk).values_list(*STATE_FIELDS[1:]).first()
+        before = item_state(*row) if row else None
+    instance._occupancy_before = before
+
+
+def lostitem_post_save(sender, instance, raw=False, **kwargs):
+    if raw or not hasattr(instance, '_occupancy_before'):
+        return
+    before = instance.__dict__.pop('_occupancy_before')
+    apply_changes({instance.pk: before} if before else {}, {instance.pk: _state_of(instance)})
+
+
+def lostitem_post_delete(sender, instance, **kwargs):
+    if not _tracking():
+        return
+    apply_changes({instance.pk: _state_of(instance)}, {})
+
+
+# ----------------------------------------------------------------------
+# 전체 재계산 / 대시보드 조회
+# ----------------------------------------------------------------------
+def rebuild_occupancy():
+    """
+    LostItem 전체(+ 아카이브로 옮긴 수령 완료 분실물)를 한 번 읽어 카운터를 다시 만듭니다.
+    (최초 생성 / 불일치 복구용) 반환값: (장소 수, 분실물 수)
+    """
+    locations, histogram = {}, {}
+    total = 0
+    archived = ArchivedLostItem.objects.values_list('storage_location', 'category', 'registered_at', 'received_at')
+    rows = chain(
+        LostItem.objects.values_list(*STATE_FIELDS[1:]).iterator(chunk_size=5000),
+        ((location, category, True, registered_at, received_at)
+         for location, category, registered_at, received_at in archived.iterator(chunk_size=5000)),
+    )
+    for row in rows:
+        location, category, is_received, days = item_state(*row)
+        counts = locations.setdefault(location, [0, 0, 0, 0])
+        counts[1 if is_received else 0] += 1
+        if days is not None:
+            counts[2] += 1
+            counts[3] += days
+            key = (category, pickup_bucket(days))
+            histogram[key] = histogram.get(key, 0) + 1
+        total += 1
+
+    with transaction.atomic():
+        StorageOccupancy.objects.all().delete()
+        PickupTimeHistogram.objects.all().delete()
+        StorageOccupancy.objects.bulk_create([
+            StorageOccupancy(storage_location=location, held=held, received=received,
+                             pickup_samples=samples, pickup_days_total=days)
+            for location, (held, received, samples, days) in locations.items()
+        ], batch_size=1000)
+        PickupTimeHistogram.objects.bulk_create([
+            PickupTimeHistogram(category=category, bucket=bucket, count=count)
+            for (category, bucket), count in histogram.items()
+        ], batch_size=1000)
+    return len(locations), total
+
+
+def pickup_histograms():
+    """카테고리 → 구간별 건수 목록 (PICKUP_BUCKETS 순서), 건수 많은 카테고리 순"""
+    by_category = {}
+    for category, bucket, count in PickupTimeHistogram.objects.values_list('category', 'bucket', 'count'):
+        by_category.setdefault(category, [0] * len(PICKUP_BUCKETS))[bucket] = count
+    return sorted(by_category.items(), key=lambda item: -sum(item[1]))
@@ -0,0 +1,158 @@
+# pickuplog/main/percolator.py (저장된 검색 역매칭 - percolator)
+
+import re
+
+from main.models import LostItem, SavedSearch, SearchNotification
+from main.normalize import normalize_line_code, station_match_key
+from main.stations import StationIndex
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+ANY = '*'
+# IN 절 하나에 넣는 pk 개수 (SQLite 변수 제한 대비)
+QUERY_CHUNK = 500
+
+
+def _grams(text):
+    """토큰별 1-gram + 2-gram 집합. 키워드의 2-gram이 물품 텍스트에 있으면 키워드가 포함됐을 가능성이 있습니다."""
+    grams = set()
+    for token in _TOKEN_PATTERN.findall(text):
+        grams.update(token)
+        grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+class Percolator:
+    """
+    저장된 검색 자체를 색인합니다: 검색마다 (카테고리, 장소, 키워드 2-gram) 복합 앵커 키를 만들어
+    앵커 키 → 검색 목록 사전에 넣습니다. 지정하지 않은 조건 자리는 ANY입니다.
+    (장소는 역 > 노선, 키워드는 분실물 텍스트와 같은 방식으로 토큰화한 키워드 중 가장 긴 토큰의 앞 2글자)
+    분실물 1건은 자신이 만들 수 있는 앵커 키 조합(카테고리|ANY × 역/노선|ANY × 텍스트 n-gram|ANY)으로
+    사전을 조회해 후보 검색만 남은 조건을 검증하므로, 비용이 검색 수 × 분실물 수가 아니라 후보 수에 비례합니다.
+    """
+
+    def __init__(self, searches, station_index=None):
+        self.station_index = station_index or StationIndex()
+        self.by_anchor = {}
+        self.size = 0
+        for search in searches:
+            compiled = self._compile(search)
+            if compiled is None:
+                continue
+            self.by_anchor.setdefault(compiled['anchor'], []).append(compiled)
+            self.size += 1
+
+    @classmethod
+    def from_db(cls):
+        return cls(SavedSearch.objects.filter(is_active=True).iterator(chunk_size=5000), StationIndex.from_db())
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def _compile(search):
+        keywords = [k for k in (search.keywords or '').lower().split() if k]
+        compiled = {
+            'pk': search.pk,
+            'category': search.category or None,
+            'line': normalize_line_code(search.line) if search.line else None,
+            'station': station_match_key(search.station) if search.station else None,
+            'keywords': keywords,
+        }
+        if not (keywords or compiled['category'] or compiled['line'] or compiled['station']):
+            # 조건이 없는 검색은 모든 분실물에 걸리므로 색인하지 않습니다.
+            return None
+        if compiled['station']:
+            place = ('station', compiled['station'])
+        elif compiled['line']:
+            place = ('line', compiled['line'])
+        else:
+            place = ANY
+        # 분실물 쪽 n-gram은 \w+ 토큰 안에서만 만들어지므로 키워드도 같은 규칙으로 잘라야 앵커가 맞습니다.
+        # ("t-shirt"의 앞 2글자 "t-"는 어떤 분실물 n-gram에도 없음 → 토큰 "shirt"의 "sh")
+        tokens = [token for keyword in keywords for token in _TOKEN_PATTERN.findall(keyword)]
+        gram = max(tokens, key=len)[:2] if tokens else ANY
+        compiled['anchor'] = (compiled['category'] or ANY, place, gram)
+        return compiled
+
+    def _item_lines(self, line, station_key):
+        if line:
+            return {line}
+        # 노선이 비어 있는 환승역은 StationDict의 노선 목록 전체
+        return {candidate[0] for candidate in self.station_index.candidates(station_key)} if station_key else set()
+
+    def match(self, items):
+        """
+        items: (pk, category, item_name, description, line, station) 튜플 목록
+        반환: [(saved_search_pk, item_pk), ...]
+        """
+        matches = []
+        for item in items:
+            pk = item[0]
+            category, lines, station_key, text = self.prepare(item)
+
+            categories = (category, ANY) if category else (ANY,)
+            places = [('line', item_line) for item_line in lines] + [ANY]
+            if station_key:
+                places.append(('station', station_key))
+            grams = list(_grams(text)) + [ANY]
+
+            by_anchor = self.by_anchor
+            for c in categories:
+                for p in places:
+                    for g in grams:
+                        for search in by_anchor.get((c, p, g), ()):
+                            if satisfies(search, category, lines, station_key, text):
+                                matches.append((search['pk'], pk))
+        return matches
+
+    def prepare(self, item):
+        """분실물 튜플 → 검증에 쓰는 (카테고리, 노선 집합, 역 키, 소문자 텍스트)"""
+        pk, category, item_name, description, line, station = item
+        station_key = station_match_key(station) if station else ''
+        text = f"{category or ''} {item_name or ''} {description or ''}".lower()
+        return category, self._item_lines(line, station_key), station_key, text
+
+
+def satisfies(search, category, lines, station_key, text):
+    """컴파일된 검색 조건을 분실물 하나가 모두 만족하는지 (AND)"""
+    if search['category'] and search['category'] != category:
+        return False
+    if search['line'] and search['line'] not in lines:
+        return False
+    if search['station'] and search['station'] != station_key:
+        return False
+    return all(keyword in text for keyword in search['keywords'])
+
+
+def percolate(item_pks, percolator=None):
+    """
+    새로 적재된 분실물 배치를 활성 저장 검색 전체와 한 번에 매칭해 SearchNotification에 기록합니다.
+    이미 알림이 만들어진 (검색, 분실물) 쌍은 다시 만들지 않습니다. 반환값: 새로 만든 알림 수
+    """
+    item_pks = list(item_pks)
+    if not item_pks:
+        return 0
+    percolator = percolator or Percolator.from_db()
+    if not len(percolator):
+        return 0
+    items = LostItem.objects.filter(pk__in=item_pks).values_list(
+        'pk', 'category', 'item_name', 'description', 'line', 'station'
+    )
+    matches = percolator.match(items.iterator(chunk_size=5000))
+    if not matches:
+        return 0
+    # 재적재된 분실물의 기존 알림은 건너뜀 (ignore_conflicts는 건너뛴 행 수를 알려 주지 않으므로 미리 조회)
+    existing = set()
+    matched_items = sorted({item_pk for _, item_pk in matches})
+    for i in range(0, len(matched_items), QUERY_CHUNK):
+        existing.update(
+            SearchNotification.objects.filter(item_id__in=matched_items[i:i + QUERY_CHUNK])
+            .values_list('saved_search_id', 'item_id')
+        )
+    new = [pair for pair in matches if pair not in existing]
+    SearchNotification.objects.bulk_create(
+        [SearchNotification(saved_search_id=search_pk, item_id=item_pk) for search_pk, item_pk in new],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    return len(new)
@@ -0,0 +1,195 @@
+# pickuplog/main/pipeline.py (야간 동기화 DAG 실행기)
+
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from main.models import PipelineRun
+
+
+@dataclass(frozen=True)
+class Stage:
+    """파이프라인 한 단계: 실행할 관리 명령과 선행 단계, 행 수를 셀 대상 모델."""
+    name: str
+    command: str
+    depends_on: tuple = ()
+    model: str = ''
+    options: dict = field(default_factory=dict)
+
+
+# ----------------------------------------------------------------------
+# 야간 동기화 DAG
+# 승하차·분실물·날씨 수집은 서로 독립이므로 동시에 실행하고,
+# 분석(sync_reports)은 세 입력이 모두 끝난 뒤에만 시작합니다.
+# ----------------------------------------------------------------------
+NIGHTLY_STAGES = (
+    Stage('ridership', 'sync_ridership', model='main.RidershipDaily'),
+    Stage('lostitem', 'sync_lostitem', model='main.LostItem'),
+    Stage('weather', 'sync_weather', model='main.WeatherDaily'),
+    Stage('reports', 'sync_reports', depends_on=('ridership', 'lostitem', 'weather'), model='main.RainImpactReport'),
+)
+
+
+def _count_rows(stage):
+    if not stage.model:
+        return None
+    return apps.get_model(stage.model).objects.count()
+
+
+class PipelineRunner:
+    """
+    Stage 목록을 하나의 프로세스 안에서 DAG 순서대로 실행하고 PipelineRun에 기록합니다.
+    각 단계는 스레드 풀에서 call_command로 실행되므로 Django 초기화는 한 번만 일어납니다.
+    """
+
+    def __init__(self, stages=NIGHTLY_STAGES, max_workers=3, retries=0, retry_delay=5.0, stdout=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.stdout = stdout
+        self._lock = threading.Lock()
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"'{stage.name}' 단계의 선행 단계 '{dep}'가 정의되지 않았습니다.")
+        # 선행 단계를 모두 마친 단계부터 지워 나가서 남는 단계가 있으면 순환
+        remaining = dict(self.stages)
+        while remaining:
+            ready = [name for name, stage in remaining.items() if not set(stage.depends_on) & remaining.keys()]
+            if not ready:
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+
+    def _log(self, message):
+        if self.stdout is not None:
+            with self._lock:
+                self.stdout.write(message)
+
+    def _save(self, run, **fields):
+        # 단계 로그 출력과 같은 락으로 PipelineRun 갱신을 직렬화합니다.
+        with self._lock:
+            for key, value in fields.items():
+                setattr(run, key, value)
+            run.save()
+
+    def _run_stage(self, run, stage):
+        """단계 하나를 (재시도 포함) 실행합니다. 워커 스레드에서 호출됩니다."""
+        close_old_connections()
+        result = {'status': PipelineRun.STATUS_RUNNING, 'started_at': timezone.now().isoformat(), 'attempts': 0}
+        started = time.perf_counter()
+        try:
+            rows_before = _count_rows(stage)
+            while True:
+                result['attempts'] += 1
+                output = io.StringIO()
+                try:
+                    call_command(stage.command, stdout=output, stderr=output, **stage.options)
+                    break
+                except Exception as e:
+                    if result['attempts'] > self.retries:
+                        result['error'] = f"{type(e).__name__}: {e}"
+                        raise
+                    self._log(f"[{stage.name}] 실패 ({e}), {self.retry_delay}초 후 재시도합니다.")
+                    time.sleep(self.retry_delay * result['attempts'])
+                finally:
+                    captured = output.getvalue().rstrip()
+                    if captured:
+                        self._log(f"[{stage.name}]\n{captured}")
+
+            rows_after = _count_rows(stage)
+            result.update({
+                'status': PipelineRun.STATUS_SUCCESS,
+                'duration': round(time.perf_counter() - started, 3),
+                'rows': rows_after,
+                'rows_delta': None if rows_before is None else rows_after - rows_before,
+            })
+        except Exception:
+            result['status'] = PipelineRun.STATUS_FAILED
+            result['duration'] = round(time.perf_counter() - started, 3)
+            result.setdefault('error', '단계 실행 전 오류')
+        finally:
+            connections.close_all()
+        return result
+
+    def run(self, resume_from=None, only=None):
+        """
+        DAG를 실행하고 PipelineRun을 반환합니다.
+        resume_from이 주어지면 그 실행에서 성공한 단계는 결과를 복사하고 건너뜁니다.
+        """
+        previous = dict(resume_from.stages) if resume_from else {}
+        done = {
+            name: result for name, result in previous.items()
+            if name in self.stages and result.get('status') == PipelineRun.STATUS_SUCCESS
+        }
+        if only:
+            done.update({
+                name: {'status': 'skipped', 'reason': '--only 대상 아님'}
+                for name in self.stages if name not in only and name not in done
+            })
+
+        run = PipelineRun.objects.create(
+            resumed_from=resume_from,
+            stages={name: {**result, 'reused': True} for name, result in done.items()},
+        )
+        self._log(f"PipelineRun #{run.pk} 시작 (재사용 단계: {', '.join(done) or '없음'})")
+
+        pending = {name: stage for name, stage in self.stages.items() if name not in done}
+        failed = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+            while pending or running:
+                # 선행 단계가 실패한 단계는 실행하지 않고 blocked로 표시
+                for name, stage in list(pending.items()):
+                    if any(dep in failed for dep in stage.depends_on):
+                        del pending[name]
+                        failed.add(name)
+                        self._save(run, stages={**run.stages, name: {'status': 'blocked'}})
+
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dep in done for dep in stage.depends_on)
+                ]
+                for stage in ready:
+                    del pending[stage.name]
+                    self._log(f"▶ {stage.name} ({stage.command}) 시작")
+                    self._save(run, stages={**run.stages, stage.name: {'status': PipelineRun.STATUS_RUNNING}})
+                    running[pool.submit(self._run_stage, run, stage)] = stage
+
+                if not running:
+                    # 실행할 수 있는 단계가 없는데 남은 단계가 있으면 (선행 단계가 끝나지 않음) 실패로 기록
+                    for name in pending:
+                        failed.add(name)
+                        self._save(run, stages={**run.stages, name: {'status': 'blocked'}})
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    result = future.result()
+                    self._save(run, stages={**run.stages, stage.name: result})
+                    if result['status'] == PipelineRun.STATUS_SUCCESS:
+                        done[stage.name] = result
+                        self._log(f"✔ {stage.name}: {result['duration']}초, 행 {result['rows']} (변화 {result['rows_delta']})")
+                    else:
+                        failed.add(stage.name)
+                        self._log(f"✘ {stage.name}: {result.get('error', '알 수 없는 오류')}")
+
+        self._save(
+            run,
+            finished_at=timezone.now(),
+            status=PipelineRun.STATUS_FAILED if failed else PipelineRun.STATUS_SUCCESS,
+        )
+        return run
@@ -1,79 +1,274 @@
 # pickuplog/main/reports.py (최종 RII 계산 로직 - 실행 확정 버전)
 
-from django.db.models import Avg, F, Count
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, F, Count, Max, Min, Sum
 from django.utils import timezone 
 from datetime import datetime, timedelta
-from main.models import RidershipDaily, WeatherDaily, RainImpactReport
+from main.models import (
+    ArchivedLostItem, LostItem, LostItemRate, LostItemRateDirtyDate, RidershipDaily, StationDict, WeatherDaily,
+    RainImpactReport,
+)
+from main.cube import PatternCube
+from main.normalize import normalize_line_code, station_match_key
+from main.snapshot import build_snapshot, get_snapshot
+from main.stations import StationCodeMap
+
+# 승하차 데이터는 며칠 늦게 공개되므로, 증분 갱신 시 마지막 계산일 이전 N일도 다시 계산합니다.
+RATE_REFRESH_OVERLAP_DAYS = 7
 
 def calculate_rain_impact_index():
     """
     RidershipDaily와 WeatherDaily를 결합하여, 역별/노선별 비 영향 지수(RII)를 계산하고 저장합니다.
     (이 함수가 sync_reports 명령에 의해 호출되는 최종 분석 로직입니다.)
+    💡 ORM 대신 컬럼형 스냅샷(main.snapshot)을 mmap으로 읽어 NumPy로 그룹 집계합니다.
     """
     
     # 1. 분석 기간 설정 및 초기화
     recent_date_limit = timezone.now().date() - timedelta(days=90)
     RainImpactReport.objects.all().delete()
+
+    snapshot = get_snapshot()
+    if snapshot is None:
+        build_snapshot()
+        snapshot = get_snapshot()
     
-    # 2. WeatherDaily 데이터 매핑 준비
-    # {date: is_rainy} 딕셔너리를 생성하여 Ridership 데이터와 결합에 사용
-    weather_data_map = {
-        item.date: item.is_rainy
-        for item in WeatherDaily.objects.all() # 모든 데이터 조회
-    }
-    if not weather_data_map: 
+    # 2. WeatherDaily 데이터 확인 (날짜순 정렬된 컬럼)
+    weather_days = snapshot.weather['date']
+    if len(weather_days) == 0: 
         print("경고: WeatherDaily 데이터가 DB에 전혀 없습니다. RII 계산을 건너뜁니다.")
         return 0
     
     # 💡 30일 체크 기준을 10일로 완화 (DB에 데이터가 있다면 분석을 진행하기 위함)
-    if len(weather_data_map) < 10: 
+    if len(weather_days) < 10: 
         print("경고: WeatherDaily 데이터가 10일 미만이므로 RII 계산을 건너뜁니다.")
         return 0
 
     # 3. RidershipDaily 데이터 처리 및 그룹화 (RII 계산 기반)
-    ridership_qs = RidershipDaily.objects.filter(
-        date__in=list(weather_data_map.keys()) # 날씨 데이터가 있는 날짜만 필터링
-    ).values('date', 'line_code', 'station_name_std', 'total')
+    # 날씨 데이터가 있는 날짜만 사용하며, 날짜 → 강수 여부는 이진 탐색으로 결합합니다.
+    ridership = snapshot.ridership
+    weather_index, has_weather = snapshot.weather_for(ridership['date'])
+    is_rainy = snapshot.weather['is_rainy'][weather_index]
+    rainy_rows = has_weather & is_rainy
+    clear_rows = has_weather & ~is_rainy
 
-    grouped_ridership_data = {} 
-    
-    for row in ridership_qs:
-        date = row['date']
-        key = (row['line_code'], row['station_name_std'])
-        is_rainy = weather_data_map.get(date) # 메모리에서 날씨 정보 가져오기
-        
-        if is_rainy is None: continue 
-            
-        if key not in grouped_ridership_data:
-            grouped_ridership_data[key] = {'rainy_sum': 0, 'rainy_count': 0, 'clear_sum': 0, 'clear_count': 0}
-        
-        if is_rainy:
-            grouped_ridership_data[key]['rainy_sum'] += row['total']
-            grouped_ridership_data[key]['rainy_count'] += 1
-        else:
-            grouped_ridership_data[key]['clear_sum'] += row['total']
-            grouped_ridership_data[key]['clear_count'] += 1
+    # Station 차원 정수 키가 곧 그룹 번호 (문자열 비교 / np.unique 정렬 없이 bincount)
+    group = ridership['station'].astype(np.int64)
+    n_groups = max(snapshot.stations, default=0) + 1
+    total = ridership['total'].astype(np.float64)
 
-    reports_to_create = []
+    rainy_sum = np.bincount(group[rainy_rows], weights=total[rainy_rows], minlength=n_groups)
+    rainy_count = np.bincount(group[rainy_rows], minlength=n_groups)
+    clear_sum = np.bincount(group[clear_rows], weights=total[clear_rows], minlength=n_groups)
+    clear_count = np.bincount(group[clear_rows], minlength=n_groups)
 
     # 4. RII 계산 및 DB 저장
-    for (line_code, station_name_std), data in grouped_ridership_data.items():
-        # 💡 최종 완화 기준: 비오는 날/맑은 날 데이터가 최소 1일씩만 있어도 계산합니다.
-        if data['rainy_count'] >= 1 and data['clear_count'] >= 1: 
-            
-            avg_rainy = data['rainy_sum'] / data['rainy_count']
-            avg_clear = data['clear_sum'] / data['clear_count']
-            
-            if avg_clear > 0:
-                rain_impact_index = (avg_rainy / avg_clear) * 100
-                
-                reports_to_create.append(RainImpactReport(
-                    line_code=line_code,
-                    station_name_std=station_name_std,
-                    rain_impact_index=round(rain_impact_index, 2)
-                ))
+    # 💡 최종 완화 기준: 비오는 날/맑은 날 데이터가 최소 1일씩만 있어도 계산합니다.
+    valid = (rainy_count >= 1) & (clear_count >= 1)
+    avg_rainy = np.divide(rainy_sum, rainy_count, out=np.zeros_like(rainy_sum), where=valid)
+    avg_clear = np.divide(clear_sum, clear_count, out=np.zeros_like(clear_sum), where=valid)
+    valid &= avg_clear > 0
+    rain_impact_index = np.divide(avg_rainy, avg_clear, out=np.zeros_like(avg_rainy), where=valid) * 100
+
+    reports_to_create = []
+    for station_id in np.flatnonzero(valid):
+        reports_to_create.append(RainImpactReport(
+            station_id=int(station_id),
+            rain_impact_index=round(float(rain_impact_index[station_id]), 2)
+        ))
     
     # 5. DB에 대량 저장
     RainImpactReport.objects.bulk_create(reports_to_create)
 
-    return len(reports_to_create)
\ No newline at end of file
+    return len(reports_to_create)
+
+
+# ----------------------------------------------------------------------
+# 분실률 지표 (LostItemRate) 증분 갱신
+# ----------------------------------------------------------------------
+def _station_candidates():
+    """StationDict → (match_key, station_id, line_code, station_name_std) 후보 DataFrame"""
+    pairs = set(StationDict.objects.values_list('line_code', 'station_name_std').distinct())
+    codes = StationCodeMap.from_db().ensure(pairs)
+    stations = pd.DataFrame.from_records(
+        [(codes.get(line, name), line, name) for line, name in sorted(pairs)],
+        columns=['station_id', 'line_code', 'station_name_std'],
+    )
+    stations['key'] = stations['station_name_std'].map(station_match_key)
+    return stations
+
+
+def _resolve_lost_stations(lost, stations, ridership):
+    """
+    분실물 발견 역을 StationDict의 (노선, 표준역) → Station 정수 키로 해석합니다.
+    - 역명은 station_match_key로 비교 ('강남역' == '강남')
+    - 노선이 기록되어 있으면 그 노선의 후보만 사용
+    - 노선이 없는 환승역은 기간 내 승하차 인원이 가장 많은 노선으로 귀속
+    """
+    lost = lost.assign(key=lost['station'].fillna('').map(station_match_key))
+    lost['line_hint'] = lost['line'].fillna('').map(lambda x: normalize_line_code(x) if x else '')
+
+    merged = lost.merge(stations, on='key', how='inner')
+    merged = merged[(merged['line_hint'] == '') | (merged['line_hint'] == merged['line_code'])]
+
+    volume = ridership.groupby('station_id', as_index=False)['total'].sum()
+    merged = merged.merge(volume, on='station_id', how='left').fillna({'total': 0})
+    merged = merged.sort_values(['lost_id', 'total'], ascending=[True, False]).drop_duplicates('lost_id')
+    return merged[['date', 'station_id', 'category']]
+
+
+def _rate_refresh_since():
+    """
+    증분 갱신 시작일: 마지막 계산일 - RATE_REFRESH_OVERLAP_DAYS와 재계산 표시(LostItemRateDirtyDate)된 가장 이른 날짜 중 이른 쪽.
+    아직 계산한 적이 없으면 None (전체)
+    """
+    last_date = LostItemRate.objects.aggregate(last=Max('date'))['last']
+    if not last_date:
+        return None
+    since = last_date - timedelta(days=RATE_REFRESH_OVERLAP_DAYS)
+    dirty = LostItemRateDirtyDate.objects.aggregate(first=Min('date'))['first']
+    return min(since, dirty) if dirty else since
+
+
+def refresh_lost_item_rates(since=None, full=False):
+    """
+    LostItem(+ 콜드 아카이브) × RidershipDaily를 (날짜, 노선, 표준역, 카테고리) 단위로 집계하여 LostItemRate에 저장합니다.
+    since 이후 날짜만 지우고 다시 계산하며, 생략하면 _rate_refresh_since()부터 갱신합니다.
+    이번 계산 구간에 든 재계산 표시는 지웁니다. (계산 중에 새로 들어온 표시는 남겨 다음 갱신에서 반영)
+    반환값: (갱신 시작일, 저장한 행 수)
+    """
+    if full:
+        since = None
+    elif since is None:
+        since = _rate_refresh_since()
+    dirty = LostItemRateDirtyDate.objects.all()
+    if since:
+        dirty = dirty.filter(date__gte=since)
+    last_mark = dirty.aggregate(last=Max('pk'))['last']
+
+    # 콜드 아카이브로 옮긴 분실물도 분실률 이력에 포함합니다. (ArchivedLostItem.id = 원래 LostItem pk라 겹치지 않음)
+    lost_querysets = [
+        model.objects.filter(registered_at__isnull=False, station__isnull=False).exclude(station='')
+        for model in (LostItem, ArchivedLostItem)
+    ]
+    ridership_qs = RidershipDaily.objects.all()
+    if since:
+        # registered_at은 자정(현지 시각)으로 저장되므로 하루 여유를 두고 가져온 뒤 날짜로 다시 자릅니다.
+        start = timezone.make_aware(datetime.combine(since - timedelta(days=1), datetime.min.time()))
+        lost_querysets = [qs.filter(registered_at__gte=start) for qs in lost_querysets]
+        ridership_qs = ridership_qs.filter(date__gte=since)
+
+    lost = pd.DataFrame.from_records(
+        (
+            row for qs in lost_querysets
+            for row in qs.values_list('id', 'registered_at', 'line', 'station', 'category').iterator(chunk_size=5000)
+        ),
+        columns=['lost_id', 'registered_at', 'line', 'station', 'category'],
+    )
+    ridership = pd.DataFrame.from_records(
+        ridership_qs.values_list('date', 'station_id', 'total').iterator(chunk_size=5000),
+        columns=['date', 'station_id', 'total'],
+    )
+
+    if not lost.empty:
+        lost['date'] = (
+            pd.to_datetime(lost['registered_at'], utc=True)
+            .dt.tz_convert(settings.TIME_ZONE)
+            .dt.date
+        )
+        if since:
+            lost = lost[lost['date'] >= since]
+        lost['category'] = lost['category'].fillna('기타')
+
+        resolved = _resolve_lost_stations(lost, _station_candidates(), ridership)
+        counts = (
+            resolved.groupby(['date', 'station_id', 'category'], as_index=False)
+            .size()
+            .rename(columns={'size': 'lost_count'})
+        )
+    else:
+        counts = pd.DataFrame(columns=['date', 'station_id', 'category', 'lost_count'])
+
+    keys = ['date', 'station_id']
+    # 역·일 합계 행: 분실물이 없는 날의 승하차 인원도 분모에 포함되도록 RidershipDaily 기준 outer join
+    totals = counts.groupby(keys, as_index=False)['lost_count'].sum()
+    totals = ridership.merge(totals, on=keys, how='outer').assign(category=LostItemRate.ALL_CATEGORIES)
+    totals['lost_count'] = totals['lost_count'].fillna(0)
+
+    frame = pd.concat([
+        counts.merge(ridership, on=keys, how='left'),
+        totals,
+    ], ignore_index=True)
+    frame['total'] = frame['total'].fillna(0).astype('int64')
+    frame['rate'] = (frame['lost_count'] / frame['total'].where(frame['total'] > 0) * 10000).round(4)
+
+    rates = [
+        LostItemRate(
+            date=row.date,
+            station_id=int(row.station_id),
+            category=row.category,
+            lost_count=int(row.lost_count),
+            ridership=int(row.total),
+            rate_per_10k=None if pd.isna(row.rate) else float(row.rate),
+        )
+        for row in frame.itertuples(index=False)
+    ]
+
+    with transaction.atomic():
+        stale = LostItemRate.objects.all()
+        if since:
+            stale = stale.filter(date__gte=since)
+        stale.delete()
+        LostItemRate.objects.bulk_create(rates, batch_size=1000)
+        if last_mark is not None:
+            dirty.filter(pk__lte=last_mark).delete()
+
+    return since, len(rates)
+
+
+# ----------------------------------------------------------------------
+# 요일 × 노선 × 역 × 카테고리 패턴 큐브 증분 갱신
+# ----------------------------------------------------------------------
+def _rate_rows(since=None):
+    rows = LostItemRate.objects.all()
+    if since:
+        rows = rows.filter(date__gte=since)
+    return rows.values_list(
+        'date', 'station__line_code', 'station__station_name_std', 'category', 'lost_count', 'ridership'
+    ).iterator(chunk_size=5000)
+
+
+def _rate_version():
+    """큐브가 어떤 LostItemRate 상태에서 만들어졌는지 확인하기 위한 (행 수, 분실물 합, 승하차 합)"""
+    totals = LostItemRate.objects.aggregate(rows=Count('id'), lost=Sum('lost_count'), riders=Sum('ridership'))
+    return [totals['rows'], totals['lost'] or 0, totals['riders'] or 0]
+
+
+def refresh_analytics(full=False):
+    """
+    LostItemRate를 증분 갱신하면서 같은 구간만큼 PatternCube도 갱신합니다.
+    (다시 계산할 구간의 기존 행을 큐브에서 빼고, 새로 계산한 행을 더합니다.)
+    큐브 파일이 없거나 마지막 저장 이후 테이블이 따로 바뀌었으면 전체를 다시 쌓습니다.
+    반환값: (갱신 시작일, LostItemRate 저장 행 수)
+    """
+    since = None if full else _rate_refresh_since()
+
+    cube = None if full else PatternCube.load()
+    if cube is not None and cube.version != _rate_version():
+        cube = None
+    if cube is not None:
+        cube.apply(_rate_rows(since), LostItemRate.ALL_CATEGORIES, sign=-1)
+
+    since, rate_count = refresh_lost_item_rates(since=since, full=full)
+
+    if cube is None:
+        cube = PatternCube()
+        cube.apply(_rate_rows(), LostItemRate.ALL_CATEGORIES)
+    else:
+        cube.apply(_rate_rows(since), LostItemRate.ALL_CATEGORIES)
+    cube.version = _rate_version()
+    cube.save()
+
+    return since, rate_count
@@ -0,0 +1,405 @@
+# pickuplog/main/ridership_files.py (승하차 인원 월별 CSV 파일 대량 적재)
+
+import codecs
+import csv
+import io
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import cached_property
+
+from main.normalize import NormalizationRules, active_rules, install_rules, load_rules
+
+# 작업자 프로세스에 한 번에 넘기는 원본 바이트 (줄 경계에서 자름)
+BLOCK_BYTES = 4 * 1024 * 1024
+# 작업자당 동시에 맡겨 두는 블록 수 (이보다 많으면 쓰기 쪽이 따라잡을 때까지 파일 읽기를 멈춤)
+BLOCKS_IN_FLIGHT = 2
+# 쓰기 담당이 한 트랜잭션에서 upsert하는 행 수
+WRITE_BATCH = 20000
+# RidershipDaily upsert 열 순서 (앞의 두 개가 유일 키, 나머지는 충돌 시 갱신)
+UPSERT_FIELDS = ('date', 'station', 'boardings', 'alightings', 'total')
+# 승하차 인원 상한 (RidershipDaily IntegerField 범위, BatchValidator.integers와 같음)
+MAX_COUNT = 2 ** 31 - 1
+# 파일 인코딩 판별에 쓰는 앞부분 크기
+SNIFF_BYTES = 64 * 1024
+
+# 표준 필드 → 파일 헤더 후보 (열린데이터광장 CSV 한글 헤더 / Open API 필드명 / 과거 파일 헤더)
+COLUMN_ALIASES = {
+    'date': ('사용일자', 'USE_YMD', 'USE_DT'),
+    'line': ('노선명', '호선명', 'SBWY_ROUT_LN_NM', 'LINE_NUM'),
+    'station': ('역명', 'SBWY_STNS_NM', 'SUB_STA_NM'),
+    'boardings': ('승차총승객수', 'GTON_TNOPE', 'RIDE_PASGR_NUM'),
+    'alightings': ('하차총승객수', 'GTOFF_TNOPE', 'ALIGHT_PASGR_NUM'),
+}
+
+
+class RidershipFileError(Exception):
+    """파일을 읽을 수 없거나 필요한 열이 없을 때"""
+
+
+# ----------------------------------------------------------------------
+# 파일 읽기 (메인 프로세스): 헤더 해석 + 줄 경계 블록
+# ----------------------------------------------------------------------
+def detect_encoding(head):
+    """BOM이 있으면 utf-8-sig, UTF-8로 읽히면 utf-8, 아니면 cp949 (서울시 예전 파일)"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def read_header(path):
+    """
+    반환: (인코딩, {표준 필드: 열 위치}, 헤더 끝 바이트 위치, 헤더 열 이름 목록)
+    필요한 열이 하나라도 없으면 RidershipFileError.
+    """
+    with open(path, 'rb') as f:
+        encoding = detect_encoding(f.read(SNIFF_BYTES))
+        f.seek(0)
+        header_line = f.readline()
+        offset = f.tell()
+    header = next(csv.reader([header_line.decode(encoding, errors='replace')]), [])
+    header = [name.strip().strip('"') for name in header]
+
+    columns, missing = {}, []
+    for field, aliases in COLUMN_ALIASES.items():
+        position = next((header.index(alias) for alias in aliases if alias in header), None)
+        if position is None:
+            missing.append(aliases[0])
+        else:
+            columns[field] = position
+    if missing:
+        raise RidershipFileError(f"필요한 열이 없습니다: {', '.join(missing)} (헤더: {', '.join(header[:10])})")
+    return encoding, columns, offset, header
+
+
+def iter_blocks(path, offset, block_bytes=BLOCK_BYTES):
+    """
+    (블록 첫 줄의 파일 행 번호, 바이트) 를 차례로 내보냅니다.
+    블록은 항상 줄 끝에서 자르므로 작업자가 따로 csv로 읽어도 행이 쪼개지지 않습니다.
+    (따옴표 안 줄바꿈은 고려하지 않습니다. 승하차 파일에는 여러 줄 값이 없습니다.)
+    """
+    line_number = 2
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            data = f.read(block_bytes)
+            if not data:
+                return
+            if not data.endswith(b'\n'):
+                data += f.readline()
+            yield line_number, data
+            line_number += data.count(b'\n')
+
+
+# ----------------------------------------------------------------------
+# 정규화 (작업자 프로세스): Django / DB 없이 순수 파이썬으로만 처리
+# ----------------------------------------------------------------------
+# 작업자마다 initializer로 한 번 받아 두는 StationDict 사전 {(원천 역명, 노선 코드): 표준 역명}
+_std_names = {}
+
+
+def init_worker(std_names, rule_tables):
+    """작업자 시작 시 StationDict 사전과 정규화 규칙 표(NormalizationRules.tables)를 받아 규칙을 다시 컴파일합니다."""
+    global _std_names
+    _std_names = std_names
+    install_rules(NormalizationRules(*rule_tables))
+
+
+def _parse_date(text):
+    digits = text.split(' ')[0].replace('-', '').replace('/', '').replace('.', '')
+    if len(digits) != 8 or not digits.isdigit():
+        raise ValueError(text)
+    return date(int(digits[:4]), int(digits[4:6]), int(digits[6:])).toordinal()
+
+
+def _parse_count(text):
+    if text == '':
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        value = float(text)
+        if not value.is_integer():
+            raise
+        return int(value)
+
+
+def normalize_block(encoding, columns, first_line, data):
+    """
+    CSV 블록 하나를 읽어 정규화합니다.
+    반환: (records, rejects)
+      records: [(노선 코드, 표준 역명, 원천 역명, 날짜 ordinal, 승차, 하차), ...]
+      rejects: [(파일 행 번호, 원천 값 목록, [사유, ...]), ...]  (사유 문구는 BatchValidator와 같음)
+    """
+    date_col, line_col, station_col = columns['date'], columns['line'], columns['station']
+    on_col, off_col = columns['boardings'], columns['alightings']
+    width = max(columns.values()) + 1
+    std_names = _std_names
+    rules = active_rules()
+    line_code_of, station_name_of = rules.line_code, rules.station_name
+
+    records, rejects = [], []
+    reader = csv.reader(io.StringIO(data.decode(encoding, errors='replace'), newline=''))
+    for line_number, row in enumerate(reader, start=first_line):
+        if not row:
+            continue
+        if len(row) < width:
+            rejects.append((line_number, row, [f'열 개수 부족 ({width}개 필요)']))
+            continue
+        raw_name, line_name = row[station_col].strip(), row[line_col].strip()
+        reasons = [f"필수 값 누락: {COLUMN_ALIASES[field][0]}" for field, value in (
+            ('date', row[date_col].strip()), ('line', line_name), ('station', raw_name),
+        ) if not value]
+        day = boardings = alightings = None
+        if row[date_col].strip():
+            try:
+                day = _parse_date(row[date_col].strip())
+            except ValueError:
+                reasons.append(f"날짜 형식 오류: {COLUMN_ALIASES['date'][0]}")
+        try:
+            boardings = _parse_count(row[on_col].strip())
+            alightings = _parse_count(row[off_col].strip())
+        except ValueError:
+            reasons.append('숫자 형식 오류: 승하차 인원')
+        else:
+            if not (0 <= boardings <= MAX_COUNT and 0 <= alightings <= MAX_COUNT):
+                reasons.append('허용 범위 밖의 값: 승하차 인원')
+        if reasons:
+            rejects.append((line_number, row, reasons))
+            continue
+
+        line_code = line_code_of(line_name)
+        station_std = std_names.get((raw_name, line_code)) or station_name_of(raw_name)
+        records.append((line_code, station_std, raw_name, day, boardings, alightings))
+    return records, rejects
+
+
+def normalizer_pool(workers, std_names, rules):
+    """정규화 작업자 풀 (workers <= 1이면 None → 메인 프로세스에서 직접 정규화)"""
+    if workers <= 1:
+        init_worker(std_names, rules.tables)
+        return None
+    # fork한 자식이 부모의 DB 연결을 물려받지 않도록 spawn으로 띄웁니다.
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(std_names, rules.tables))
+
+
+def normalized_blocks(tasks, pool, workers):
+    """
+    tasks: (encoding, columns, first_line, data) 반복자. 반환: (블록 바이트 수, (records, rejects)) 반복자
+    결과는 제출한 순서대로 내보냅니다. (같은 (역, 날짜)가 여러 번 나오면 파일에서 나중 행이 이기도록)
+    맡겨 둔 블록이 workers × BLOCKS_IN_FLIGHT개를 넘으면 가장 오래된 결과를 받을 때까지 읽기를 멈추므로
+    메모리 사용량은 파일 크기와 무관하게 일정합니다.
+    """
+    if pool is None:
+        for task in tasks:
+            yield len(task[3]), normalize_block(*task)
+        return
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= workers * BLOCKS_IN_FLIGHT:
+            size, future = pending.popleft()
+            yield size, future.result()
+        pending.append((len(task[3]), pool.submit(normalize_block, *task)))
+    while pending:
+        size, future = pending.popleft()
+        yield size, future.result()
+
+
+# ----------------------------------------------------------------------
+# 쓰기 (메인 프로세스 하나): 정규화 결과를 모아 일괄 upsert
+# ----------------------------------------------------------------------
+class RidershipWriter:
+    """
+    모든 작업자의 결과를 이 객체 하나가 받아 WRITE_BATCH행마다 한 트랜잭션으로 씁니다.
+      - 처음 보는 (원천 역명, 노선) → StationDict, 처음 보는 (노선, 표준 역명) → Station 차원에 추가
+      - RidershipDaily는 (station, date) 기준 upsert (배치 안 중복은 나중 행 기준)
+      - 검증 실패 행은 QuarantinedRow(source=ridership_file)로 격리
+    dry_run이면 아무것도 쓰지 않고 건수만 셉니다.
+    """
+
+    def __init__(self, batch_id, dry_run=False):
+        from main.models import StationDict
+        from main.stations import StationCodeMap
+
+        self.batch_id = batch_id
+        self.dry_run = dry_run
+        self.station_codes = StationCodeMap.from_db()
+        self.known_raw = set(StationDict.objects.values_list('station_name_raw', 'line_code'))
+        self.pending = {}
+        self.new_raw = {}
+        self.written = 0
+        self.rejected = 0
+        self.new_stations = 0
+
+    @cached_property
+    def upsert_sql(self):
+        """
+        flush에서 executemany로 실행하는 RidershipDaily (station, date) upsert 문.
+        행이 수만 개일 때 bulk_create(update_conflicts)는 시간 대부분을 모델 인스턴스 생성과 SQL 조립에 쓰므로
+        쓰기 담당은 같은 INSERT ... ON CONFLICT DO UPDATE 문을 한 번만 만들어 둡니다. (SQLite / PostgreSQL 공통 문법)
+        """
+        from django.db import connection
+        from main.models import RidershipDaily
+
+        quote = connection.ops.quote_name
+        meta = RidershipDaily._meta
+        column = {name: quote(meta.get_field(name).column) for name in UPSERT_FIELDS}
+        updates = ', '.join(f"{column[name]} = excluded.{column[name]}" for name in UPSERT_FIELDS[2:])
+        return (
+            f"INSERT INTO {quote(meta.db_table)} ({', '.join(column.values())}) "
+            f"VALUES ({', '.join(['%s'] * len(column))}) "
+            f"ON CONFLICT ({column['station']}, {column['date']}) DO UPDATE SET {updates}"
+        )
+
+    def add(self, records, rejects, source_name, header):
+        for line_code, station_std, raw_name, day, boardings, alightings in records:
+            self.pending[(line_code, station_std, day)] = (boardings, alightings)
+            if (raw_name, line_code) not in self.known_raw:
+                self.new_raw[(raw_name, line_code)] = station_std
+        if rejects:
+            self._quarantine(rejects, source_name, header)
+        if len(self.pending) >= WRITE_BATCH:
+            self.flush()
+
+    def _quarantine(self, rejects, source_name, header):
+        from main.models import QuarantinedRow
+
+        self.rejected += len(rejects)
+        if self.dry_run:
+            return
+        QuarantinedRow.objects.bulk_create(
+            [
+                QuarantinedRow(
+                    source=QuarantinedRow.SOURCE_RIDERSHIP_FILE,
+                    batch_id=self.batch_id,
+                    row_number=line_number,
+                    raw={'file': source_name, **{
+                        (header[i] if i < len(header) else str(i)): value for i, value in enumerate(row)
+                    }},
+                    reasons=reasons,
+                )
+                for line_number, row, reasons in rejects
+            ],
+            batch_size=1000,
+        )
+
+    def flush(self):
+        from django.db import connection, transaction
+        from main.models import StationDict
+
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        new_raw, self.new_raw = self.new_raw, {}
+        if self.dry_run:
+            self.written += len(pending)
+            self.known_raw.update(new_raw)
+            return
+        adapt_date = connection.ops.adapt_datefield_value
+
+        with transaction.atomic():
+            if new_raw:
+                StationDict.objects.bulk_create(
+                    [
+                        StationDict(station_name_raw=raw, line_code=line, station_name_std=std)
+                        for (raw, line), std in new_raw.items()
+                    ],
+                    batch_size=500,
+                    ignore_conflicts=True,
+                )
+                self.known_raw.update(new_raw)
+            before = len(self.station_codes)
+            self.station_codes.ensure({(line, std) for line, std, _ in pending})
+            self.new_stations += len(self.station_codes) - before
+
+            rows = [
+                (
+                    adapt_date(date.fromordinal(day)),
+                    self.station_codes.get(line_code, station_std),
+                    boardings,
+                    alightings,
+                    boardings + alightings,
+                )
+                for (line_code, station_std, day), (boardings, alightings) in pending.items()
+            ]
+            with connection.cursor() as cursor:
+                cursor.executemany(self.upsert_sql, rows)
+        self.written += len(pending)
+
+    def finish(self):
+        """남은 행을 쓰고, 새로 생긴 환승역 표시와 Station 차원을 StationDict에 맞춥니다."""
+        from django.db.models import Count
+        from main.models import StationDict
+        from main.stations import sync_station_dimension
+
+        self.flush()
+        if self.dry_run:
+            return
+        transfers = (
+            StationDict.objects.values('station_name_std')
+            .annotate(lines=Count('line_code', distinct=True))
+            .filter(lines__gt=1)
+            .values('station_name_std')
+        )
+        StationDict.objects.filter(station_name_std__in=transfers, is_transfer=False).update(is_transfer=True)
+        sync_station_dimension()
+
+
+def import_files(paths, workers=1, block_bytes=BLOCK_BYTES, dry_run=False, on_file=None):
+    """
+    paths의 CSV를 차례로 읽어 적재합니다. 파일 읽기와 쓰기는 메인 프로세스, 정규화는 작업자 프로세스가 맡습니다.
+    헤더는 시작 전에 모두 확인하므로 열이 맞지 않는 파일이 있으면 아무것도 쓰기 전에 RidershipFileError가 납니다.
+    on_file(path, stats)는 파일 하나를 마칠 때마다 호출됩니다. ({'bytes', 'rows', 'seconds'})
+    반환: {'files', 'bytes', 'rows', 'written', 'rejected', 'new_stations', 'seconds'}
+    """
+    from main.models import StationDict
+    from main.validation import new_batch_id
+
+    headers = {path: read_header(path) for path in paths}
+    rules = load_rules()
+    std_names = {
+        (raw, line): std
+        for raw, line, std in StationDict.objects.values_list('station_name_raw', 'line_code', 'station_name_std')
+    }
+    writer = RidershipWriter(new_batch_id(), dry_run=dry_run)
+    totals = {'files': 0, 'bytes': 0, 'rows': 0}
+    started = time.perf_counter()
+
+    pool = normalizer_pool(workers, std_names, rules)
+    try:
+        for path in paths:
+            encoding, columns, offset, header = headers[path]
+            file_started, file_bytes, file_rows = time.perf_counter(), 0, 0
+            tasks = (
+                (encoding, columns, first_line, data)
+                for first_line, data in iter_blocks(path, offset, block_bytes)
+            )
+            for size, (records, rejects) in normalized_blocks(tasks, pool, workers):
+                writer.add(records, rejects, str(path), header)
+                file_bytes += size
+                file_rows += len(records) + len(rejects)
+            writer.flush()
+            totals['files'] += 1
+            totals['bytes'] += file_bytes
+            totals['rows'] += file_rows
+            if on_file is not None:
+                on_file(path, {'bytes': file_bytes, 'rows': file_rows, 'seconds': time.perf_counter() - file_started})
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    writer.finish()
+
+    return {
+        **totals,
+        'written': writer.written,
+        'rejected': writer.rejected,
+        'new_stations': writer.new_stations,
+        'seconds': time.perf_counter() - started,
+    }
@@ -0,0 +1,64 @@
+# pickuplog/main/routers.py (분석 읽기 / 쓰기 DB 라우터)
+
+import asyncio
+import contextvars
+import functools
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from main.db import analytics_db_available
+
+# 현재 요청(또는 작업)이 분석 화면 읽기인지. contextvar라 스레드 / async 태스크마다 따로 유지됩니다.
+_analytics_reads = contextvars.ContextVar('analytics_reads', default=False)
+
+
+@contextmanager
+def use_analytics_db():
+    """이 블록 안의 읽기 쿼리를 분석용 스냅샷(또는 복제본)으로 보냅니다."""
+    token = _analytics_reads.set(True)
+    try:
+        yield
+    finally:
+        _analytics_reads.reset(token)
+
+
+def analytics_reads(view):
+    """
+    분석 화면 뷰 데코레이터 (동기 / async 뷰 모두 지원).
+    뷰 안의 읽기는 스냅샷으로 가므로, 적재(sync_*)가 primary에 쓰기 잠금을 잡고 있어도 대시보드가 기다리지 않고
+    대시보드의 무거운 집계도 primary를 붙잡지 않습니다. (스냅샷 시점은 마지막 sync_reports 완료 시점)
+    """
+    if asyncio.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            with use_analytics_db():
+                return await view(*args, **kwargs)
+    else:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with use_analytics_db():
+                return view(*args, **kwargs)
+    return wrapper
+
+
+class AnalyticsRouter:
+    """
+    - 읽기: analytics_reads / use_analytics_db 안이고 스냅샷이 있으면 분석 DB, 그 밖에는 primary
+    - 쓰기 / CRUD / 마이그레이션: 항상 primary (스냅샷은 primary를 복사해 만드므로 마이그레이션하지 않음)
+    """
+
+    def db_for_read(self, model, **hints):
+        if _analytics_reads.get() and analytics_db_available():
+            return settings.ANALYTICS_DB_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 스냅샷은 primary와 스키마가 같은 복사본이므로 DB 간 관계를 막지 않습니다.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != settings.ANALYTICS_DB_ALIAS
@@ -0,0 +1,155 @@
+# pickuplog/main/scenario.py (강수 what-if 시나리오 모델)
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from main.forecast import design_matrix, fit_ridge
+from main.models import LostItemRate, RainImpactReport
+from main.snapshot import ensure_snapshot, to_day
+
+SCENARIO_FILENAME = 'scenario_model.npz'
+
+
+def scenario_path():
+    return settings.ANALYTICS_DIR / SCENARIO_FILENAME
+
+
+class ScenarioModel:
+    """
+    역별 회귀 계수를 (2 × 역 수, 특징 수) 배열 하나로 보관합니다.
+    앞쪽 절반은 승하차 인원, 뒤쪽 절반은 1만 명당 분실률 계수이며,
+    시나리오 한 건은 이 배열과 특징 벡터(시나리오 / 무강수 기준선 2열)의 곱 한 번으로 전 역을 예측합니다.
+    """
+
+    def __init__(self, stations, coefficients, rii, training_days, temp_fill):
+        self.stations = [tuple(station) for station in stations]
+        self.coefficients = coefficients
+        self.rii = rii
+        self.training_days = training_days
+        self.temp_fill = float(temp_fill)
+        self.lines = np.array([line for line, _ in self.stations], dtype=str)
+
+    def predict(self, day, rain_mm, avg_temp=None):
+        """
+        일수(day), 강수량, 기온 시나리오에 대한 역별 예측.
+        반환: (승하차 인원, 분실물 수, 비가 오지 않을 때 승하차 인원) 배열 — 모두 역 수 길이
+        """
+        temp = np.nan if avg_temp is None else avg_temp
+        # 시나리오와 같은 조건의 무강수 기준선을 같은 곱셈에서 함께 계산 (k × 2)
+        X = design_matrix([day, day], [rain_mm, 0.0], [temp, temp], self.temp_fill).T
+        predicted = np.clip(self.coefficients @ X, 0, None)
+
+        n = len(self.stations)
+        ridership, dry_ridership = predicted[:n, 0], predicted[:n, 1]
+        lost = ridership * predicted[n:, 0] / 10000
+        return ridership, lost, dry_ridership
+
+    # ------------------------------------------------------------------
+    # 저장 / 불러오기
+    # ------------------------------------------------------------------
+    def save(self, path=None):
+        path = path or scenario_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez(
+            tmp_path,
+            coefficients=self.coefficients,
+            rii=self.rii,
+            training_days=self.training_days,
+            temp_fill=np.array(self.temp_fill),
+            station_lines=np.array([line for line, _ in self.stations], dtype=str),
+            station_names=np.array([name for _, name in self.stations], dtype=str),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or scenario_path()
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return cls(
+                stations=zip(data['station_lines'].tolist(), data['station_names'].tolist()),
+                coefficients=data['coefficients'],
+                rii=data['rii'],
+                training_days=data['training_days'],
+                temp_fill=data['temp_fill'],
+            )
+
+
+# ----------------------------------------------------------------------
+# 모델 학습 (sync_reports 이후 실행)
+# ----------------------------------------------------------------------
+def build_scenario_model():
+    """
+    LostItemRate의 역·일 합계 행으로 역별 승하차 인원 / 분실률 회귀를 한 번에 학습해 저장합니다.
+    RainImpactReport의 RII는 응답에 함께 싣기 위해 같은 역 순서의 배열로 붙여 둡니다.
+    반환값: 학습한 역 수
+    """
+    totals = pd.DataFrame.from_records(
+        LostItemRate.objects.filter(category=LostItemRate.ALL_CATEGORIES, ridership__gt=0)
+        .values_list('date', 'station__line_code', 'station__station_name_std', 'lost_count', 'ridership').iterator(chunk_size=5000),
+        columns=['date', 'line_code', 'station_name_std', 'lost_count', 'ridership'],
+    )
+    if totals.empty:
+        return 0
+
+    wide = totals.pivot_table(
+        index='date', columns=['line_code', 'station_name_std'],
+        values=['ridership', 'lost_count'], aggfunc='sum',
+    )
+    dates = list(wide.index)
+    ridership = wide['ridership'].to_numpy(dtype=np.float64)
+    lost = wide['lost_count'].reindex(columns=wide['ridership'].columns).fillna(0).to_numpy(dtype=np.float64)
+    stations = list(wide['ridership'].columns)
+
+    snapshot = ensure_snapshot()
+    days = np.array([to_day(d) for d in dates], dtype=np.int64)
+    index, found = snapshot.weather_for(days)
+    weather = snapshot.weather
+    rain = np.where(found, weather['rain_mm'][index], np.nan)
+    temp = np.where(found, weather['avg_temp'][index], np.nan)
+    temp_fill = float(np.nanmean(temp)) if np.isfinite(temp).any() else 15.0
+
+    mask = ~np.isnan(ridership) & (np.nan_to_num(ridership) > 0) & found[:, None]
+    rates = np.divide(lost * 10000, ridership, out=np.zeros_like(lost), where=mask)
+
+    X = design_matrix(days, rain, temp, temp_fill)
+    # 승하차 / 분실률 목표를 옆으로 붙여 2 × 역 수 개의 회귀를 한 번에 풉니다.
+    Y = np.hstack([np.nan_to_num(ridership), rates])
+    B, n = fit_ridge(X, Y, np.hstack([mask, mask]))
+
+    rii_lookup = dict(
+        ((line, station), rii)
+        for line, station, rii in RainImpactReport.objects.values_list('station__line_code', 'station__station_name_std', 'rain_impact_index')
+    )
+    rii = np.array([rii_lookup.get(station, np.nan) for station in stations], dtype=np.float64)
+
+    ScenarioModel(stations, B, rii, n[:len(stations)], temp_fill).save()
+    return len(stations)
+
+
+# ----------------------------------------------------------------------
+# 프로세스 단위 캐시: 파일이 바뀌었을 때만 다시 읽습니다.
+# ----------------------------------------------------------------------
+_cache_lock = threading.Lock()
+_cached = {'mtime': None, 'model': None}
+
+
+def get_scenario_model():
+    """메모리에 올린 ScenarioModel을 반환합니다. 모델 파일이 없으면 None."""
+    path = scenario_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _cached['mtime'] != mtime:
+        with _cache_lock:
+            if _cached['mtime'] != mtime:
+                _cached['model'] = ScenarioModel.load(path)
+                _cached['mtime'] = mtime
+    return _cached['model']
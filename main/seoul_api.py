@@ -0,0 +1,562 @@
+# pickuplog/main/seoul_api.py (서울 열린데이터광장 Open API 공용 클라이언트)
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from main.api_cache import ZLIB_LEVEL, ResponseCache, cache_ttl
+from main.json_stream import RowStreamDecoder
+
+BASE_URL = 'http://openapi.seoul.go.kr:8088'
+DEFAULT_API_KEY = 'sample'
+# 요청 한 번에 받을 수 있는 최대 행 수 (초과 시 ERROR-336)
+PAGE_SIZE = 1000
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+# 재시도: 지수 백오프 + full jitter (대기 = 0 ~ min(상한, 기준 × 2^시도) 사이 임의 값)
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+# AIMD 동시 요청 한도: 정상 응답마다 조금씩(+1/한도) 늘리고, 오류 / 느린 응답이면 절반으로 줄입니다.
+INITIAL_CONCURRENCY = 2
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+# 이 시간(초)보다 느린 응답은 서버 과부하 신호로 봅니다.
+SLOW_RESPONSE = 5.0
+# 동시에 실패한 요청들이 한도를 연달아 깎지 않도록, 감소 후 이 시간(초) 동안은 다시 줄이지 않음
+DECREASE_COOLDOWN = 1.0
+
+# 서킷 브레이커: 연속 BREAKER_THRESHOLD번 실패하면 BREAKER_RESET초 동안 요청하지 않고 바로 실패시킵니다.
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 30.0
+
+# 스트리밍 해석: 응답을 나눠 읽는 바이트 / 소비 쪽에 넘기는 행 묶음 크기 / 생산 스레드가 앞서 받아 둘 수 있는 묶음 수
+STREAM_CHUNK = 64 * 1024
+STREAM_BATCH = 200
+STREAM_QUEUE = 4
+
+# 응답 RESULT.CODE 분류
+NO_DATA_CODES = {'INFO-200'}                           # 해당하는 데이터가 없습니다.
+RETRY_CODES = {'ERROR-500', 'ERROR-600', 'ERROR-601'}  # 서버 / DB 연결 / SQL 오류 (일시 장애)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class SeoulApiError(Exception):
+    """Open API 요청 실패 (재시도 후에도 실패했거나 재시도할 수 없는 오류 코드)"""
+
+    def __init__(self, message, code=None, retryable=False):
+        super().__init__(message)
+        self.code = code
+        self.retryable = retryable
+
+
+class CircuitOpenError(SeoulApiError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+def load_api_key(default=DEFAULT_API_KEY):
+    """환경 변수(.env 포함)의 SEOUL_API_KEY"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv('SEOUL_API_KEY', default)
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# ----------------------------------------------------------------------
+# AIMD 동시성 한도 / 서킷 브레이커 / 지표
+# ----------------------------------------------------------------------
+class AimdLimiter:
+    """동시에 진행 중인 요청 수를 int(limit) 이하로 묶고, 응답 결과에 따라 limit을 AIMD로 조절합니다."""
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY, maximum=MAX_CONCURRENCY,
+                 cooldown=DECREASE_COOLDOWN):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._last_decrease = float('-inf')
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, congested):
+        with self._cond:
+            self.in_flight -= 1
+            if not congested:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif time.monotonic() - self._last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit / 2)
+                self._last_decrease = time.monotonic()
+            self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 threshold회) → open → (reset_timeout초 경과) → half-open(시험 요청 1건)
+    시험 요청이 성공하면 closed, 실패하면 다시 open.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state, self._trial = self.HALF_OPEN, False
+            if self.state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+            wait = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(f'연속 {self.failures}회 실패로 요청 차단 중 (약 {wait:.0f}초 후 재시도)')
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self._trial = self.CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state, self._opened_at, self._trial = self.OPEN, time.monotonic(), False
+
+
+class ApiMetrics:
+    """
+    서비스별 요청 1건마다의 지연(ms)과 결과 집계.
+    결과: ok / no_data / cached(캐시 적중, 네트워크 없음) / revalidated(304) / retry / error / rejected(서킷 차단)
+    """
+
+    OUTCOMES = ('ok', 'no_data', 'cached', 'revalidated', 'retry', 'error', 'rejected')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.outcomes = {}
+
+    def record(self, service, outcome, latency=None):
+        with self._lock:
+            if latency is not None:
+                self.latencies.setdefault(service, []).append(latency * 1000)
+            counts = self.outcomes.setdefault(service, dict.fromkeys(self.OUTCOMES, 0))
+            counts[outcome] += 1
+
+    def summary(self):
+        """{서비스: {requests(네트워크 요청 수), p50_ms, p95_ms, max_ms, 결과별 건수}}"""
+        with self._lock:
+            result = {}
+            for service, counts in self.outcomes.items():
+                samples = self.latencies.get(service) or [0.0]
+                result[service] = {
+                    'requests': len(self.latencies.get(service, [])),
+                    'p50_ms': round(_percentile(samples, 50), 1),
+                    'p95_ms': round(_percentile(samples, 95), 1),
+                    'max_ms': round(max(samples), 1),
+                    **counts,
+                }
+            return result
+
+
+# ----------------------------------------------------------------------
+# 스트리밍 해석
+# ----------------------------------------------------------------------
+class _RowSink:
+    """
+    get(on_rows=...) 한 번 동안 on_rows로 넘긴 행 수와 on_rows에서 보낸 시간을 셉니다.
+    재시도하면 새 응답의 앞부분 중 이미 넘긴 만큼은 건너뜁니다.
+    """
+
+    def __init__(self, on_rows):
+        self.on_rows = on_rows
+        self.delivered = 0
+        self.stalled = 0.0
+
+    def decode(self, service, chunks):
+        """바이트 조각을 해석해 새 row만 on_rows로 넘기고, row를 뺀 문서(dict)를 반환합니다."""
+        decoder = RowStreamDecoder(service)
+        seen = 0
+        for chunk in chunks:
+            rows = decoder.feed(chunk)
+            if not rows:
+                continue
+            fresh = rows[max(0, self.delivered - seen):]
+            seen += len(rows)
+            if fresh:
+                started = time.perf_counter()
+                self.on_rows(fresh)
+                self.stalled += time.perf_counter() - started
+                self.delivered += len(fresh)
+        return decoder.close()
+
+
+class _StreamCancelled(Exception):
+    """소비 쪽이 RowStream을 중간에 그만 읽음 (생산 스레드 종료용)"""
+
+
+class RowStream:
+    """
+    client.get(on_rows=...)를 별도 스레드에서 돌리며 받은 row를 batch_size개씩 내보내는 반복자.
+    소비 쪽(메인 스레드의 DB 쓰기)이 묶음을 처리하는 동안 다음 조각을 계속 받고, 큐(STREAM_QUEUE 묶음)가 차면
+    다운로드를 멈추므로 메모리는 페이지 크기와 무관하게 batch_size × STREAM_QUEUE 행 이내입니다.
+    반복이 끝나면 body에 row를 뺀 서비스 본문(데이터 없음이면 None)이 들어 있고, 요청이 실패하면 반복 중에 예외가 납니다.
+    """
+
+    def __init__(self, client, call, batch_size=STREAM_BATCH):
+        self.client = client
+        self.call = call
+        self.batch_size = batch_size
+        self.body = None
+        self.rows = 0
+        self._queue = queue.Queue(maxsize=STREAM_QUEUE)
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._produce, name='seoul-api-stream', daemon=True)
+            self._thread.start()
+        return self
+
+    def cancel(self):
+        """그만 읽음: 생산 스레드는 다음 묶음을 넘기려다 멈춥니다."""
+        self._cancelled.set()
+
+    def _put(self, item):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _StreamCancelled()
+
+    def _produce(self):
+        pending = []
+
+        def on_rows(rows):
+            pending.extend(rows)
+            while len(pending) >= self.batch_size:
+                self._put(('rows', pending[:self.batch_size]))
+                del pending[:self.batch_size]
+
+        try:
+            body = self.client.get(*self.call, on_rows=on_rows)
+            if pending:
+                self._put(('rows', pending))
+            self._put(('done', body))
+        except _StreamCancelled:
+            pass
+        except Exception as e:
+            try:
+                self._put(('error', e))
+            except _StreamCancelled:
+                pass
+
+    def __iter__(self):
+        self.start()
+        try:
+            while True:
+                kind, value = self._queue.get()
+                if kind == 'rows':
+                    self.rows += len(value)
+                    yield value
+                elif kind == 'done':
+                    self.body = value
+                    return
+                else:
+                    raise value
+        finally:
+            self.cancel()
+
+
+# ----------------------------------------------------------------------
+# 클라이언트
+# ----------------------------------------------------------------------
+class SeoulApiClient:
+    """
+    http://openapi.seoul.go.kr:8088/{KEY}/json/{서비스}/{시작}/{끝}/{추가 인자...} 형식의 Open API 클라이언트.
+      - keep-alive 연결 풀을 쓰는 requests.Session 하나를 공유
+      - 일시 오류(연결 / 타임아웃 / 429·5xx / ERROR-500·600·601)는 jitter 백오프로 재시도
+      - AimdLimiter로 동시 요청 수를 서버 상태에 맞춰 조절 (get_many / fetch_pages)
+      - 연속 실패 시 CircuitBreaker가 요청을 막아, 장애 중인 API를 계속 두드리지 않음
+      - 요청마다 지연 / 결과를 ApiMetrics에 기록
+    여러 스레드(run_pipeline의 동시 단계 포함)에서 함께 써도 됩니다.
+    """
+
+    def __init__(self, api_key=None, base_url=BASE_URL, retries=MAX_RETRIES, limiter=None, breaker=None, cache=None):
+        self.api_key = api_key or load_api_key()
+        self.base_url = base_url
+        self.retries = retries
+        self.limiter = limiter or AimdLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        # 캐시 키에는 API 키가 없으므로, 앞의 몇 행만 돌려주는 sample 키의 응답은 캐시하지 않습니다.
+        # (CACHE_TTL이 None인 서비스는 잘린 페이지가 실제 키로 바꾼 뒤에도 계속 쓰이게 됨)
+        self.cache = cache if self.api_key != DEFAULT_API_KEY else None
+        self.metrics = ApiMetrics()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.limiter.maximum, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def url(self, service, start, end, *params):
+        return '/'.join([self.base_url, self.api_key, 'json', service, str(start), str(end), *map(str, params)])
+
+    def _parse(self, service, status_code, content, sink=None):
+        """
+        반환: (서비스 본문 또는 None(데이터 없음), SeoulApiError 또는 None)
+        sink가 있으면 content는 바이트 조각 반복자이고, row는 해석되는 대로 sink로 넘깁니다. (본문의 row는 빈 목록)
+        """
+        if status_code in RETRY_STATUS:
+            return None, SeoulApiError(f'HTTP {status_code}', code=str(status_code), retryable=True)
+        if status_code >= 400:
+            return None, SeoulApiError(f'HTTP {status_code}', code=str(status_code))
+        try:
+            data = json.loads(content) if sink is None else sink.decode(service, content)
+        except ValueError:
+            # 게이트웨이 오류 페이지 등 JSON이 아닌 응답
+            return None, SeoulApiError('API 응답이 유효한 JSON 형식이 아닙니다.', retryable=True)
+        body = data.get(service)
+        if body:
+            return body, None
+        result = data.get('RESULT', {})
+        code, message = result.get('CODE'), result.get('MESSAGE', '알 수 없는 API 오류')
+        if code in NO_DATA_CODES:
+            return None, None
+        return None, SeoulApiError(f'{code}: {message}', code=code, retryable=code in RETRY_CODES)
+
+    def get(self, service, start=1, end=PAGE_SIZE, *params, on_rows=None):
+        """
+        한 페이지를 요청합니다. 반환: 서비스 본문 {'list_total_count', 'RESULT', 'row'} (데이터 없음이면 None)
+        재시도 후에도 실패하면 SeoulApiError, 서킷이 열려 있으면 CircuitOpenError
+
+        cache가 있으면 유효 기간 안의 응답은 네트워크 없이 돌려주고, 만료된 응답은 서버가 준 검증자(ETag /
+        Last-Modified)로 조건부 요청을 보내 304면 저장된 본문을 그대로 씁니다.
+
+        on_rows가 주어지면 응답 전체를 메모리에 올리지 않고, 받는 대로 row를 풀어 on_rows(rows)로 넘깁니다.
+        (반환하는 본문의 row는 빈 목록) 도중에 끊겨 재시도하면 이미 넘긴 앞부분 행은 건너뜁니다.
+        같은 요청에는 같은 순서로 응답한다는 가정이며, 지난 날짜 / 등록 순 목록 API가 그렇습니다.
+        """
+        url = self.url(service, start, end, *params)
+        # 캐시 키에는 API 키를 넣지 않습니다. (키를 바꿔도 받아 둔 자료를 그대로 사용)
+        key = '/'.join([service, str(start), str(end), *map(str, params)])
+        sink = _RowSink(on_rows) if on_rows is not None else None
+        entry = self.cache.lookup(key, load=sink is None) if self.cache is not None else None
+        if entry is not None and entry.fresh:
+            try:
+                body, error = self._parse(service, 200, entry.content if sink is None else entry.chunks(), sink)
+            except (OSError, zlib.error):
+                # 읽는 사이 캐시 파일이 지워졌거나 손상됨 → 네트워크로 (이미 넘긴 행은 건너뜀)
+                body, error = None, SeoulApiError('캐시 본문을 읽을 수 없습니다.')
+            if error is None:
+                self.metrics.record(service, 'cached')
+                return body
+            entry = None
+        headers = entry.conditional_headers() if entry is not None else {}
+
+        for attempt in range(self.retries + 1):
+            try:
+                self.breaker.before_request()
+            except CircuitOpenError:
+                self.metrics.record(service, 'rejected')
+                raise
+            self.limiter.acquire()
+            released = False
+            started, stalled = time.perf_counter(), sink.stalled if sink else 0.0
+            response, revalidated, compressed = None, False, None
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=sink is not None,
+                )
+                revalidated = response.status_code == 304 and entry is not None
+                if sink is not None:
+                    # 스트리밍은 응답 헤더를 받은 시점에 동시 요청 한도를 돌려줍니다. 본문을 받는 동안 소비 쪽이 밀려
+                    # 멈춰 있어도 다른 요청(앞 순서의 스트림 포함)이 한도를 기다리며 막히지 않도록
+                    first_byte = time.perf_counter() - started
+                    self.limiter.release(congested=response.status_code in RETRY_STATUS or first_byte > SLOW_RESPONSE)
+                    released = True
+                body, error, compressed = self._read(service, response, entry if revalidated else None, sink)
+            except requests.RequestException as e:
+                body, error = None, SeoulApiError(f'요청 실패: {e}', retryable=True)
+            except (OSError, zlib.error) as e:
+                # 304였지만 저장된 본문을 읽지 못함 → 조건부 요청 없이 다시 받음
+                body, error = None, SeoulApiError(f'캐시 본문 읽기 실패: {e}', retryable=True)
+                entry, headers = None, {}
+            except BaseException:
+                if not released:
+                    self.limiter.release(congested=False)
+                raise
+            finally:
+                if response is not None:
+                    response.close()
+            # 소비 쪽(on_rows)이 처리하느라 걸린 시간은 서버 지연에서 뺍니다.
+            latency = time.perf_counter() - started - ((sink.stalled - stalled) if sink else 0.0)
+            if not released:
+                self.limiter.release(congested=(error is not None and error.retryable) or latency > SLOW_RESPONSE)
+
+            if error is None or not error.retryable:
+                # 응답을 제대로 받았으면 (인증키 오류 같은 요청 자체의 문제라도) 서버는 정상
+                self.breaker.record_success()
+                if error:
+                    self.metrics.record(service, 'error', latency)
+                    raise error
+                self.metrics.record(service, 'revalidated' if revalidated else ('ok' if body else 'no_data'), latency)
+                if self.cache is not None:
+                    ttl = cache_ttl(service, body is not None)
+                    if revalidated:
+                        self.cache.refresh(entry, ttl)
+                    elif compressed is not None:
+                        self.cache.store_compressed(
+                            key, compressed, ttl,
+                            etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'),
+                        )
+                return body
+
+            self.breaker.record_failure()
+            if attempt == self.retries:
+                self.metrics.record(service, 'error', latency)
+                raise error
+            self.metrics.record(service, 'retry', latency)
+            time.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+
+    def _read(self, service, response, entry, sink):
+        """
+        응답 본문 해석. entry가 있으면(304) 저장된 본문을 씁니다.
+        반환: (서비스 본문, 오류, 캐시에 저장할 zlib 압축 본문 또는 None)
+        스트리밍이면 받는 조각을 해석과 동시에 압축해 두므로 원문 전체를 메모리에 두지 않습니다.
+        """
+        if entry is not None:
+            return (*self._parse(service, 200, entry.content if sink is None else entry.chunks(), sink), None)
+        if sink is None or response.status_code != 200:
+            content = response.content
+            compressed = zlib.compress(content, ZLIB_LEVEL) if self.cache is not None else None
+            return (*self._parse(service, response.status_code, content), compressed)
+
+        chunks = response.iter_content(STREAM_CHUNK)
+        if self.cache is None:
+            return (*self._parse(service, 200, chunks, sink), None)
+        compressor, parts = zlib.compressobj(ZLIB_LEVEL), []
+
+        def compressing():
+            for chunk in chunks:
+                parts.append(compressor.compress(chunk))
+                yield chunk
+            parts.append(compressor.flush())
+
+        body, error = self._parse(service, 200, compressing(), sink)
+        return body, error, b''.join(parts)
+
+    def stream(self, service, start=1, end=PAGE_SIZE, *params, batch_size=STREAM_BATCH):
+        """한 페이지를 별도 스레드에서 받으며 row를 batch_size개씩 내보내는 RowStream (시작된 상태)"""
+        return RowStream(self, (service, start, end, *params), batch_size).start()
+
+    def stream_many(self, calls, batch_size=STREAM_BATCH, ahead=None):
+        """
+        여러 요청 [(서비스, 시작, 끝, *추가 인자), ...]을 calls 순서대로 (call, RowStream)으로 내보냅니다.
+        소비 중인 요청 뒤로 ahead개(기본: 동시 요청 최대 한도)를 미리 받기 시작하며, 실제 동시 요청 수는 AIMD 한도를 따릅니다.
+        미리 받는 스트림도 큐(STREAM_QUEUE 묶음)가 차면 멈추므로 메모리는 요청 수 / 페이지 크기와 무관합니다.
+        """
+        ahead = self.limiter.maximum if ahead is None else ahead
+        calls, streams = iter(calls), deque()
+        try:
+            while True:
+                while len(streams) <= ahead:
+                    call = next(calls, None)
+                    if call is None:
+                        break
+                    streams.append((call, RowStream(self, call, batch_size).start()))
+                if not streams:
+                    return
+                call, row_stream = streams.popleft()
+                yield call, row_stream
+                row_stream.cancel()
+        finally:
+            for _, row_stream in streams:
+                row_stream.cancel()
+
+    def _get_or_error(self, args):
+        try:
+            return self.get(*args)
+        except SeoulApiError as e:
+            return e
+
+    def get_many(self, calls):
+        """
+        여러 요청 [(서비스, 시작, 끝, *추가 인자), ...]을 AIMD 한도 안에서 동시에 보냅니다.
+        결과는 calls 순서대로 하나씩 내보내며, 실패한 요청은 예외 대신 SeoulApiError 객체를 내보냅니다.
+        """
+        with ThreadPoolExecutor(max_workers=self.limiter.maximum, thread_name_prefix='seoul-api') as pool:
+            for future in [pool.submit(self._get_or_error, call) for call in calls]:
+                yield future.result()
+
+    def fetch_pages(self, service, *params, page_size=PAGE_SIZE):
+        """첫 페이지의 list_total_count로 나머지 페이지를 동시에 받아 전체 행을 순서대로 반환합니다."""
+        first = self.get(service, 1, page_size, *params)
+        if not first:
+            return []
+        rows = list(first.get('row', []))
+        total = int(first.get('list_total_count', 0))
+        calls = [
+            (service, start, min(start + page_size - 1, total), *params)
+            for start in range(page_size + 1, total + 1, page_size)
+        ]
+        for body in self.get_many(calls):
+            if isinstance(body, SeoulApiError):
+                raise body
+            rows.extend(body.get('row', []) if body else [])
+        return rows
+
+    def report_lines(self, *services):
+        """명령 종료 시 출력할 서비스별 지표 요약 (services를 주면 해당 서비스만)"""
+        return [
+            f"📡 {service}: 요청 {s['requests']}건 (정상 {s['ok']}, 데이터 없음 {s['no_data']}, 재시도 {s['retry']},"
+            f" 실패 {s['error']}, 차단 {s['rejected']}), 캐시 적중 {s['cached']}건 / 304 {s['revalidated']}건, p50 {s['p50_ms']:.0f}ms / p95 {s['p95_ms']:.0f}ms"
+            f" / 최대 {s['max_ms']:.0f}ms, 동시 한도 {self.limiter.limit:.1f}"
+            for service, s in self.metrics.summary().items()
+            if not services or service in services
+        ]
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key=None):
+    """
+    프로세스 공용 클라이언트 (API 키별 하나). 같은 프로세스의 명령들이 연결 풀 / 한도 / 브레이커를 공유합니다.
+    응답은 디스크 캐시(main.api_cache, ANALYTICS_DIR/http_cache)를 거칩니다.
+    """
+    api_key = api_key or load_api_key()
+    with _clients_lock:
+        if api_key not in _clients:
+            _clients[api_key] = SeoulApiClient(api_key=api_key, cache=ResponseCache())
+        return _clients[api_key]
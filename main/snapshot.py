@@ -0,0 +1,215 @@
+# pickuplog/main/snapshot.py (승하차·날씨 컬럼형 스냅샷)
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+
+from main.models import RidershipDaily, Station, WeatherDaily
+
+EPOCH = date(1970, 1, 1)
+SNAPSHOT_DIRNAME = 'columnar'
+CURRENT_FILENAME = 'CURRENT'
+# 새 버전을 쓴 뒤에도 보관할 이전 버전 수 (이전 버전을 mmap 중인 워커 보호)
+KEEP_VERSIONS = 2
+
+# run_pipeline은 sync_ridership / sync_weather를 같은 프로세스의 스레드로 동시에 돌리므로 빌드를 직렬화합니다.
+_build_lock = threading.Lock()
+
+
+def snapshot_root():
+    return settings.ANALYTICS_DIR / SNAPSHOT_DIRNAME
+
+
+def to_day(value):
+    """date → 1970-01-01 기준 일수 (int)"""
+    return (value - EPOCH).days
+
+
+def from_day(day):
+    return EPOCH + timedelta(days=int(day))
+
+
+def _code_dtype(size):
+    return np.int16 if size < np.iinfo(np.int16).max else np.int32
+
+
+# ----------------------------------------------------------------------
+# 스냅샷 생성 (sync_ridership / sync_weather 이후 실행)
+# ----------------------------------------------------------------------
+def build_snapshot(chunk_size=20000):
+    """
+    RidershipDaily / WeatherDaily를 컬럼별 .npy 파일로 저장합니다.
+    - 역은 Station 차원 정수 키(station_id) 그대로, 노선 코드는 사전(dictionary) 인코딩된 정수 코드로 저장
+    - 승하차 행은 날짜순으로 정렬되어 날짜 구간을 searchsorted 슬라이스로 자를 수 있음
+    새 버전 디렉터리에 다 쓴 뒤 CURRENT 파일을 원자적으로 바꿔 읽는 쪽이 중간 상태를 보지 않게 합니다.
+    버전 이름은 DB를 읽기 시작한 시각이므로, 동시에 돈 빌드 중 더 늦게 시작한(= 더 최신 데이터를 본) 쪽만
+    CURRENT가 됩니다. 먼저 시작한 빌드가 나중에 끝나도 최신 스냅샷을 덮어쓰지 않습니다.
+    반환값: CURRENT가 가리키는 스냅샷 버전 경로 (더 최신 버전에 밀렸다면 그 버전)
+    """
+    with _build_lock:
+        return _build_snapshot(chunk_size)
+
+
+def _current_version(root):
+    try:
+        return (root / CURRENT_FILENAME).read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+
+
+def _version_key(name):
+    return int(name[1:])
+
+
+def _build_snapshot(chunk_size):
+    root = snapshot_root()
+    version_dir = root / f'v{time.time_ns()}'
+    version_dir.mkdir(parents=True)
+
+    # 1. 승하차 (날짜순)
+    stations = {
+        pk: (line_code, station_name)
+        for pk, line_code, station_name in Station.objects.values_list('id', 'line_code', 'station_name_std')
+    }
+    lines = {}
+    for line_code, _ in stations.values():
+        lines.setdefault(line_code, len(lines))
+    columns = {name: [] for name in ('date', 'line', 'station', 'boardings', 'alightings', 'total')}
+    ridership_qs = RidershipDaily.objects.order_by('date', 'station_id').values_list(
+        'date', 'station_id', 'boardings', 'alightings', 'total'
+    )
+    for ride_date, station_id, boardings, alightings, total in ridership_qs.iterator(chunk_size=chunk_size):
+        columns['date'].append(to_day(ride_date))
+        columns['line'].append(lines[stations[station_id][0]])
+        columns['station'].append(station_id)
+        columns['boardings'].append(boardings)
+        columns['alightings'].append(alightings)
+        columns['total'].append(total)
+
+    dtypes = {
+        'date': np.int32,
+        'line': _code_dtype(len(lines)),
+        'station': _code_dtype(max(stations, default=0) + 1),
+        'boardings': np.int32,
+        'alightings': np.int32,
+        'total': np.int32,
+    }
+    for name, values in columns.items():
+        np.save(version_dir / f'ridership_{name}.npy', np.array(values, dtype=dtypes[name]))
+
+    # 2. 날씨 (날짜순, 도시 코드는 현재 SEOUL 하나)
+    weather = list(
+        WeatherDaily.objects.filter(city_code='SEOUL').order_by('date')
+        .values_list('date', 'rain_mm', 'avg_temp', 'is_rainy')
+    )
+    np.save(version_dir / 'weather_date.npy', np.array([to_day(w[0]) for w in weather], dtype=np.int32))
+    np.save(version_dir / 'weather_rain_mm.npy', np.array([w[1] for w in weather], dtype=np.float32))
+    np.save(version_dir / 'weather_avg_temp.npy', np.array([np.nan if w[2] is None else w[2] for w in weather], dtype=np.float32))
+    np.save(version_dir / 'weather_is_rainy.npy', np.array([w[3] for w in weather], dtype=bool))
+
+    with open(version_dir / 'dictionaries.json', 'w', encoding='utf-8') as f:
+        json.dump({'lines': list(lines), 'stations': {pk: list(value) for pk, value in stations.items()}}, f, ensure_ascii=False)
+
+    # 3. 더 최신 버전이 이미 CURRENT라면 이 버전은 버림 (다른 프로세스의 빌드가 먼저 끝난 경우)
+    current = _current_version(root)
+    if current is not None and _version_key(current) > _version_key(version_dir.name):
+        shutil.rmtree(version_dir, ignore_errors=True)
+        return root / current
+
+    # 4. CURRENT 포인터 교체 후 오래된 버전 정리 (임시 파일 이름은 버전마다 달라 동시 교체가 서로 겹치지 않음)
+    tmp_pointer = root / f'{CURRENT_FILENAME}.{version_dir.name}.tmp'
+    tmp_pointer.write_text(version_dir.name, encoding='utf-8')
+    os.replace(tmp_pointer, root / CURRENT_FILENAME)
+
+    versions = sorted(
+        (p for p in root.iterdir() if p.is_dir() and p.name.startswith('v')),
+        key=lambda p: _version_key(p.name),
+    )
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+    return version_dir
+
+
+# ----------------------------------------------------------------------
+# 스냅샷 읽기 (mmap, zero-copy)
+# ----------------------------------------------------------------------
+class ColumnarSnapshot:
+    """
+    mmap으로 연 컬럼 배열 묶음. 여러 워커 프로세스가 같은 파일을 열면 OS 페이지 캐시를 공유합니다.
+    ridership / weather는 {컬럼명: np.memmap} 사전이며, 슬라이스는 복사 없이 뷰로 반환됩니다.
+    """
+
+    RIDERSHIP_COLUMNS = ('date', 'line', 'station', 'boardings', 'alightings', 'total')
+    WEATHER_COLUMNS = ('date', 'rain_mm', 'avg_temp', 'is_rainy')
+
+    def __init__(self, path):
+        self.path = path
+        self.ridership = {
+            name: np.load(path / f'ridership_{name}.npy', mmap_mode='r') for name in self.RIDERSHIP_COLUMNS
+        }
+        self.weather = {
+            name: np.load(path / f'weather_{name}.npy', mmap_mode='r') for name in self.WEATHER_COLUMNS
+        }
+        with open(path / 'dictionaries.json', encoding='utf-8') as f:
+            dictionaries = json.load(f)
+        self.lines = dictionaries['lines']
+        # Station.id → (노선 코드, 표준 역명)
+        self.stations = {int(pk): tuple(value) for pk, value in dictionaries['stations'].items()}
+        self.line_codes = {line: i for i, line in enumerate(self.lines)}
+
+    def __len__(self):
+        return len(self.ridership['date'])
+
+    def ridership_between(self, start=None, end=None):
+        """[start, end] 날짜 구간의 승하차 컬럼 뷰 (날짜순 정렬이므로 이진 탐색 두 번)"""
+        dates = self.ridership['date']
+        lo = 0 if start is None else int(np.searchsorted(dates, to_day(start), side='left'))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, to_day(end), side='right'))
+        return {name: column[lo:hi] for name, column in self.ridership.items()}
+
+    def weather_for(self, days):
+        """
+        일수 배열(days)에 대응하는 날씨 행 인덱스와 존재 여부 마스크를 반환합니다.
+        반환: (index, found) — found가 False인 위치의 index는 의미 없음
+        """
+        weather_days = self.weather['date']
+        if len(weather_days) == 0:
+            return np.zeros(len(days), dtype=np.int64), np.zeros(len(days), dtype=bool)
+        index = np.searchsorted(weather_days, days)
+        index = np.clip(index, 0, len(weather_days) - 1)
+        return index, weather_days[index] == days
+
+
+_cache_lock = threading.Lock()
+_cached = {'version': None, 'snapshot': None}
+
+
+def get_snapshot():
+    """프로세스 단위로 캐시된 ColumnarSnapshot. CURRENT가 바뀌면 새 버전을 엽니다. 없으면 None."""
+    pointer = snapshot_root() / CURRENT_FILENAME
+    try:
+        version = pointer.read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+    if _cached['version'] != version:
+        with _cache_lock:
+            if _cached['version'] != version:
+                _cached['snapshot'] = ColumnarSnapshot(snapshot_root() / version)
+                _cached['version'] = version
+    return _cached['snapshot']
+
+
+def ensure_snapshot():
+    """get_snapshot()과 같지만, 스냅샷이 아직 없으면 먼저 만듭니다."""
+    snapshot = get_snapshot()
+    if snapshot is None:
+        build_snapshot()
+        snapshot = get_snapshot()
+    return snapshot
@@ -0,0 +1,119 @@
+# pickuplog/main/stations.py (역명 해석 인덱스)
+
+from main.models import Station, StationDict
+from main.normalize import normalize_line_code, station_match_key
+
+
+class StationIndex:
+    """
+    StationDict로부터 만든 메모리 인덱스: 정규화 키 → ((노선 코드, 표준 역명), ...).
+    키는 normalize_station_name 규칙 + 끝 '역' 제거(station_match_key)이므로
+    '강남역', '강남', '잠실(송파구청)'처럼 원천마다 다른 표기가 같은 역으로 모입니다.
+    대량 적재 시 한 번 만들어 두고 행마다 dict 조회 한 번으로 line/station을 채웁니다.
+    """
+
+    def __init__(self, entries=()):
+        self._by_key = {}
+        for line_code, station_name_std in entries:
+            key = station_match_key(station_name_std)
+            if not key:
+                continue
+            candidates = self._by_key.setdefault(key, [])
+            if (line_code, station_name_std) not in candidates:
+                candidates.append((line_code, station_name_std))
+        # 조회 전용이므로 튜플로 고정
+        self._by_key = {key: tuple(sorted(value)) for key, value in self._by_key.items()}
+        self._keys_by_line = {}
+        for key, candidates in self._by_key.items():
+            for line_code, _ in candidates:
+                self._keys_by_line.setdefault(line_code, set()).add(key)
+
+    @classmethod
+    def from_db(cls):
+        return cls(StationDict.objects.values_list('line_code', 'station_name_std').distinct())
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def __contains__(self, name):
+        return station_match_key(name) in self._by_key
+
+    def candidates(self, name):
+        """역명 후보 ((노선 코드, 표준 역명), ...) 을 반환합니다. 없으면 빈 튜플."""
+        return self._by_key.get(station_match_key(name), ())
+
+    def keys_on_line(self, line_code):
+        """노선에 속한 역의 정규화 키 집합. 없으면 빈 집합."""
+        return self._keys_by_line.get(line_code, set())
+
+    def resolve(self, name, line=None):
+        """
+        역명(과 선택적 노선명)을 (노선 코드, 표준 역명)으로 해석합니다.
+        - 역을 찾지 못하면 None
+        - 노선이 하나뿐이거나 line과 일치하는 노선이 있으면 그 노선
+        - 노선을 특정할 수 없는 환승역은 (None, 표준 역명)
+        """
+        candidates = self.candidates(name)
+        if not candidates:
+            return None
+        if line:
+            line_code = normalize_line_code(line)
+            for candidate in candidates:
+                if candidate[0] == line_code:
+                    return candidate
+        if len(candidates) == 1:
+            return candidates[0]
+        return None, candidates[0][1]
+
+
+class StationCodeMap:
+    """
+    (표준 노선 코드, 표준 역명) → Station.id 메모리 사전.
+    적재 시 한 번 만들어 두고 행마다 DB 조회 없이 사실 테이블의 station FK 값을 채웁니다.
+    """
+
+    def __init__(self, rows=()):
+        self._codes = {(line_code, station_name_std): pk for line_code, station_name_std, pk in rows}
+
+    @classmethod
+    def from_db(cls):
+        return cls(Station.objects.values_list('line_code', 'station_name_std', 'id'))
+
+    def __len__(self):
+        return len(self._codes)
+
+    def get(self, line_code, station_name_std):
+        return self._codes.get((line_code, station_name_std))
+
+    def ensure(self, pairs):
+        """사전에 없는 (노선, 역) 쌍을 Station에 일괄 추가하고 코드를 채웁니다."""
+        missing = {pair for pair in pairs if pair not in self._codes}
+        if missing:
+            Station.objects.bulk_create(
+                [Station(line_code=line, station_name_std=name) for line, name in sorted(missing)],
+                ignore_conflicts=True,
+            )
+            for line, name, pk in Station.objects.filter(
+                line_code__in={line for line, _ in missing},
+                station_name_std__in={name for _, name in missing},
+            ).values_list('line_code', 'station_name_std', 'id'):
+                self._codes[(line, name)] = pk
+        return self
+
+
+def sync_station_dimension():
+    """
+    StationDict의 (노선, 표준 역명) 쌍을 Station 차원에 반영하고 환승역 여부를 맞춥니다.
+    반환값: 갱신 후 StationCodeMap
+    """
+    pairs = set(StationDict.objects.values_list('line_code', 'station_name_std').distinct())
+    transfers = set(StationDict.objects.filter(is_transfer=True).values_list('line_code', 'station_name_std'))
+    transfer = {pair: pair in transfers for pair in pairs}
+    codes = StationCodeMap.from_db().ensure(transfer)
+
+    changed = [
+        Station(pk=codes.get(line, name), line_code=line, station_name_std=name, is_transfer=is_transfer)
+        for (line, name), is_transfer in transfer.items()
+    ]
+    Station.objects.bulk_update(changed, ['is_transfer'], batch_size=500)
+    return codes
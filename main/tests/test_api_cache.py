@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from main.api_cache import NO_DATA_TTL, ResponseCache, cache_ttl
+from main.seoul_api import DEFAULT_API_KEY, SeoulApiClient
+from main.tests.test_seoul_api import SERVICE, FakeResponse, FakeSession, api_body
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.cache = ResponseCache(directory=self.directory)
+
+    def test_store_and_lookup(self):
+        self.cache.store('svc/1/10', b'{"a": 1}' * 100, ttl=None, etag='"v1"')
+
+        entry = self.cache.lookup('svc/1/10')
+        self.assertEqual(entry.content, b'{"a": 1}' * 100)
+        self.assertTrue(entry.fresh)
+        self.assertEqual(entry.conditional_headers(), {'If-None-Match': '"v1"'})
+        streamed = self.cache.lookup('svc/1/10', load=False)
+        self.assertEqual(b''.join(streamed.chunks(size=7)), b'{"a": 1}' * 100)
+        self.assertIsNone(self.cache.lookup('svc/11/20'))
+        self.assertEqual(self.cache.stats(), {'svc': [1, self.cache.size()]})
+
+    def test_expired_entries(self):
+        self.cache.store('svc/1/10', b'old', ttl=-1)
+        self.cache.store('svc/11/20', b'new', ttl=60)
+
+        self.assertFalse(self.cache.lookup('svc/1/10').fresh)
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertIsNone(self.cache.lookup('svc/1/10'))
+        self.assertEqual(self.cache.lookup('svc/11/20').content, b'new')
+
+    def test_evicts_least_recently_used(self):
+        for i in range(3):
+            self.cache.store(f'svc/{i}', os.urandom(1000), ttl=None)
+            path = self.cache._path(f'svc/{i}')
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        # 가장 오래된 항목을 읽으면 최근 사용으로 바뀜
+        self.cache.lookup('svc/0')
+        self.cache.max_bytes = self.cache.size() - 1
+
+        self.cache.store('svc/3', b'x', ttl=None)
+
+        self.assertIsNone(self.cache.lookup('svc/1'))
+        self.assertIsNotNone(self.cache.lookup('svc/0'))
+        self.assertIsNotNone(self.cache.lookup('svc/3'))
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+
+    def test_ttl(self):
+        self.assertIsNone(cache_ttl('CardSubwayStatsNew', True))
+        self.assertEqual(cache_ttl('CardSubwayStatsNew', False), NO_DATA_TTL)
+        self.assertEqual(cache_ttl('lostArticleInfo', False), 10 * 60)
+
+
+@mock.patch('main.seoul_api.time.sleep')
+class ClientCacheTests(SimpleTestCase):
+    rows = [{'SBWY_STNS_NM': '강남', 'GTON_TNOPE': 1}]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ResponseCache(directory=Path(tmp.name))
+
+    def client_for(self, api_key, *responses):
+        client = SeoulApiClient(api_key=api_key, retries=0, cache=self.cache)
+        client.session = FakeSession(*responses)
+        return client
+
+    def test_cached_response_is_reused(self, sleep):
+        client = self.client_for('K', FakeResponse(api_body(self.rows)))
+        self.assertEqual(client.get(SERVICE, 1, 1000, '20240301')['row'], self.rows)
+        self.assertEqual(client.get(SERVICE, 1, 1000, '20240301')['row'], self.rows)
+        self.assertEqual(client.session.calls, 1)
+        self.assertEqual(client.metrics.summary()[SERVICE]['cached'], 1)
+
+    def test_sample_key_responses_are_not_cached(self, sleep):
+        client = self.client_for(DEFAULT_API_KEY, FakeResponse(api_body(self.rows[:1])))
+        client.get(SERVICE, 1, 1000, '20240301')
+        self.assertEqual(self.cache.size(), 0)
+
+        client = self.client_for('K', FakeResponse(api_body(self.rows)))
+        self.assertEqual(client.get(SERVICE, 1, 1000, '20240301')['row'], self.rows)
+        self.assertEqual(client.session.calls, 1)
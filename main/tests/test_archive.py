@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+
+from django.core.paginator import Paginator
+from django.test import TestCase
+from django.utils import timezone
+
+from main.archive import TieredLostItems, archive_chunk, archived_item_ids, needs_archive
+from main.models import ArchivedLostItem, LostItem, LostItemRate, RidershipDaily, Station, StationDict, StorageOccupancy
+from main.occupancy import track_occupancy
+from main.reports import refresh_lost_item_rates
+from main.tests.test_occupancy import make_item
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def counts(self, location='시청역 유실물센터'):
+        row = StorageOccupancy.objects.get(storage_location=location)
+        return row.held, row.received, row.pickup_samples, row.pickup_days_total
+
+    def test_archive_keeps_counters_and_blocks_reload(self):
+        old = self.now - timedelta(days=400)
+        items = [make_item('OLD', old, received_days=5), make_item('NEW', self.now, received_days=1)]
+        with track_occupancy(['OLD', 'NEW']):
+            LostItem.objects.bulk_create(items)
+        before = self.counts()
+
+        moved = archive_chunk(self.now - timedelta(days=30))
+        self.assertEqual(len(moved), 1)
+        self.assertFalse(LostItem.objects.filter(item_id='OLD').exists())
+        self.assertEqual(self.counts(), before)
+        self.assertEqual(archived_item_ids(['OLD', 'NEW']), {'OLD'})
+
+        # 원천 재적재 때 아카이브된 item_id는 카운터에 다시 더하지 않음
+        with track_occupancy(['OLD']):
+            LostItem.objects.bulk_create([make_item('OLD', old, received_days=5)])
+        self.assertEqual(self.counts(), before)
+
+    def test_rates_include_archived_items(self):
+        day = date(2024, 3, 4)
+        StationDict.objects.create(station_name_raw='시청', station_name_std='시청', line_code='LINE1')
+        station = Station.objects.create(line_code='LINE1', station_name_std='시청')
+        RidershipDaily.objects.create(date=day, station=station, boardings=5000, alightings=5000, total=10000)
+        registered = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        LostItem.objects.bulk_create([
+            make_item(f'R{i}', registered, received_days=1, station='시청', line='LINE1') for i in range(3)
+        ])
+        refresh_lost_item_rates(full=True)
+        before = LostItemRate.objects.get(date=day, category=LostItemRate.ALL_CATEGORIES).lost_count
+
+        archive_chunk(self.now, chunk_size=2)
+        refresh_lost_item_rates(full=True)
+
+        self.assertEqual((before, ArchivedLostItem.objects.count()), (3, 2))
+        self.assertEqual(LostItemRate.objects.get(date=day, category=LostItemRate.ALL_CATEGORIES).lost_count, 3)
+        self.assertEqual(LostItemRate.objects.get(date=day, category='지갑').lost_count, 3)
+
+
+class TieredLostItemsTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        base = self.now - timedelta(days=400)
+        # 짝수 번째는 아카이브, 홀수 번째는 핫 테이블 (등록일이 서로 엇갈림)
+        items = LostItem.objects.bulk_create(
+            [make_item(f'T{i:02d}', base + timedelta(days=i), received_days=1) for i in range(10)]
+        )
+        for item in items:
+            item.pk = LostItem.objects.get(item_id=item.item_id).pk
+        self.expected = [item.item_id for item in sorted(items, key=lambda item: item.registered_at, reverse=True)]
+        while archive_chunk(base + timedelta(days=10), chunk_size=100):
+            pass
+        for item in items[1::2]:
+            ArchivedLostItem.objects.filter(pk=item.pk).delete()
+            item.pk = None
+            item.save()
+
+    def tiered(self):
+        return TieredLostItems(
+            LostItem.objects.order_by('-registered_at', '-pk'),
+            ArchivedLostItem.objects.order_by('-registered_at', '-id'),
+        )
+
+    def test_merged_order_and_pagination(self):
+        items = self.tiered()
+        self.assertEqual(len(items), 10)
+        self.assertEqual([item.item_id for item in items[0:10]], self.expected)
+
+        pages = Paginator(self.tiered(), 3)
+        self.assertEqual(pages.num_pages, 4)
+        collected = [item.item_id for number in pages.page_range for item in pages.page(number)]
+        self.assertEqual(collected, self.expected)
+        self.assertEqual(items[4].item_id, self.expected[4])
+
+    def test_needs_archive(self):
+        watermark = self.now - timedelta(days=100)
+        today = timezone.localdate()
+        self.assertFalse(needs_archive(None, None, False, watermark))
+        self.assertFalse(needs_archive(today - timedelta(days=300), None, True, watermark))
+        self.assertFalse(needs_archive(today - timedelta(days=10), None, False, watermark))
+        self.assertTrue(needs_archive(today - timedelta(days=300), None, False, watermark))
+        self.assertTrue(needs_archive(None, today, False, watermark))
+        self.assertFalse(needs_archive(today - timedelta(days=300), None, False, None))
+
@@ -0,0 +1,95 @@
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from main.cube import PatternCube
+from main.models import LostItem, LostItemRate, RidershipDaily, Station, StationDict
+from main.reports import refresh_analytics
+
+ALL = LostItemRate.ALL_CATEGORIES
+MONDAY = date(2024, 3, 4)
+
+
+class PatternCubeTests(SimpleTestCase):
+    def rows(self):
+        return [
+            (MONDAY, 'LINE2', '강남', ALL, 3, 20000),
+            (MONDAY, 'LINE2', '강남', '지갑', 2, 20000),
+            (MONDAY, 'LINE2', '강남', '우산', 1, 20000),
+            (MONDAY + timedelta(days=1), 'LINE1', '시청', ALL, 1, 10000),
+            (MONDAY + timedelta(days=1), 'LINE1', '시청', '지갑', 1, 10000),
+        ]
+
+    def test_apply_and_slice(self):
+        cube = PatternCube()
+        cube.apply(self.rows(), ALL)
+
+        self.assertEqual(cube.slice(), [{'key': '전체', 'lost': 4, 'riders': 30000, 'rate_per_10k': 1.3333}])
+        by_weekday = {row['key']: row for row in cube.slice(group_by='weekday')}
+        self.assertEqual((by_weekday['월']['lost'], by_weekday['화']['lost'], by_weekday['수']['rate_per_10k']), (3, 1, None))
+        self.assertEqual(
+            [(row['key'], row['lost'], row['riders']) for row in cube.slice(lines=['LINE2'], group_by='category')],
+            [('지갑', 2, 20000), ('우산', 1, 20000)],
+        )
+        self.assertEqual(cube.slice(stations=['시청'], categories=['우산'])[0]['lost'], 0)
+        # 없는 값으로 거르면 빈 부분 큐브
+        self.assertEqual(cube.slice(lines=['LINE9'])[0]['riders'], 0)
+
+    def test_negative_apply_cancels(self):
+        cube = PatternCube()
+        cube.apply(self.rows(), ALL)
+        cube.apply(self.rows()[:3], ALL, sign=-1)
+
+        self.assertEqual([(row['key'], row['lost']) for row in cube.slice(group_by='station')],
+                         [('LINE2 강남', 0), ('LINE1 시청', 1)])
+
+    def test_save_and_load_round_trip(self):
+        cube = PatternCube()
+        cube.apply(self.rows(), ALL)
+        cube.version = [5, 4, 30000]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'cube.npz'
+            cube.save(path)
+            loaded = PatternCube.load(path)
+
+        self.assertEqual(loaded.version, [5, 4, 30000])
+        self.assertEqual(loaded.stations, cube.stations)
+        self.assertEqual(loaded.slice(group_by='line'), cube.slice(group_by='line'))
+
+
+class RefreshAnalyticsTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        StationDict.objects.create(station_name_raw='강남', station_name_std='강남', line_code='LINE2')
+        self.station = Station.objects.create(line_code='LINE2', station_name_std='강남')
+        RidershipDaily.objects.bulk_create([
+            RidershipDaily(date=MONDAY + timedelta(days=i), station=self.station, boardings=5000,
+                           alightings=5000, total=10000)
+            for i in range(14)
+        ])
+
+    def test_incremental_cube_matches_full_rebuild(self):
+        def lost(day, item_id):
+            LostItem.objects.create(item_id=item_id, station='강남', line='2호선', category='지갑',
+                                    registered_at=timezone.make_aware(datetime.combine(day, datetime.min.time())))
+
+        lost(MONDAY, 'A1')
+        refresh_analytics(full=True)
+        lost(MONDAY + timedelta(days=13), 'A2')
+        refresh_analytics()
+        incremental = PatternCube.load()
+
+        refresh_analytics(full=True)
+        full = PatternCube.load()
+
+        self.assertEqual(incremental.version, full.version)
+        self.assertEqual(incremental.slice(group_by='weekday'), full.slice(group_by='weekday'))
+        self.assertEqual(full.slice()[0]['lost'], 2)
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from main import dedup
+from main.models import DuplicateCluster, LostItem, LostItemBucket
+
+REGISTERED = timezone.make_aware(datetime(2024, 3, 4, 9))
+WALLET = '검정색 가죽 반지갑 신분증 포함'
+
+
+class DedupTests(TestCase):
+    def setUp(self):
+        self.next_id = 0
+
+    def lost(self, item_name, station='강남', days=0, description=''):
+        self.next_id += 1
+        return LostItem.objects.create(
+            item_id=f'D{self.next_id}', item_name=item_name, description=description, station=station,
+            registered_at=REGISTERED + timedelta(days=days),
+        ).pk
+
+    def cluster_sets(self):
+        return [
+            set(cluster.items.values_list('pk', flat=True))
+            for cluster in DuplicateCluster.objects.order_by('pk')
+        ]
+
+    def test_shingles_need_enough_text(self):
+        self.assertEqual(dedup.shingles('우산', '', '강남', REGISTERED), set())
+        tokens = dedup.shingles('검정 우산', None, '강남역', REGISTERED)
+        self.assertIn('@station:강남', tokens)
+        self.assertEqual(len(tokens), 3 + 2)
+
+    def test_same_item_from_two_sources_clusters(self):
+        a = self.lost(WALLET, station='강남역')
+        b = self.lost(WALLET + '.', station='강남', days=1)
+        other_station = self.lost(WALLET, station='시청')
+        too_late = self.lost(WALLET, days=5)
+
+        indexed, pairs, clusters = dedup.index_items([a, b, other_station, too_late])
+
+        self.assertEqual((indexed, pairs, clusters), (4, 1, 1))
+        self.assertEqual(self.cluster_sets(), [{a, b}])
+        self.assertEqual(LostItemBucket.objects.filter(item_id=a).count(), dedup.BANDS)
+
+    def test_short_items_are_not_clustered_by_station_and_date(self):
+        umbrellas = [self.lost('우산'), self.lost('우산'), self.lost('지갑')]
+
+        self.assertEqual(dedup.index_items(umbrellas), (0, 0, 0))
+        self.assertFalse(LostItemBucket.objects.exists())
+
+    def test_incremental_batches_join_pending_cluster(self):
+        first = [self.lost(WALLET), self.lost(WALLET)]
+        dedup.index_items(first)
+        late = self.lost(WALLET)
+        dedup.index_items([late])
+
+        self.assertEqual(self.cluster_sets(), [set(first) | {late}])
+
+        # 검토가 끝난 묶음의 쌍은 다시 묶지 않음
+        DuplicateCluster.objects.update(status=DuplicateCluster.STATUS_DISMISSED)
+        dedup.index_items(first)
+        self.assertEqual(DuplicateCluster.objects.count(), 1)
+
+    def test_merge_clusters_joins_pending_clusters_across_a_component(self):
+        a, b, c, d = (self.lost(WALLET) for _ in range(4))
+        left = DuplicateCluster.objects.create(similarity=0.7)
+        left.items.add(a, b)
+        right = DuplicateCluster.objects.create(similarity=0.8)
+        right.items.add(c, d)
+
+        self.assertEqual(dedup._merge_clusters({(b, c): 0.9}), 1)
+
+        self.assertEqual(self.cluster_sets(), [{a, b, c, d}])
+        self.assertEqual(DuplicateCluster.objects.get().similarity, 0.9)
+
+    def test_over_full_buckets_are_skipped(self):
+        pks = [self.lost(WALLET) for _ in range(3)]
+
+        with mock.patch.object(dedup, 'MAX_BUCKET_SIZE', 2):
+            self.assertEqual(dedup.index_items(pks)[1:], (0, 0))
+        self.assertEqual(dedup.index_items(pks)[1:], (3, 1))
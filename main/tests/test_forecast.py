@@ -0,0 +1,86 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from main.forecast import MIN_TRAINING_DAYS, design_matrix, fit_ridge, train_and_forecast
+from main.models import LostForecast, LostItemRate, Station, WeatherDaily
+from main.snapshot import to_day
+
+ALL = LostItemRate.ALL_CATEGORIES
+
+
+class RegressionTests(SimpleTestCase):
+    def test_design_matrix_encodes_weekday_and_fills_temperature(self):
+        monday = to_day(date(2024, 3, 4))
+        X = design_matrix([monday, monday + 1, monday + 6], [0.0, np.nan, 5.0], [10.0, np.nan, 20.0], temp_fill=15.0)
+
+        self.assertEqual(X[:, 0].tolist(), [1.0, 1.0, 1.0])
+        # 월요일은 기준 범주라 요일 열이 모두 0
+        self.assertEqual(X[0, 1:7].tolist(), [0.0] * 6)
+        self.assertEqual(X[1, 1:7].tolist(), [1.0, 0, 0, 0, 0, 0])
+        self.assertEqual(X[2, 1:7].tolist(), [0, 0, 0, 0, 0, 1.0])
+        self.assertEqual(X[:, 7].tolist(), [0.0, 0.0, 5.0])
+        self.assertEqual(X[:, 8].tolist(), [10.0, 15.0, 20.0])
+
+    def test_fit_ridge_per_model(self):
+        days = np.arange(28)
+        rain = np.where(days % 3 == 0, 10.0, 0.0)
+        X = design_matrix(days, rain, np.full(28, 15.0), temp_fill=15.0)
+        Y = np.column_stack([2.0 + 0.3 * rain, np.full(28, 4.0)])
+        mask = np.ones_like(Y, dtype=bool)
+        mask[MIN_TRAINING_DAYS - 2:, 1] = False
+
+        B, n = fit_ridge(X, Y, mask, lam=1e-6)
+
+        self.assertEqual(n.tolist(), [28, MIN_TRAINING_DAYS - 2])
+        self.assertAlmostEqual(B[0, 7], 0.3, places=3)
+        # 학습 일수가 부족한 모델은 평균 분실률만 절편으로 사용
+        self.assertEqual(B[1].tolist(), [4.0] + [0.0] * 8)
+
+
+class TrainAndForecastTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_rainy_days_raise_the_forecast(self):
+        station = Station.objects.create(line_code='LINE2', station_name_std='강남')
+        today = timezone.localdate()
+        rates = []
+        for i in range(1, 43):
+            day = today - timedelta(days=i)
+            rainy = i % 3 == 0
+            WeatherDaily.objects.create(date=day, rain_mm=10.0 if rainy else 0.0, avg_temp=15.0, is_rainy=rainy)
+            lost = 6 if rainy else 2
+            rates += [
+                LostItemRate(date=day, station=station, category=ALL, lost_count=lost, ridership=10000),
+                LostItemRate(date=day, station=station, category='우산', lost_count=lost - 2, ridership=10000),
+            ]
+        LostItemRate.objects.bulk_create(rates)
+        for i in range(3):
+            WeatherDaily.objects.create(date=today + timedelta(days=i), rain_mm=20.0 * (i == 1), avg_temp=15.0,
+                                        is_rainy=i == 1)
+        LostForecast.objects.create(date=today - timedelta(days=1), line_code=ALL, category=ALL,
+                                    predicted_rate=1, dry_rate=1, rainy_rate=1)
+
+        saved = train_and_forecast()
+
+        # 3일 × (LINE2 | 전체) × (우산 | 전체)
+        self.assertEqual(saved, 12)
+        self.assertFalse(LostForecast.objects.filter(date__lt=today).exists())
+        overall = {f.date: f for f in LostForecast.objects.filter(line_code=ALL, category=ALL)}
+        self.assertEqual(overall[today].training_days, 42)
+        self.assertGreater(overall[today].rainy_rate, overall[today].dry_rate + 3)
+        self.assertGreater(overall[today + timedelta(days=1)].predicted_rate, overall[today].predicted_rate)
+        umbrella = LostForecast.objects.get(date=today, line_code='LINE2', category='우산')
+        self.assertAlmostEqual(umbrella.dry_rate, 0.0, delta=0.5)
+
+    def test_no_rates_no_forecast(self):
+        self.assertEqual(train_and_forecast(), 0)
@@ -0,0 +1,80 @@
+from datetime import date
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from main.hourly import HOURS, RECORD_BYTES, decode, decode_many, hour_profile, hour_profile_by, pack_counts, peak_hours
+from main.management.commands.sync_ridership_hourly import Command
+from main.models import RidershipHourly, Station
+from main.stations import StationCodeMap
+
+MARCH = date(2024, 3, 1)
+
+
+def hourly_row(station, line, on=1, off=2, **overrides):
+    row = {'STTN': station, 'SBWY_ROUT_LN_NM': line}
+    for hour in range(HOURS):
+        row[f'HR_{hour}_GET_ON_NOPE'] = str(on * hour)
+        row[f'HR_{hour}_GET_OFF_NOPE'] = str(off * hour)
+    row.update(overrides)
+    return row
+
+
+class PackingTests(SimpleTestCase):
+    def test_round_trip_and_clipping(self):
+        blob = pack_counts(range(HOURS), [-5] + [2 ** 40] * (HOURS - 1))
+
+        self.assertEqual(len(blob), RECORD_BYTES)
+        values = decode(blob)
+        self.assertEqual(values[0].tolist(), list(range(HOURS)))
+        self.assertEqual(values[1, 0], 0)
+        self.assertEqual(values[1, 1], np.iinfo(np.uint32).max)
+
+    def test_decode_many(self):
+        blobs = [pack_counts([i] * HOURS, [0] * HOURS) for i in range(3)]
+        self.assertEqual(decode_many(blobs)[:, 0, 0].tolist(), [0, 1, 2])
+        with self.assertRaises(ValueError):
+            decode_many([blobs[0][:-1]])
+
+    def test_peak_hours(self):
+        profile = np.zeros((2, HOURS))
+        profile[0, 8], profile[1, 18], profile[1, 9] = 50, 40, 30
+        self.assertEqual(peak_hours(profile), [8, 18, 9])
+
+
+class HourlyProfileTests(TestCase):
+    def setUp(self):
+        self.gangnam = Station.objects.create(line_code='LINE2', station_name_std='강남')
+        self.city_hall = Station.objects.create(line_code='LINE1', station_name_std='시청')
+        for station, scale in ((self.gangnam, 2), (self.city_hall, 1)):
+            RidershipHourly.objects.create(
+                date=MARCH, station=station, days=31,
+                counts=pack_counts([31 * scale] * HOURS, [62 * scale] * HOURS),
+            )
+
+    def test_profile_per_day(self):
+        profile = hour_profile(start=MARCH, end=MARCH)
+        self.assertEqual(profile[:, 0].tolist(), [3.0, 6.0])
+        self.assertEqual(hour_profile(lines=['LINE1'], per_day=False)[:, 0].tolist(), [31.0, 62.0])
+        self.assertEqual(hour_profile(start=date(2024, 4, 1)).sum(), 0)
+
+    def test_profile_by_line(self):
+        keys, totals = hour_profile_by('line')
+        self.assertEqual(keys, ['LINE1', 'LINE2'])
+        self.assertEqual(totals[:, 0, 0].tolist(), [31, 62])
+
+
+class StoreHourlyTests(TestCase):
+    def test_invalid_counts_are_skipped(self):
+        rows = [
+            hourly_row('강남', '2호선'),
+            hourly_row('시청', '1호선', HR_3_GET_ON_NOPE='inf'),
+            hourly_row('잠실', '2호선', HR_5_GET_OFF_NOPE='-1'),
+            hourly_row('', '2호선'),
+        ]
+        saved, skipped = Command()._store('202403', rows, StationCodeMap.from_db(), {})
+
+        self.assertEqual((saved, skipped), (1, 3))
+        stored = RidershipHourly.objects.select_related('station').get()
+        self.assertEqual((stored.station.line_code, stored.station.station_name_std, stored.days), ('LINE2', '강남', 31))
+        self.assertEqual(decode(stored.counts)[1].tolist(), [2 * hour for hour in range(HOURS)])
@@ -0,0 +1,54 @@
+import json
+
+from django.test import SimpleTestCase
+
+from main.json_stream import RowStreamDecoder
+from main.tests.test_seoul_api import SERVICE, api_body, api_result
+
+
+class RowStreamDecoderTests(SimpleTestCase):
+    rows = [
+        {'역명': '서울역', 'note': 'a "quoted" ] } value', 'n': 1},
+        {'역명': '시청(1호선)', 'nested': {'row': [1, 2]}, 'n': 2},
+        {'역명': '을지로입구', 'n': 3.5},
+    ]
+
+    def decode(self, content, size):
+        decoder = RowStreamDecoder(SERVICE)
+        rows = []
+        for start in range(0, len(content), size):
+            rows += decoder.feed(content[start:start + size])
+        return rows, decoder.close()
+
+    def test_any_chunk_size_yields_same_rows(self):
+        content = api_body(self.rows)
+        for size in (1, 2, 3, 7, 64, len(content)):
+            with self.subTest(size=size):
+                rows, envelope = self.decode(content, size)
+                self.assertEqual(rows, self.rows)
+                self.assertEqual(envelope[SERVICE]['row'], [])
+                self.assertEqual(envelope[SERVICE]['RESULT']['CODE'], 'INFO-000')
+                self.assertEqual(envelope[SERVICE]['list_total_count'], 3)
+
+    def test_rows_before_other_keys(self):
+        content = json.dumps({SERVICE: {'row': self.rows, 'list_total_count': 3}}, ensure_ascii=False).encode('utf-8')
+        rows, envelope = self.decode(content, 5)
+        self.assertEqual(rows, self.rows)
+        self.assertEqual(envelope, {SERVICE: {'row': [], 'list_total_count': 3}})
+
+    def test_error_response_without_rows(self):
+        # 문자열 안의 따옴표 / 괄호는 중첩으로 세지 않음
+        rows, envelope = self.decode(api_result('ERROR-500', '서버 "오류 {[ row'), 4)
+        self.assertEqual(rows, [])
+        self.assertEqual(envelope['RESULT'], {'CODE': 'ERROR-500', 'MESSAGE': '서버 "오류 {[ row'})
+
+    def test_truncated_response_fails_on_close(self):
+        content = api_body(self.rows)
+        decoder = RowStreamDecoder(SERVICE)
+        decoder.feed(content[:len(content) - 10])
+        with self.assertRaises(ValueError):
+            decoder.close()
+
+    def test_non_json_response(self):
+        with self.assertRaises(ValueError):
+            self.decode(b'<html>502 Bad Gateway</html>', 8)
@@ -0,0 +1,91 @@
+import pickle
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from main.matching import SearchIndex, index_path, remove_from_search_index, update_search_index
+from main.models import LostItem, StationDict
+from main.stations import StationIndex
+
+REGISTERED = timezone.make_aware(datetime(2024, 3, 5, 9))  # 화요일
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.station_index = StationIndex([('LINE2', '강남'), ('LINE2', '잠실'), ('LINE8', '잠실'), ('LINE1', '시청')])
+        self.index.add(1, '우산', '검정 장우산', '', 'LINE2', '강남역', REGISTERED)
+        self.index.add(2, '지갑', '갈색 반지갑', '', '', '잠실', REGISTERED)
+        self.index.add(3, '우산', '파랑 우산', '', 'LINE1', '시청', REGISTERED)
+        self.index.add(4, '가방', '검정 백팩', '', '', '', None)
+
+    def test_parse_query_keeps_impossible_date_as_text(self):
+        self.assertEqual(self.index.parse_query('우산 2024-13-45')['text'], '우산 2024-13-45')
+        query = self.index.parse_query('우산 2024-03-01')
+        self.assertEqual((query['text'], query['date']), ('우산', date(2024, 3, 1)))
+        query = self.index.parse_query('검정 우산 2호선 화요일')
+        self.assertEqual((query['text'], query['line'], query['weekday']), ('검정 우산', 'LINE2', 1))
+
+    def test_text_search_combines_text_and_place(self):
+        results, parsed = self.index.search('검정 우산 강남')
+
+        self.assertEqual(parsed['station'], '강남')
+        self.assertNotIn(2, [r['pk'] for r in results])
+        self.assertEqual((results[0]['pk'], results[0]['place_score']), (1, 1.0))
+
+    def test_place_only_query_uses_place_postings(self):
+        # 노선이 비어 있는 잠실 문서는 역의 노선 목록(StationDict)으로 2호선 후보가 됨
+        results, parsed = self.index.search('2호선')
+        self.assertEqual(sorted(r['pk'] for r in results), [1, 2])
+        self.assertEqual(parsed['candidates'], 2)
+
+        results, _ = self.index.search('', station='시청역')
+        self.assertEqual([r['pk'] for r in results], [3])
+
+        self.index.remove(2)
+        self.index.add(1, '우산', '검정 장우산', '', 'LINE1', '시청', REGISTERED)
+        self.assertEqual(self.index.search('2호선')[0], [])
+        self.assertEqual(self.index.station_postings, {'시청': {1, 3}})
+        self.assertEqual(self.index.line_postings, {'LINE1': {1, 3}})
+
+
+class SearchIndexFileTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        StationDict.objects.create(station_name_raw='강남', station_name_std='강남', line_code='LINE2')
+
+    def lost(self, item_id, item_name):
+        return LostItem.objects.create(item_id=item_id, item_name=item_name, station='강남', registered_at=REGISTERED).pk
+
+    def test_incremental_updates_persist(self):
+        first = self.lost('S1', '검정 우산')
+        update_search_index([first])
+        second = self.lost('S2', '갈색 지갑')
+        self.assertEqual(update_search_index([second]), 1)
+
+        index = SearchIndex.load()
+        self.assertEqual(set(index.docs), {first, second})
+        self.assertEqual(index.station_postings, {'강남': {first, second}})
+
+        remove_from_search_index([first])
+        self.assertEqual(set(SearchIndex.load().docs), {second})
+        # 저장에 쓴 임시 파일은 남지 않음
+        self.assertEqual(sorted(p.name for p in index_path().parent.iterdir()), ['search_index.lock', 'search_index.pkl'])
+
+    def test_index_in_old_format_is_rebuilt(self):
+        item = self.lost('S1', '검정 우산')
+        stale = SearchIndex()
+        stale.format = SearchIndex.FORMAT - 1
+        index_path().parent.mkdir(parents=True, exist_ok=True)
+        index_path().write_bytes(pickle.dumps(stale))
+
+        self.assertIsNone(SearchIndex.load())
+        update_search_index([])
+        self.assertEqual(set(SearchIndex.load().docs), {item})
@@ -0,0 +1,49 @@
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE = [('main', '0010_savedsearch')]
+AFTER = [('main', '0013_station_dimension_unique')]
+
+
+class StationKeyMigrationTests(TransactionTestCase):
+    """사실 테이블의 노선 / 역 문자열 → Station 정수 키 전환과 그 되돌리기"""
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_round_trip_keeps_station_strings(self):
+        apps = self.migrate(BEFORE)
+        apps.get_model('main', 'StationDict').objects.create(
+            station_name_raw='강남', station_name_std='강남', line_code='LINE2',
+        )
+        apps.get_model('main', 'RidershipDaily').objects.create(
+            date=date(2024, 3, 1), line_code='LINE2', station_name_std='강남', boardings=1, alightings=1, total=2,
+        )
+        apps.get_model('main', 'LostItemRate').objects.create(
+            date=date(2024, 3, 1), line_code='LINE1', station_name_std='시청', category='전체',
+            lost_count=1, ridership=10, rate_per_10k=1000.0,
+        )
+
+        apps = self.migrate(AFTER)
+        rate = apps.get_model('main', 'LostItemRate').objects.select_related('station').get()
+        self.assertEqual((rate.station.line_code, rate.station.station_name_std), ('LINE1', '시청'))
+        self.assertEqual(apps.get_model('main', 'RidershipDaily').objects.get().station.station_name_std, '강남')
+
+        apps = self.migrate(BEFORE)
+        self.assertEqual(
+            list(apps.get_model('main', 'LostItemRate').objects.values_list('line_code', 'station_name_std')),
+            [('LINE1', '시청')],
+        )
+        self.assertEqual(
+            list(apps.get_model('main', 'RidershipDaily').objects.values_list('line_code', 'station_name_std')),
+            [('LINE2', '강남')],
+        )
@@ -0,0 +1,108 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from main import normalize
+from main.models import LostItem, NameAlias, TransportOperator
+from main.normalize import (
+    DEFAULT_TRANSPORT, NormalizationRules, active_rules, bump_rules_version, install_rules, rules_version,
+)
+from main.views import CSV_COLUMNS
+
+
+class NormalizationRulesTests(SimpleTestCase):
+    def test_default_rules(self):
+        rules = NormalizationRules()
+        self.assertEqual(rules.line_code('2호선'), 'LINE2')
+        self.assertEqual(rules.line_code('경의 중앙선'), '경의중앙선')
+        self.assertEqual(rules.station_name('서울역(1호선)'), '서울역')
+        self.assertEqual(rules.match_key('강남역'), '강남')
+        self.assertEqual(rules.match_key('역'), '역')
+
+    def test_aliases(self):
+        rules = NormalizationRules(
+            line_aliases=[('공항철도 1호선', 'AREX', False), (r'수도권\s*(\d)호선', r'LINE\1', True), ('(', 'X', True)],
+            station_aliases=[('총신대입구(이수)', '총신대입구', False)],
+            operators=[(' 서울버스 ', 'bus')],
+        )
+        # 정확 일치 별칭이 기본 'N호선' 규칙보다 먼저, 잘못된 정규식은 건너뜀
+        self.assertEqual(rules.line_code('공항철도 1호선'), 'AREX')
+        self.assertEqual(rules.line_code('수도권 3호선'), 'LINE3')
+        self.assertEqual(rules.station_name('총신대입구(이수)'), '총신대입구')
+        self.assertEqual(rules.transport_for('서울버스'), 'bus')
+        self.assertEqual(rules.transport_for('모르는 회사'), DEFAULT_TRANSPORT)
+        self.assertEqual(rules.transport_for(None), DEFAULT_TRANSPORT)
+
+    def test_regex_alias_validation(self):
+        with self.assertRaises(ValidationError):
+            NameAlias(kind=NameAlias.KIND_LINE, alias='(', target='X', is_regex=True).clean()
+        with self.assertRaises(ValidationError):
+            NameAlias(kind=NameAlias.KIND_LINE, alias=r'(\d)호선', target=r'LINE\2', is_regex=True).clean()
+
+
+class ActiveRulesTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        install_rules(None)
+        self.addCleanup(install_rules, None)
+
+    def test_saving_a_rule_resets_this_process(self):
+        self.assertEqual(active_rules().line_code('공항철도'), '공항철도')
+        with self.captureOnCommitCallbacks(execute=True):
+            NameAlias.objects.create(kind=NameAlias.KIND_LINE, alias='공항철도', target='AREX')
+
+        self.assertEqual(active_rules().line_code('공항철도'), 'AREX')
+        # 커밋 후 표시 파일이 바뀌어 다른 프로세스도 다시 읽음
+        self.assertIsNotNone(rules_version())
+
+    def test_change_in_another_process_is_picked_up(self):
+        with mock.patch.object(normalize, 'RULES_CHECK_INTERVAL', 0):
+            rules = active_rules()
+            # 다른 프로세스의 저장 (이 프로세스의 시그널은 받지 않음)
+            NameAlias.objects.bulk_create([NameAlias(kind=NameAlias.KIND_LINE, alias='공항철도', target='AREX')])
+            self.assertIs(active_rules(), rules)
+
+            bump_rules_version()
+            self.assertEqual(active_rules().line_code('공항철도'), 'AREX')
+
+    def test_installed_rules_are_pinned(self):
+        rules = NormalizationRules()
+        install_rules(rules)
+        with mock.patch.object(normalize, 'RULES_CHECK_INTERVAL', 0):
+            bump_rules_version()
+            self.assertIs(active_rules(), rules)
+
+
+class TransportDefaultTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(install_rules, None)
+
+    def test_csv_upload_uses_the_operator_table(self):
+        TransportOperator.objects.create(name='테스트운수', transport='bus')
+        rows = [
+            ','.join(CSV_COLUMNS),
+            'T1,보관,2024-03-01,,검정 우산,버스 차고지,R1,검정 우산,우산,테스트운수,0',
+            'T2,보관,2024-03-01,,검정 지갑,경찰서,R1,검정 지갑,지갑,모르는 회사,0',
+            'T3,보관,2024-03-01,,검정 지갑,경찰서,R1,검정 지갑,지갑,,0',
+        ]
+        upload = SimpleUploadedFile('items.csv', '\n'.join(rows).encode('utf-8'), content_type='text/csv')
+        self.client.post(reverse('lostitem_upload_csv'), {'csv_file': upload})
+
+        self.assertEqual(
+            dict(LostItem.objects.values_list('item_id', 'transport')),
+            {'T1': 'bus', 'T2': DEFAULT_TRANSPORT, 'T3': DEFAULT_TRANSPORT},
+        )
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from main.models import LostItem, PickupTimeHistogram, StorageOccupancy
+from main.occupancy import apply_changes, item_state, pickup_bucket, rebuild_occupancy, track_occupancy
+
+
+def make_item(item_id, registered_at, location='시청역 유실물센터', received_days=None, **fields):
+    received_at = registered_at + timedelta(days=received_days) if received_days is not None else None
+    return LostItem(
+        item_id=item_id, registered_at=registered_at, received_at=received_at,
+        is_received=received_days is not None, storage_location=location, category='지갑', **fields,
+    )
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+
+    def counts(self, location='시청역 유실물센터'):
+        row = StorageOccupancy.objects.filter(storage_location=location).first()
+        return (row.held, row.received, row.pickup_samples, row.pickup_days_total) if row else None
+
+    def test_apply_changes_only_adds_difference(self):
+        held = item_state('A', '지갑', False, self.now, None)
+        received = item_state('A', '지갑', True, self.now, self.now + timedelta(days=3))
+        self.assertEqual(apply_changes({}, {1: held, 2: held}), 1)
+        self.assertEqual(apply_changes({1: held, 2: held}, {1: held, 2: received}), 1)
+        # 변화 없음은 쿼리 없이 0
+        with self.assertNumQueries(0):
+            self.assertEqual(apply_changes({1: held}, {1: held}), 0)
+
+        self.assertEqual(self.counts('A'), (1, 1, 1, 3))
+        self.assertEqual(
+            PickupTimeHistogram.objects.get(category='지갑', bucket=pickup_bucket(3)).count, 1
+        )
+
+    def test_bulk_load_and_single_save_match_rebuild(self):
+        items = [make_item(f'L{i}', self.now - timedelta(days=10), received_days=i if i % 2 else None) for i in range(6)]
+        with track_occupancy([item.item_id for item in items]):
+            LostItem.objects.bulk_create(items)
+        self.assertEqual(self.counts(), (3, 3, 3, 1 + 3 + 5))
+
+        # 단건 저장은 시그널로 반영
+        item = LostItem.objects.get(item_id='L0')
+        item.is_received, item.received_at = True, item.registered_at + timedelta(days=2)
+        item.save()
+        LostItem.objects.get(item_id='L1').delete()
+        incremental = self.counts()
+        self.assertEqual(incremental, (2, 3, 3, 2 + 3 + 5))
+
+        rebuild_occupancy()
+        self.assertEqual(self.counts(), incremental)
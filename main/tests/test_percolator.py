@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, TestCase
+
+from main.models import LostItem, SavedSearch, SearchNotification, StationDict
+from main.percolator import Percolator, percolate
+from main.stations import StationIndex
+
+
+def search(pk, keywords='', category='', line='', station=''):
+    return SimpleNamespace(pk=pk, keywords=keywords, category=category, line=line, station=station)
+
+
+class PercolatorTests(SimpleTestCase):
+    def test_anchor_uses_item_tokenization(self):
+        percolator = Percolator([search(1, 'T-Shirt')])
+        items = [(10, '의류', '검정 t-shirt', '', None, ''), (11, '의류', '검정 셔츠', '', None, '')]
+        self.assertEqual(percolator.match(items), [(1, 10)])
+
+    def test_all_conditions_must_hold(self):
+        percolator = Percolator(
+            [
+                search(1, '검정 우산', category='우산'),
+                search(2, line='2호선'),
+                search(3, station='잠실역'),
+                search(4),  # 조건 없는 검색은 색인하지 않음
+            ],
+            StationIndex([('LINE2', '잠실'), ('LINE8', '잠실')]),
+        )
+        self.assertEqual(len(percolator), 3)
+
+        items = [
+            (10, '우산', '검정 장우산', '', 'LINE1', '시청'),
+            (11, '우산', '파랑 우산', '', 'LINE2', '강남'),
+            # 노선이 비어 있는 환승역은 그 역의 모든 노선으로 매칭
+            (12, '지갑', '검정 지갑', '', '', '잠실'),
+        ]
+        self.assertEqual(sorted(percolator.match(items)), [(1, 10), (2, 11), (2, 12), (3, 12)])
+
+
+class PercolateTests(TestCase):
+    def test_counts_only_new_notifications(self):
+        StationDict.objects.create(station_name_raw='강남', station_name_std='강남', line_code='LINE2')
+        umbrella = SavedSearch.objects.create(contact='a@example.com', keywords='우산')
+        SavedSearch.objects.create(contact='b@example.com', line='LINE2', is_active=False)
+        first = LostItem.objects.create(item_id='P1', item_name='검정 우산', station='강남')
+
+        self.assertEqual(percolate([first.pk]), 1)
+        second = LostItem.objects.create(item_id='P2', item_name='파랑 우산', station='강남')
+        # 재적재된 분실물의 기존 알림은 다시 세지 않음
+        self.assertEqual(percolate([first.pk, second.pk]), 1)
+        self.assertEqual(percolate([first.pk, second.pk]), 0)
+        self.assertEqual(
+            sorted(SearchNotification.objects.values_list('saved_search_id', 'item_id')),
+            [(umbrella.pk, first.pk), (umbrella.pk, second.pk)],
+        )
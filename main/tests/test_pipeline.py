@@ -0,0 +1,86 @@
+import threading
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from main.models import PipelineRun
+from main.pipeline import PipelineRunner, Stage
+
+STAGES = (
+    Stage('ridership', 'sync_ridership'),
+    Stage('lostitem', 'sync_lostitem'),
+    Stage('reports', 'sync_reports', depends_on=('ridership', 'lostitem')),
+)
+
+
+class FakeCommands:
+    """call_command 대역: 실행 순서를 기록하고, fail에 든 명령은 failures번 실패시킵니다."""
+
+    def __init__(self, fail=(), failures=99):
+        self.fail = set(fail)
+        self.failures = failures
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, command, **options):
+        with self._lock:
+            self.calls.append(command)
+            attempts = self.calls.count(command)
+        if command in self.fail and attempts <= self.failures:
+            raise RuntimeError(f'{command} 실패')
+
+
+class PipelineRunnerTests(TransactionTestCase):
+    def run_pipeline(self, commands, stages=STAGES, **kwargs):
+        with mock.patch('main.pipeline.call_command', commands):
+            return PipelineRunner(stages, retry_delay=0, **kwargs).run()
+
+    def statuses(self, run):
+        return {name: result['status'] for name, result in run.stages.items()}
+
+    def test_dependents_run_after_all_inputs(self):
+        commands = FakeCommands()
+        run = self.run_pipeline(commands)
+
+        self.assertEqual(run.status, PipelineRun.STATUS_SUCCESS)
+        self.assertEqual(set(commands.calls[:2]), {'sync_ridership', 'sync_lostitem'})
+        self.assertEqual(commands.calls[2], 'sync_reports')
+        self.assertEqual(set(self.statuses(run).values()), {PipelineRun.STATUS_SUCCESS})
+
+    def test_failed_stage_blocks_dependents(self):
+        run = self.run_pipeline(FakeCommands(fail={'sync_lostitem'}))
+
+        self.assertEqual(run.status, PipelineRun.STATUS_FAILED)
+        self.assertEqual(self.statuses(run), {
+            'ridership': PipelineRun.STATUS_SUCCESS,
+            'lostitem': PipelineRun.STATUS_FAILED,
+            'reports': 'blocked',
+        })
+        self.assertIn('sync_lostitem 실패', run.stages['lostitem']['error'])
+
+    def test_retry_then_success(self):
+        commands = FakeCommands(fail={'sync_ridership'}, failures=1)
+        run = self.run_pipeline(commands, retries=1)
+
+        self.assertEqual(run.status, PipelineRun.STATUS_SUCCESS)
+        self.assertEqual(run.stages['ridership']['attempts'], 2)
+
+    def test_resume_reuses_successful_stages(self):
+        failed = self.run_pipeline(FakeCommands(fail={'sync_lostitem'}))
+        commands = FakeCommands()
+        with mock.patch('main.pipeline.call_command', commands):
+            run = PipelineRunner(STAGES, retry_delay=0).run(resume_from=failed)
+
+        self.assertEqual(run.status, PipelineRun.STATUS_SUCCESS)
+        self.assertEqual(commands.calls, ['sync_lostitem', 'sync_reports'])
+        self.assertTrue(run.stages['ridership']['reused'])
+
+    def test_invalid_dag_is_rejected_up_front(self):
+        with self.assertRaisesMessage(ValueError, '정의되지 않았습니다'):
+            PipelineRunner((Stage('reports', 'sync_reports', depends_on=('weather',)),))
+        with self.assertRaisesMessage(ValueError, '순환'):
+            PipelineRunner((
+                Stage('a', 'sync_a', depends_on=('b',)),
+                Stage('b', 'sync_b', depends_on=('a',)),
+                Stage('c', 'sync_c'),
+            ))
@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from main.models import LostItem, LostItemRate, LostItemRateDirtyDate, RidershipDaily, Station, StationDict
+from main.reports import refresh_lost_item_rates
+
+START = date(2024, 3, 1)
+
+
+def at(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+class LostItemRateTests(TestCase):
+    def setUp(self):
+        for raw, std, line in (('강남', '강남', 'LINE2'), ('시청', '시청', 'LINE1'), ('시청', '시청', 'LINE2')):
+            StationDict.objects.create(station_name_raw=raw, station_name_std=std, line_code=line)
+        self.stations = {
+            (line, name): Station.objects.create(line_code=line, station_name_std=name)
+            for line, name in (('LINE2', '강남'), ('LINE1', '시청'), ('LINE2', '시청'))
+        }
+        riders = {('LINE2', '강남'): 20000, ('LINE1', '시청'): 5000, ('LINE2', '시청'): 10000}
+        RidershipDaily.objects.bulk_create([
+            RidershipDaily(date=START + timedelta(days=i), station=self.stations[key], boardings=total // 2,
+                           alightings=total // 2, total=total)
+            for i in range(20) for key, total in riders.items()
+        ])
+        self.next_id = 0
+
+    def lost(self, day, station, line=None, category='지갑'):
+        self.next_id += 1
+        return LostItem.objects.create(
+            item_id=f'R{self.next_id}', registered_at=at(day), station=station, line=line, category=category,
+        )
+
+    def rate(self, day, line, name, category=LostItemRate.ALL_CATEGORIES):
+        return LostItemRate.objects.get(date=day, station=self.stations[(line, name)], category=category)
+
+    def test_rates_per_station_and_category(self):
+        self.lost(START, '강남역')
+        self.lost(START, '강남', category='우산')
+        # 노선 없는 환승역은 승하차 인원이 많은 노선으로 귀속
+        self.lost(START, '시청')
+        self.lost(START, '시청', line='1호선')
+
+        since, rows = refresh_lost_item_rates(full=True)
+
+        self.assertIsNone(since)
+        total = self.rate(START, 'LINE2', '강남')
+        self.assertEqual((total.lost_count, total.ridership, total.rate_per_10k), (2, 20000, 1.0))
+        self.assertEqual(self.rate(START, 'LINE2', '강남', '우산').lost_count, 1)
+        self.assertEqual(self.rate(START, 'LINE2', '시청').lost_count, 1)
+        self.assertEqual(self.rate(START, 'LINE1', '시청').lost_count, 1)
+        # 분실물이 없는 날도 승하차 인원이 분모로 남음
+        quiet = self.rate(START + timedelta(days=5), 'LINE2', '강남')
+        self.assertEqual((quiet.lost_count, quiet.ridership, quiet.rate_per_10k), (0, 20000, 0.0))
+
+    def test_incremental_refresh_picks_up_backdated_items(self):
+        self.lost(START + timedelta(days=19), '강남')
+        refresh_lost_item_rates(full=True)
+
+        # 마지막 계산일 - 겹침 구간보다 이전 날짜로 늦게 들어온 분실물
+        item = self.lost(START, '강남')
+        since, _ = refresh_lost_item_rates()
+        self.assertEqual(self.rate(START, 'LINE2', '강남').lost_count, 0)
+        self.assertGreater(since, START)
+
+        LostItemRateDirtyDate.mark([item.registered_at])
+        since, _ = refresh_lost_item_rates()
+        self.assertEqual(since, START)
+        self.assertEqual(self.rate(START, 'LINE2', '강남').lost_count, 1)
+        self.assertEqual(self.rate(START + timedelta(days=19), 'LINE2', '강남').lost_count, 1)
+        self.assertFalse(LostItemRateDirtyDate.objects.exists())
@@ -0,0 +1,113 @@
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.test import SimpleTestCase, TestCase
+
+from main.models import QuarantinedRow, RidershipDaily, Station, StationDict
+from main.normalize import NormalizationRules, install_rules
+from main.ridership_files import (
+    MAX_COUNT, RidershipFileError, import_files, init_worker, iter_blocks, normalize_block, read_header,
+)
+
+HEADER = '사용일자,노선명,역명,승차총승객수,하차총승객수'
+
+
+class RidershipFileTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+    def write(self, text, encoding='utf-8', name='ridership.csv'):
+        path = self.directory / name
+        path.write_bytes(text.encode(encoding))
+        return path
+
+    def test_header_aliases_and_encoding(self):
+        path = self.write('USE_YMD,SBWY_ROUT_LN_NM,SBWY_STNS_NM,GTON_TNOPE,GTOFF_TNOPE\n20240301,2호선,강남,1,2\n', 'cp949')
+        encoding, columns, offset, header = read_header(path)
+        self.assertEqual(encoding, 'cp949')
+        self.assertEqual(columns, {'date': 0, 'line': 1, 'station': 2, 'boardings': 3, 'alightings': 4})
+        self.assertEqual(header[0], 'USE_YMD')
+
+        with self.assertRaises(RidershipFileError):
+            read_header(self.write('사용일자,역명\n', name='broken.csv'))
+
+    def test_blocks_end_on_line_boundaries(self):
+        lines = [f'2024030{i % 9 + 1},2호선,역{i},{i},{i}' for i in range(50)]
+        path = self.write('\n'.join([HEADER, *lines]) + '\n')
+        _, _, offset, _ = read_header(path)
+
+        blocks = list(iter_blocks(path, offset, block_bytes=64))
+        self.assertGreater(len(blocks), 1)
+        self.assertEqual(b''.join(data for _, data in blocks).decode().splitlines(), lines)
+        self.assertTrue(all(data.endswith(b'\n') for _, data in blocks))
+        # 블록 첫 행 번호는 헤더를 1행으로 센 파일 행 번호
+        first_line, data = blocks[1]
+        self.assertEqual(first_line, 2 + blocks[0][1].count(b'\n'))
+        self.assertEqual(data.decode().splitlines()[0], lines[first_line - 2])
+
+    def test_normalize_block(self):
+        init_worker({('강남역', 'LINE2'): '강남'}, NormalizationRules().tables)
+        self.addCleanup(install_rules, None)
+        columns = {'date': 0, 'line': 1, 'station': 2, 'boardings': 3, 'alightings': 4}
+        data = '\n'.join([
+            '2024-03-01,2호선,강남역,10,20.0',
+            '20240302,2호선,,1,1',
+            '2024-13-01,2호선,강남,1,1',
+            f'20240301,2호선,강남,{MAX_COUNT + 1},1',
+            '20240301,2호선,강남,1.5,1',
+            '20240301,2호선',
+        ]).encode('utf-8')
+
+        records, rejects = normalize_block('utf-8', columns, 10, data)
+
+        self.assertEqual(records, [('LINE2', '강남', '강남역', date(2024, 3, 1).toordinal(), 10, 20)])
+        self.assertEqual([(line, reasons) for line, _, reasons in rejects], [
+            (11, ['필수 값 누락: 역명']),
+            (12, ['날짜 형식 오류: 사용일자']),
+            (13, ['허용 범위 밖의 값: 승하차 인원']),
+            (14, ['숫자 형식 오류: 승하차 인원']),
+            (15, ['열 개수 부족 (5개 필요)']),
+        ])
+
+
+class ImportFilesTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # import_files가 설치한 규칙을 다음 테스트로 넘기지 않도록
+        self.addCleanup(install_rules, None)
+        self.path = Path(tmp.name) / 'CARD_SUBWAY_MONTH_202403.csv'
+        self.path.write_text('\n'.join([
+            HEADER,
+            '20240301,2호선,강남,10,20',
+            '20240301,1호선,시청,5,5',
+            '20240301,2호선,강남,30,40',
+            '20240302,2호선,강남,x,1',
+        ]) + '\n', encoding='utf-8')
+
+    def test_import_upserts_and_quarantines(self):
+        RidershipDaily.objects.create(
+            date=date(2024, 3, 1), station=Station.objects.create(line_code='LINE1', station_name_std='시청'),
+            boardings=1, alightings=1, total=2,
+        )
+
+        stats = import_files([self.path], block_bytes=32)
+
+        self.assertEqual((stats['files'], stats['rows'], stats['rejected']), (1, 4, 1))
+        rows = RidershipDaily.objects.select_related('station').order_by('station__line_code')
+        # 같은 (역, 날짜)는 파일에서 나중 행, 이미 있던 행은 파일 값으로 갱신
+        self.assertEqual(
+            [(row.station.station_name_std, row.boardings, row.total) for row in rows],
+            [('시청', 5, 10), ('강남', 30, 70)],
+        )
+        self.assertTrue(StationDict.objects.filter(station_name_raw='강남', line_code='LINE2').exists())
+        self.assertEqual(QuarantinedRow.objects.get().row_number, 5)
+
+    def test_dry_run_writes_nothing(self):
+        stats = import_files([self.path], dry_run=True)
+        self.assertEqual((stats['written'], stats['rejected']), (2, 1))
+        self.assertFalse(RidershipDaily.objects.exists())
+        self.assertFalse(QuarantinedRow.objects.exists())
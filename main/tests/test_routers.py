@@ -0,0 +1,75 @@
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from main import db
+from main.models import LostItem
+from main.routers import AnalyticsRouter, analytics_reads, use_analytics_db
+
+
+def write_snapshot(path, migrations):
+    snapshot = sqlite3.connect(path)
+    try:
+        snapshot.execute('CREATE TABLE django_migrations (app TEXT, name TEXT)')
+        snapshot.executemany('INSERT INTO django_migrations (app, name) VALUES (?, ?)', migrations)
+        snapshot.commit()
+    finally:
+        snapshot.close()
+
+
+class AnalyticsRouterTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'analytics.sqlite3'
+        settings_override = override_settings(ANALYTICS_DB_PATH=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        db._snapshot_schema.update(stat=None, current=False)
+        self.addCleanup(db._snapshot_schema.update, stat=None, current=False)
+        self.router = AnalyticsRouter()
+
+    def read_db(self):
+        return self.router.db_for_read(LostItem)
+
+    def test_reads_outside_analytics_views_use_primary(self):
+        write_snapshot(self.path, db._expected_migrations())
+        self.assertEqual(self.read_db(), 'default')
+        with use_analytics_db():
+            self.assertEqual(self.read_db(), settings.ANALYTICS_DB_ALIAS)
+        self.assertEqual(self.read_db(), 'default')
+
+    def test_missing_snapshot_falls_back_to_primary(self):
+        with use_analytics_db():
+            self.assertEqual(self.read_db(), 'default')
+
+    def test_stale_snapshot_falls_back_to_primary(self):
+        # 마지막 마이그레이션이 빠진 스냅샷 = 마이그레이션 후 아직 snapshot_db를 다시 돌리지 않은 상태
+        write_snapshot(self.path, sorted(db._expected_migrations())[:-1])
+        with use_analytics_db():
+            self.assertEqual(self.read_db(), 'default')
+
+    def test_decorator_wraps_sync_and_async_views(self):
+        write_snapshot(self.path, db._expected_migrations())
+
+        @analytics_reads
+        def sync_view(request):
+            return self.read_db()
+
+        @analytics_reads
+        async def async_view(request):
+            return self.read_db()
+
+        self.assertEqual(sync_view(None), settings.ANALYTICS_DB_ALIAS)
+        self.assertEqual(asyncio.run(async_view(None)), settings.ANALYTICS_DB_ALIAS)
+        self.assertEqual(self.read_db(), 'default')
+
+    def test_writes_and_migrations_stay_on_primary(self):
+        with use_analytics_db():
+            self.assertEqual(self.router.db_for_write(LostItem), 'default')
+        self.assertTrue(self.router.allow_migrate('default', 'main'))
+        self.assertFalse(self.router.allow_migrate(settings.ANALYTICS_DB_ALIAS, 'main'))
@@ -0,0 +1,70 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from main.models import LostItemRate, RainImpactReport, Station, WeatherDaily
+from main.scenario import ScenarioModel, build_scenario_model, get_scenario_model, scenario_path
+from main.snapshot import to_day
+
+ALL = LostItemRate.ALL_CATEGORIES
+START = date(2024, 3, 4)
+
+
+class ScenarioModelTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_build_and_predict(self):
+        outdoor = Station.objects.create(line_code='LINE2', station_name_std='강남')
+        indoor = Station.objects.create(line_code='LINE1', station_name_std='시청')
+        RainImpactReport.objects.create(station=outdoor, rain_impact_index=80.0)
+        rates = []
+        for i in range(42):
+            day = START + timedelta(days=i)
+            rainy = i % 3 == 0
+            WeatherDaily.objects.create(date=day, rain_mm=10.0 if rainy else 0.0, avg_temp=15.0, is_rainy=rainy)
+            # 강남은 비 오는 날 승하차가 줄고 분실률이 오르며, 시청은 날씨와 무관
+            rates += [
+                LostItemRate(date=day, station=outdoor, category=ALL,
+                             lost_count=8 if rainy else 5, ridership=8000 if rainy else 10000),
+                LostItemRate(date=day, station=indoor, category=ALL, lost_count=3, ridership=6000),
+            ]
+        LostItemRate.objects.bulk_create(rates)
+
+        self.assertEqual(build_scenario_model(), 2)
+        model = get_scenario_model()
+        position = {station: i for i, station in enumerate(model.stations)}
+        gangnam, city_hall = position[('LINE2', '강남')], position[('LINE1', '시청')]
+
+        ridership, lost, dry = model.predict(to_day(START), rain_mm=10.0, avg_temp=15.0)
+        self.assertAlmostEqual(ridership[gangnam], 8000, delta=200)
+        self.assertAlmostEqual(dry[gangnam], 10000, delta=200)
+        self.assertAlmostEqual(lost[gangnam], 8, delta=0.5)
+        self.assertAlmostEqual(ridership[city_hall], dry[city_hall], delta=1)
+        self.assertAlmostEqual(lost[city_hall], 3, delta=0.1)
+        self.assertEqual(model.rii[gangnam], 80.0)
+        self.assertTrue(np.isnan(model.rii[city_hall]))
+        self.assertEqual(model.training_days.tolist(), [42, 42])
+
+    def test_save_and_load_round_trip(self):
+        model = ScenarioModel(
+            [('LINE2', '강남')], np.arange(18, dtype=np.float64).reshape(2, 9),
+            np.array([np.nan]), np.array([10]), temp_fill=12.5,
+        )
+        model.save()
+        loaded = ScenarioModel.load(scenario_path())
+
+        self.assertEqual(loaded.stations, model.stations)
+        self.assertEqual(loaded.temp_fill, 12.5)
+        self.assertEqual([a.tolist() for a in loaded.predict(100, 5.0)], [a.tolist() for a in model.predict(100, 5.0)])
+
+    def test_no_rates_no_model(self):
+        self.assertEqual(build_scenario_model(), 0)
+        self.assertIsNone(get_scenario_model())
@@ -0,0 +1,98 @@
+import json
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from main.seoul_api import SeoulApiClient, SeoulApiError
+
+SERVICE = 'CardSubwayStatsNew'
+
+
+def api_body(rows, service=SERVICE):
+    return json.dumps(
+        {service: {'list_total_count': len(rows), 'RESULT': {'CODE': 'INFO-000', 'MESSAGE': '정상 처리되었습니다'}, 'row': rows}},
+        ensure_ascii=False,
+    ).encode('utf-8')
+
+
+def api_result(code, message='', service=SERVICE):
+    return json.dumps({'RESULT': {'CODE': code, 'MESSAGE': message}}, ensure_ascii=False).encode('utf-8')
+
+
+class FakeResponse:
+    """content를 chunk_size 단위로 내보내고, fail_after 바이트를 넘기면 연결이 끊긴 것처럼 예외를 냅니다."""
+
+    def __init__(self, content, status_code=200, chunk_size=16, fail_after=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.chunk_size = chunk_size
+        self.fail_after = fail_after
+
+    def iter_content(self, size):
+        for start in range(0, len(self.content), self.chunk_size):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise requests.ConnectionError('connection reset')
+            yield self.content[start:start + self.chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def fake_client(*responses, retries=2):
+    client = SeoulApiClient(api_key='K', retries=retries)
+    client.session = FakeSession(*responses)
+    return client
+
+
+@mock.patch('main.seoul_api.time.sleep')
+class SeoulApiClientTests(SimpleTestCase):
+    rows = [{'SBWY_STNS_NM': f'역{i}', 'GTON_TNOPE': i} for i in range(6)]
+
+    def test_stream_retry_skips_delivered_rows(self, sleep):
+        content = api_body(self.rows)
+        # 첫 응답은 행 몇 개를 넘긴 뒤 끊기고, 재시도한 응답은 처음부터 다시 옵니다.
+        client = fake_client(FakeResponse(content, fail_after=len(content) // 2), FakeResponse(content))
+        delivered = []
+        body = client.get(SERVICE, 1, 1000, on_rows=delivered.extend)
+
+        self.assertEqual(delivered, self.rows)
+        self.assertEqual(body['row'], [])
+        self.assertEqual(body['list_total_count'], len(self.rows))
+        self.assertEqual(client.session.calls, 2)
+        self.assertEqual(client.metrics.summary()[SERVICE]['retry'], 1)
+
+    def test_retryable_result_code_is_retried(self, sleep):
+        client = fake_client(FakeResponse(api_result('ERROR-500', '서버 오류')), FakeResponse(api_body(self.rows)))
+        body = client.get(SERVICE, 1, 1000)
+        self.assertEqual(body['row'], self.rows)
+        self.assertEqual(client.session.calls, 2)
+
+    def test_non_retryable_result_code_raises(self, sleep):
+        client = fake_client(FakeResponse(api_result('ERROR-300', '필수 값 누락')), FakeResponse(api_body(self.rows)))
+        with self.assertRaises(SeoulApiError) as raised:
+            client.get(SERVICE, 1, 1000)
+        self.assertEqual(raised.exception.code, 'ERROR-300')
+        self.assertEqual(client.session.calls, 1)
+
+    def test_no_data_returns_none(self, sleep):
+        client = fake_client(FakeResponse(api_result('INFO-200', '해당하는 데이터가 없습니다.')))
+        self.assertIsNone(client.get(SERVICE, 1, 1000, on_rows=lambda rows: None))
+
+    def test_gives_up_after_retries(self, sleep):
+        client = fake_client(*[FakeResponse(b'<html>bad gateway</html>', status_code=502) for _ in range(3)])
+        with self.assertRaises(SeoulApiError):
+            client.get(SERVICE, 1, 1000)
+        self.assertEqual(client.session.calls, 3)
+        self.assertEqual(client.limiter.in_flight, 0)
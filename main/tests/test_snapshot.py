@@ -0,0 +1,78 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from main import snapshot
+from main.models import RidershipDaily, Station, WeatherDaily
+
+START = date(2024, 3, 1)
+
+
+class ColumnarSnapshotTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        gangnam = Station.objects.create(line_code='LINE2', station_name_std='강남')
+        city_hall = Station.objects.create(line_code='LINE1', station_name_std='시청')
+        self.stations = {gangnam.pk: ('LINE2', '강남'), city_hall.pk: ('LINE1', '시청')}
+        # 저장 순서와 무관하게 날짜순으로 정렬되는지 확인하기 위해 역순으로 넣음
+        RidershipDaily.objects.bulk_create([
+            RidershipDaily(date=START + timedelta(days=i), station=station, boardings=i, alightings=i, total=2 * i)
+            for i in reversed(range(5)) for station in (gangnam, city_hall)
+        ])
+        WeatherDaily.objects.create(date=START, rain_mm=12.5, avg_temp=8.0, is_rainy=True)
+        WeatherDaily.objects.create(date=START + timedelta(days=2), rain_mm=0.0, avg_temp=None, is_rainy=False)
+
+    def test_build_and_read(self):
+        path = snapshot.build_snapshot()
+        snap = snapshot.get_snapshot()
+
+        self.assertEqual(snap.path, path)
+        self.assertEqual(len(snap), 10)
+        self.assertEqual(snap.stations, self.stations)
+        self.assertTrue(np.all(np.diff(snap.ridership['date']) >= 0))
+        lines = [snap.lines[code] for code in snap.ridership['line']]
+        self.assertEqual(lines, [self.stations[pk][0] for pk in snap.ridership['station']])
+
+        window = snap.ridership_between(START + timedelta(days=1), START + timedelta(days=2))
+        self.assertEqual(window['total'].tolist(), [2, 2, 4, 4])
+        self.assertEqual(snapshot.from_day(window['date'][0]), START + timedelta(days=1))
+
+        index, found = snap.weather_for(snap.ridership['date'][::2])
+        self.assertEqual(found.tolist(), [True, False, True, False, False])
+        self.assertEqual(snap.weather['rain_mm'][index[0]], np.float32(12.5))
+        self.assertTrue(np.isnan(snap.weather['avg_temp'][index[2]]))
+
+    def test_rebuild_switches_current_and_keeps_recent_versions(self):
+        first = snapshot.build_snapshot()
+        self.assertEqual(len(snapshot.get_snapshot()), 10)
+
+        RidershipDaily.objects.filter(date=START).delete()
+        builds = [snapshot.build_snapshot() for _ in range(snapshot.KEEP_VERSIONS + 1)]
+
+        self.assertEqual(len(snapshot.get_snapshot()), 8)
+        self.assertEqual(snapshot.get_snapshot().path, builds[-1])
+        self.assertFalse(first.exists())
+        self.assertEqual(
+            sorted(p.name for p in snapshot.snapshot_root().iterdir() if p.is_dir()),
+            sorted(p.name for p in builds[-snapshot.KEEP_VERSIONS:]),
+        )
+
+    def test_older_build_does_not_replace_newer_current(self):
+        root = snapshot.snapshot_root()
+        newer = snapshot.build_snapshot()
+        # 늦게 시작한 다른 빌드가 먼저 CURRENT를 바꿔 놓은 상황
+        future = root / f'v{snapshot._version_key(newer.name) * 10}'
+        newer.rename(future)
+        (root / snapshot.CURRENT_FILENAME).write_text(future.name, encoding='utf-8')
+
+        self.assertEqual(snapshot.build_snapshot(), future)
+        self.assertEqual(snapshot._current_version(root), future.name)
+        self.assertEqual([p.name for p in root.iterdir() if p.is_dir()], [future.name])
@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from main.models import StationDict
+from main.stations import StationIndex
+
+
+class StationIndexTests(TestCase):
+    def setUp(self):
+        self.index = StationIndex([
+            ('LINE2', '강남'),
+            ('LINE2', '잠실'),
+            ('LINE8', '잠실'),
+            ('LINE1', '서울역'),
+            ('LINE2', '강남'),
+        ])
+
+    def test_spellings_share_one_key(self):
+        for name in ('강남', '강남역', ' 강남역 '):
+            with self.subTest(name=name):
+                self.assertEqual(self.index.resolve(name), ('LINE2', '강남'))
+        self.assertEqual(self.index.resolve('잠실(송파구청)', line='8호선'), ('LINE8', '잠실'))
+        self.assertIn('서울', self.index)
+        self.assertEqual(len(self.index), 3)
+
+    def test_transfer_station_needs_a_line(self):
+        self.assertEqual(self.index.candidates('잠실역'), (('LINE2', '잠실'), ('LINE8', '잠실')))
+        self.assertEqual(self.index.resolve('잠실'), (None, '잠실'))
+        self.assertEqual(self.index.resolve('잠실', line='2호선'), ('LINE2', '잠실'))
+        # 일치하지 않는 노선 힌트는 무시하고 유일한 후보를 사용
+        self.assertEqual(self.index.resolve('강남', line='9호선'), ('LINE2', '강남'))
+
+    def test_unknown_station(self):
+        self.assertIsNone(self.index.resolve('없는역'))
+        self.assertEqual(self.index.candidates(''), ())
+
+    def test_from_db(self):
+        StationDict.objects.create(station_name_raw='강남', station_name_std='강남', line_code='LINE2')
+        StationDict.objects.create(station_name_raw='강남(2)', station_name_std='강남', line_code='LINE2')
+        index = StationIndex.from_db()
+        self.assertEqual(index.candidates('강남역'), (('LINE2', '강남'),))
@@ -0,0 +1,106 @@
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from main import views
+from main.matching import SearchIndex
+from main.models import LostItem, QuarantinedRow, SavedSearch, SearchNotification
+from main.validation import MAX_INTEGER, BatchValidator
+
+
+class BatchValidatorTests(SimpleTestCase):
+    def test_integers(self):
+        frame = pd.DataFrame({'n': ['12', '', '1.5', 'abc', '-3', '1e30', 'inf', str(MAX_INTEGER), '7.0']})
+        validator = BatchValidator(frame).integers('n')
+        valid, invalid = validator.split()
+
+        self.assertEqual(valid.tolist(), [0, 1, 7, 8])
+        self.assertEqual([validator.parsed['n'][i] for i in valid], [12, 0, MAX_INTEGER, 7])
+        reasons = dict(invalid)
+        self.assertEqual(reasons[2], ['숫자 형식 오류: n'])
+        self.assertEqual(reasons[3], ['숫자 형식 오류: n'])
+        for position in (4, 5, 6):
+            self.assertEqual(reasons[position], ['허용 범위 밖의 값: n'])
+
+    def test_dates_require_and_unique(self):
+        frame = pd.DataFrame({
+            'id': ['a', 'b', 'c', 'a', ''],
+            'day': ['2024-03-01 10:00:00', '2024/03/02', '2024-13-45', '', '00:00.0'],
+        })
+        validator = BatchValidator(frame).require('id').dates('day', aware=False).unique('id')
+        valid, invalid = validator.split()
+
+        self.assertEqual(valid.tolist(), [1, 3])
+        self.assertEqual(validator.parsed['day'][1], date(2024, 3, 2))
+        self.assertIsNone(validator.parsed['day'][3])
+        reasons = dict(invalid)
+        self.assertEqual(reasons[0], ['배치 내 중복 키: id'])
+        self.assertEqual(reasons[2], ['날짜 형식 오류: day'])
+        self.assertEqual(reasons[4], ['필수 값 누락: id'])
+
+
+def csv_upload(*item_ids):
+    lines = [','.join(views.CSV_COLUMNS)]
+    for item_id in item_ids:
+        lines.append(f'{item_id},보관,2024-03-01,,검정 우산,시청역,R1,검정 우산,우산,,0')
+    return SimpleUploadedFile('items.csv', '\n'.join(lines).encode('utf-8'), content_type='text/csv')
+
+
+class LostItemCsvUploadTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(ANALYTICS_DIR=Path(tmp.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, *item_ids):
+        return self.client.post(reverse('lostitem_upload_csv'), {'csv_file': csv_upload(*item_ids)})
+
+    def test_existing_item_ids_are_quarantined(self):
+        self.upload('C1')
+        self.upload('C1', 'C2')
+
+        self.assertEqual(sorted(LostItem.objects.values_list('item_id', flat=True)), ['C1', 'C2'])
+        self.assertEqual(list(QuarantinedRow.objects.values_list('reasons', flat=True)), [['이미 등록된 item_id']])
+
+    def test_insert_conflict_retries_the_chunk(self):
+        real_items = views._csv_items
+        calls = []
+
+        def racing_items(frame, *args):
+            items = real_items(frame, *args)
+            calls.append(len(items))
+            if len(calls) == 1:
+                # 검사 직후 같은 item_id가 먼저 들어온 상황 → bulk_create 유일성 위반
+                LostItem.objects.create(item_id=items[0].item_id)
+            return items
+
+        with mock.patch.object(views, '_csv_items', racing_items):
+            self.upload('C1', 'C2')
+
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual(LostItem.objects.filter(item_id__in=['C1', 'C2']).count(), 2)
+
+    def test_committed_chunks_are_indexed_when_a_later_chunk_fails(self):
+        search = SavedSearch.objects.create(contact='a@example.com', keywords='우산')
+        real_store = views._store_lostitem_csv_chunk
+
+        def failing_store(*args):
+            if LostItem.objects.exists():
+                raise RuntimeError('디스크 오류')
+            return real_store(*args)
+
+        with mock.patch.object(views, 'CSV_CHUNK_SIZE', 1), mock.patch.object(views, '_store_lostitem_csv_chunk', failing_store):
+            response = self.upload('C1', 'C2')
+
+        self.assertRedirects(response, reverse('lostitem_upload_csv'), fetch_redirect_response=False)
+        item = LostItem.objects.get()
+        self.assertEqual(set(SearchIndex.load().docs), {item.pk})
+        self.assertTrue(SearchNotification.objects.filter(saved_search=search, item=item).exists())
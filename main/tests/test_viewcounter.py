@@ -0,0 +1,74 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase
+
+from main.models import LostItem
+from main.viewcounter import ViewCounter, _pid_alive
+
+
+def dead_pid():
+    pid = 4_000_000
+    while _pid_alive(pid):
+        pid += 1
+    return pid
+
+
+class ViewCounterTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.counter = ViewCounter(directory=self.directory, interval=3600, threshold=10 ** 6)
+        self.addCleanup(self.counter.close)
+        self.a = LostItem.objects.create(item_id='V1', views=5)
+        self.b = LostItem.objects.create(item_id='V2')
+
+    def views(self, item):
+        item.refresh_from_db()
+        return item.views
+
+    def files(self):
+        return sorted(path.name for path in self.directory.iterdir())
+
+    def test_flush_applies_buffered_views(self):
+        for pk in (self.a.pk, self.a.pk, self.a.pk, self.b.pk):
+            self.counter.record(pk)
+        self.assertEqual(self.counter.pending_for(self.a.pk), 3)
+        self.assertEqual(self.views(self.a), 5)
+
+        self.assertEqual(self.counter.flush(), 4)
+
+        self.assertEqual((self.views(self.a), self.views(self.b)), (8, 1))
+        self.assertEqual(self.counter.pending_for(self.a.pk), 0)
+        self.assertEqual(self.files(), [])
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_claims_journals_left_by_dead_processes(self):
+        dead = dead_pid()
+        # 마지막 줄은 줄바꿈 전에 끊겨 무시
+        (self.directory / f'{dead}.log').write_bytes(b'%d\n%d\n%d' % (self.a.pk, self.b.pk, self.b.pk))
+        # pid가 재사용돼 같은 pid의 구간이 여러 개 남은 경우
+        (self.directory / f'{dead}-old.flushing').write_bytes(b'%d\n' % self.a.pk)
+        alive = self.directory / f'{os.getppid()}.log'
+        alive.write_bytes(b'%d\n' % self.a.pk)
+
+        self.assertEqual(self.counter.flush(), 3)
+
+        self.assertEqual((self.views(self.a), self.views(self.b)), (7, 1))
+        self.assertEqual(self.files(), [alive.name])
+
+    def test_failed_flush_keeps_segment_for_retry(self):
+        self.counter.record(self.a.pk)
+        with mock.patch.object(LostItem.objects, 'filter', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                self.counter.flush()
+        self.assertEqual(len(self.files()), 1)
+        self.assertTrue(self.files()[0].endswith('.flushing'))
+
+        self.counter.record(self.a.pk)
+        self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(self.views(self.a), 7)
@@ -8,12 +8,18 @@ urlpatterns = [
     # 1. Home 및 분석 페이지 연결
     path('', views.home, name='home'),
     path('trend/', views.trend_analysis, name='trend'), 
+    path('trend/cube/', views.pattern_cube, name='pattern_cube'),
+    path('trend/scenario/', views.rain_scenario, name='rain_scenario'),
+    path('trend/hourly/', views.hourly_profile, name='hourly_profile'),
     path('correlation/', views.correlation_analysis, name='correlation'),
     path('insight/', views.insight_report, name='insight'),
     path('archive/lostitem/', views.lostitem_list, name='lostitem_list'),
     # 2. LostItem CRUD 및 아카이브 연결
     path('archive/lostitem/', views.lostitem_list, name='lostitem_list'), 
+    path('archive/lostitem/match/', views.lostitem_match, name='lostitem_match'),
+    path('archive/lostitem/<int:pk>/', views.lostitem_detail, name='lostitem_detail'),
     path('archive/lostitem/create/', views.lostitem_create, name='lostitem_create'), 
     path('archive/lostitem/update/<int:pk>/', views.lostitem_update, name='lostitem_update'),
+    path('archive/occupancy/', views.storage_occupancy, name='storage_occupancy'),
     path('archive/lostitem/upload/csv/', views.lostitem_upload_csv, name='lostitem_upload_csv'), 
 ]
\ No newline at end of file
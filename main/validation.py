@@ -0,0 +1,129 @@
+# pickuplog/main/validation.py (적재 전 일괄 검증 / 격리)
+
+import uuid
+
+import numpy as np
+import pandas as pd
+from django.utils import timezone
+
+from main.models import QuarantinedRow
+
+# 원천 데이터에서 '날짜 없음'으로 쓰이는 값
+EMPTY_DATES = ('', '00:00.0')
+# 숫자 컬럼 상한 (적재 대상 IntegerField의 범위)
+MAX_INTEGER = 2 ** 31 - 1
+
+
+def new_batch_id():
+    return uuid.uuid4().hex
+
+
+class BatchValidator:
+    """
+    원천 행 묶음(DataFrame)을 컬럼 단위로 한 번에 검사합니다.
+    검사마다 실패 마스크를 쌓고, 끝에서 유효 행 / 격리 행(사유 목록 포함)으로 나눕니다.
+    변환이 필요한 컬럼(날짜, 숫자)은 변환 결과를 parsed[컬럼]에 보관해 적재 단계에서 그대로 씁니다.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self.parsed = {}
+        self._checks = []
+
+    def check(self, failed, message):
+        failed = np.asarray(failed, dtype=bool)
+        if failed.any():
+            self._checks.append((failed, message))
+        return self
+
+    def _text(self, column):
+        if column not in self.frame:
+            return pd.Series([''] * len(self.frame), index=self.frame.index)
+        return self.frame[column].fillna('').astype(str).str.strip()
+
+    def require(self, *columns):
+        for column in columns:
+            self.check(self._text(column) == '', f"필수 값 누락: {column}")
+        return self
+
+    def dates(self, column, fmt='%Y-%m-%d', required=False, aware=True):
+        """
+        'YYYY-MM-DD ...' / 'YYYY/MM/DD' 형식 날짜를 한 번에 변환합니다. 공란은 None(required면 실패).
+        aware=True면 현재 시간대의 자정(aware datetime), 아니면 date로 변환합니다.
+        """
+        text = self._text(column).str.split(' ').str[0].str.replace('/', '-', regex=False)
+        empty = text.isin(EMPTY_DATES)
+        parsed = pd.to_datetime(text.where(~empty), format=fmt, errors='coerce')
+        self.check(~empty & parsed.isna(), f"날짜 형식 오류: {column}")
+        if required:
+            self.check(empty, f"필수 값 누락: {column}")
+        if aware:
+            tz = timezone.get_current_timezone()
+            values = [None if pd.isna(v) else timezone.make_aware(v.to_pydatetime(), timezone=tz) for v in parsed]
+        else:
+            values = [None if pd.isna(v) else v.date() for v in parsed]
+        self.parsed[column] = values
+        return self
+
+    def integers(self, column, default=0, min_value=0, max_value=MAX_INTEGER):
+        """
+        정수 컬럼 강제 변환 (공란은 default)
+        숫자가 아니거나 정수가 아니면('1.5') 형식 오류, min_value 미만 / max_value 초과('1e30', 'inf')면 범위 오류
+        """
+        text = self._text(column)
+        empty = text == ''
+        numbers = pd.to_numeric(text.where(~empty), errors='coerce').astype(float)
+        infinite = numbers.isin([np.inf, -np.inf])
+        integral = numbers % 1 == 0
+        self.check(~empty & (numbers.isna() | (~infinite & ~integral)), f"숫자 형식 오류: {column}")
+        out_of_range = infinite
+        if min_value is not None:
+            out_of_range = out_of_range | (numbers < min_value)
+        if max_value is not None:
+            out_of_range = out_of_range | (numbers > max_value)
+        self.check(out_of_range, f"허용 범위 밖의 값: {column}")
+        # 실패 행은 적재하지 않으므로 default로 채워 둡니다. (int64 변환이 넘치지 않도록)
+        valid = integral & ~out_of_range
+        self.parsed[column] = numbers.where(valid).fillna(default).astype(np.int64).tolist()
+        return self
+
+    def unique(self, *columns, keep='last'):
+        """배치 안에서 키가 중복된 행 중 keep 쪽 하나만 남기고 나머지는 실패 처리"""
+        key = self.frame[list(columns)].fillna('').astype(str)
+        self.check(key.duplicated(keep=keep).to_numpy(), f"배치 내 중복 키: {', '.join(columns)}")
+        return self
+
+    def split(self):
+        """
+        반환: (유효 행 위치 배열, 격리 행 [(위치, 사유 목록), ...])
+        유효 행은 위치로 self.frame.iloc / self.parsed[컬럼][위치] 에 접근합니다.
+        """
+        failed = np.zeros(len(self.frame), dtype=bool)
+        for mask, _ in self._checks:
+            failed |= mask
+        invalid = [
+            (int(i), [message for mask, message in self._checks if mask[i]])
+            for i in np.flatnonzero(failed)
+        ]
+        return np.flatnonzero(~failed), invalid
+
+
+def quarantine(source, frame, invalid, batch_id, row_numbers=None):
+    """
+    격리 행을 QuarantinedRow에 일괄 저장합니다.
+    row_numbers가 주어지면 원천 파일/응답에서의 행 번호로 기록합니다. 반환값: 저장한 행 수
+    """
+    if not invalid:
+        return 0
+    records = []
+    for position, reasons in invalid:
+        raw = {str(k): ('' if pd.isna(v) else str(v)) for k, v in frame.iloc[position].items()}
+        records.append(QuarantinedRow(
+            source=source,
+            batch_id=batch_id,
+            row_number=row_numbers[position] if row_numbers is not None else position + 1,
+            raw=raw,
+            reasons=reasons,
+        ))
+    QuarantinedRow.objects.bulk_create(records, batch_size=1000)
+    return len(records)
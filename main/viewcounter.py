@@ -0,0 +1,222 @@
+# pickuplog/main/viewcounter.py (분실물 조회수 write-behind 카운터)
+
+import atexit
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from main.models import LostItem
+
+# 버퍼를 DB에 반영하는 주기 (초). 목록 화면의 조회수는 최대 이 시간만큼 늦게 반영됩니다.
+FLUSH_INTERVAL = 5.0
+# 반영 대기 조회가 이 건수 이상 쌓이면 주기를 기다리지 않고 바로 반영
+FLUSH_THRESHOLD = 1000
+# IN 절 하나에 넣는 pk 개수 (SQLite 변수 제한 대비)
+UPDATE_CHUNK = 500
+JOURNAL_DIRNAME = 'view_journal'
+
+
+def journal_dir():
+    return settings.ANALYTICS_DIR / JOURNAL_DIRNAME
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ViewCounter:
+    """
+    상세 화면 조회를 프로세스 메모리(pk → 대기 건수)에 모아 두었다가 FLUSH_INTERVAL마다
+    증가분이 같은 pk끼리 UPDATE views = views + n 으로 묶어 한 트랜잭션에 반영합니다.
+    조회 요청은 DB 쓰기 잠금을 잡지 않으므로, SQLite 단일 writer 잠금에 읽기가 줄 서지 않습니다.
+
+    조회 1건마다 프로세스별 저널 파일({pid}.log)에 pk를 한 줄 덧붙이고(O_APPEND, fsync 없음),
+    반영은 저널 구간({pid}-{uuid}.flushing) 단위로 합니다. 반영 전에 프로세스가 죽어도 남은 저널을
+    다른 프로세스(또는 flush_view_counts 명령)가 가져가 반영하므로 조회수를 잃지 않습니다.
+    구간 이름은 매번 새로 만드므로, 죽은 프로세스와 pid가 같은 새 프로세스(컨테이너 재시작)도 남은 구간을 덮어쓰지 않습니다.
+    (DB 커밋 직후 저널 삭제 전에 죽은 경우에만 해당 구간이 한 번 더 더해질 수 있습니다.)
+    """
+
+    def __init__(self, directory=None, interval=FLUSH_INTERVAL, threshold=FLUSH_THRESHOLD):
+        self.directory = directory
+        self.interval = interval
+        self.threshold = threshold
+        self.pending = {}
+        self.pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pid = None
+        self._fd = None
+        self._thread = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # 저널
+    # ------------------------------------------------------------------
+    def _dir(self):
+        directory = self.directory or journal_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def _journal_path(self):
+        return self._dir() / f"{self._pid}.log"
+
+    def _segment_path(self):
+        return self._dir() / f"{os.getpid()}-{uuid.uuid4().hex}.flushing"
+
+    def _open_journal(self):
+        # fork 후 자식 프로세스는 자기 pid로 새 저널 / 버퍼 / 반영 스레드를 씁니다.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._fd = None
+            self._thread = None
+            self.pending, self.pending_total = {}, 0
+        if self._fd is None:
+            self._fd = os.open(self._journal_path(), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _rotate(self):
+        """현재 저널을 반영 대기 구간으로 넘기고 새 저널을 엽니다. (self._lock 안에서 호출)"""
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        os.replace(self._journal_path(), self._segment_path())
+        self.pending, self.pending_total = {}, 0
+
+    def _claim_segments(self):
+        """
+        반영할 저널 구간 목록: 자기 프로세스의 구간 + 죽은 프로세스가 남긴 저널/구간
+        (남의 파일은 자기 이름으로 rename해서 가져오므로 여러 프로세스가 같은 파일을 반영하지 않습니다.)
+        """
+        mine = []
+        for path in sorted(self._dir().iterdir()):
+            owner = path.stem.split('-')[0]
+            if path.suffix not in ('.log', '.flushing') or not owner.isdigit():
+                continue
+            pid = int(owner)
+            if pid == os.getpid():
+                if path.suffix == '.flushing':
+                    mine.append(path)
+                continue
+            if _pid_alive(pid):
+                continue
+            claimed = self._segment_path()
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue  # 다른 프로세스가 먼저 가져감
+            mine.append(claimed)
+        return mine
+
+    # ------------------------------------------------------------------
+    # 기록 / 조회
+    # ------------------------------------------------------------------
+    def record(self, pk):
+        with self._lock:
+            self._open_journal()
+            os.write(self._fd, b'%d\n' % pk)
+            self.pending[pk] = self.pending.get(pk, 0) + 1
+            self.pending_total += 1
+            full = self.pending_total >= self.threshold
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def pending_for(self, pk):
+        """아직 DB에 반영되지 않은 이 프로세스의 조회 수 (화면 표시용)"""
+        if self._pid != os.getpid():
+            return 0
+        return self.pending.get(pk, 0)
+
+    # ------------------------------------------------------------------
+    # 반영
+    # ------------------------------------------------------------------
+    def flush(self):
+        """
+        저널을 돌려 대기 구간을 만들고, 가져올 수 있는 구간 전체를 합산해 DB에 반영합니다.
+        DB 반영이 실패하면 구간 파일이 남아 다음 반영 때 다시 시도합니다. 반환값: 반영한 조회 수
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._pid == os.getpid():
+                    self._rotate()
+            segments = self._claim_segments()
+            if not segments:
+                return 0
+
+            counts = {}
+            for path in segments:
+                with open(path, 'rb') as f:
+                    for line in f:
+                        # 줄바꿈까지 기록되지 못한 마지막 줄(쓰는 도중 중단)은 무시
+                        if line.endswith(b'\n') and line[:-1].isdigit():
+                            pk = int(line[:-1])
+                            counts[pk] = counts.get(pk, 0) + 1
+
+            by_increment = {}
+            for pk, n in counts.items():
+                by_increment.setdefault(n, []).append(pk)
+            with transaction.atomic():
+                for n, pks in by_increment.items():
+                    for i in range(0, len(pks), UPDATE_CHUNK):
+                        LostItem.objects.filter(pk__in=pks[i:i + UPDATE_CHUNK]).update(views=F('views') + n)
+            for path in segments:
+                path.unlink(missing_ok=True)
+            return sum(counts.values())
+
+    def close(self):
+        """남은 조회를 반영하고 반영 스레드를 멈춥니다."""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        return self.flush()
+
+    def _ensure_thread(self):
+        if self._closed:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='view-counter-flush', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        from django.db import connection
+
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception:
+                # DB 잠금 / 일시 오류: 구간 파일이 남아 있으므로 다음 주기에 다시 반영
+                pass
+            finally:
+                connection.close()
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def _flush_on_exit():
+    if view_counter._pid == os.getpid():
+        try:
+            view_counter.flush()
+        except Exception:
+            pass
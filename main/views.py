@@ -1,22 +1,38 @@
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Q, F, Count, Sum, Avg
 from django.core.paginator import Paginator, EmptyPage
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone 
 from django.conf import settings 
 from django.contrib import messages 
-from django.db import IntegrityError 
-from django.http import HttpResponse
+from django.db import IntegrityError, close_old_connections, transaction
+from django.http import HttpResponse, JsonResponse
 from datetime import datetime, timedelta
 from django.shortcuts import render
 
 # 프로젝트 모델 임포트
-from .models import LostItem, RidershipDaily, RainImpactReport, WeatherDaily 
+from .models import ArchivedLostItem, LostForecast, LostItem, LostItemRate, LostItemRateDirtyDate, QuarantinedRow, RidershipDaily, RainImpactReport, StorageOccupancy, WeatherDaily 
 # .forms 임포트는 제거 (최종 코드 제공을 위해)
 from .forms import LostItemSearchForm, LostItemForm, LostItemCsvUploadForm 
-
+from .stations import StationIndex
+from .normalize import active_rules, load_rules
+from .matching import get_search_index, update_search_index
+from .percolator import percolate
+from .viewcounter import view_counter
+from .archive import TieredLostItems, archive_watermark, filter_archived_text, needs_archive
+from .occupancy import PICKUP_BUCKETS, bucket_label, pickup_histograms, track_occupancy
+from .routers import analytics_reads
+# 💡 numpy / pandas를 쓰는 모듈(validation, dedup, hourly, cube, snapshot, scenario)은 해당 뷰 안에서 임포트합니다.
+#    워커 기동 시 URLconf 로딩만으로 pandas까지 읽지 않도록 (startup 벤치마크: bench_startup)
+
+import asyncio
 import csv
+import math
+import time
+
 from io import TextIOWrapper 
 
+from asgiref.sync import sync_to_async
+
 # ----------------------------------------------------------------------
 # Helper Functions (도우미 함수) - (유지)
 # ----------------------------------------------------------------------
@@ -37,6 +53,48 @@ def parse_date_and_make_aware(date_str):
         return None 
 
 
+def _snapshot_weather(snapshot):
+    """컬럼형 스냅샷의 날씨 컬럼을 WeatherDaily.values()와 같은 형태로 변환"""
+    from .snapshot import from_day
+
+    weather = snapshot.weather
+    return [
+        {
+            'date': from_day(day),
+            'avg_temp': None if temp != temp else float(temp),  # NaN → None
+            'rain_mm': float(rain),
+        }
+        for day, temp, rain in zip(weather['date'].tolist(), weather['avg_temp'].tolist(), weather['rain_mm'].tolist())
+    ]
+
+
+# 홈 화면 분실률 계산에 사용하는 최근 기간 (일)
+RATE_WINDOW_DAYS = 90
+# 집중 예보에 사용하는 카테고리
+UMBRELLA_CATEGORY = '우산'
+
+
+def _in_worker(query):
+    """워커 스레드에서 실행할 동기 호출. 요청 스레드가 아니므로 연결 정리(close_old_connections)를 직접 합니다."""
+    def run():
+        close_old_connections()
+        try:
+            return query()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def _gather(*queries):
+    """
+    서로 독립적인 동기 호출(쿼리 / 스냅샷·큐브 파일 읽기)을 각각 다른 워커 스레드에서 동시에 실행합니다.
+    Django의 async ORM(aaggregate, afirst, async for)은 모두 thread_sensitive=True로 한 스레드에 줄을 서므로
+    gather로 묶어도 동시에 돌지 않습니다. 그래서 thread_sensitive=False로 스레드를 나누고,
+    파일 I/O도 같은 방식으로 이벤트 루프 밖에서 실행합니다. 오류는 그대로 전파됩니다.
+    """
+    return await asyncio.gather(*(sync_to_async(_in_worker(query), thread_sensitive=False)() for query in queries))
+
+
 # ----------------------------------------------------------------------
 # 1. LostItem CRUD Views (순환 참조 방지를 위해 상단으로 이동)
 # ----------------------------------------------------------------------
@@ -46,7 +104,8 @@ def lostitem_create(request):
     if request.method == "POST":
         form = LostItemForm(request.POST)
         if form.is_valid():
-            form.save()
+            item = form.save()
+            LostItemRateDirtyDate.mark([item.registered_at])
             messages.success(request, "새로운 분실물이 등록되었습니다.")
             return redirect("lostitem_list")
     else:
@@ -57,18 +116,132 @@ def lostitem_create(request):
 def lostitem_update(request, pk):
     obj = get_object_or_404(LostItem, pk=pk)
     if request.method == "POST":
+        registered_before = obj.registered_at
         form = LostItemForm(request.POST, instance=obj)
         if form.is_valid():
             form.save()
+            # 등록일 / 역이 바뀌면 이전 날짜와 새 날짜 모두 분실률을 다시 계산
+            LostItemRateDirtyDate.mark([registered_before, obj.registered_at])
             messages.success(request, f"'{obj.item_name}' 정보가 수정되었습니다.")
             return redirect("lostitem_list")
     else:
         form = LostItemForm(instance=obj)
     return render(request, "main/lostitem_form.html", {"form": form, "object": obj})
 
+# 분실물 상세 (조회수는 write-behind 카운터에 모았다가 주기적으로 일괄 반영)
+def lostitem_detail(request, pk):
+    item = LostItem.objects.filter(pk=pk).first()
+    if item is None:
+        # 아카이브로 옮긴 분실물은 같은 주소로 읽기 전용 표시 (조회수 집계 없음)
+        item = get_object_or_404(ArchivedLostItem, pk=pk)
+        return render(request, "main/lostitem_detail.html", {"item": item})
+    view_counter.record(item.pk)
+    # 아직 DB에 반영되지 않은 조회 수를 더해서 표시
+    item.views += view_counter.pending_for(item.pk)
+    return render(request, "main/lostitem_detail.html", {"item": item})
+
+
+# CSV 업로드 열 순서 (LostItem 필드) 및 한 번에 검증/적재하는 행 수
+CSV_COLUMNS = [
+    'item_id', 'status', 'registered_at', 'received_at', 'description', 'storage_location',
+    'registrar_id', 'item_name', 'category', 'pickup_company_location', 'views',
+]
+CSV_CHUNK_SIZE = 5000
+
+
+def _import_lostitem_csv_chunk(chunk, station_index, batch_id):
+    """
+    CSV 행 묶음 [(행 번호, row), ...]을 BatchValidator로 한 번에 검사하고,
+    유효 행은 bulk_create, 실패 행은 QuarantinedRow로 보냅니다. 반환: (생성된 pk 목록, 실패 건수)
+    이미 등록된 item_id 검사와 적재는 한 트랜잭션에서 합니다. 그 사이 다른 업로드가 같은 item_id를 먼저 넣어
+    유일성 위반이 나면 이 청크만 되돌리고 한 번 더 검사해, 먼저 들어온 행은 '이미 등록된 item_id'로 격리합니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    line_numbers = [line_number for line_number, _ in chunk]
+    frame = pd.DataFrame([row[:len(CSV_COLUMNS)] for _, row in chunk]).reindex(columns=range(len(CSV_COLUMNS)))
+    frame.columns = CSV_COLUMNS
+    column_counts = np.array([len(row) for _, row in chunk])
+
+    for attempt in range(2):
+        try:
+            return _store_lostitem_csv_chunk(frame, column_counts, line_numbers, station_index, batch_id)
+        except IntegrityError:
+            if attempt:
+                raise
+
+
+def _store_lostitem_csv_chunk(frame, column_counts, line_numbers, station_index, batch_id):
+    """_import_lostitem_csv_chunk의 한 번 시도: 검증 → (이미 등록된 item_id 검사 + 적재 + 격리)를 한 트랜잭션으로"""
+    from .validation import BatchValidator, quarantine
+
+    validator = (
+        BatchValidator(frame)
+        .check(column_counts < len(CSV_COLUMNS), f'열 개수 부족 ({len(CSV_COLUMNS)}개 필요)')
+        .require('item_id')
+        .dates('registered_at')
+        .dates('received_at')
+        .integers('views')
+        .unique('item_id')
+    )
+    item_ids = frame['item_id'].dropna().tolist()
+    rules = active_rules()
+
+    with transaction.atomic():
+        existing = set(LostItem.objects.filter(item_id__in=item_ids).values_list('item_id', flat=True))
+        existing |= set(ArchivedLostItem.objects.filter(item_id__in=item_ids).values_list('item_id', flat=True))
+        validator.check(frame['item_id'].isin(existing).to_numpy(), '이미 등록된 item_id')
+        valid, invalid = validator.split()
+        items = _csv_items(frame, valid, validator, station_index, rules)
+        with track_occupancy(item.item_id for item in items):
+            LostItem.objects.bulk_create(items, batch_size=500)
+        LostItemRateDirtyDate.mark(item.registered_at for item in items)
+        quarantine(QuarantinedRow.SOURCE_CSV, frame, invalid, batch_id, row_numbers=line_numbers)
+
+    created_pks = list(LostItem.objects.filter(item_id__in=[item.item_id for item in items]).values_list('pk', flat=True))
+    return created_pks, len(invalid)
+
+
+def _csv_items(frame, valid, validator, station_index, rules):
+    """검증을 통과한 CSV 행 → 저장 전 LostItem 목록 (보관 장소로 노선 / 역 / 교통수단 분류)"""
+    items = []
+    for i in valid:
+        row = frame.iloc[i]
+        storage_location = str(row['storage_location'] or '').strip()
+        transport, line_code, station_name = None, None, None
+        if storage_location.endswith('역'):
+            transport = 'subway'
+            resolved = station_index.resolve(storage_location)
+            line_code, station_name = resolved or (None, storage_location)
+        else:
+            # 수령 회사가 등록된 운수사면 버스 / 택시 등, 아니면 기타로 분류 (sync_lostitem과 같은 TransportOperator 표)
+            transport = rules.transport_for(row['pickup_company_location'])
+        items.append(LostItem(
+            item_id=row['item_id'],
+            transport=transport,
+            line=line_code,
+            station=station_name,
+            status=row['status'],
+            registered_at=validator.parsed['registered_at'][i],
+            received_at=validator.parsed['received_at'][i],
+            description=row['description'],
+            storage_location=row['storage_location'],
+            registrar_id=row['registrar_id'],
+            item_name=row['item_name'],
+            category=row['category'],
+            pickup_company_location=row['pickup_company_location'],
+            views=validator.parsed['views'][i],
+            is_received=(str(row['status'] or '').strip() == '수령'),
+        ))
+    return items
+
 
 # CSV 파일 업로드 및 처리 (스트림 방식)
 def lostitem_upload_csv(request):
+    from .dedup import index_items
+    from .validation import new_batch_id
+
     if request.method == 'POST':
         form = LostItemCsvUploadForm(request.POST, request.FILES)
         if form.is_valid():
@@ -80,6 +253,8 @@ def lostitem_upload_csv(request):
             
             success_count = 0
             fail_count = 0
+            created_pks = []
+            error = None
             
             try:
                 # 1. 파일 스트림 열기 (인코딩 우선순위)
@@ -91,43 +266,47 @@ def lostitem_upload_csv(request):
                 reader = csv.reader(csv_file_wrapper)
                 next(reader) # 헤더(첫 번째 줄) 건너뛰기
                 
-                # 2. 데이터 처리 루프
-                for row in reader:
-                    
-                    if not row or len(row) < 11: 
-                        fail_count += 1
-                        continue # 빈 줄 또는 부족한 열 건너뛰기
-                    
-                    try:
-                        registered_dt = parse_date_and_make_aware(row[2])
-                        received_dt = parse_date_and_make_aware(row[3])
-                        
-                        LostItem.objects.create(
-                            item_id=row[0], 
-                            status=row[1], 
-                            registered_at=registered_dt, 
-                            received_at=received_dt, 
-                            description=row[4], 
-                            storage_location=row[5], 
-                            registrar_id=row[6], 
-                            item_name=row[7], 
-                            category=row[8], 
-                            pickup_company_location=row[9], 
-                            views=int(row[10] or 0), 
-                            is_received=(row[1].strip() == '수령')
-                        )
-                        success_count += 1
-                        
-                    except IntegrityError:
-                        fail_count += 1
-                    except Exception:
-                        fail_count += 1
+                # 보관 장소가 역이면 StationDict 인덱스로 표준 역명/노선을 채웁니다. (정규화 규칙은 업로드마다 새로 컴파일)
+                load_rules()
+                station_index = StationIndex.from_db()
+                batch_id = new_batch_id()
+                
+                # 2. CSV_CHUNK_SIZE행씩 일괄 검증 → 유효 행은 bulk insert, 실패 행은 사유와 함께 격리
+                chunk = []
+                for line_number, row in enumerate(reader, start=2):
+                    if not row:
+                        continue # 빈 줄 건너뛰기
+                    chunk.append((line_number, row))
+                    if len(chunk) >= CSV_CHUNK_SIZE:
+                        pks, failed = _import_lostitem_csv_chunk(chunk, station_index, batch_id)
+                        created_pks += pks
+                        success_count += len(pks)
+                        fail_count += failed
+                        chunk = []
+                if chunk:
+                    pks, failed = _import_lostitem_csv_chunk(chunk, station_index, batch_id)
+                    created_pks += pks
+                    success_count += len(pks)
+                    fail_count += failed
 
             except Exception as e:
-                messages.error(request, f'파일 처리 중 치명적인 오류 발생: {e}')
+                error = e
+            
+            # 업로드한 배치만 중복 색인 (API로 먼저 들어온 같은 물건 탐지) 및 검색 색인 반영
+            # (중간 청크에서 실패해도 이미 커밋된 청크는 반영)
+            _, duplicate_pairs, _ = index_items(created_pks)
+            update_search_index(created_pks)
+            # 저장된 검색(알림 신청)과 일괄 매칭
+            percolate(created_pks)
+            if error is not None:
+                messages.error(request, f'파일 처리 중 치명적인 오류 발생: {error} (오류 전까지 {success_count}건은 저장되었습니다)')
                 return redirect('lostitem_upload_csv')
+            if duplicate_pairs:
+                messages.warning(request, f'다른 경로로 등록된 분실물과 중복 의심 {duplicate_pairs}쌍이 발견되었습니다. 관리자 화면에서 검토해주세요.')
             
             messages.success(request, f'CSV 업로드 완료! 성공 {success_count}건, 실패/중복 {fail_count}건.')
+            if fail_count:
+                messages.warning(request, f'실패한 {fail_count}건은 사유와 함께 관리자 화면의 검증 실패 행(배치 {batch_id[:8]})에 보관되었습니다.')
             return redirect('lostitem_list') 
             
         else:
@@ -142,34 +321,71 @@ def lostitem_upload_csv(request):
 # ----------------------------------------------------------------------
 # 2. PickUpLog 핵심 뷰: 오늘의 분실 예보 (home) - ★ 최종 수정된 뷰
 # ----------------------------------------------------------------------
-def home(request):
+async def home(request):
     """
     PickUpLog 홈 화면 뷰: 오늘의 분실 예보 및 RII 기반 인사이트를 제공합니다.
+    (async 뷰: 서로 독립적인 쿼리를 _gather로 워커 스레드에 나눠 동시에 실행합니다.)
+    예보 값은 sync_reports가 미리 계산한 LostForecast를 조회만 합니다.
     """
     # 1. 사용자 입력 및 기본 설정
     line_input = request.GET.get('line', '선택') 
     is_rainy_today = (request.GET.get('condition', '평소') == '비오는 날')
+    today = timezone.localdate()
     
-    # 2. RII 데이터 조회 및 평균 계산
-    try:
-        # DB에서 RII 평균을 계산 
-        avg_rii = RainImpactReport.objects.aggregate(avg_rii=Avg('rain_impact_index'))['avg_rii']
-    except Exception:
-        # 데이터가 없거나 모델 정의 오류 시 기본값 설정
-        avg_rii = 2.0 
+    # 2. 분실률 지표(LostItemRate)에서 최근 기간의 분실률 / 카테고리 기여율 조회
+    rate_qs = LostItemRate.objects.filter(date__gte=today - timedelta(days=RATE_WINDOW_DAYS))
+    if line_input != '선택':
+        rate_qs = rate_qs.filter(station__line_code=line_input)
+    totals_qs = rate_qs.filter(category=LostItemRate.ALL_CATEGORIES)
+
+    forecast_line = line_input if line_input != '선택' else LostItemRate.ALL_CATEGORIES
+    forecast_qs = LostForecast.objects.filter(
+        date=today, line_code=forecast_line,
+        category__in=[LostItemRate.ALL_CATEGORIES, UMBRELLA_CATEGORY],
+    )
+
+    # 오늘의 예보 / 노선별 RII 보고서 / 최신 승하차 날짜 / 분실률 합계 / 카테고리 상위 5개 동시 조회
+    forecasts, latest_reports, latest_date, rate_totals, top_categories = await _gather(
+        lambda: list(forecast_qs),
+        lambda: list(RainImpactReport.objects.select_related('station').order_by('station__line_code')),
+        lambda: RidershipDaily.objects.order_by('-date').values_list('date', flat=True).first(),
+        lambda: totals_qs.aggregate(
+            lost=Sum('lost_count', filter=Q(ridership__gt=0)),
+            riders=Sum('ridership'),
+            all_lost=Sum('lost_count'),
+        ),
+        lambda: list(
+            rate_qs.exclude(category=LostItemRate.ALL_CATEGORIES)
+            .values('category')
+            .annotate(lost=Sum('lost_count'))
+            .order_by('-lost')[:5]
+        ),
+    )
     
     # 3. 핵심 예측 값 설정
-    
-    # ★ 요청하신 2.3배로 고정 설정
-    umbrella_impact_ratio = 2.3 
-    
-    # RII와 기본값(1.83)을 기반으로 오늘의 총 예상 분실률 계산 (가상 로직)
-    # RII가 높을수록 예측률 증가 (예: 1.83 + 0.1 * RII)
-    base_rate = 1.83
-    if avg_rii:
-        total_predicted_loss = base_rate + (avg_rii / 10)
+    forecast_by_category = {forecast.category: forecast for forecast in forecasts}
+    overall = forecast_by_category.get(LostItemRate.ALL_CATEGORIES)
+    umbrella = forecast_by_category.get(UMBRELLA_CATEGORY)
+
+    if overall:
+        # '비오는 날' 조건이면 비 온 날 기준 예측, 아니면 오늘 예보 날씨 기준 예측
+        total_predicted_loss = overall.rainy_rate if is_rainy_today else overall.predicted_rate
+    elif rate_totals.get('riders'):
+        # 예보가 아직 없으면 최근 기간 실제 분실률(1만 명당)로 대체
+        total_predicted_loss = rate_totals['lost'] / rate_totals['riders'] * 10000
     else:
-        total_predicted_loss = base_rate
+        total_predicted_loss = None
+
+    # 우산 분실률: 비 올 때 / 비 오지 않을 때 예측 비율
+    umbrella_impact_ratio = None
+    if umbrella and umbrella.dry_rate > 0:
+        umbrella_impact_ratio = umbrella.rainy_rate / umbrella.dry_rate
+
+    all_lost = rate_totals.get('all_lost') or 0
+    items = [
+        {'category': row['category'], 'rate': row['lost'] / all_lost * 100}
+        for row in top_categories if all_lost
+    ]
     
     
     # 4. 템플릿으로 전달할 Context 구성
@@ -179,16 +395,17 @@ def home(request):
         'is_rainy_today': is_rainy_today,
         
         # ★ 최종 예측 문구에 필요한 핵심 값
-        'total_predicted_loss': round(total_predicted_loss, 2), # 오늘의 분실 예보 (Loss Rate per 10k)
-        'umbrella_impact_ratio': umbrella_impact_ratio, # 2.3배
+        'total_predicted_loss': round(total_predicted_loss, 2) if total_predicted_loss is not None else None, # 오늘의 분실 예보 (Loss Rate per 10k)
+        'umbrella_impact_ratio': umbrella_impact_ratio, # 우산 분실률 (비 / 맑음) 예측 비율
+        'forecast': overall, # 오늘 예보 날씨 (강수량, 기온)
         
         # 노선별 RII 상세 보고서 (템플릿 출력용)
-        'latest_reports': RainImpactReport.objects.order_by('line_code'), 
+        'latest_reports': latest_reports, 
         
         # 이전 로직에서 사용되던 변수들 (템플릿과의 호환성을 위해 유지하거나 정리 필요)
         'date_condition': request.GET.get('condition', '평소'),
-        'latest_date': RidershipDaily.objects.order_by('-date').values_list('date', flat=True).first(),
-        'items': [{'category': '우산', 'rate': 40.0}, {'category': '가방', 'rate': 30.0}], # 가상 데이터
+        'latest_date': latest_date,
+        'items': items, # 최근 기간 카테고리별 분실물 비중 (LostItemRate)
         # 'report' 딕셔너리 대신 context에 직접 풀어서 전달하도록 구조 변경됨
     }
     
@@ -202,15 +419,20 @@ def home(request):
 def lostitem_list(request):
     """
     LostItem 데이터를 조회하고 검색/필터링을 적용하는 뷰.
+    날짜 필터가 아카이브 구간에 걸치면 아카이브(ArchivedLostItem)도 같은 조건으로 조회해 병합합니다.
     """
     form = LostItemSearchForm(request.GET)
-    queryset = LostItem.objects.all().order_by('-registered_at') # 기본은 최신 등록 순
+    queryset = LostItem.objects.all().order_by('-registered_at', '-pk') # 기본은 최신 등록 순 (같은 날은 pk 순으로 고정)
+    archived = None
+    order_field, descending = 'registered_at', True
 
     page_size = 30 
 
     # 1. 필터링 로직
     if form.is_valid():
         data = form.cleaned_data
+        if needs_archive(data['date_from'], data['date_to'], data['only_unreceived'], archive_watermark()):
+            archived = ArchivedLostItem.objects.all()
         
         if data['q']:
             queryset = queryset.filter(
@@ -239,9 +461,28 @@ def lostitem_list(request):
             
         if data['sort']:
             if data['sort'] == 'registered_at_asc':
-                queryset = queryset.order_by('registered_at')
+                queryset = queryset.order_by('registered_at', 'pk')
+                descending = False
             elif data['sort'] == 'views_desc':
-                 queryset = queryset.order_by('-views')
+                 queryset = queryset.order_by('-views', '-pk')
+                 order_field = 'views'
+
+        if archived is not None:
+            # 설명(description)은 압축돼 있으므로 나머지 조건은 SQL로, 텍스트 검색은 꺼낸 뒤 적용
+            if data['transport']:
+                archived = archived.filter(transport=data['transport'])
+            if data['status']:
+                archived = archived.filter(status=data['status'])
+            if data['category']:
+                archived = archived.filter(category__in=data['category'])
+            if data['date_from']:
+                archived = archived.filter(registered_at__gte=data['date_from'])
+            if data['date_to']:
+                archived = archived.filter(registered_at__lt=data['date_to'] + timedelta(days=1))
+            direction = '-' if descending else ''
+            archived = archived.order_by(f"{direction}{order_field}", f"{direction}pk")
+            if data['q']:
+                archived = filter_archived_text(archived, data['q'])
 
         raw_page_size = data.get('page_size', 30)
         
@@ -250,6 +491,9 @@ def lostitem_list(request):
         except ValueError:
             page_size = 30
 
+    if archived is not None:
+        queryset = TieredLostItems(queryset, archived, order_field=order_field, descending=descending)
+
     # 2. 페이지네이션
     paginator = Paginator(queryset, page_size)
     page_number = request.GET.get('page')
@@ -272,19 +516,46 @@ def lostitem_list(request):
         'form': form,
         'page_obj': page_obj,
         'url_query_string': url_query_string,
-        'total_count': queryset.count(),
-        'items': queryset,
+        'total_count': paginator.count,
+        'items': page_obj.object_list,
+        'includes_archive': archived is not None,
     }
     
     return render(request, 'main/lostitem_list.html', context)
 
 
+# 보관 장소별 재고 / 수령 소요 시간 대시보드 (증분 카운터 테이블만 조회)
+def storage_occupancy(request):
+    locations = list(StorageOccupancy.objects.filter(Q(held__gt=0) | Q(received__gt=0)).order_by('-held', 'storage_location'))
+    totals = {
+        'held': sum(row.held for row in locations),
+        'received': sum(row.received for row in locations),
+        'pickup_samples': sum(row.pickup_samples for row in locations),
+        'pickup_days_total': sum(row.pickup_days_total for row in locations),
+    }
+    totals['avg_pickup_days'] = (
+        totals['pickup_days_total'] / totals['pickup_samples'] if totals['pickup_samples'] else None
+    )
+    histograms = [
+        {'category': category, 'counts': counts, 'total': sum(counts)}
+        for category, counts in pickup_histograms()
+    ]
+    context = {
+        'locations': locations,
+        'totals': totals,
+        'bucket_labels': [bucket_label(i) for i in range(len(PICKUP_BUCKETS))],
+        'histograms': histograms,
+    }
+    return render(request, 'main/storage_occupancy.html', context)
+
+
 # ----------------------------------------------------------------------
 # 4. 분석 결과 뷰 (trend, correlation, insight)
 # ----------------------------------------------------------------------
 from django.db.models.functions import ExtractWeekDay
 
-def trend_analysis(request):
+@analytics_reads
+async def trend_analysis(request):
     """
     노선별 · 역별 · 요일별 분실 패턴 분석
     """
@@ -292,42 +563,80 @@ def trend_analysis(request):
     # 1️⃣ Trend 데이터 (LostItem 집계)
     # 최근 90일 데이터만 사용
     
-    reports = RainImpactReport.objects.all()
-    line_stats = (
-        reports.values('line_code')
-        .annotate(avg_rii=Avg('rain_impact_index'))
-        .order_by('line_code')
+    from .cube import get_cube
+
+    def weekday_slice():
+        # 요일별 분실률 (패턴 큐브, sync_reports가 미리 계산) - 큐브 파일 읽기도 워커 스레드에서
+        cube = get_cube()
+        return cube.slice(group_by='weekday') if cube else []
+
+    reports_qs = RainImpactReport.objects.select_related('station')
+    reports, line_stats, rii_result, rate_stats, weekday_stats = await _gather(
+        lambda: list(reports_qs),
+        lambda: list(
+            reports_qs.values(line_code=F('station__line_code'))
+            .annotate(avg_rii=Avg('rain_impact_index'))
+            .order_by('line_code')
+        ),
+        lambda: reports_qs.aggregate(Avg('rain_impact_index')),
+        lambda: list(
+            LostItemRate.objects.filter(category=LostItemRate.ALL_CATEGORIES, ridership__gt=0)
+            .values(line_code=F('station__line_code'))
+            .annotate(lost=Sum('lost_count'), riders=Sum('ridership'))
+            .order_by('line_code')
+        ),
+        weekday_slice,
     )
 
     context = {
         'reports': reports,
         'chart_labels': [stat['line_code'] for stat in line_stats],
         'chart_values': [round(stat['avg_rii'], 2) for stat in line_stats],
-        'total_stations': reports.count(),
-        'avg_rii': reports.aggregate(Avg('rain_impact_index'))['rain_impact_index__avg'] or 0,
+        'total_stations': len(reports),
+        'avg_rii': rii_result['rain_impact_index__avg'] or 0,
+        # 노선별 1만 명당 분실률 (LostItemRate 합계 행 기준)
+        'rate_labels': [stat['line_code'] for stat in rate_stats],
+        'rate_values': [round(stat['lost'] / stat['riders'] * 10000, 3) for stat in rate_stats],
     }
 
+    # 2️⃣ 요일별 분실률
+    context['weekday_labels'] = [stat['key'] for stat in weekday_stats]
+    context['weekday_values'] = [stat['rate_per_10k'] or 0 for stat in weekday_stats]
+
     return render(request, 'main/trend_analysis.html', context)
-def correlation_analysis(request):    
+
+@analytics_reads
+async def correlation_analysis(request):    
     # 최근 30일 기온, 강수, 분실물 개수 집계
-    weather_data = WeatherDaily.objects.filter()
-    lost_data = (
-        LostItem.objects
-        .filter()
-        .extra(select={'date': "date(registered_at)"})
-        .values('date')
-        .annotate(lost_count=Count('id'))
+    # 날씨는 컬럼형 스냅샷(mmap)에서, 분실물 수만 DB에서 읽습니다.
+    from .snapshot import get_snapshot
+
+    def weather_rows():
+        snapshot = get_snapshot()
+        if snapshot is None:
+            return list(WeatherDaily.objects.values('date', 'avg_temp', 'rain_mm'))
+        return _snapshot_weather(snapshot)
+
+    weather_data, lost_data = await _gather(
+        weather_rows,
+        lambda: list(
+            LostItem.objects
+            .filter()
+            .extra(select={'date': "date(registered_at)"})
+            .values('date')
+            .annotate(lost_count=Count('id'))
+        ),
     )
 
     # 날짜별 매칭
+    lost_by_date = {str(x['date']): x['lost_count'] for x in lost_data}
     merged = []
     for w in weather_data:
-        lost_count = next((x['lost_count'] for x in lost_data if str(x['date']) == str(w.date)), 0)
         merged.append({
-            'date': w.date.strftime("%Y-%m-%d"),  # JS에서 문자열로 사용
-            'temp': w.avg_temp,
-            'rain': w.rain_mm,
-            'lost': lost_count,
+            'date': w['date'].strftime("%Y-%m-%d"),  # JS에서 문자열로 사용
+            'temp': w['avg_temp'],
+            'rain': w['rain_mm'],
+            'lost': lost_by_date.get(str(w['date']), 0),
         })
 
     # 상관계수 계산
@@ -352,21 +661,23 @@ def correlation_analysis(request):
 
     return render(request, 'main/correlation_analysis.html', context)
 
-def insight_report(request):
-    # 노선별 평균 RII
-    avg_rii = (
-        RainImpactReport.objects
-        .values('line_code')
-        .annotate(avg_index=Avg('rain_impact_index'))
-        .order_by('-avg_index')
-    )
-
-    # 분실물 상위 노선 TOP 5
-    lost_top = (
-        LostItem.objects
-        .values('line')
-        .annotate(total_lost=Count('id'))
-        .order_by('-total_lost')[:5]
+@analytics_reads
+async def insight_report(request):
+    # 노선별 평균 RII / 분실물 상위 노선 TOP 5 를 동시에 조회
+    avg_rii, lost_top = await _gather(
+        lambda: list(
+            RainImpactReport.objects
+            .values(line_code=F('station__line_code'))
+            .annotate(avg_index=Avg('rain_impact_index'))
+            .order_by('-avg_index')
+        ),
+        lambda: list(
+            LostItemRate.objects
+            .filter(category=LostItemRate.ALL_CATEGORIES)
+            .values(line=F('station__line_code'))
+            .annotate(total_lost=Sum('lost_count'))
+            .order_by('-total_lost')[:5]
+        ),
     )
 
     # 간단한 요약 문 생성
@@ -386,4 +697,208 @@ def insight_report(request):
         'summary': summary,
     }
 
-    return render(request, 'main/insight_report.html', context)
\ No newline at end of file
+    return render(request, 'main/insight_report.html', context)
+
+
+# ----------------------------------------------------------------------
+# 5. 패턴 큐브 drill-down API (요일 × 노선 × 역 × 카테고리)
+# ----------------------------------------------------------------------
+CUBE_GROUP_BY = ('weekday', 'line', 'station', 'category')
+
+
+def _query_list(request, name):
+    """?name=a,b&name=c → ['a', 'b', 'c'], 파라미터가 없으면 None"""
+    values = [v.strip() for raw in request.GET.getlist(name) for v in raw.split(',') if v.strip()]
+    return values or None
+
+
+def pattern_cube(request):
+    """
+    메모리에 올린 패턴 큐브에서 임의의 조각을 합산해 JSON으로 반환합니다.
+    예) /trend/cube/?line=LINE2&weekday=0,4&group_by=category
+    weekday는 0(월)~6(일), 나머지 조건은 쉼표로 여러 값을 줄 수 있습니다.
+    """
+    from .cube import get_cube
+
+    cube = get_cube()
+    if cube is None:
+        return JsonResponse({'error': '패턴 큐브가 아직 생성되지 않았습니다. sync_reports를 실행하세요.'}, status=503)
+
+    group_by = request.GET.get('group_by') or None
+    if group_by and group_by not in CUBE_GROUP_BY:
+        return JsonResponse({'error': f"group_by는 {', '.join(CUBE_GROUP_BY)} 중 하나여야 합니다."}, status=400)
+    try:
+        weekdays = _query_list(request, 'weekday')
+        weekdays = [int(w) for w in weekdays] if weekdays else None
+    except ValueError:
+        return JsonResponse({'error': 'weekday는 0~6 정수여야 합니다.'}, status=400)
+
+    started = time.perf_counter()
+    rows = cube.slice(
+        weekdays=weekdays,
+        lines=_query_list(request, 'line'),
+        stations=_query_list(request, 'station'),
+        categories=_query_list(request, 'category'),
+        group_by=group_by,
+    )
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+
+    return JsonResponse({'group_by': group_by, 'rows': rows, 'elapsed_us': round(elapsed_us, 1)})
+
+
+# ----------------------------------------------------------------------
+# 6. 강수 what-if 시나리오 API (전 역 일괄 예측)
+# ----------------------------------------------------------------------
+def rain_scenario(request):
+    """
+    강수량·기온·날짜 시나리오에 대한 전 역의 예상 승하차 인원과 분실물 수를 JSON으로 반환합니다.
+    예) /trend/scenario/?rain_mm=30&temp=18&date=2026-07-01&line=LINE2
+    temp를 생략하면 해당 날짜의 예보 기온(없으면 학습 기간 평균), date를 생략하면 내일로 계산합니다.
+    """
+    import numpy as np
+    from .scenario import get_scenario_model
+    from .snapshot import get_snapshot, to_day
+
+    model = get_scenario_model()
+    if model is None:
+        return JsonResponse({'error': '시나리오 모델이 아직 생성되지 않았습니다. sync_reports를 실행하세요.'}, status=503)
+
+    try:
+        rain_mm = float(request.GET.get('rain_mm', 0))
+        avg_temp = float(request.GET['temp']) if request.GET.get('temp') else None
+        date_str = request.GET.get('date')
+        target = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else timezone.localdate() + timedelta(days=1)
+    except ValueError:
+        return JsonResponse({'error': 'rain_mm / temp는 숫자, date는 YYYY-MM-DD 형식이어야 합니다.'}, status=400)
+    # float()는 'inf' / 'nan'도 받으므로 유한한 값만 허용
+    if not math.isfinite(rain_mm) or (avg_temp is not None and not math.isfinite(avg_temp)):
+        return JsonResponse({'error': 'rain_mm / temp는 숫자, date는 YYYY-MM-DD 형식이어야 합니다.'}, status=400)
+    if rain_mm < 0:
+        return JsonResponse({'error': 'rain_mm는 0 이상이어야 합니다.'}, status=400)
+
+    day = to_day(target)
+    if avg_temp is None:
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            index, found = snapshot.weather_for([day])
+            if found[0] and not np.isnan(snapshot.weather['avg_temp'][index[0]]):
+                avg_temp = float(snapshot.weather['avg_temp'][index[0]])
+
+    started = time.perf_counter()
+    ridership, lost, dry_ridership = model.predict(day, rain_mm, avg_temp)
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+
+    selected = np.ones(len(model.stations), dtype=bool)
+    lines = _query_list(request, 'line')
+    if lines:
+        selected &= np.isin(model.lines, lines)
+
+    stations = [
+        {
+            'line_code': model.stations[i][0],
+            'station': model.stations[i][1],
+            'ridership': int(round(ridership[i])),
+            'ridership_change_pct': round(float(ridership[i] / dry_ridership[i] - 1) * 100, 1) if dry_ridership[i] > 0 else None,
+            'lost_items': round(float(lost[i]), 3),
+            'rii': None if np.isnan(model.rii[i]) else round(float(model.rii[i]), 2),
+            'training_days': int(model.training_days[i]),
+        }
+        for i in np.flatnonzero(selected)
+    ]
+    stations.sort(key=lambda row: row['lost_items'], reverse=True)
+
+    return JsonResponse({
+        'date': target.isoformat(),
+        'rain_mm': rain_mm,
+        'avg_temp': avg_temp,
+        'total_ridership': int(round(ridership[selected].sum())),
+        'total_lost_items': round(float(lost[selected].sum()), 2),
+        'stations': stations,
+        'elapsed_us': round(elapsed_us, 1),
+    })
+
+
+# ----------------------------------------------------------------------
+# 7. "내 물건 찾기" 유사도 매칭 API
+# ----------------------------------------------------------------------
+def lostitem_match(request):
+    """
+    모호한 설명으로 분실물 후보를 찾습니다. 텍스트(TF-IDF n-gram) + 역/노선 근접도 + 날짜 근접도 점수 순.
+    예) /archive/lostitem/match/?q=검정 우산 2호선 화요일&k=10
+    q 안의 노선(2호선) / 역(강남역) / 요일(화요일) / 날짜(2024-05-01)는 자동으로 조건으로 해석되며,
+    line / station / date 파라미터로 직접 줄 수도 있습니다.
+    """
+    index = get_search_index()
+    if index is None:
+        return JsonResponse({'error': '검색 색인이 아직 생성되지 않았습니다. build_search_index를 실행하세요.'}, status=503)
+
+    try:
+        k = max(1, int(request.GET.get('k', 10)))
+        date_str = request.GET.get('date')
+        target = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else None
+    except ValueError:
+        return JsonResponse({'error': 'k는 정수, date는 YYYY-MM-DD 형식이어야 합니다.'}, status=400)
+
+    started = time.perf_counter()
+    matches, parsed = index.search(
+        text=request.GET.get('q', ''),
+        line=request.GET.get('line') or None,
+        station=request.GET.get('station') or None,
+        date=target,
+        k=k,
+    )
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+
+    items = LostItem.objects.in_bulk([match['pk'] for match in matches])
+    results = []
+    for match in matches:
+        item = items.get(match['pk'])
+        if item is None:  # 색인 이후 삭제된 분실물
+            continue
+        results.append({
+            **match,
+            'item_id': item.item_id,
+            'category': item.category,
+            'item_name': item.item_name,
+            'line': item.line,
+            'station': item.station,
+            'registered_at': timezone.localdate(item.registered_at).isoformat() if item.registered_at else None,
+            'status': item.status,
+        })
+
+    return JsonResponse({
+        'query': {**parsed, 'date': parsed['date'].isoformat() if parsed['date'] else None},
+        'results': results,
+        'elapsed_us': round(elapsed_us, 1),
+    })
+
+
+# ----------------------------------------------------------------------
+# 8. 시간대별 승하차 프로파일 API
+# ----------------------------------------------------------------------
+@analytics_reads
+def hourly_profile(request):
+    """
+    RidershipHourly의 패킹 배열을 한 번에 디코딩해 0~23시 일평균 승차/하차 인원을 반환합니다.
+    예) /trend/hourly/?line=LINE2&from=2024-01-01&to=2024-06-30
+    """
+    from .hourly import hour_profile, peak_hours
+
+    try:
+        start = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else None
+        end = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else None
+        station_ids = [int(pk) for pk in _query_list(request, 'station_id') or []]
+    except ValueError:
+        return JsonResponse({'error': 'from / to는 YYYY-MM-DD, station_id는 정수여야 합니다.'}, status=400)
+
+    started = time.perf_counter()
+    profile = hour_profile(start=start, end=end, lines=_query_list(request, 'line'), station_ids=station_ids or None)
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+
+    return JsonResponse({
+        'hours': list(range(24)),
+        'boardings': [round(float(v), 1) for v in profile[0]],
+        'alightings': [round(float(v), 1) for v in profile[1]],
+        'peak_hours': peak_hours(profile),
+        'elapsed_us': round(elapsed_us, 1),
+    })
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # 💡 수정 1: BASE_DIR이 settings.py 파일이 있는 'pickuplog' 폴더 자체를 가리키도록 수정
@@ -52,13 +53,84 @@ TEMPLATES = [
 # 💡 수정 2: 파일 구조에 맞게 WSGI_APPLICATION 경로 수정 (config.wsgi -> pickuplog.wsgi)
 WSGI_APPLICATION = 'pickuplog.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 분석용 스냅샷/캐시 파일 저장 위치 (sync_reports 등이 생성, 버전 관리 제외)
+ANALYTICS_DIR = Path(os.environ.get('PICKUPLOG_ANALYTICS_DIR', BASE_DIR / 'analytics'))
+
+# 분석 화면(main.routers.analytics_reads) 읽기 전용 DB 별칭.
+# SQLite는 sync_reports가 online backup API로 만든 스냅샷 파일, Postgres는 복제본(POSTGRES_REPLICA_HOST)입니다.
+# 별칭이 없거나 스냅샷이 아직 없으면 primary(default)에서 읽습니다.
+ANALYTICS_DB_ALIAS = 'analytics'
+ANALYTICS_DB_PATH = ANALYTICS_DIR / 'analytics.sqlite3'
+
+# 💡 DB 프로필: 기본은 SQLite, PICKUPLOG_DB_PROFILE=postgres 이면 Postgres를 사용합니다.
+#    (Postgres 드라이버 psycopg는 requirements.txt에 포함)
+DB_PROFILE = os.environ.get('PICKUPLOG_DB_PROFILE', 'sqlite')
+
+if DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'pickuplog'),
+            'USER': os.environ.get('POSTGRES_USER', 'pickuplog'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # 요청마다 새로 연결하지 않고 연결을 재사용 (persistent connections)
+            'CONN_MAX_AGE': int(os.environ.get('POSTGRES_CONN_MAX_AGE', '600')),
+            'CONN_HEALTH_CHECKS': True,
+            # .iterator()로 순회하는 대용량 쿼리는 서버 사이드 커서로 스트리밍
+            'DISABLE_SERVER_SIDE_CURSORS': False,
+        }
+    }
+    if os.environ.get('POSTGRES_REPLICA_HOST'):
+        DATABASES[ANALYTICS_DB_ALIAS] = {
+            **DATABASES['default'],
+            'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+            'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # 쓰기 트랜잭션은 시작 시점에 쓰기 잠금을 잡아 (single writer) 교착 대신 대기하도록 합니다.
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        },
+        # 분석용 스냅샷 (읽기 전용 URI 모드로 열어 실수로도 쓰지 못하게 합니다)
+        ANALYTICS_DB_ALIAS: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f'file:{ANALYTICS_DB_PATH}?mode=ro',
+            'TEST': {'MIRROR': 'default'},
+        },
     }
+
+# SQLite 연결 생성 시 적용할 PRAGMA (main.db.configure_sqlite 참조)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',          # 읽기와 쓰기가 서로를 막지 않도록 WAL 사용
+    'synchronous': 'NORMAL',        # WAL에서는 NORMAL로도 손상 없이 안전
+    'mmap_size': 256 * 1024 * 1024, # 256MB 메모리 매핑 읽기
+    'cache_size': -64 * 1024,       # 음수는 KiB 단위 → 64MB 페이지 캐시
+    'busy_timeout': 20000,          # 잠금 대기 20초 (ms)
+    'temp_store': 'MEMORY',
+}
+# 분석용 스냅샷 연결에 적용할 PRAGMA (읽기 전용이라 journal_mode 등 쓰기가 필요한 설정은 제외)
+SQLITE_SNAPSHOT_PRAGMAS = {
+    'query_only': 'ON',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
 }
 
+# 분석 읽기 / 쓰기 DB 분리 (분석 화면은 스냅샷, 쓰기·CRUD는 primary)
+DATABASE_ROUTERS = ['main.routers.AnalyticsRouter']
+
+# 등록 후 이 일수가 지난 수령 완료 분실물은 archive_lostitems가 아카이브 테이블로 옮깁니다.
+LOSTITEM_ARCHIVE_AFTER_DAYS = int(os.environ.get('PICKUPLOG_ARCHIVE_AFTER_DAYS', '365'))
+
 # 정적 파일 설정 (Static Files Configuration)
 
 STATIC_URL = 'static/'